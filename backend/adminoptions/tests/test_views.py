@@ -831,8 +831,8 @@ class TestPendingTasks:
         assert len(response.data) == 1
 
     @pytest.mark.integration
-    def test_get_pending_tasks_auto_cancels_expired(self, api_client, user, db):
-        """Test pending tasks auto-cancels expired caretaker requests"""
+    def test_get_pending_tasks_hides_expired(self, api_client, user, db):
+        """Test pending tasks leaves out expired caretaker requests without cancelling them"""
         # Arrange
         api_client.force_authenticate(user=user)
         past_date = timezone.now() - timedelta(days=1)
@@ -851,9 +851,9 @@ class TestPendingTasks:
 
         # Assert
         assert response.status_code == status.HTTP_200_OK
+        assert task.pk not in [t["id"] for t in response.data]
         task.refresh_from_db()
-        assert task.status == AdminTask.TaskStatus.CANCELLED
-        assert "Auto-cancelled" in task.notes
+        assert task.status == AdminTask.TaskStatus.PENDING
 
 
 class TestCheckPendingCaretakerRequestForUser:
@@ -30,6 +30,8 @@ from adminoptions.serializers import (
     GuideSectionSerializer,
 )
 from caretakers.models import Caretaker
+from caretakers.services.request_service import CaretakerRequestService
+from common.utils.tagged_cache import TaggedCache, make_tag
 from communications.models import Comment
 from documents.models import ProjectDocument
 from projects.models import Project, ProjectMember
@@ -539,29 +541,11 @@ class PendingTasks(APIView):
     def get(self, req):
         settings.LOGGER.info(msg=f"{req.user} is getting all pending admin tasks")
 
-        # Auto-cancel expired pending caretaker requests before returning
-        from django.utils import timezone
-
-        expired_caretaker_requests = AdminTask.objects.filter(
-            status=AdminTask.TaskStatus.PENDING,
-            action=AdminTask.ActionTypes.SETCARETAKER,
-            end_date__lt=timezone.now(),  # Compare datetime to datetime
+        # Expired caretaker requests are cancelled by the scheduler
+        # (CaretakerRequestService.expire_requests), not on read
+        all = AdminTask.objects.filter(status=AdminTask.TaskStatus.PENDING).exclude(
+            pk__in=CaretakerRequestService.get_expired_requests()
         )
-
-        if expired_caretaker_requests.exists():
-            count = expired_caretaker_requests.count()
-            settings.LOGGER.info(
-                msg=f"Auto-cancelling {count} expired caretaker request(s)"
-            )
-            for request in expired_caretaker_requests:
-                request.status = AdminTask.TaskStatus.CANCELLED
-                request.notes = (
-                    request.notes or ""
-                ) + "\n[Auto-cancelled: end date passed while request was pending]"
-                request.save()
-
-        # Get all remaining pending tasks
-        all = AdminTask.objects.filter(status=AdminTask.TaskStatus.PENDING)
         ser = AdminTaskSerializer(
             all,
             many=True,
@@ -1010,6 +994,9 @@ class MergeUsers(APIView):
                 # Inherit the projects of the secondary user
                 user_projects = ProjectMember.objects.filter(user=u)
                 user_projects.update(user=primary_user)
+                # update() sends no signals, so drop the primary user's
+                # cached project list here
+                TaggedCache.invalidate([make_tag("user", primary_user.pk)])
 
                 # Inherit the roles of the secondary user
                 for project in user_projects:
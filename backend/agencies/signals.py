@@ -2,14 +2,18 @@
 Django signals for the agencies app.
 
 Handles automatic updates when Affiliation names change to ensure
-data consistency across related models.
+data consistency across related models, and bumps the cache tags of changed
+business areas.
 """
 
 from django.conf import settings
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 
-from .models import Affiliation
+from common.utils.tagged_cache import TaggedCache, make_tag
+from medias.models import BusinessAreaPhoto
+
+from .models import Affiliation, BusinessArea, Division
 
 
 @receiver(pre_save, sender=Affiliation)
@@ -90,3 +94,22 @@ def update_project_affiliations_on_name_change(sender, instance, **kwargs):
         pass
     except Exception as e:
         settings.LOGGER.error(f"Error updating project affiliations: {str(e)}")
+
+
+TaggedCache.invalidate_on_change(
+    BusinessArea, lambda business_area: [make_tag("business_area", business_area.pk)]
+)
+TaggedCache.invalidate_on_change(
+    BusinessAreaPhoto,
+    lambda photo: [make_tag("business_area", photo.business_area_id)],
+)
+# Business areas are cached with their division's name
+TaggedCache.invalidate_on_change(
+    Division,
+    lambda division: [
+        make_tag("business_area", pk)
+        for pk in BusinessArea.objects.filter(division=division).values_list(
+            "pk", flat=True
+        )
+    ],
+)
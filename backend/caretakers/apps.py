@@ -5,3 +5,7 @@ class CaretakersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "caretakers"
     verbose_name = "Caretakers"
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import caretakers.signals  # noqa: F401
@@ -2,12 +2,14 @@
 Caretaker services
 """
 
+from .caretaker_graph_service import CaretakerGraphService
 from .caretaker_service import CaretakerService
 from .request_service import CaretakerRequestService
 from .task_service import CaretakerTaskService
 
 __all__ = [
     "CaretakerService",
+    "CaretakerGraphService",
     "CaretakerTaskService",
     "CaretakerRequestService",
 ]
@@ -0,0 +1,337 @@
+"""
+Caretaker graph service - In-memory caretaker relationships, loaded in one query
+"""
+
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from medias.models import UserAvatar
+from users.models import User
+
+from ..models import Caretaker
+
+CARETAKER_GRAPH_VERSION_KEY = "caretakers:graph:version"
+VERSION_CHECK_INTERVAL = 5  # seconds between checks of the shared version
+MAX_AGE = 300  # reload at least this often, e.g. when the cache is a dummy
+
+# Depth of the nested trees returned by default, as User model methods did
+DEFAULT_MAX_DEPTH = 12
+
+_graph_lock = threading.Lock()
+_graph = None
+
+
+class CaretakerGraphService:
+    """
+    Caretaker relationships held in memory, loaded once per worker
+
+    Every Caretaker row is one edge from the user being caretaken for to
+    their caretaker. The edges are loaded with a single query into
+    adjacency lists for both directions, so walking the graph costs no
+    queries; expiry is checked against end_date at walk time, as edges
+    lapse without being saved. Caretaker saves and deletes bump a version
+    counter in the shared cache, so every worker reloads on its next walk
+    after a change (checked at most every VERSION_CHECK_INTERVAL seconds).
+
+    Walks track visited users, so cycles (A caretakes for B and B for A)
+    end instead of recursing.
+    """
+
+    @staticmethod
+    def get_caretaker_ids(user_id, active_only=True):
+        """
+        Get the direct caretakers of a user
+
+        Args:
+            user_id: ID of the user being caretaken for
+            active_only: Skip expired relationships
+
+        Returns:
+            list: Caretaker user IDs
+        """
+        edges = CaretakerGraphService._get_graph()["caretakers"].get(user_id, ())
+        return [
+            edge["caretaker_id"]
+            for edge in CaretakerGraphService._filter(edges, active_only)
+        ]
+
+    @staticmethod
+    def get_caretaking_ids(caretaker_id, active_only=True):
+        """
+        Get the users a caretaker directly caretakes for
+
+        Args:
+            caretaker_id: ID of the caretaker
+            active_only: Skip expired relationships
+
+        Returns:
+            list: User IDs
+        """
+        edges = CaretakerGraphService._get_graph()["caretaking"].get(caretaker_id, ())
+        return [
+            edge["user_id"]
+            for edge in CaretakerGraphService._filter(edges, active_only)
+        ]
+
+    @staticmethod
+    def get_reachable_caretaking_ids(caretaker_id, active_only=True, exclude=()):
+        """
+        Get everyone a caretaker caretakes for, directly or through others
+
+        Args:
+            caretaker_id: ID of the caretaker
+            active_only: Skip expired relationships
+            exclude: User IDs not to walk through
+
+        Returns:
+            list: User IDs in breadth-first order, starting with caretaker_id
+        """
+        caretaking = CaretakerGraphService._get_graph()["caretaking"]
+        visited = set(exclude)
+        if caretaker_id in visited:
+            return []
+
+        order = []
+        queue = deque([caretaker_id])
+        visited.add(caretaker_id)
+        while queue:
+            user_id = queue.popleft()
+            order.append(user_id)
+            for edge in CaretakerGraphService._filter(
+                caretaking.get(user_id, ()), active_only
+            ):
+                if edge["user_id"] not in visited:
+                    visited.add(edge["user_id"])
+                    queue.append(edge["user_id"])
+        return order
+
+    @staticmethod
+    def get_caretakers_tree(user_id, max_depth=DEFAULT_MAX_DEPTH):
+        """
+        Get a user's active caretakers, each with their own caretakers nested
+
+        Args:
+            user_id: ID of the user being caretaken for
+            max_depth: Levels of nesting to include
+
+        Returns:
+            list: Caretaker dicts (see _node_data) with a "caretakers" list
+        """
+        walker = _TreeWalker(CaretakerGraphService._get_graph(), max_depth)
+        trees = walker.caretakers(user_id, 0, ())
+        return walker.resolve(trees)
+
+    @staticmethod
+    def get_caretaking_tree(caretaker_id, max_depth=DEFAULT_MAX_DEPTH):
+        """
+        Get the users a caretaker actively caretakes for, nested both ways
+
+        Each user carries "caretaking_for" (who they in turn caretake for)
+        and "caretakers" (their own caretakers, from a fresh walk).
+
+        Args:
+            caretaker_id: ID of the caretaker
+            max_depth: Levels of nesting to include
+
+        Returns:
+            list: User dicts (see _node_data)
+        """
+        walker = _TreeWalker(CaretakerGraphService._get_graph(), max_depth)
+        trees = walker.caretaking(caretaker_id, 0, ())
+        return walker.resolve(trees)
+
+    @staticmethod
+    def invalidate():
+        """
+        Drop this worker's copy and, once committed, tell other workers
+
+        Called by the Caretaker post_save/post_delete signals.
+        """
+        CaretakerGraphService.clear()
+
+        def bump_version():
+            try:
+                cache.incr(CARETAKER_GRAPH_VERSION_KEY)
+            except ValueError:
+                cache.set(CARETAKER_GRAPH_VERSION_KEY, 1, None)
+            # A walk between the save and the commit may have reloaded
+            CaretakerGraphService.clear()
+
+        transaction.on_commit(bump_version)
+
+    @staticmethod
+    def clear():
+        """Drop this worker's copy so the next walk reloads"""
+        global _graph
+        with _graph_lock:
+            _graph = None
+
+    @staticmethod
+    def _filter(edges, active_only):
+        if not active_only:
+            return edges
+        now = timezone.now()
+        return [
+            edge for edge in edges if edge["end_date"] is None or edge["end_date"] > now
+        ]
+
+    @staticmethod
+    def _get_graph():
+        global _graph
+        now = time.monotonic()
+        graph = _graph
+        if graph and now < graph["checked_at"] + VERSION_CHECK_INTERVAL:
+            return graph
+
+        version = cache.get(CARETAKER_GRAPH_VERSION_KEY)
+        with _graph_lock:
+            graph = _graph
+            if (
+                graph is None
+                or graph["version"] != version
+                or now > graph["loaded_at"] + MAX_AGE
+            ):
+                graph = CaretakerGraphService._load(version, now)
+            else:
+                graph["checked_at"] = now
+            _graph = graph
+        return graph
+
+    @staticmethod
+    def _load(version, now):
+        caretakers = {}
+        caretaking = {}
+        first_edge = {}
+        edges = Caretaker.objects.order_by("pk").values(
+            "pk", "user_id", "caretaker_id", "end_date"
+        )
+        count = 0
+        for edge in edges:
+            caretakers.setdefault(edge["user_id"], []).append(edge)
+            caretaking.setdefault(edge["caretaker_id"], []).append(edge)
+            first_edge.setdefault(edge["user_id"], edge)
+            count += 1
+
+        settings.LOGGER.info(f"Loaded {count} caretaker relationships")
+        return {
+            "version": version,
+            "loaded_at": now,
+            "checked_at": now,
+            "caretakers": caretakers,
+            "caretaking": caretaking,
+            # Each user's earliest relationship as caretakee, expired or not
+            "first_edge": first_edge,
+        }
+
+
+class _TreeWalker:
+    """
+    Builds nested caretaker trees from the graph
+
+    Trees are built with user IDs first, then every user's details are
+    fetched in one query and filled in by resolve(). A user's fresh
+    caretakers walk doesn't depend on the path that reached them, so it's
+    computed once per walk.
+    """
+
+    def __init__(self, graph, max_depth):
+        self.graph = graph
+        self.max_depth = max_depth
+        self.user_ids = set()
+        self._fresh_caretakers = {}
+
+    def caretakers(self, user_id, depth, path):
+        if depth >= self.max_depth or user_id in path:
+            return []
+        path = path + (user_id,)
+        result = []
+        for edge in CaretakerGraphService._filter(
+            self.graph["caretakers"].get(user_id, ()), active_only=True
+        ):
+            caretaker_id = edge["caretaker_id"]
+            if caretaker_id in path:
+                continue
+            self.user_ids.add(caretaker_id)
+            result.append(
+                {
+                    "id": caretaker_id,
+                    "caretakers": self.caretakers(caretaker_id, depth + 1, path),
+                }
+            )
+        return result
+
+    def caretaking(self, caretaker_id, depth, path):
+        if depth >= self.max_depth or caretaker_id in path:
+            return []
+        path = path + (caretaker_id,)
+        result = []
+        for edge in CaretakerGraphService._filter(
+            self.graph["caretaking"].get(caretaker_id, ()), active_only=True
+        ):
+            user_id = edge["user_id"]
+            if user_id in path:
+                continue
+            if user_id not in self._fresh_caretakers:
+                self._fresh_caretakers[user_id] = self.caretakers(user_id, 0, ())
+            self.user_ids.add(user_id)
+            result.append(
+                {
+                    "id": user_id,
+                    "caretaking_for": self.caretaking(user_id, depth + 1, path),
+                    "caretakers": self._fresh_caretakers[user_id],
+                }
+            )
+        return result
+
+    def resolve(self, trees):
+        """Replace each node's ID with the user's details"""
+        users = {
+            user["pk"]: user
+            for user in User.objects.filter(pk__in=self.user_ids).values(
+                "pk",
+                "display_first_name",
+                "display_last_name",
+                "is_superuser",
+                "email",
+                "avatar__file",
+            )
+        }
+        return self._resolve(trees, users)
+
+    def _resolve(self, trees, users):
+        result = []
+        for node in trees:
+            if node["id"] not in users:
+                # Deleted since the graph was loaded
+                continue
+            data = self._node_data(users[node["id"]])
+            for key in ("caretaking_for", "caretakers"):
+                if key in node:
+                    data[key] = self._resolve(node[key], users)
+            result.append(data)
+        return result
+
+    def _node_data(self, user):
+        """The fields User.get_caretaker_data returns"""
+        first_edge = self.graph["first_edge"].get(user["pk"])
+        avatar = user["avatar__file"]
+        return {
+            "id": user["pk"],
+            "caretaker_obj_id": first_edge["pk"] if first_edge else None,
+            "display_first_name": user["display_first_name"],
+            "display_last_name": user["display_last_name"],
+            "is_superuser": user["is_superuser"],
+            "email": user["email"],
+            "image": (
+                UserAvatar._meta.get_field("file").storage.url(avatar)
+                if avatar
+                else None
+            ),
+            "end_date": first_edge["end_date"] if first_edge else None,
+        }
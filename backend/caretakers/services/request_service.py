@@ -6,6 +6,8 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import TextField, Value
+from django.db.models.functions import Coalesce, Concat
 from django.utils import timezone
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 
@@ -14,6 +16,8 @@ from users.models import User
 
 from ..models import Caretaker
 
+EXPIRED_REQUEST_NOTE = "\n[Auto-cancelled: end date passed while request was pending]"
+
 
 class CaretakerRequestService:
     """Service for managing caretaker requests via AdminTask"""
@@ -70,37 +74,63 @@ class CaretakerRequestService:
             raise PermissionDenied("You are not authorized to respond to this request")
 
     @staticmethod
-    @transaction.atomic
-    def auto_cancel_expired_request(task):
+    def get_expired_requests():
         """
-        Auto-cancel a caretaker request if it has expired
+        Get pending caretaker requests whose end date has passed
 
-        Args:
-            task: AdminTask instance
+        A request stays open through its end date, in TIME_ZONE.
 
         Returns:
-            bool: True if cancelled, False if not expired
+            QuerySet of AdminTask
         """
-        # Only cancel if task has end_date and it's in the past
-        if not task.end_date:
-            return False
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        return AdminTask.objects.filter(
+            action=AdminTask.ActionTypes.SETCARETAKER,
+            status=AdminTask.TaskStatus.PENDING,
+            end_date__lt=today,
+        )
 
-        # Convert end_date to date if it's a datetime
-        end_date = task.end_date
-        if isinstance(end_date, datetime):
-            end_date = end_date.date()
+    @staticmethod
+    @transaction.atomic
+    def expire_requests():
+        """
+        Cancel every pending caretaker request whose end date has passed
 
-        if end_date >= timezone.now().date():
-            return False
+        Runs on a schedule (see SCHEDULED_JOBS), so reads only hide expired
+        requests rather than cancelling them.
 
-        # Cancel the task
-        task.status = AdminTask.TaskStatus.CANCELLED
-        task.notes = f"Auto-cancelled: Request expired on {end_date}"
-        task.save()
+        Returns:
+            int: Number of requests cancelled
+        """
+        # Imported here as the dashboard counts build on the caretaker models
+        from users.services.dashboard_count_service import DashboardCountService
 
-        settings.LOGGER.info(f"Auto-cancelled expired caretaker request {task.pk}")
+        expired = list(
+            CaretakerRequestService.get_expired_requests()
+            .select_for_update()
+            .values_list("pk", "secondary_users")
+        )
+        if not expired:
+            return 0
+
+        AdminTask.objects.filter(pk__in=[pk for pk, _ in expired]).update(
+            status=AdminTask.TaskStatus.CANCELLED,
+            notes=Concat(
+                Coalesce("notes", Value(""), output_field=TextField()),
+                Value(EXPIRED_REQUEST_NOTE),
+                output_field=TextField(),
+            ),
+            updated_at=timezone.now(),
+        )
+        # update() skips the signals that drop the dashboard counters
+        DashboardCountService.invalidate_admin_tasks(
+            [user_id for _, user_ids in expired for user_id in user_ids or ()]
+        )
 
-        return True
+        settings.LOGGER.info(
+            f"Auto-cancelled {len(expired)} expired caretaker requests"
+        )
+        return len(expired)
 
     @staticmethod
     def get_user_requests(user):
@@ -111,7 +141,7 @@ class CaretakerRequestService:
         - caretaker_request: Request where user is primary_user (wants someone to be THEIR caretaker)
         - become_caretaker_request: Request where user is in secondary_users (someone wants THEM to be caretaker)
 
-        Auto-cancels any expired requests.
+        Expired requests are left out; expire_requests cancels them.
 
         Args:
             user: User instance
@@ -119,6 +149,8 @@ class CaretakerRequestService:
         Returns:
             dict with 'caretaker_request' and 'become_caretaker_request' keys
         """
+        expired = CaretakerRequestService.get_expired_requests()
+
         # Get caretaker request (user wants someone to be their caretaker)
         caretaker_request = (
             AdminTask.objects.filter(
@@ -126,6 +158,7 @@ class CaretakerRequestService:
                 status=AdminTask.TaskStatus.PENDING,
                 primary_user=user,
             )
+            .exclude(pk__in=expired)
             .select_related(
                 "requester",
                 "primary_user",
@@ -133,14 +166,6 @@ class CaretakerRequestService:
             .first()
         )
 
-        # Auto-cancel if expired
-        if caretaker_request:
-            cancelled = CaretakerRequestService.auto_cancel_expired_request(
-                caretaker_request
-            )
-            if cancelled:
-                caretaker_request = None
-
         # Get become caretaker request (someone wants user to be their caretaker)
         become_caretaker_request = (
             AdminTask.objects.filter(
@@ -148,6 +173,7 @@ class CaretakerRequestService:
                 status=AdminTask.TaskStatus.PENDING,
                 secondary_users__contains=[user.pk],
             )
+            .exclude(pk__in=expired)
             .select_related(
                 "requester",
                 "primary_user",
@@ -155,14 +181,6 @@ class CaretakerRequestService:
             .first()
         )
 
-        # Auto-cancel if expired
-        if become_caretaker_request:
-            cancelled = CaretakerRequestService.auto_cancel_expired_request(
-                become_caretaker_request
-            )
-            if cancelled:
-                become_caretaker_request = None
-
         return {
             "caretaker_request": caretaker_request,
             "become_caretaker_request": become_caretaker_request,
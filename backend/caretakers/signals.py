@@ -0,0 +1,18 @@
+"""
+Django signals for the caretakers app.
+
+Keeps every worker's in-memory caretaker graph in step with the Caretaker table.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Caretaker
+from .services.caretaker_graph_service import CaretakerGraphService
+
+
+@receiver(post_save, sender=Caretaker)
+@receiver(post_delete, sender=Caretaker)
+def invalidate_caretaker_graph(sender, instance, **kwargs):
+    """Reload the caretaker graph after a relationship changes"""
+    CaretakerGraphService.invalidate()
@@ -19,11 +19,122 @@ from caretakers.services.request_service import CaretakerRequestService
 from caretakers.services.task_service import CaretakerTaskService
 from common.tests.factories import BusinessAreaFactory, ProjectFactory, UserFactory
 from documents.models import ProjectDocument
-from projects.models import Project, ProjectMember
+from projects.models import ProjectMember
 
 User = get_user_model()
 
 
+class TestCaretakerGraphService:
+    """Test CaretakerGraphService graph walks"""
+
+    @pytest.fixture
+    def chain(self, db):
+        """user1 is caretaken for by user2, who is caretaken for by user3"""
+        user1, user2, user3 = (UserFactory(username=f"user{i}") for i in (1, 2, 3))
+        Caretaker.objects.create(user=user1, caretaker=user2)
+        Caretaker.objects.create(user=user2, caretaker=user3)
+        return user1, user2, user3
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_caretakers_tree(self, chain):
+        """Test caretakers are nested up the chain with their details"""
+        # Arrange
+        from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+        user1, user2, user3 = chain
+
+        # Act
+        tree = CaretakerGraphService.get_caretakers_tree(user1.pk)
+
+        # Assert
+        assert len(tree) == 1
+        assert tree[0]["id"] == user2.pk
+        assert tree[0]["email"] == user2.email
+        assert tree[0]["caretaker_obj_id"] == user2.caretakers.first().pk
+        assert tree[0]["caretakers"][0]["id"] == user3.pk
+        assert tree[0]["caretakers"][0]["caretakers"] == []
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_caretaking_tree(self, chain):
+        """Test caretaking is nested down the chain with fresh caretakers"""
+        # Arrange
+        from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+        user1, user2, user3 = chain
+
+        # Act
+        tree = CaretakerGraphService.get_caretaking_tree(user3.pk)
+
+        # Assert
+        assert [node["id"] for node in tree] == [user2.pk]
+        assert [node["id"] for node in tree[0]["caretaking_for"]] == [user1.pk]
+        assert [node["id"] for node in tree[0]["caretakers"]] == [user3.pk]
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_trees_stop_at_cycles_and_depth(self, chain):
+        """Test a cycle ends the walk, and max_depth limits nesting"""
+        # Arrange
+        from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+        user1, user2, user3 = chain
+        Caretaker.objects.create(user=user3, caretaker=user1)
+
+        # Act
+        tree = CaretakerGraphService.get_caretakers_tree(user1.pk)
+        shallow = CaretakerGraphService.get_caretakers_tree(user1.pk, max_depth=1)
+
+        # Assert
+        assert tree[0]["id"] == user2.pk
+        assert tree[0]["caretakers"][0]["id"] == user3.pk
+        assert tree[0]["caretakers"][0]["caretakers"] == []
+        assert shallow[0]["caretakers"] == []
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_expired_relationships_skipped(self, chain):
+        """Test expired relationships are left out unless asked for"""
+        # Arrange
+        from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+        user1, user2, _ = chain
+        Caretaker.objects.filter(user=user1).update(
+            end_date=timezone.now() - timedelta(days=1)
+        )
+        CaretakerGraphService.clear()
+
+        # Act & Assert
+        assert CaretakerGraphService.get_caretakers_tree(user1.pk) == []
+        assert CaretakerGraphService.get_caretaker_ids(user1.pk) == []
+        assert CaretakerGraphService.get_caretaker_ids(user1.pk, active_only=False) == [
+            user2.pk
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_graph_reloads_after_save(self, chain, django_assert_num_queries):
+        """Test walks are served from memory until a relationship changes"""
+        # Arrange
+        from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+        user1, user2, user3 = chain
+        CaretakerGraphService.get_caretaker_ids(user1.pk)
+
+        # Act & Assert
+        with django_assert_num_queries(0):
+            assert CaretakerGraphService.get_reachable_caretaking_ids(user3.pk) == [
+                user3.pk,
+                user2.pk,
+                user1.pk,
+            ]
+
+        user4 = UserFactory()
+        Caretaker.objects.create(user=user4, caretaker=user1)
+        assert CaretakerGraphService.get_caretaking_ids(user1.pk) == [user4.pk]
+
+
 class TestCaretakerTaskService:
     """Test CaretakerTaskService business logic"""
 
@@ -100,336 +211,6 @@ class TestCaretakerTaskService:
         # Assert
         assert len(assignments) == 0
 
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_get_directorate_documents(self, db):
-        """Test get_directorate_documents returns correct documents"""
-        # Arrange
-        project1 = ProjectFactory()
-        project2 = ProjectFactory()
-
-        # Create documents at different stages
-        doc1 = ProjectDocument.objects.create(
-            project=project1,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=True,
-            business_area_lead_approval_granted=True,
-            directorate_approval_granted=False,
-        )
-
-        # Document already approved (should be excluded)
-        ProjectDocument.objects.create(
-            project=project2,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.APPROVED,
-            project_lead_approval_granted=True,
-            business_area_lead_approval_granted=True,
-            directorate_approval_granted=True,
-        )
-
-        # Document not ready for directorate (should be excluded)
-        ProjectDocument.objects.create(
-            project=project1,
-            kind="projectplan",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=True,
-            business_area_lead_approval_granted=False,
-            directorate_approval_granted=False,
-        )
-
-        projects = Project.objects.filter(pk__in=[project1.pk, project2.pk])
-
-        # Act
-        documents = CaretakerTaskService.get_directorate_documents(projects)
-
-        # Assert
-        assert documents.count() == 1
-        assert documents.first().pk == doc1.pk
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_get_ba_documents(self, db):
-        """Test get_ba_documents returns correct documents"""
-        # Arrange
-        project1 = ProjectFactory()
-        project2 = ProjectFactory()
-
-        # Document ready for BA approval
-        doc1 = ProjectDocument.objects.create(
-            project=project1,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=True,
-            business_area_lead_approval_granted=False,
-        )
-
-        # Document already approved (should be excluded)
-        ProjectDocument.objects.create(
-            project=project2,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.APPROVED,
-            project_lead_approval_granted=True,
-            business_area_lead_approval_granted=True,
-        )
-
-        # Document not ready for BA (should be excluded)
-        ProjectDocument.objects.create(
-            project=project1,
-            kind="projectplan",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=False,
-            business_area_lead_approval_granted=False,
-        )
-
-        projects = Project.objects.filter(pk__in=[project1.pk, project2.pk])
-
-        # Act
-        documents = CaretakerTaskService.get_ba_documents(projects)
-
-        # Assert
-        assert documents.count() == 1
-        assert documents.first().pk == doc1.pk
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_get_lead_documents(self, db):
-        """Test get_lead_documents returns correct documents"""
-        # Arrange
-        project1 = ProjectFactory()
-        project2 = ProjectFactory()
-
-        # Document ready for project lead approval
-        doc1 = ProjectDocument.objects.create(
-            project=project1,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=False,
-        )
-
-        # Document already approved (should be excluded)
-        ProjectDocument.objects.create(
-            project=project2,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.APPROVED,
-            project_lead_approval_granted=True,
-        )
-
-        # Document already has lead approval (should be excluded)
-        ProjectDocument.objects.create(
-            project=project1,
-            kind="projectplan",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=True,
-        )
-
-        project_ids = [project1.pk, project2.pk]
-
-        # Act
-        documents = CaretakerTaskService.get_lead_documents(project_ids)
-
-        # Assert
-        assert documents.count() == 1
-        assert documents.first().pk == doc1.pk
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_get_team_documents(self, db):
-        """Test get_team_documents returns correct documents"""
-        # Arrange
-        project1 = ProjectFactory()
-        project2 = ProjectFactory()
-
-        # Document ready for team member attention
-        doc1 = ProjectDocument.objects.create(
-            project=project1,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.INAPPROVAL,
-            project_lead_approval_granted=False,
-        )
-
-        # Document already approved (should be excluded)
-        ProjectDocument.objects.create(
-            project=project2,
-            kind="concept",
-            status=ProjectDocument.StatusChoices.APPROVED,
-            project_lead_approval_granted=True,
-        )
-
-        project_ids = [project1.pk, project2.pk]
-
-        # Act
-        documents = CaretakerTaskService.get_team_documents(project_ids)
-
-        # Assert
-        assert documents.count() == 1
-        assert documents.first().pk == doc1.pk
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_project_lead(self, db):
-        """Test analyze_caretakee_roles identifies project leads"""
-        # Arrange
-        user = UserFactory()
-        project = ProjectFactory()
-
-        # Make user a project lead
-        ProjectMember.objects.create(
-            project=project,
-            user=user,
-            is_leader=True,
-            role="supervising",
-        )
-
-        # Create caretaker assignment
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert
-        assert user.id in roles["project_lead_user_ids"]
-        assert user.id not in roles["team_member_user_ids"]
-        assert not roles["directorate_user_found"]
-        assert len(roles["ba_leader_user_ids"]) == 0
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_team_member(self, db):
-        """Test analyze_caretakee_roles identifies team members"""
-        # Arrange
-        user = UserFactory()
-        project = ProjectFactory()
-
-        # Make user a team member (not leader)
-        ProjectMember.objects.create(
-            project=project,
-            user=user,
-            is_leader=False,
-            role="research",
-        )
-
-        # Create caretaker assignment
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert
-        assert user.id in roles["team_member_user_ids"]
-        assert user.id not in roles["project_lead_user_ids"]
-        assert not roles["directorate_user_found"]
-        assert len(roles["ba_leader_user_ids"]) == 0
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_ba_leader(self, db):
-        """Test analyze_caretakee_roles identifies BA leaders"""
-        # Arrange
-        user = UserFactory()
-        BusinessAreaFactory(leader=user)
-
-        # Create caretaker assignment
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert
-        assert user.id in roles["ba_leader_user_ids"]
-        assert not roles["directorate_user_found"]
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_directorate_by_ba(self, db, directorate_user):
-        """Test analyze_caretakee_roles identifies Directorate users by BA"""
-        # Arrange
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(
-            user=directorate_user, caretaker=caretaker
-        )
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert
-        assert roles["directorate_user_found"] is True
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_directorate_by_superuser(self, db):
-        """Test analyze_caretakee_roles identifies superusers as Directorate"""
-        # Arrange
-        user = UserFactory(is_superuser=True)
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert
-        assert roles["directorate_user_found"] is True
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_closed_projects_excluded(self, db):
-        """Test analyze_caretakee_roles excludes closed projects"""
-        # Arrange
-        user = UserFactory()
-        # Use COMPLETED status which is in CLOSED_ONLY tuple
-        closed_project = ProjectFactory(status=Project.StatusChoices.COMPLETED)
-
-        # Make user a project lead of closed project
-        ProjectMember.objects.create(
-            project=closed_project,
-            user=user,
-            is_leader=True,
-            role="supervising",
-        )
-
-        # Create caretaker assignment
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert - User should NOT be in project_lead_user_ids because project is closed
-        # The service correctly excludes closed projects from the query
-        assert user.id not in roles["project_lead_user_ids"]
-        assert user.id not in roles["team_member_user_ids"]
-
-    @pytest.mark.django_db
-    @pytest.mark.integration
-    def test_analyze_caretakee_roles_active_projects_included(self, db):
-        """Test analyze_caretakee_roles includes active projects"""
-        # Arrange
-        user = UserFactory()
-        # Use ACTIVE status (not in CLOSED_ONLY tuple)
-        active_project = ProjectFactory(status=Project.StatusChoices.ACTIVE)
-
-        # Make user a project lead of active project
-        ProjectMember.objects.create(
-            project=active_project,
-            user=user,
-            is_leader=True,
-            role="supervising",
-        )
-
-        # Create caretaker assignment
-        caretaker = UserFactory()
-        assignment = Caretaker.objects.create(user=user, caretaker=caretaker)
-
-        # Act
-        roles = CaretakerTaskService.analyze_caretakee_roles([assignment])
-
-        # Assert - User SHOULD be in project_lead_user_ids because project is active
-        assert user.id in roles["project_lead_user_ids"]
-        assert user.id not in roles["team_member_user_ids"]
-
     @pytest.mark.django_db
     @pytest.mark.integration
     def test_get_tasks_for_user_no_assignments(self, db):
@@ -443,10 +224,12 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 0
-        assert len(tasks["directorate_documents"]) == 0
-        assert len(tasks["ba_documents"]) == 0
-        assert len(tasks["lead_documents"]) == 0
-        assert len(tasks["member_documents"]) == 0
+        assert tasks["caretakees"] == {}
+        assert tasks["pending"]["documents"] == []
+        assert tasks["pending"]["directorate"] == {}
+        assert tasks["pending"]["ba"] == {}
+        assert tasks["pending"]["lead"] == {}
+        assert tasks["pending"]["team"] == {}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -473,9 +256,7 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 1
-        assert tasks["roles"]["directorate_user_found"] is True
-        assert len(tasks["directorate_documents"]) == 1
-        assert tasks["directorate_documents"][0].pk == doc.pk
+        assert tasks["pending"]["directorate"] == {doc.pk: None}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -504,7 +285,7 @@ class TestCaretakerTaskService:
         tasks = CaretakerTaskService.get_tasks_for_user(caretaker.id, requesting_user)
 
         # Assert - Should filter out directorate documents
-        assert len(tasks["directorate_documents"]) == 0
+        assert tasks["pending"]["directorate"] == {}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -533,9 +314,7 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 1
-        assert ba_leader.id in tasks["roles"]["ba_leader_user_ids"]
-        assert len(tasks["ba_documents"]) == 1
-        assert tasks["ba_documents"][0].pk == doc.pk
+        assert tasks["pending"]["ba"] == {doc.pk: ba_leader.id}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -568,9 +347,7 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 1
-        assert project_lead.id in tasks["roles"]["project_lead_user_ids"]
-        assert len(tasks["lead_documents"]) == 1
-        assert tasks["lead_documents"][0].pk == doc.pk
+        assert tasks["pending"]["lead"] == {doc.pk: project_lead.id}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -603,9 +380,7 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 1
-        assert team_member.id in tasks["roles"]["team_member_user_ids"]
-        assert len(tasks["member_documents"]) == 1
-        assert tasks["member_documents"][0].pk == doc.pk
+        assert tasks["pending"]["team"] == {doc.pk: team_member.id}
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -652,10 +427,42 @@ class TestCaretakerTaskService:
 
         # Assert
         assert len(tasks["caretaker_assignments"]) == 1
-        assert user.id in tasks["roles"]["ba_leader_user_ids"]
-        assert user.id in tasks["roles"]["project_lead_user_ids"]
-        assert len(tasks["ba_documents"]) == 1
-        assert len(tasks["lead_documents"]) == 1
+        assert list(tasks["pending"]["ba"].values()) == [user.id]
+        assert list(tasks["pending"]["lead"].values()) == [user.id]
+        assert len(tasks["pending"]["documents"]) == 2
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_get_tasks_for_user_nested_caretakees(self, db):
+        """Test get_tasks_for_user covers caretakees of caretakees together"""
+        # Arrange
+        caretaker = UserFactory()
+        caretakee = UserFactory()
+        nested_caretakee = UserFactory()
+        Caretaker.objects.create(user=caretakee, caretaker=caretaker)
+        Caretaker.objects.create(user=nested_caretakee, caretaker=caretakee)
+
+        docs = {}
+        for member in (caretakee, nested_caretakee):
+            project = ProjectFactory()
+            ProjectMember.objects.create(
+                project=project, user=member, is_leader=True, role="supervising"
+            )
+            docs[member.id] = ProjectDocument.objects.create(
+                project=project,
+                kind="concept",
+                status=ProjectDocument.StatusChoices.INAPPROVAL,
+                project_lead_approval_granted=False,
+            )
+
+        # Act
+        tasks = CaretakerTaskService.get_tasks_for_user(caretaker.id, caretaker)
+
+        # Assert
+        assert set(tasks["caretakees"]) == {caretakee.id, nested_caretakee.id}
+        assert tasks["pending"]["lead"] == {
+            doc.pk: user_id for user_id, doc in docs.items()
+        }
 
 
 class TestCaretakerService:
@@ -1192,80 +999,91 @@ class TestCaretakerRequestService:
 
     @pytest.mark.django_db
     @pytest.mark.integration
-    def test_auto_cancel_expired_request_expired(self, db):
-        """Test auto_cancel_expired_request cancels expired request"""
+    def test_expire_requests(self, db, django_assert_max_num_queries):
+        """Test expire_requests cancels only pending requests past their end date"""
         # Arrange
         user = UserFactory()
         caretakee = UserFactory()
 
-        # Create task with end_date in the past
-        past_date = timezone.now() - timedelta(days=1)
-        task = AdminTask.objects.create(
-            action=AdminTask.ActionTypes.SETCARETAKER,
-            status=AdminTask.TaskStatus.PENDING,
-            primary_user=caretakee,
-            secondary_users=[user.pk],
-            end_date=past_date,
+        def make_task(end_date, status=AdminTask.TaskStatus.PENDING, notes=None):
+            return AdminTask.objects.create(
+                action=AdminTask.ActionTypes.SETCARETAKER,
+                status=status,
+                primary_user=caretakee,
+                secondary_users=[user.pk],
+                end_date=end_date,
+                notes=notes,
+            )
+
+        expired = [
+            make_task(timezone.now() - timedelta(days=1), notes="Leave"),
+            make_task(timezone.now() - timedelta(days=30)),
+        ]
+        current = make_task(timezone.now() + timedelta(days=1))
+        open_ended = make_task(None)
+        rejected = make_task(
+            timezone.now() - timedelta(days=1), status=AdminTask.TaskStatus.REJECTED
         )
 
         # Act
-        result = CaretakerRequestService.auto_cancel_expired_request(task)
+        with patch(
+            "users.services.dashboard_count_service.DashboardCountService.invalidate_admin_tasks"
+        ) as mock_invalidate:
+            with django_assert_max_num_queries(4):
+                count = CaretakerRequestService.expire_requests()
 
         # Assert
-        assert result is True
-        task.refresh_from_db()
-        assert task.status == AdminTask.TaskStatus.CANCELLED
-        assert "Auto-cancelled" in task.notes
+        assert count == 2
+        for task in expired:
+            task.refresh_from_db()
+            assert task.status == AdminTask.TaskStatus.CANCELLED
+            assert "Auto-cancelled" in task.notes
+        assert expired[0].notes.startswith("Leave\n")
+        for task in (current, open_ended):
+            task.refresh_from_db()
+            assert task.status == AdminTask.TaskStatus.PENDING
+        rejected.refresh_from_db()
+        assert rejected.status == AdminTask.TaskStatus.REJECTED
+        assert list(mock_invalidate.call_args.args[0]) == [user.pk, user.pk]
 
     @pytest.mark.django_db
     @pytest.mark.integration
-    def test_auto_cancel_expired_request_not_expired(self, db):
-        """Test auto_cancel_expired_request does not cancel non-expired request"""
+    def test_expire_requests_nothing_expired(self, db):
+        """Test expire_requests does nothing when no request has expired"""
         # Arrange
-        user = UserFactory()
-        caretakee = UserFactory()
-
-        # Create task with end_date in the future
-        future_date = timezone.now() + timedelta(days=1)
-        task = AdminTask.objects.create(
-            action=AdminTask.ActionTypes.SETCARETAKER,
-            status=AdminTask.TaskStatus.PENDING,
-            primary_user=caretakee,
-            secondary_users=[user.pk],
-            end_date=future_date,
-        )
+        UserFactory()
 
         # Act
-        result = CaretakerRequestService.auto_cancel_expired_request(task)
+        count = CaretakerRequestService.expire_requests()
 
         # Assert
-        assert result is False
-        task.refresh_from_db()
-        assert task.status == AdminTask.TaskStatus.PENDING
+        assert count == 0
 
     @pytest.mark.django_db
     @pytest.mark.integration
-    def test_auto_cancel_expired_request_no_end_date(self, db):
-        """Test auto_cancel_expired_request does not cancel request without end_date"""
+    def test_get_expired_requests_uses_local_date(self, db):
+        """Test a request expires after its end date in TIME_ZONE, not UTC"""
         # Arrange
-        user = UserFactory()
-        caretakee = UserFactory()
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
 
+        perth = ZoneInfo("Australia/Perth")
         task = AdminTask.objects.create(
             action=AdminTask.ActionTypes.SETCARETAKER,
             status=AdminTask.TaskStatus.PENDING,
-            primary_user=caretakee,
-            secondary_users=[user.pk],
-            end_date=None,
+            primary_user=UserFactory(),
+            secondary_users=[UserFactory().pk],
+            end_date=datetime(2026, 3, 1, 12, tzinfo=perth),
         )
+        # 1am on 2 March in Perth, still 1 March in UTC
+        now = datetime(2026, 3, 2, 1, tzinfo=perth)
 
         # Act
-        result = CaretakerRequestService.auto_cancel_expired_request(task)
+        with patch("django.utils.timezone.now", return_value=now):
+            expired = list(CaretakerRequestService.get_expired_requests())
 
         # Assert
-        assert result is False
-        task.refresh_from_db()
-        assert task.status == AdminTask.TaskStatus.PENDING
+        assert expired == [task]
 
     @pytest.mark.django_db
     @pytest.mark.integration
@@ -1317,8 +1135,8 @@ class TestCaretakerRequestService:
 
     @pytest.mark.django_db
     @pytest.mark.integration
-    def test_get_user_requests_auto_cancels_expired(self, db):
-        """Test get_user_requests auto-cancels expired requests"""
+    def test_get_user_requests_hides_expired(self, db):
+        """Test get_user_requests leaves out expired requests without cancelling them"""
         # Arrange
         user = UserFactory()
         caretaker = UserFactory()
@@ -1339,7 +1157,7 @@ class TestCaretakerRequestService:
         # Assert
         assert requests["caretaker_request"] is None
         task.refresh_from_db()
-        assert task.status == AdminTask.TaskStatus.CANCELLED
+        assert task.status == AdminTask.TaskStatus.PENDING
 
     @pytest.mark.django_db
     @pytest.mark.integration
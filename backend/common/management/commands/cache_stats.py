@@ -0,0 +1,49 @@
+"""
+Management command to report tagged cache reads per key family.
+
+Counts come from every worker (see common/utils/tagged_cache.py), each adding
+its own every CACHE_METRICS_FLUSH_INTERVAL seconds, so the latest reads may
+not show yet. Stale reads found an entry whose tags had been bumped.
+
+Usage:
+    python manage.py cache_stats
+    python manage.py cache_stats --reset
+"""
+
+from django.core.management.base import BaseCommand
+
+from common.utils.tagged_cache import TaggedCache
+
+
+class Command(BaseCommand):
+    help = "Report hits, misses and stale reads of the tagged service caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after reporting them",
+        )
+
+    def handle(self, *args, **options):
+        stats = TaggedCache.get_stats()
+        if not stats:
+            self.stdout.write(self.style.WARNING("No tagged cache reads recorded"))
+        else:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"\n{'Family':<24} {'Hits':>10} {'Misses':>10} {'Stale':>10} "
+                    f"{'Errors':>8} {'Hit rate':>9}"
+                )
+            )
+            for family, counts in sorted(stats.items()):
+                reads = sum(counts.values())
+                hit_rate = counts["hit"] / reads * 100 if reads else 0.0
+                self.stdout.write(
+                    f"{family:<24} {counts['hit']:>10} {counts['miss']:>10} "
+                    f"{counts['stale']:>10} {counts['error']:>8} {hit_rate:>8.1f}%"
+                )
+
+        if options["reset"]:
+            TaggedCache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("\n✓ Counters reset"))
@@ -0,0 +1,129 @@
+"""
+Management command to summarise request profiles from the application log.
+
+RequestProfilingMiddleware (config/profiling_middleware.py) logs one
+"request_profile {...}" line per request. This groups them by view and lists
+the worst offenders.
+
+Usage:
+    python manage.py query_budget_report /var/log/spms/app.log
+    python manage.py query_budget_report app.log app.log.1 --sort db_ms --top 10
+    kubectl logs deploy/spms-backend | python manage.py query_budget_report -
+"""
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.profiling_middleware import PROFILE_LOG_PREFIX
+
+SORT_KEYS = ("queries", "db_ms", "total_ms", "over_budget", "duplicate_queries")
+
+
+class Command(BaseCommand):
+    help = "Summarise logged request profiles, worst views first"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "log_files",
+            nargs="+",
+            help="Log files to read, or - for standard input",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=SORT_KEYS,
+            default="queries",
+            help="Rank views by their mean of this (over_budget: by count)",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of views to list",
+        )
+
+    def handle(self, *args, **options):
+        views = {}
+        total = 0
+        for path in options["log_files"]:
+            for record in self.read_profiles(path):
+                key = (record.get("method"), record.get("route") or "<unresolved>")
+                views.setdefault(key, []).append(record)
+                total += 1
+
+        if not total:
+            self.stdout.write(self.style.WARNING("No request profiles found"))
+            return
+
+        summaries = [
+            self.summarise(method, route, records)
+            for (method, route), records in views.items()
+        ]
+        summaries.sort(key=lambda summary: summary[options["sort"]], reverse=True)
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== {total} request(s) over {len(views)} view(s), "
+                f"by {options['sort']} ==="
+            )
+        )
+        self.stdout.write(
+            f"{'requests':>8} {'queries':>8} {'max':>6} {'repeated':>8} "
+            f"{'db_ms':>9} {'total_ms':>9} {'over':>5}  view"
+        )
+        for summary in summaries[: options["top"]]:
+            line = (
+                f"{summary['requests']:>8} {summary['queries']:>8.1f} "
+                f"{summary['max_queries']:>6} {summary['duplicate_queries']:>8.1f} "
+                f"{summary['db_ms']:>9.1f} {summary['total_ms']:>9.1f} "
+                f"{summary['over_budget']:>5}  {summary['method']} {summary['route']}"
+            )
+            style = self.style.WARNING if summary["over_budget"] else str
+            self.stdout.write(style(line))
+
+    def read_profiles(self, path):
+        """Yield the profile records logged in a file"""
+        if path == "-":
+            yield from self.parse_profiles(sys.stdin)
+            return
+        try:
+            with open(path, encoding="utf-8", errors="replace") as stream:
+                yield from self.parse_profiles(stream)
+        except OSError as e:
+            raise CommandError(f"Can't read {path}: {e}")
+
+    @staticmethod
+    def parse_profiles(lines):
+        """Yield the profile records in log lines, skipping everything else"""
+        decoder = json.JSONDecoder()
+        marker = f"{PROFILE_LOG_PREFIX} {{"
+        for line in lines:
+            start = line.find(marker)
+            if start == -1:
+                continue
+            try:
+                record, _ = decoder.raw_decode(line, start + len(marker) - 1)
+            except ValueError:
+                continue
+            yield record
+
+    @staticmethod
+    def summarise(method, route, records):
+        """Means and worst cases for one view"""
+        count = len(records)
+
+        def mean(field):
+            return sum(record.get(field, 0) for record in records) / count
+
+        return {
+            "method": method,
+            "route": route,
+            "requests": count,
+            "queries": mean("queries"),
+            "max_queries": max(record.get("queries", 0) for record in records),
+            "duplicate_queries": mean("duplicate_queries"),
+            "db_ms": mean("db_ms"),
+            "total_ms": mean("total_ms"),
+            "over_budget": sum(1 for record in records if record.get("over_budget")),
+        }
@@ -0,0 +1,112 @@
+"""
+Management command to run periodic housekeeping jobs (see config/scheduler.py).
+
+Usage:
+    python manage.py run_scheduler
+    python manage.py run_scheduler --list
+    python manage.py run_scheduler --once  # Run the jobs due this minute and exit
+    python manage.py run_scheduler --job expire_caretaker_requests
+"""
+
+import signal
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from config.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = "Run the jobs in SCHEDULED_JOBS on their schedules"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the scheduled jobs and exit",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs due this minute, if leader, then exit",
+        )
+        parser.add_argument(
+            "--job",
+            action="append",
+            dest="jobs",
+            help="Run this job now, whatever its schedule, then exit (repeatable)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=settings.SCHEDULER_POLL_INTERVAL,
+            help="Seconds between checks for the next minute",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler()
+
+        if options["list"]:
+            for name, job in scheduler.jobs.items():
+                self.stdout.write(f"{str(job.schedule):<16} {name}: {job.describe()}")
+            return
+
+        if options["jobs"]:
+            unknown = set(options["jobs"]) - set(scheduler.jobs)
+            if unknown:
+                raise CommandError(f"Unknown job(s): {', '.join(sorted(unknown))}")
+            failed = [
+                name for name in options["jobs"] if not self._run(scheduler, name)
+            ]
+            if failed:
+                raise CommandError(f"Job(s) failed: {', '.join(failed)}")
+            return
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== Scheduler started with {len(scheduler.jobs)} job(s) ==="
+            )
+        )
+
+        # Start a minute back so jobs due this minute run
+        last_minute = self._current_minute() - timedelta(minutes=1)
+        try:
+            while self.running:
+                minute = self._current_minute()
+                if minute > last_minute:
+                    if scheduler.is_leader():
+                        for name in scheduler.get_due_jobs(last_minute, minute):
+                            if not self.running:
+                                break
+                            self._run(scheduler, name)
+                    last_minute = minute
+
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        finally:
+            scheduler.resign()
+
+        self.stdout.write(self.style.SUCCESS("\n✓ Scheduler stopped"))
+
+    def _run(self, scheduler, name):
+        self.stdout.write(f"Running {name}")
+        succeeded = scheduler.run_job(name)
+        if not succeeded:
+            self.stdout.write(self.style.ERROR(f"  {name} failed"))
+        return succeeded
+
+    @staticmethod
+    def _current_minute():
+        return timezone.localtime().replace(second=0, microsecond=0)
+
+    def _stop(self, signum, frame):
+        # Let the current job finish; no more are started
+        self.running = False
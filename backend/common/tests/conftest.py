@@ -11,6 +11,33 @@ from rest_framework.test import APIClient
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_area_registry():
+    """
+    Start every test with an empty in-memory area registry.
+
+    Rolled-back test transactions don't fire Area signals, so areas loaded
+    by one test would otherwise be served to the next.
+    """
+    from locations.services.area_registry import AreaRegistry
+
+    AreaRegistry.clear()
+    yield
+    AreaRegistry.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_caretaker_graph():
+    """
+    Start every test with an empty in-memory caretaker graph, as for areas.
+    """
+    from caretakers.services.caretaker_graph_service import CaretakerGraphService
+
+    CaretakerGraphService.clear()
+    yield
+    CaretakerGraphService.clear()
+
+
 @pytest.fixture
 def api_client():
     """
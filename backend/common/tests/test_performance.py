@@ -8,7 +8,13 @@ Run with: poetry run pytest backend/common/tests/test_performance.py --benchmark
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from sentry_sdk.transport import Transport
+
+from common.tests.factories import AdminTaskFactory, AreaFactory, ProjectFactory
+from common.tests.test_helpers import projects_urls
 
 User = get_user_model()
 
@@ -86,6 +92,276 @@ class TestEndpointPerformance:
         assert result.status_code == 200
 
 
+@pytest.mark.django_db
+class TestProjectListQueryCount:
+    """Query-count regressions for project list endpoints."""
+
+    @pytest.fixture
+    def projects_with_areas(self, db):
+        """Create 25 projects with areas, every fifth with a deletion request."""
+        from projects.models import ProjectArea
+
+        areas = [AreaFactory() for _ in range(3)]
+        projects = []
+        for i in range(25):
+            project = ProjectFactory()
+            ProjectArea.objects.create(
+                project=project, areas=[area.pk for area in areas]
+            )
+            if i % 5 == 0:
+                AdminTaskFactory(action="deleteproject", project=project)
+            projects.append(project)
+        return projects
+
+    def _count_queries(self, api_client, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(projects_urls.list(), {"page_size": page_size})
+        assert response.status_code == 200
+        assert len(response.data["projects"]) == page_size
+        return len(queries), response
+
+    def test_project_list_queries_independent_of_page_size(
+        self, api_client, user, projects_with_areas
+    ):
+        """Areas and deletion requests are resolved once per page."""
+        # Arrange - the first request also loads the area registry
+        api_client.force_authenticate(user=user)
+        self._count_queries(api_client, 1)
+
+        # Act
+        small_page_queries, _ = self._count_queries(api_client, 5)
+        large_page_queries, response = self._count_queries(api_client, 25)
+
+        # Assert
+        assert large_page_queries == small_page_queries
+        results = {project["id"]: project for project in response.data["projects"]}
+        for i, project in enumerate(projects_with_areas):
+            assert len(results[project.pk]["areas"]) == 3
+            assert (results[project.pk]["deletion_request_id"] is not None) == (
+                i % 5 == 0
+            )
+
+    def test_project_map_queries_independent_of_project_count(
+        self, api_client, user, projects_with_areas
+    ):
+        """The unpaginated map doesn't add queries per project."""
+        # Arrange
+        api_client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as before:
+            api_client.get(projects_urls.path("map"))
+
+        from projects.models import ProjectArea
+
+        for project in ProjectFactory.create_batch(10):
+            ProjectArea.objects.create(project=project, areas=[AreaFactory().pk])
+
+        # Act
+        with CaptureQueriesContext(connection) as after:
+            response = api_client.get(projects_urls.path("map"))
+
+        # Assert
+        assert len(response.data["projects"]) == 35
+        assert len(after) == len(before)
+
+
+@pytest.mark.django_db
+class TestReportCyclePerformance:
+    """Benchmark for opening a reporting cycle over many projects."""
+
+    @pytest.fixture
+    def synthetic_projects(self, db):
+        """Create 1,000 active projects, one in ten a student project."""
+        from common.tests.factories import BusinessAreaFactory
+        from projects.models import Project
+
+        business_area = BusinessAreaFactory()
+        return Project.objects.bulk_create(
+            Project(
+                title=f"Synthetic project {i}",
+                year=2020,
+                number=i,
+                status="active",
+                kind="student" if i % 10 == 0 else "science",
+                business_area=business_area,
+            )
+            for i in range(1000)
+        )
+
+    def test_open_cycle_performance(self, benchmark, synthetic_projects):
+        """Benchmark opening a cycle for 1,000 projects in bulk."""
+        from documents.models import AnnualReport, ProjectDocument
+        from documents.services.report_cycle_service import ReportCycleService
+        from projects.models import Project
+
+        user = User.objects.create_user(username="admin", email="admin@example.com")
+        annual_report = AnnualReport.objects.create(
+            year=2023, date_open="2023-07-01", date_closed="2024-06-30"
+        )
+
+        def reset():
+            ProjectDocument.objects.filter(
+                kind__in=["progressreport", "studentreport"]
+            ).delete()
+            Project.objects.update(status="active")
+
+        def open_cycle():
+            with CaptureQueriesContext(connection) as queries:
+                result = ReportCycleService.open_cycle(user, annual_report)
+            return result, len(queries)
+
+        result, query_count = benchmark.pedantic(
+            open_cycle, setup=reset, rounds=3, iterations=1
+        )
+
+        assert result["progress_reports"] == 900
+        assert result["student_reports"] == 100
+        assert query_count <= 12
+
+
+class _DiscardTransport(Transport):
+    """Sentry transport that drops envelopes instead of sending them"""
+
+    def capture_envelope(self, envelope):
+        pass
+
+
+@pytest.mark.django_db
+class TestTraceSamplingOverhead:
+    """
+    Per-request overhead of Sentry tracing, with and without traces_sampler.
+
+    Each benchmark sends an unauthenticated API request through the WSGI
+    handler Sentry instruments. Compare the means: "baseline" has Sentry
+    off, "full_sampling" is the old traces_sample_rate=1.0 and
+    profiles_sample_rate=1.0, and "traces_sampler" is the current setup.
+    """
+
+    @pytest.fixture
+    def wsgi_get(self):
+        """Call the WSGI application directly, as gunicorn would."""
+        import io
+
+        from django.core.handlers.wsgi import WSGIHandler
+
+        application = WSGIHandler()
+
+        def get(path):
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": "",
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": io.StringIO(),
+                "wsgi.url_scheme": "http",
+            }
+            statuses = []
+            body = application(environ, lambda status, headers: statuses.append(status))
+            b"".join(body)
+            return statuses[0]
+
+        return get
+
+    @pytest.fixture
+    def sentry(self):
+        """Initialise Sentry with a given configuration, off again afterwards."""
+        import sentry_sdk
+
+        def init(**options):
+            sentry_sdk.init(
+                dsn="https://public@sentry.invalid/1",
+                transport=_DiscardTransport,
+                **options,
+            )
+
+        yield init
+        sentry_sdk.init()
+
+    def test_request_baseline(self, benchmark, wsgi_get):
+        """Benchmark a request with Sentry off."""
+        status = benchmark(wsgi_get, "/api/v1/users/me")
+        assert status.startswith("403")
+
+    def test_request_full_sampling(self, benchmark, wsgi_get, sentry):
+        """Benchmark a request tracing and profiling every transaction."""
+        sentry(traces_sample_rate=1.0, profiles_sample_rate=1.0)
+        status = benchmark(wsgi_get, "/api/v1/users/me")
+        assert status.startswith("403")
+
+    def test_request_traces_sampler(self, benchmark, wsgi_get, sentry, settings):
+        """Benchmark a request under the route-aware traces_sampler."""
+        from config.sentry_sampling import TraceSampler
+
+        TraceSampler.clear()
+        sentry(
+            traces_sampler=TraceSampler.traces_sampler,
+            profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
+        )
+        status = benchmark(wsgi_get, "/api/v1/users/me")
+        assert status.startswith("403")
+
+
+@pytest.mark.django_db
+class TestSSOMiddlewareOverhead:
+    """Per-request cost of DBCAMiddleware for a signed-in SSO user."""
+
+    @pytest.fixture
+    def sso_client(self, db):
+        """A client signed in as an SSO user, sending the proxy's headers."""
+        from django.test import Client
+
+        email = "sso.user@dbca.wa.gov.au"
+        user = User.objects.create_user(
+            username=email, email=email, first_name="Sso", last_name="User"
+        )
+        client = Client(
+            headers={
+                "remote-user": email,
+                "x-email": email,
+                "x-first-name": "Sso",
+                "x-last-name": "User",
+            }
+        )
+        client.force_login(user)
+        return client
+
+    def test_sso_request_performance(self, benchmark, sso_client):
+        """Benchmark an API request from a signed-in SSO user."""
+
+        def get_me():
+            with CaptureQueriesContext(connection) as queries:
+                response = sso_client.get("/api/v1/users/me")
+            return response, len(queries)
+
+        response, query_count = benchmark(get_me)
+        assert response.status_code == 200
+        assert query_count == 8
+
+    def test_sso_request_adds_no_queries(self, sso_client, settings):
+        """Test DBCAMiddleware costs no queries once the session is bound."""
+        # Arrange
+        from django.test import Client
+
+        sso_client.get("/api/v1/users/me")
+
+        # Act
+        with CaptureQueriesContext(connection) as with_sso:
+            sso_client.get("/api/v1/users/me")
+        settings.MIDDLEWARE = [
+            name for name in settings.MIDDLEWARE if "DBCAMiddleware" not in name
+        ]
+        # A new client loads the middleware again; the session carries over
+        plain_client = Client()
+        plain_client.cookies = sso_client.cookies
+        with CaptureQueriesContext(connection) as without_sso:
+            plain_client.get("/api/v1/users/me")
+
+        # Assert
+        assert len(with_sso) == len(without_sso)
+
+
 # Performance test configuration
 # Add to pytest.ini:
 # [pytest]
@@ -0,0 +1,182 @@
+"""
+Tests for tagged service caching
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from common.tests.factories import BusinessAreaFactory
+from common.utils.tagged_cache import (
+    TaggedCache,
+    cached,
+    instance_from_dict,
+    instance_to_dict,
+    make_tag,
+)
+from users.models import User, UserProfile, UserWork
+
+calls = []
+
+
+@cached(
+    "user_projects",
+    tags=lambda user_id: [make_tag("user", user_id)],
+    result_tags=lambda result: [make_tag("project", pk) for pk in result["projects"]],
+)
+def get_projects(user_id):
+    """Cached function for the tests"""
+    calls.append(user_id)
+    return {"user": user_id, "projects": [10, 11], "call": len(calls)}
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-tagged-cache",
+        }
+    }
+    settings.CACHE_METRICS_FLUSH_INTERVAL = 3600
+    TaggedCache.flush_metrics()
+    cache.clear()
+    calls.clear()
+    yield
+    TaggedCache.flush_metrics()
+    cache.clear()
+
+
+class TestTaggedCache:
+    """Tests for TaggedCache and the cached decorator"""
+
+    @pytest.mark.unit
+    def test_caches_until_a_tag_is_bumped(
+        self, locmem_cache, django_capture_on_commit_callbacks, db
+    ):
+        """Test a result is reused until a tag from its arguments is bumped"""
+        # Arrange
+        first = get_projects(5)
+
+        # Act
+        second = get_projects(5)
+        with django_capture_on_commit_callbacks(execute=True):
+            TaggedCache.invalidate([make_tag("user", 5)])
+        third = get_projects(5)
+
+        # Assert
+        assert first == second
+        assert third["call"] == 2
+        assert calls == [5, 5]
+
+    @pytest.mark.unit
+    def test_result_tags(self, locmem_cache, django_capture_on_commit_callbacks, db):
+        """Test bumping a tag named by the result invalidates it"""
+        # Arrange
+        get_projects(5)
+        get_projects(6)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            TaggedCache.invalidate([make_tag("project", 11)])
+        get_projects(5)
+        get_projects(6)
+
+        # Assert
+        assert calls == [5, 6, 5, 6]
+
+    @pytest.mark.unit
+    def test_other_tags_untouched(
+        self, locmem_cache, django_capture_on_commit_callbacks, db
+    ):
+        """Test bumping an unrelated tag leaves an entry alone"""
+        # Arrange
+        get_projects(5)
+        get_projects(6)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            TaggedCache.invalidate([make_tag("user", 6)])
+        get_projects(5)
+
+        # Assert
+        assert calls == [5, 6]
+
+    @pytest.mark.unit
+    def test_change_while_computing(self, locmem_cache):
+        """Test a bump made while the result is computed isn't lost"""
+
+        # Arrange
+        @cached("user_profile", tags=lambda user_id: [make_tag("user", user_id)])
+        def get_profile(user_id):
+            calls.append(user_id)
+            TaggedCache._bump({make_tag("user", user_id)})
+            return {"user": user_id}
+
+        # Act
+        get_profile(5)
+        get_profile(5)
+
+        # Assert
+        assert calls == [5, 5]
+
+    @pytest.mark.unit
+    def test_ignores_entries_without_tags(self, locmem_cache):
+        """Test values cached in the old format are misses"""
+        # Arrange
+        cache.set("user:5:projects", ["pickled project"])
+
+        # Act
+        result = get_projects(5)
+
+        # Assert
+        assert result["projects"] == [10, 11]
+        assert calls == [5]
+
+    @pytest.mark.unit
+    def test_stats(self, locmem_cache, django_capture_on_commit_callbacks, db):
+        """Test reads are counted per key family"""
+        # Arrange
+        get_projects(5)
+        get_projects(5)
+        with django_capture_on_commit_callbacks(execute=True):
+            TaggedCache.invalidate([make_tag("user", 5)])
+        get_projects(5)
+        get_projects(5)
+
+        # Act
+        stats = TaggedCache.get_stats()
+        out = StringIO()
+        call_command("cache_stats", "--reset", stdout=out)
+
+        # Assert
+        assert stats == {"user_projects": {"hit": 2, "miss": 1, "stale": 1, "error": 0}}
+        assert "50.0%" in out.getvalue()
+        assert TaggedCache.get_stats() == {}
+
+    @pytest.mark.integration
+    def test_instance_round_trip(self, user, django_assert_num_queries):
+        """Test a model and its related objects rebuild without queries"""
+        # Arrange
+        business_area = BusinessAreaFactory()
+        UserWork.objects.create(user=user, business_area=business_area, role="Role")
+        UserProfile.objects.filter(user=user).delete()
+        loaded = User.objects.select_related("work__business_area").get(pk=user.pk)
+        data = instance_to_dict(loaded, ["work__business_area", "profile"])
+
+        # Act
+        with django_assert_num_queries(0):
+            rebuilt = instance_from_dict(User, data)
+            role = rebuilt.work.role
+            business_area_name = rebuilt.work.business_area.name
+            profile = getattr(rebuilt, "profile", None)
+
+        # Assert
+        assert rebuilt.pk == user.pk
+        assert rebuilt.username == user.username
+        assert not rebuilt._state.adding
+        assert role == "Role"
+        assert business_area_name == business_area.name
+        assert profile is None
@@ -2,19 +2,34 @@
 Tests for common utility functions
 """
 
+import gzip
+import io
 from datetime import date
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from rest_framework import serializers
 
+from common.utils.exports import (
+    build_export_response,
+    get_export_format,
+    iter_csv,
+    iter_gzip,
+)
 from common.utils.filters import (
     apply_boolean_filter,
     apply_date_range_filter,
     apply_search_filter,
     apply_status_filter,
 )
-from common.utils.pagination import get_page_number, get_page_size, paginate_queryset
+from common.utils.pagination import (
+    encode_cursor,
+    estimate_count,
+    get_page_number,
+    get_page_size,
+    paginate_queryset,
+    paginate_queryset_by_cursor,
+)
 from common.utils.validators import (
     validate_date_range,
     validate_file_extension,
@@ -22,6 +37,104 @@ from common.utils.validators import (
     validate_not_empty,
     validate_positive_number,
 )
+from users.models import User
+
+
+class TestExportUtils:
+    """Tests for streaming export utilities"""
+
+    HEADER = ["ID", "Name"]
+    ROWS = [[1, "Alpha"], [2, 'Beta, "B"'], [3, None]]
+
+    def test_iter_csv_yields_one_chunk_per_row(self):
+        """Test CSV rows are encoded lazily, one line per chunk"""
+        # Act
+        chunks = list(iter_csv(self.HEADER, iter(self.ROWS)))
+
+        # Assert
+        assert len(chunks) == 4
+        assert chunks[0] == b"ID,Name\r\n"
+        assert chunks[2] == b'2,"Beta, ""B"""\r\n'
+
+    def test_iter_gzip_round_trip(self):
+        """Test gzipped chunks decompress to the original stream"""
+        # Arrange
+        chunks = list(iter_csv(self.HEADER, self.ROWS))
+
+        # Act
+        compressed = b"".join(iter_gzip(iter(chunks)))
+
+        # Assert
+        assert gzip.decompress(compressed) == b"".join(chunks)
+
+    def test_build_export_response_streams_csv(self):
+        """Test CSV exports stream with a download filename"""
+        # Act
+        response = build_export_response(self.HEADER, iter(self.ROWS), "things")
+
+        # Assert
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        assert 'filename="things.csv"' in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode("utf-8")
+        assert content.splitlines()[1] == "1,Alpha"
+
+    def test_build_export_response_gzip(self):
+        """Test csv.gz exports stream compressed CSV"""
+        # Act
+        response = build_export_response(
+            self.HEADER, iter(self.ROWS), "things", "csv.gz"
+        )
+
+        # Assert
+        assert response["Content-Type"] == "application/gzip"
+        assert 'filename="things.csv.gz"' in response["Content-Disposition"]
+        content = gzip.decompress(b"".join(response.streaming_content))
+        assert content.startswith(b"ID,Name\r\n1,Alpha")
+
+    def test_build_export_response_xlsx(self):
+        """Test XLSX exports when openpyxl is installed"""
+        # Arrange
+        openpyxl = pytest.importorskip("openpyxl")
+
+        # Act
+        response = build_export_response(self.HEADER, iter(self.ROWS), "things", "xlsx")
+
+        # Assert
+        workbook = openpyxl.load_workbook(io.BytesIO(b"".join(response)))
+        rows = list(workbook.active.values)
+        assert rows[0] == ("ID", "Name")
+        assert rows[1] == (1, "Alpha")
+
+    def test_build_export_response_missing_optional_dependency(self):
+        """Test a clear error when the XLSX/Parquet library is missing"""
+        # Act & Assert
+        with patch.dict("sys.modules", {"openpyxl": None, "pyarrow": None}):
+            with pytest.raises(serializers.ValidationError, match="openpyxl"):
+                build_export_response(self.HEADER, iter(self.ROWS), "x", "xlsx")
+            with pytest.raises(serializers.ValidationError, match="pyarrow"):
+                build_export_response(self.HEADER, iter(self.ROWS), "x", "parquet")
+
+    def test_get_export_format(self):
+        """Test reading the export format from the query string"""
+        # Arrange
+        request = Mock()
+        request.query_params = {"file_format": "csv.gz"}
+
+        # Act & Assert
+        assert get_export_format(request) == "csv.gz"
+        request.query_params = {}
+        assert get_export_format(request) == "csv"
+
+    def test_get_export_format_unsupported(self):
+        """Test unsupported formats are rejected"""
+        # Arrange
+        request = Mock()
+        request.query_params = {"file_format": "pdf"}
+
+        # Act & Assert
+        with pytest.raises(serializers.ValidationError):
+            get_export_format(request)
 
 
 class TestPaginationUtils:
@@ -219,6 +332,135 @@ class TestPaginationUtils:
         # Assert
         assert result["page_size"] == 20  # Default page size
 
+    def test_paginate_queryset_by_cursor_walks_all_rows(self, db):
+        """Test following next_cursor visits every row once, in order"""
+        # Arrange
+        from common.tests.factories import UserFactory
+
+        users = [UserFactory(first_name=name) for name in "CABACBCA"]
+        expected = sorted(users, key=lambda user: (user.first_name, user.id))
+        ordering = ("first_name", "id")
+
+        # Act
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            request = Mock()
+            request.query_params = {"cursor": cursor, "page_size": "3"}
+            result = paginate_queryset_by_cursor(
+                User.objects.filter(pk__in=[user.pk for user in users]),
+                request,
+                ordering,
+            )
+            seen.extend(result["items"])
+            cursor = result["next_cursor"]
+
+        # Assert
+        assert [user.pk for user in seen] == [user.pk for user in expected]
+        assert result["total_results"] is None
+
+    def test_paginate_queryset_by_cursor_descending(self, db):
+        """Test descending keyset fields page backwards through values"""
+        # Arrange
+        from common.tests.factories import UserFactory
+
+        users = [UserFactory() for _ in range(5)]
+        queryset = User.objects.filter(pk__in=[user.pk for user in users])
+        request = Mock()
+        request.query_params = {"cursor": "", "page_size": "2"}
+        first_page = paginate_queryset_by_cursor(queryset, request, ("-id",))
+        request.query_params = {
+            "cursor": first_page["next_cursor"],
+            "page_size": "2",
+        }
+
+        # Act
+        result = paginate_queryset_by_cursor(queryset, request, ("-id",))
+
+        # Assert
+        ids = sorted((user.pk for user in users), reverse=True)
+        assert [user.pk for user in first_page["items"]] == ids[:2]
+        assert [user.pk for user in result["items"]] == ids[2:4]
+
+    def test_paginate_queryset_by_cursor_invalid_cursor(self, db):
+        """Test a malformed cursor is rejected"""
+        # Arrange
+        request = Mock()
+        request.query_params = {"cursor": "not-a-cursor"}
+
+        # Act & Assert
+        with pytest.raises(serializers.ValidationError):
+            paginate_queryset_by_cursor(User.objects.all(), request, ("id",))
+
+        request.query_params = {"cursor": encode_cursor([1, 2])}
+        with pytest.raises(serializers.ValidationError):
+            paginate_queryset_by_cursor(User.objects.all(), request, ("id",))
+
+    def test_paginate_queryset_uses_cursor_when_requested(self, db):
+        """Test the cursor parameter only switches mode with cursor_ordering"""
+        # Arrange
+        from common.tests.factories import UserFactory
+
+        [UserFactory() for _ in range(3)]
+        request = Mock()
+        request.query_params = {"cursor": "", "page_size": "2"}
+
+        # Act
+        offset = paginate_queryset(User.objects.order_by("id"), request)
+        keyset = paginate_queryset(User.objects.all(), request, cursor_ordering=("id",))
+
+        # Assert
+        assert offset["next_cursor"] is None
+        assert offset["total_results"] == 3
+        assert keyset["next_cursor"] is not None
+        assert keyset["total_results"] is None
+
+    def test_paginate_queryset_by_cursor_estimated_total(self, db):
+        """Test total=estimated counts the whole queryset, not what's left"""
+        # Arrange
+        from common.tests.factories import UserFactory
+
+        users = [UserFactory() for _ in range(5)]
+        queryset = User.objects.filter(pk__in=[user.pk for user in users])
+        request = Mock()
+        request.query_params = {
+            "cursor": encode_cursor([users[2].pk]),
+            "page_size": "2",
+            "total": "estimated",
+        }
+
+        # Act
+        result = paginate_queryset_by_cursor(queryset, request, ("id",))
+
+        # Assert
+        assert len(result["items"]) == 2
+        assert result["total_results"] == 5
+        assert result["total_pages"] == 3
+
+    def test_estimate_count_caches_filtered_counts(self, db, settings):
+        """Test filtered counts are reused until they expire"""
+        # Arrange
+        from django.core.cache import cache
+
+        from common.tests.factories import UserFactory
+
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        cache.clear()
+        UserFactory(first_name="Estimate")
+        queryset = User.objects.filter(first_name="Estimate")
+        assert estimate_count(queryset) == 1
+        UserFactory(first_name="Estimate")
+
+        # Act
+        result = estimate_count(queryset)
+
+        # Assert
+        assert result == 1
+        cache.clear()
+        assert estimate_count(queryset) == 2
+
     def test_get_page_number_valid(self):
         """Test extracting valid page number"""
         # Arrange
@@ -2,6 +2,7 @@
 Common utilities for DRY backend architecture
 """
 
+from .exports import build_export_response, get_export_format, iter_csv
 from .filters import (
     apply_boolean_filter,
     apply_date_range_filter,
@@ -9,7 +10,14 @@ from .filters import (
     apply_status_filter,
 )
 from .mixins import ProjectTeamMemberMixin, TeamMemberMixin
-from .pagination import get_page_number, get_page_size, paginate_queryset
+from .pagination import (
+    estimate_count,
+    get_page_number,
+    get_page_size,
+    paginate_queryset,
+    paginate_queryset_by_cursor,
+)
+from .tagged_cache import TaggedCache, cached, make_tag
 from .validators import (
     validate_date_range,
     validate_file_extension,
@@ -21,6 +29,8 @@ from .validators import (
 __all__ = [
     # Pagination
     "paginate_queryset",
+    "paginate_queryset_by_cursor",
+    "estimate_count",
     "get_page_number",
     "get_page_size",
     # Filters
@@ -34,7 +44,15 @@ __all__ = [
     "validate_positive_number",
     "validate_file_size",
     "validate_file_extension",
+    # Exports
+    "build_export_response",
+    "get_export_format",
+    "iter_csv",
     # Mixins
     "TeamMemberMixin",
     "ProjectTeamMemberMixin",
+    # Caching
+    "TaggedCache",
+    "cached",
+    "make_tag",
 ]
@@ -2,18 +2,35 @@
 Pagination utilities for consistent list view pagination
 """
 
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from hashlib import md5
 from math import ceil
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
 
+# Seconds to reuse a filtered count in estimate_count()
+ESTIMATED_COUNT_TIMEOUT = 60
 
-def paginate_queryset(queryset, request):
+
+def paginate_queryset(queryset, request, cursor_ordering=None):
     """
     Paginate queryset based on request parameters
 
+    Views that pass cursor_ordering also accept a `cursor` parameter; when
+    it's present (empty for the first page) the page is fetched by keyset
+    with paginate_queryset_by_cursor() instead of by page number.
+
     Args:
         queryset: QuerySet to paginate
         request: HTTP request with query parameters
+        cursor_ordering: Optional ordering enabling cursor pagination
 
     Returns:
         Dict with pagination data:
@@ -23,6 +40,7 @@ def paginate_queryset(queryset, request):
             'total_pages': total_pages,
             'current_page': page,
             'page_size': page_size,
+            'next_cursor': None,
         }
 
     Example:
@@ -36,6 +54,9 @@ def paginate_queryset(queryset, request):
             'total_pages': paginated['total_pages'],
         })
     """
+    if cursor_ordering and "cursor" in request.query_params:
+        return paginate_queryset_by_cursor(queryset, request, cursor_ordering)
+
     try:
         page = int(request.query_params.get("page", 1))
         if page < 1:
@@ -65,9 +86,179 @@ def paginate_queryset(queryset, request):
         "total_pages": total_pages,
         "current_page": page,
         "page_size": page_size,
+        "next_cursor": None,
+    }
+
+
+def paginate_queryset_by_cursor(queryset, request, ordering):
+    """
+    Paginate queryset by keyset, for infinite scroll and deep pages
+
+    Instead of OFFSET, each page filters for rows after the last row of the
+    previous page, so page 500 costs the same as page 1 and rows inserted
+    meanwhile don't shift or repeat items. There's no exact total; pass
+    `total=estimated` for an approximate one from estimate_count().
+
+    Args:
+        queryset: QuerySet to paginate
+        request: HTTP request with `cursor`, `page_size` and `total` params
+        ordering: Field names to order by, "-" prefixed for descending. The
+            fields must be non-null and the last must be unique, e.g. "id"
+
+    Returns:
+        Dict with pagination data:
+        {
+            'items': list of rows,
+            'next_cursor': opaque string, or None on the last page,
+            'total_results': estimated count, or None,
+            'total_pages': estimated pages, or None,
+            'page_size': page_size,
+        }
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    page_size = get_page_size(request)
+    page = queryset.order_by(*ordering)
+
+    cursor = request.query_params.get("cursor")
+    if cursor:
+        try:
+            page = page.filter(_keyset_filter(ordering, decode_cursor(cursor)))
+        except (TypeError, ValueError):
+            # Values of the wrong type for their field, e.g. a forged cursor
+            raise ValidationError("Invalid cursor")
+
+    # One extra row tells us whether there's a next page without a count
+    items = list(page[: page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(
+            [_get_ordering_value(items[-1], field) for field in ordering]
+        )
+
+    total_results = total_pages = None
+    if request.query_params.get("total") == "estimated":
+        total_results = estimate_count(queryset)
+        total_pages = ceil(total_results / page_size)
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "total_results": total_results,
+        "total_pages": total_pages,
+        "page_size": page_size,
     }
 
 
+def encode_cursor(values):
+    """
+    Encode the ordering values of a row as an opaque cursor
+
+    Args:
+        values: Ordering values; dates and datetimes are sent as ISO 8601,
+            which the field lookups parse back
+
+    Returns:
+        str: URL-safe cursor
+    """
+    encoded = json.dumps(values, default=_encode_cursor_value)
+    return urlsafe_b64encode(encoded.encode("utf-8")).decode("ascii")
+
+
+def _encode_cursor_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Can't use {type(value).__name__} in a cursor")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor
+
+    Args:
+        cursor: Cursor string from the request
+
+    Returns:
+        list: Ordering values
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValidationError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValidationError("Invalid cursor")
+    return values
+
+
+def estimate_count(queryset):
+    """
+    Approximate row count without counting on every request
+
+    Unfiltered querysets use the planner's row estimate from pg_class,
+    which is free. Filtered querysets (or tables that haven't been analyzed)
+    are counted once and cached for ESTIMATED_COUNT_TIMEOUT seconds.
+
+    Args:
+        queryset: QuerySet to count
+
+    Returns:
+        int: Estimated number of rows
+    """
+    queryset = queryset.order_by()
+    if not queryset.query.where and connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table is first vacuumed or analyzed
+        if row and row[0] >= 0:
+            return row[0]
+
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = "pagination:count:" + md5(f"{sql}{params}".encode("utf-8")).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, ESTIMATED_COUNT_TIMEOUT)
+    return count
+
+
+def _get_ordering_value(item, field):
+    value = item
+    for attr in field.lstrip("-").split("__"):
+        value = getattr(value, attr)
+    return value
+
+
+def _keyset_filter(ordering, values):
+    """
+    Rows after values in ordering, i.e. (a, b, c) > (x, y, z) spelt out as
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z), with < for
+    descending fields
+    """
+    if len(values) != len(ordering):
+        raise ValidationError("Invalid cursor")
+
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
 def get_page_number(request, default=1):
     """
     Extract page number from request
@@ -0,0 +1,377 @@
+"""
+Tagged caching for service-layer reads.
+
+Each cached entry is stamped with the version of every tag it depends on,
+e.g. "user:5", "project:12" or "business_area:3". Bumping a tag
+(TaggedCache.invalidate) turns every entry stamped with it into a miss,
+without knowing their keys. TaggedCache.invalidate_on_change connects a
+model's save and delete signals to bump its tags once the transaction
+commits.
+
+Entries hold plain data: serializer output, or field dicts for model
+instances (instance_to_dict / instance_from_dict). Never pickle model
+instances, which drag their prefetch caches along and invite saving a stale
+copy.
+
+Reads are counted per key family (the CACHE_KEYS name) in each worker and
+added to shared counters every CACHE_METRICS_FLUSH_INTERVAL seconds. The
+cache_stats command reports them.
+"""
+
+import atexit
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("hit", "miss", "stale", "error")
+
+_MISSING = object()
+
+_metrics_lock = threading.Lock()
+_metrics = Counter()  # (family, outcome) -> reads since the last flush
+_last_flush = time.monotonic()
+
+
+def make_tag(kind, pk):
+    """
+    Name the tag of a row
+
+    Args:
+        kind: "user", "project" or "business_area"
+        pk: Primary key of the row
+
+    Returns:
+        str: e.g. "project:12"
+    """
+    return f"{kind}:{pk}"
+
+
+class TaggedCache:
+    """Cache entries that are invalidated by tag"""
+
+    @staticmethod
+    def get(family, key, default=None):
+        """
+        Get an entry if none of its tags have been bumped since it was set
+
+        Args:
+            family: CACHE_KEYS name the key belongs to
+            key: Cache key
+            default: Returned on a miss
+
+        Returns:
+            The cached value, or default
+        """
+        try:
+            entry = cache.get(key)
+            if not isinstance(entry, dict) or "tags" not in entry:
+                outcome = "miss"
+            else:
+                versions = TaggedCache._get_versions(entry["tags"])
+                outcome = "hit" if versions == entry["tags"] else "stale"
+        except Exception as e:
+            logger.warning(f"Cache error for {key}: {e}")
+            outcome = "error"
+
+        TaggedCache._count(family, outcome)
+        return entry["value"] if outcome == "hit" else default
+
+    @staticmethod
+    def set(family, key, value, tags, versions=None):
+        """
+        Cache a value, stamped with the current versions of its tags
+
+        Args:
+            family: CACHE_KEYS name, whose CACHE_TTL applies
+            key: Cache key
+            value: Plain data to cache
+            tags: Tags the value depends on
+            versions: Versions of some of the tags read before the value was,
+                so a change made meanwhile still invalidates it
+        """
+        tags = set(tags)
+        stamped = {
+            tag: version for tag, version in (versions or {}).items() if tag in tags
+        }
+        try:
+            stamped.update(TaggedCache.get_versions(tags - set(stamped)))
+            cache.set(
+                key,
+                {"tags": stamped, "value": value},
+                timeout=settings.CACHE_TTL[family],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache {key}: {e}")
+
+    @staticmethod
+    def get_versions(tags):
+        """
+        Get the current versions of tags, starting any that have none
+
+        Args:
+            tags: Tags to look up
+
+        Returns:
+            dict: Tag -> version
+        """
+        versions = TaggedCache._get_versions(tags)
+        for tag in set(tags) - set(versions):
+            key = settings.CACHE_KEYS["cache_tag"].format(tag=tag)
+            # Start from the clock, so a tag that was evicted and restarted
+            # doesn't come back at a version older entries were stamped with
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[tag] = cache.get(key)
+        return versions
+
+    @staticmethod
+    def invalidate(tags):
+        """
+        Bump tags once the current transaction commits
+
+        Args:
+            tags: Tags whose entries are now out of date
+        """
+        tags = {tag for tag in tags if tag}
+        if tags:
+            transaction.on_commit(lambda: TaggedCache._bump(tags))
+
+    @staticmethod
+    def invalidate_on_change(model, get_tags):
+        """
+        Bump a model's tags whenever one is saved or deleted
+
+        Args:
+            model: Model class
+            get_tags: Function of an instance giving the tags it affects
+        """
+
+        def receiver(sender, instance, **kwargs):
+            TaggedCache.invalidate(get_tags(instance))
+
+        uid = f"tagged_cache:{model._meta.label}"
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+    @staticmethod
+    def get_stats():
+        """
+        Get the shared read counters of every key family
+
+        Returns:
+            dict: Family -> {outcome: count}, for families with any reads
+        """
+        TaggedCache.flush_metrics()
+        keys = {
+            settings.CACHE_KEYS["cache_metrics"].format(
+                family=family, outcome=outcome
+            ): (family, outcome)
+            for family in settings.CACHE_KEYS
+            for outcome in OUTCOMES
+        }
+        stats = {}
+        for key, count in cache.get_many(list(keys)).items():
+            family, outcome = keys[key]
+            stats.setdefault(family, dict.fromkeys(OUTCOMES, 0))[outcome] = count
+        return stats
+
+    @staticmethod
+    def reset_stats():
+        """Zero the shared read counters"""
+        cache.delete_many(
+            [
+                settings.CACHE_KEYS["cache_metrics"].format(
+                    family=family, outcome=outcome
+                )
+                for family in settings.CACHE_KEYS
+                for outcome in OUTCOMES
+            ]
+        )
+
+    @staticmethod
+    def flush_metrics():
+        """Add this worker's read counts to the shared counters"""
+        global _last_flush
+        with _metrics_lock:
+            counts = dict(_metrics)
+            _metrics.clear()
+            _last_flush = time.monotonic()
+
+        for (family, outcome), count in counts.items():
+            key = settings.CACHE_KEYS["cache_metrics"].format(
+                family=family, outcome=outcome
+            )
+            try:
+                cache.add(key, 0, timeout=None)
+                cache.incr(key, count)
+            except ValueError:
+                # The cache keeps nothing (DummyCache without Redis)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to record cache metrics for {family}: {e}")
+                return
+
+    @staticmethod
+    def _get_versions(tags):
+        keys = {settings.CACHE_KEYS["cache_tag"].format(tag=tag): tag for tag in tags}
+        return {keys[key]: version for key, version in cache.get_many(keys).items()}
+
+    @staticmethod
+    def _bump(tags):
+        for tag in tags:
+            key = settings.CACHE_KEYS["cache_tag"].format(tag=tag)
+            try:
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.set(key, time.time_ns(), timeout=None)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate cache tag {tag}: {e}")
+
+    @staticmethod
+    def _count(family, outcome):
+        with _metrics_lock:
+            _metrics[(family, outcome)] += 1
+            due = (
+                time.monotonic() - _last_flush >= settings.CACHE_METRICS_FLUSH_INTERVAL
+            )
+        if due:
+            TaggedCache.flush_metrics()
+
+
+def cached(family, tags, result_tags=None, dump=None, load=None):
+    """
+    Cache a service function's result under CACHE_KEYS[family]
+
+    The key template is filled in from the function's arguments by name, and
+    the entry lives for CACHE_TTL[family] unless one of its tags is bumped.
+    Put it below @staticmethod.
+
+    Args:
+        family: CACHE_KEYS and CACHE_TTL name
+        tags: Function of the arguments giving the tags the result depends on
+        result_tags: Function of the result giving more tags, for rows that
+            only the result names
+        dump: Turns the result into plain data to cache
+        load: Turns cached data back into a result
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = settings.CACHE_KEYS[family].format(**bound.arguments)
+
+            value = TaggedCache.get(family, key, _MISSING)
+            if value is not _MISSING:
+                return load(value) if load else value
+
+            entry_tags = list(tags(**bound.arguments))
+            try:
+                versions = TaggedCache.get_versions(entry_tags)
+            except Exception as e:
+                logger.warning(f"Cache error for {key}: {e}")
+                return func(*args, **kwargs)
+
+            result = func(*args, **kwargs)
+            if result_tags:
+                entry_tags.extend(result_tags(result))
+            TaggedCache.set(
+                family, key, dump(result) if dump else result, entry_tags, versions
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instance_to_dict(instance, related=()):
+    """
+    Plain data for a model instance and objects loaded with it
+
+    Args:
+        instance: Model instance
+        related: Paths of foreign keys and one-to-one relations to include,
+            e.g. ("profile", "work__business_area")
+
+    Returns:
+        dict: For instance_from_dict
+    """
+    nested = {}
+    for path in related:
+        name, _, rest = path.partition("__")
+        nested.setdefault(name, [])
+        if rest:
+            nested[name].append(rest)
+
+    fields = {}
+    for field in instance._meta.concrete_fields:
+        value = getattr(instance, field.attname)
+        fields[field.attname] = value.name if isinstance(value, FieldFile) else value
+
+    data = {"fields": fields, "related": {}}
+    for name, paths in nested.items():
+        try:
+            obj = getattr(instance, name)
+        except ObjectDoesNotExist:
+            obj = None
+        data["related"][name] = (
+            instance_to_dict(obj, paths) if obj is not None else None
+        )
+    return data
+
+
+def instance_from_dict(model, data):
+    """
+    Rebuild a model instance from instance_to_dict data
+
+    The related objects are set as though loaded with select_related. Fields
+    added to the model since the data was cached are deferred.
+
+    Args:
+        model: Model class
+        data: From instance_to_dict
+
+    Returns:
+        Model instance
+    """
+    fields = data["fields"]
+    attnames = [field.attname for field in model._meta.concrete_fields]
+    values = [fields.get(attname, _MISSING) for attname in attnames]
+    instance = model.from_db(
+        DEFAULT_DB_ALIAS,
+        [attname for attname, value in zip(attnames, values) if value is not _MISSING],
+        [value for value in values if value is not _MISSING],
+    )
+    for name, related_data in data["related"].items():
+        field = model._meta.get_field(name)
+        field.set_cached_value(
+            instance,
+            (
+                instance_from_dict(field.related_model, related_data)
+                if related_data is not None
+                else None
+            ),
+        )
+    return instance
+
+
+atexit.register(TaggedCache.flush_metrics)
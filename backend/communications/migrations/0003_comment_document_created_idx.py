@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['document', 'created_at'], name='comment_document_created_idx'),
+        ),
+    ]
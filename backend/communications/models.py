@@ -99,6 +99,13 @@ class Comment(CommonModel):
     class Meta:
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            # Document comment threads, paged by created_at
+            models.Index(
+                fields=["document", "created_at"],
+                name="comment_document_created_idx",
+            ),
+        ]
 
 
 class Reaction(CommonModel):
@@ -1,6 +1,6 @@
 # region Imports ================================================================================================
 
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
 from documents.serializers import TinyProjectDocumentSerializer
 from users.serializers import TinyUserSerializer
@@ -63,6 +63,39 @@ class TinyCommentSerializer(ModelSerializer):
         ]
 
 
+class DocumentCommentSerializer(ModelSerializer):
+    """
+    Comment in a document thread, with the reaction aggregates annotated by
+    CommunicationService.list_document_comments
+    """
+
+    user = TinyUserSerializer(read_only=True)
+    reaction_counts = SerializerMethodField()
+    my_reactions = SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = [
+            "id",
+            "user",
+            "document",
+            "text",
+            "created_at",
+            "updated_at",
+            "reaction_counts",
+            "my_reactions",
+        ]
+
+    def get_reaction_counts(self, obj):
+        return {
+            choice: getattr(obj, f"{choice}_count")
+            for choice in Reaction.ReactionChoices.values
+        }
+
+    def get_my_reactions(self, obj):
+        return sorted(obj.my_reactions)
+
+
 class TinyCommentCreateSerializer(ModelSerializer):
 
     class Meta:
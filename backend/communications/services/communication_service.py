@@ -3,6 +3,8 @@ Communication service - Business logic for communication operations
 """
 
 from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count, Q, Value
 from rest_framework.exceptions import NotFound, PermissionDenied
 
 from communications.models import ChatRoom, Comment, DirectMessage, Reaction
@@ -12,6 +14,9 @@ from documents.templatetags.custom_filters import extract_text_content
 class CommunicationService:
     """Business logic for communication operations"""
 
+    # Keyset for paging a document's comment thread
+    COMMENT_CURSOR_ORDERING = ("created_at", "id")
+
     # ChatRoom operations
     @staticmethod
     def list_chat_rooms():
@@ -96,6 +101,45 @@ class CommunicationService:
         """List all comments"""
         return Comment.objects.all()
 
+    @staticmethod
+    def list_document_comments(document_id, user):
+        """
+        List a document's comment thread, oldest first
+
+        Users, avatars and work details are joined in, and reactions are
+        aggregated into a <reaction>_count per ReactionChoices and
+        my_reactions (the kinds user left), so a page takes one query.
+
+        Args:
+            document_id: ProjectDocument ID
+            user: Requesting user, for my_reactions
+
+        Returns:
+            QuerySet of Comment objects ordered by created_at
+        """
+        counts = {
+            f"{choice}_count": Count("reactions", filter=Q(reactions__reaction=choice))
+            for choice in Reaction.ReactionChoices.values
+        }
+        return (
+            Comment.objects.filter(document_id=document_id)
+            .select_related(
+                "user__avatar",
+                "user__work__affiliation",
+                "user__work__business_area",
+            )
+            .annotate(
+                **counts,
+                my_reactions=ArrayAgg(
+                    "reactions__reaction",
+                    filter=Q(reactions__user=user),
+                    distinct=True,
+                    default=Value([]),
+                ),
+            )
+            .order_by(*CommunicationService.COMMENT_CURSOR_ORDERING)
+        )
+
     @staticmethod
     def get_comment(pk):
         """Get comment by ID"""
@@ -6,6 +6,7 @@ import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.exceptions import NotFound, PermissionDenied
 
+from common.tests.factories import ProjectDocumentFactory
 from communications.models import ChatRoom, Comment, DirectMessage, Reaction
 from communications.services.communication_service import CommunicationService
 
@@ -170,6 +171,34 @@ class TestCommentService:
         assert comments.count() == 1
         assert comment in comments
 
+    @pytest.mark.unit
+    def test_list_document_comments(
+        self, user, other_user, comment, reaction_on_comment, project_document, db
+    ):
+        """Test a document thread is scoped, ordered and aggregates reactions"""
+        # Arrange
+        Reaction.objects.create(
+            user=other_user, comment=comment, reaction=Reaction.ReactionChoices.HEART
+        )
+        later = Comment.objects.create(
+            user=other_user, document=project_document, text="Reply"
+        )
+        other_document = ProjectDocumentFactory()
+        Comment.objects.create(user=user, document=other_document, text="Elsewhere")
+
+        # Act
+        comments = list(
+            CommunicationService.list_document_comments(project_document.pk, user)
+        )
+
+        # Assert
+        assert [c.pk for c in comments] == [comment.pk, later.pk]
+        assert comments[0].thumbup_count == 1
+        assert comments[0].heart_count == 1
+        assert comments[0].funny_count == 0
+        assert comments[0].my_reactions == ["thumbup"]
+        assert comments[1].my_reactions == []
+
     @pytest.mark.unit
     def test_get_comment(self, comment, db):
         """Test getting comment by ID"""
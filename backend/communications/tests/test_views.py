@@ -289,6 +289,55 @@ class TestCommentsView:
         # IsAuthenticated permission returns 403 for unauthenticated requests
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    @pytest.mark.integration
+    def test_list_document_comments(
+        self, api_client, user, project_document, reaction_on_comment, db
+    ):
+        """Test paging through a document's thread by cursor"""
+        # Arrange
+        for i in range(2):
+            Comment.objects.create(
+                user=user, document=project_document, text=f"Reply {i}"
+            )
+        api_client.force_authenticate(user=user)
+        url = communications_urls.path("comments")
+
+        # Act
+        first = api_client.get(url, {"document": project_document.pk, "page_size": 2})
+        second = api_client.get(
+            url,
+            {
+                "document": project_document.pk,
+                "page_size": 2,
+                "cursor": first.data["next_cursor"],
+            },
+        )
+
+        # Assert
+        assert first.status_code == status.HTTP_200_OK
+        assert [c["text"] for c in first.data["comments"]] == [
+            "Test comment",
+            "Reply 0",
+        ]
+        assert first.data["comments"][0]["reaction_counts"]["thumbup"] == 1
+        assert first.data["comments"][0]["my_reactions"] == ["thumbup"]
+        assert [c["text"] for c in second.data["comments"]] == ["Reply 1"]
+        assert second.data["next_cursor"] is None
+
+    @pytest.mark.integration
+    def test_list_document_comments_invalid_document(self, api_client, user, db):
+        """Test a non-numeric document filter is rejected"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.get(
+            communications_urls.path("comments"), {"document": "abc"}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     @pytest.mark.integration
     def test_create_comment_valid(self, api_client, user, project_document, db):
         """Test creating comment with valid data"""
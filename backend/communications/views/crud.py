@@ -2,6 +2,7 @@
 Communication CRUD views
 """
 
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -14,12 +15,14 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
+from common.utils import paginate_queryset_by_cursor
 from communications.serializers import (
     ChatRoomSerializer,
     CommentCreateSerializer,
     CommentSerializer,
     DirectMessageCreateSerializer,
     DirectMessageSerializer,
+    DocumentCommentSerializer,
     ReactionSerializer,
     TinyChatRoomSerializer,
     TinyCommentSerializer,
@@ -141,10 +144,40 @@ class Comments(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        """List all comments"""
-        comments = CommunicationService.list_comments()
-        serializer = TinyCommentSerializer(comments, many=True)
-        return Response(serializer.data, status=HTTP_200_OK)
+        """
+        List comments
+
+        With a `document` parameter, returns that document's thread a page at
+        a time (by `cursor`, oldest first) with reaction counts; otherwise
+        every comment.
+        """
+        document_id = request.query_params.get("document")
+        if document_id is None:
+            comments = CommunicationService.list_comments()
+            serializer = TinyCommentSerializer(comments, many=True)
+            return Response(serializer.data, status=HTTP_200_OK)
+
+        try:
+            document_id = int(document_id)
+        except ValueError:
+            raise ValidationError("document must be an integer")
+
+        comments = CommunicationService.list_document_comments(
+            document_id, request.user
+        )
+        paginated = paginate_queryset_by_cursor(
+            comments, request, CommunicationService.COMMENT_CURSOR_ORDERING
+        )
+        serializer = DocumentCommentSerializer(paginated["items"], many=True)
+        return Response(
+            {
+                "comments": serializer.data,
+                "total_results": paginated["total_results"],
+                "total_pages": paginated["total_pages"],
+                "next_cursor": paginated["next_cursor"],
+            },
+            status=HTTP_200_OK,
+        )
 
     def post(self, request):
         """Create new comment"""
@@ -121,19 +121,37 @@ CACHES = get_cache_config()
 # Cache Key Patterns
 # Use these patterns for consistent cache key generation across the application
 CACHE_KEYS = {
-    # User-related caches (5 minute TTL)
+    # Tagged service caches (common/utils/tagged_cache.py): entries, the
+    # version of each tag and the shared hit/miss counters per key family
     "user_projects": "user:{user_id}:projects",
     "user_profile": "user:{user_id}:profile",
+    "cache_tag": "cachetag:{tag}",
+    "cache_metrics": "cachemetrics:{family}:{outcome}",
+    # Dashboard counters (1 hour TTL, dropped by signals on change)
+    "user_counts": "user:{user_id}:counts",
+    "pending_admin_tasks": "admintasks:pending:count",
+    # SSO identity (1 hour TTL) and last_login throttle (SSO_LAST_LOGIN_INTERVAL)
+    "sso_user": "sso:user:{username}",
+    "sso_last_login": "sso:last_login:{user_id}",
+    # Library publications (LIBRARY_PUBLICATIONS_* settings), the staff
+    # profile half of the publications response (1 hour TTL, dropped by
+    # signals on change) and the library circuit breaker
+    "library_publications": "publications:library:{employee_id}",
+    "library_refresh_lock": "publications:library:{employee_id}:refreshing",
+    "library_circuit_failures": "publications:library:circuit:failures",
+    "library_circuit_open": "publications:library:circuit:open",
+    "staff_publications": "publications:staff:{employee_id}",
     # Agency-related caches (1 hour TTL)
     "agency_branches": "agency:{agency_id}:branches",
-    # Project-related caches (5 minute TTL)
-    "project_detail": "project:{project_id}:detail",
 }
 
 # Cache TTL (Time To Live) values in seconds
 CACHE_TTL = {
-    "user_projects": 300,  # 5 minutes - frequently accessed, changes occasionally
-    "user_profile": 600,  # 10 minutes - moderately accessed, changes occasionally
+    "user_projects": 3600,  # 1 hour - tagged, so dropped by signals on change
+    "user_profile": 3600,  # 1 hour - tagged, so dropped by signals on change
+    "user_counts": 3600,  # 1 hour - polled often, dropped by signals on change
+    "pending_admin_tasks": 3600,  # 1 hour - dropped by signals on change
+    "sso_user": 3600,  # 1 hour - checked against the username on every read
+    "staff_publications": 3600,  # 1 hour - dropped by signals on change
     "agency_branches": 3600,  # 1 hour - rarely changes, frequently accessed
-    "project_detail": 300,  # 5 minutes - frequently accessed, changes occasionally
 }
@@ -1,7 +1,6 @@
 # region Imports ================================================================================================
 import tempfile
 
-import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model, login
 from django.db import transaction
@@ -13,6 +12,8 @@ from rest_framework.exceptions import ParseError
 from agencies.models import Agency
 from contacts.models import UserContact
 from users.models import PublicStaffProfile, UserProfile, UserWork
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
+from users.services.sso_service import SSOService
 
 # endregion ====================================================================================================
 
@@ -81,48 +82,11 @@ class DBCAMiddleware(MiddlewareMixin):
                 user.set_password(settings.EXTERNAL_PASS)
                 user.save()
 
-                # Try to get IT Assets data, but don't fail if unavailable
-                if hasattr(settings, "IT_ASSETS_URL") and settings.IT_ASSETS_URL:
-                    try:
-                        # Add timeout to prevent long waits
-                        response = requests.get(
-                            settings.IT_ASSETS_URL,
-                            auth=(
-                                settings.IT_ASSETS_USER or "",
-                                settings.IT_ASSETS_ACCESS_TOKEN or "",
-                            ),
-                            timeout=5,  # 5 seconds timeout
-                        )
-
-                        if response.status_code == 200:
-                            try:
-                                api_data = response.json()
-                                matching_record = next(
-                                    (
-                                        item
-                                        for item in api_data
-                                        if item["email"] == attributemap["email"]
-                                    ),
-                                    None,
-                                )
-                                if matching_record:
-                                    it_asset_id = matching_record.get("id")
-                                    employee_id = matching_record.get("employee_id")
-                            except (ValueError, KeyError) as json_err:
-                                settings.LOGGER.error(
-                                    f"Failed to parse IT Assets response: {str(json_err)}"
-                                )
-                        else:
-                            settings.LOGGER.warning(
-                                f"IT Assets API returned status {response.status_code}"
-                            )
-
-                    except requests.exceptions.RequestException as api_err:
-                        settings.LOGGER.warning(
-                            f"Failed to connect to IT Assets service: {str(api_err)}"
-                        )
-                else:
-                    settings.LOGGER.warning("IT Assets URL not configured")
+                # Look the user up in the local IT Assets directory mirror
+                entry = ITAssetsDirectoryService.get_by_email(attributemap["email"])
+                if entry:
+                    it_asset_id = entry.it_asset_id
+                    employee_id = entry.employee_id
 
                 # Create PublicStaffProfile with whatever data we have (even if none)
                 PublicStaffProfile.objects.create(
@@ -222,9 +186,18 @@ class DBCAMiddleware(MiddlewareMixin):
         email = request.headers.get("x-email")
 
         if first_name and last_name and username and email:
-            user = User.objects.filter(username=email).first()
+            if request.user.is_authenticated and request.user.username == email:
+                # Fast path: the session is already bound to this identity
+                user = request.user
+            else:
+                user = SSOService.get_user(email)
+                if user:
+                    # Bind the session to the identity so later requests take
+                    # the fast path
+                    user.backend = "django.contrib.auth.backends.ModelBackend"
+                    login(request, user)
             if user:
                 request.user = user
-                user.save(update_fields=["last_login"])
+                SSOService.record_login(user.pk)
 
         return self.get_response(request)
@@ -0,0 +1,209 @@
+"""
+Email asset registry - Process-local cache of embedded images and email templates
+"""
+
+import base64
+import glob
+import os
+import threading
+from email.mime.image import MIMEImage
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.template.utils import get_app_template_dirs
+
+EMAIL_TEMPLATE_DIR = "email_templates"
+
+# Image name -> (candidate paths relative to BASE_DIR, MIME type)
+EMAIL_IMAGES = {
+    "dbca_logo": (
+        [
+            os.path.join("config", "dbca.jpg"),
+            os.path.join("documents", "assets", "dbca.jpg"),
+            "dbca.jpg",
+            os.path.join("staticfiles", "images", "dbca.jpg"),
+        ],
+        "image/jpeg",
+    ),
+    "ar_dbca_logo": (
+        [os.path.join("documents", "assets", "BCSTransparent.png")],
+        "image/png",
+    ),
+}
+
+_assets_lock = threading.Lock()
+_images = {}
+_templates = None
+
+
+class EmailAssetRegistry:
+    """
+    Images and templates for outgoing email, loaded once per process
+
+    Notifications used to read and base64-encode the logo for every
+    recipient. Images are now read once and attached to each message as a
+    single inline MIME part, referenced from the HTML as cid:<name>, so the
+    stored and rendered bodies stay small. The email_templates/*.html
+    templates are compiled together on first use.
+    """
+
+    @staticmethod
+    def cid(name):
+        """
+        Get the src to reference an inline image from an email body
+
+        Args:
+            name: Key of EMAIL_IMAGES
+
+        Returns:
+            str: cid: URL, attached by build_html_email when referenced
+        """
+        return f"cid:{name}"
+
+    @staticmethod
+    def get_image(name):
+        """
+        Get an image's bytes and MIME type, reading the file on first use
+
+        Args:
+            name: Key of EMAIL_IMAGES
+
+        Returns:
+            dict: "content", "mimetype" and "data_url", or None if the file
+                can't be found
+        """
+        if name not in _images:
+            with _assets_lock:
+                if name not in _images:
+                    _images[name] = EmailAssetRegistry._load_image(name)
+        return _images[name]
+
+    @staticmethod
+    def get_data_url(name):
+        """
+        Get an image as a base64 data URL, for HTML rendered outside email
+
+        Args:
+            name: Key of EMAIL_IMAGES
+
+        Returns:
+            str: data: URL, or "" if the image can't be found
+        """
+        image = EmailAssetRegistry.get_image(name)
+        return image["data_url"] if image else ""
+
+    @staticmethod
+    def get_template(template_name):
+        """
+        Get a compiled email template
+
+        Args:
+            template_name: Template path, e.g. "./email_templates/bump_email.html"
+
+        Returns:
+            Template
+        """
+        name = os.path.normpath(template_name)
+        templates = EmailAssetRegistry._get_templates()
+        template = templates.get(name)
+        if template is None:
+            # Not under email_templates/, so not preloaded
+            template = get_template(name)
+            with _assets_lock:
+                templates[name] = template
+        return template
+
+    @staticmethod
+    def render(template_name, context):
+        """
+        Render an email template
+
+        Args:
+            template_name: Template path
+            context: Template context dict
+
+        Returns:
+            str: Rendered HTML
+        """
+        return EmailAssetRegistry.get_template(template_name).render(context)
+
+    @staticmethod
+    def attach_inline_images(msg, html_content):
+        """
+        Attach each image referenced as cid:<name> in html_content, once
+
+        Args:
+            msg: EmailMultiAlternatives to attach to
+            html_content: HTML body of the message
+        """
+        for name in EMAIL_IMAGES:
+            if EmailAssetRegistry.cid(name) not in html_content:
+                continue
+            image = EmailAssetRegistry.get_image(name)
+            if image is None:
+                continue
+            part = MIMEImage(image["content"], _subtype=image["mimetype"].split("/")[1])
+            part.add_header("Content-ID", f"<{name}>")
+            part.add_header("Content-Disposition", "inline", filename=name)
+            msg.attach(part)
+            msg.mixed_subtype = "related"
+
+    @staticmethod
+    def clear():
+        """Drop the cached images and templates so the next use reloads"""
+        global _templates
+        with _assets_lock:
+            _images.clear()
+            _templates = None
+
+    @staticmethod
+    def _get_templates():
+        global _templates
+        if _templates is None:
+            with _assets_lock:
+                if _templates is None:
+                    _templates = EmailAssetRegistry._load_templates()
+        return _templates
+
+    @staticmethod
+    def _load_templates():
+        template_dirs = list(settings.TEMPLATES[0].get("DIRS", []))
+        template_dirs += get_app_template_dirs("templates")
+
+        templates = {}
+        for template_dir in template_dirs:
+            pattern = os.path.join(str(template_dir), EMAIL_TEMPLATE_DIR, "*.html")
+            for path in sorted(glob.glob(pattern)):
+                name = os.path.join(EMAIL_TEMPLATE_DIR, os.path.basename(path))
+                # The first directory wins, as with Django's loaders
+                if name not in templates:
+                    templates[name] = get_template(name)
+
+        settings.LOGGER.info(f"Loaded {len(templates)} email templates")
+        return templates
+
+    @staticmethod
+    def _load_image(name):
+        paths, mimetype = EMAIL_IMAGES[name]
+        for relative_path in paths:
+            path = os.path.join(settings.BASE_DIR, relative_path)
+            try:
+                with open(path, "rb") as image_file:
+                    content = image_file.read()
+            except OSError:
+                continue
+            if not content:
+                continue
+
+            encoded = base64.b64encode(content).decode("utf-8")
+            settings.LOGGER.info(f"Loaded email image {name} from {path}")
+            return {
+                "content": content,
+                "mimetype": mimetype,
+                "data_url": f"data:{mimetype};base64,{encoded}",
+            }
+
+        settings.LOGGER.error(
+            f"Could not find email image {name} at any of: {', '.join(paths)}"
+        )
+        return None
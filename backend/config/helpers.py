@@ -1,9 +1,8 @@
-import base64
-import os
-
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 
+from config.email_assets import EmailAssetRegistry
+
 # def get_encoded_image():
 #     """
 #     Encodes the DBCA logo image as a base64 string for email embedding.
@@ -23,68 +22,27 @@ from django.core.mail import EmailMultiAlternatives
 
 def get_encoded_image():
     """
-    Encodes the DBCA logo image as a base64 string for email embedding.
-    Tries multiple locations with logs incase not found.
-    """
-    import base64
-    import os
-
-    # List of possible image paths to try
-    possible_paths = [
-        os.path.join(settings.BASE_DIR, "documents", "dbca.jpg"),
-        os.path.join(settings.BASE_DIR, "dbca.jpg"),
-        os.path.join(settings.BASE_DIR, "staticfiles", "images", "dbca.jpg"),
-    ]
-
-    for image_path in possible_paths:
-        try:
-            settings.LOGGER.info(f"Trying image path: {image_path}")
-
-            if os.path.exists(image_path):
-                settings.LOGGER.info(f"Found image at: {image_path}")
-
-                with open(image_path, "rb") as img:
-                    encoded_image = base64.b64encode(img.read()).decode("utf-8")
-
-                    # Validate the encoded image
-                    if len(encoded_image) > 0:
-                        data_url = f"data:image/jpeg;base64,{encoded_image}"
-                        settings.LOGGER.info(
-                            f"Successfully encoded image from {image_path} (size: {len(data_url)} chars)"
-                        )
-                        return data_url
-                    else:
-                        settings.LOGGER.warning(
-                            f"Encoded image from {image_path} is empty"
-                        )
-                        continue  # Try next path
-            else:
-                settings.LOGGER.info(f"Image not found at: {image_path}")
-
-        except Exception as e:
-            settings.LOGGER.error(f"Error processing image at {image_path}: {e}")
-            continue  # Try next path
-
-    # If we get here, no image was found at any location
-    settings.LOGGER.error(
-        "Could not find DBCA logo image at any of the expected locations:"
-    )
-    for path in possible_paths:
-        settings.LOGGER.error(f"  - {path}")
+    Encodes the DBCA logo image as a base64 string for embedding.
 
-    return ""
+    The file is read once per process. Emails should reference the logo as
+    EmailAssetRegistry.cid("dbca_logo") instead, which attaches it once.
+    """
+    return EmailAssetRegistry.get_data_url("dbca_logo")
 
 
-def send_email_with_embedded_image(
-    recipient_email, subject, html_content, from_email=None
+def build_html_email(
+    recipient_email, subject, html_content, from_email=None, connection=None
 ):
     """
-    Send an email with embedded image via HTML content.
+    Build an HTML email with a plain text fallback.
 
-    :param recipient_email: Email address of the recipient
+    :param recipient_email: List of recipient email addresses
     :param subject: Email subject line
     :param html_content: HTML content of the email
     :param from_email: Sender's email (defaults to settings.DEFAULT_FROM_EMAIL)
+    :param connection: Open mail connection to send through, so a batch of
+        messages can share one SMTP session
+    :return: EmailMultiAlternatives ready to send
     """
     # Use default from email if not provided
     if from_email is None:
@@ -97,13 +55,31 @@ def send_email_with_embedded_image(
         "Please view this email in an HTML-compatible email client.",
         from_email,
         recipient_email,
+        connection=connection,
     )
 
     # Attach HTML alternative
     msg.attach_alternative(html_content, "text/html")
+    # Images the HTML references as cid:<name> go once as inline parts
+    EmailAssetRegistry.attach_inline_images(msg, html_content)
+    return msg
+
+
+def send_email_with_embedded_image(
+    recipient_email, subject, html_content, from_email=None
+):
+    """
+    Send an email with embedded image via HTML content, immediately.
 
-    # Send the message
-    msg.send()
+    Notifications should queue through EmailOutboxService instead, so the
+    request doesn't wait on SMTP.
+
+    :param recipient_email: Email address of the recipient
+    :param subject: Email subject line
+    :param html_content: HTML content of the email
+    :param from_email: Sender's email (defaults to settings.DEFAULT_FROM_EMAIL)
+    """
+    build_html_email(recipient_email, subject, html_content, from_email).send()
 
 
 # def get_encoded_image():
@@ -120,13 +96,7 @@ def send_email_with_embedded_image(
 
 
 def get_encoded_ar_dbca_image():
-    # Find the path to the image using Django's staticfiles finders
-    image_path = os.path.join(settings.BASE_DIR, "documents", "BCSTransparent.png")
-    print(f"AR DBCA IMAGE PATH: {image_path}")
-    if image_path and os.path.exists(image_path):
-        with open(image_path, "rb") as image_file:
-            image_data = image_file.read()
-            image_encoded = base64.b64encode(image_data).decode("utf-8")
-            return f"data:image/png;base64,{image_encoded}"
-    else:
-        return None
+    """
+    Encodes the annual report DBCA logo as a base64 string, read once per process.
+    """
+    return EmailAssetRegistry.get_data_url("ar_dbca_logo") or None
@@ -0,0 +1,201 @@
+"""
+Per-request profiling: query counts and budgets, DB time, cache reads and
+response rendering time.
+
+Each profiled request gets a Server-Timing header, readable in the browser's
+network panel, and one log line:
+
+    request_profile {"method": "GET", "route": "api/v1/projects/<int:pk>", ...}
+
+Requests running more queries than their budget (QUERY_BUDGETS, falling back
+to QUERY_BUDGET_DEFAULT) are logged as warnings. The query_budget_report
+command summarises these lines.
+"""
+
+import json
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+PROFILE_LOG_PREFIX = "request_profile"
+
+_MISSING = object()
+
+
+class RequestProfile:
+    """Counters for one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.render_time = 0.0
+        self._render_started = None
+
+    def record_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: time the query and count it"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicate_queries(self):
+        """Queries repeating an earlier statement, the mark of an N+1"""
+        return self.queries - len(self.statements)
+
+    @contextmanager
+    def count_cache_reads(self, cache):
+        """
+        Count hits and misses on a cache connection while in the block
+
+        Caches are per thread, so the instrumented methods are set on this
+        request's connection only, and whatever was there is put back after.
+        """
+        previous = {
+            name: cache.__dict__.get(name, _MISSING) for name in ("get", "get_many")
+        }
+        get, get_many = cache.get, cache.get_many
+        # Some backends' get_many calls get per key; count those reads once
+        in_get_many = False
+
+        def counted_get(key, default=None, *args, **kwargs):
+            value = get(key, _MISSING, *args, **kwargs)
+            hit = value is not _MISSING
+            if not in_get_many:
+                self.cache_hits += hit
+                self.cache_misses += not hit
+            return value if hit else default
+
+        def counted_get_many(keys, *args, **kwargs):
+            nonlocal in_get_many
+            keys = list(keys)
+            in_get_many = True
+            try:
+                values = get_many(keys, *args, **kwargs)
+            finally:
+                in_get_many = False
+            self.cache_hits += len(values)
+            self.cache_misses += len(keys) - len(values)
+            return values
+
+        cache.get, cache.get_many = counted_get, counted_get_many
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is _MISSING:
+                    cache.__dict__.pop(name, None)
+                else:
+                    cache.__dict__[name] = value
+
+    def start_render(self, response):
+        """Time the response's rendering (DRF serialises to JSON here)"""
+        self._render_started = time.perf_counter()
+        response.add_post_render_callback(self._end_render)
+
+    def _end_render(self, response):
+        self.render_time += time.perf_counter() - self._render_started
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles every request that reaches the URL resolver
+
+    Disabled with REQUEST_PROFILING = False. Sits below WhiteNoise, so
+    static files aren't profiled.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        request.profile = profile
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            stack.enter_context(connection.execute_wrapper(profile.record_query))
+            for alias in settings.CACHES:
+                stack.enter_context(profile.count_cache_reads(caches[alias]))
+            response = self.get_response(request)
+
+        total = time.perf_counter() - start
+        record = self.build_record(request, response, profile, total)
+        response["Server-Timing"] = self.server_timing(record)
+        self.log(record)
+        return response
+
+    def process_template_response(self, request, response):
+        request.profile.start_render(response)
+        return response
+
+    @staticmethod
+    def get_budget(route, view_name):
+        """
+        The query budget for a view: QUERY_BUDGETS by route, then by view
+        name, then QUERY_BUDGET_DEFAULT
+        """
+        budgets = settings.QUERY_BUDGETS
+        for key in (route, view_name):
+            if key in budgets:
+                return budgets[key]
+        return settings.QUERY_BUDGET_DEFAULT
+
+    @staticmethod
+    def build_record(request, response, profile, total):
+        """The structured record logged for a request"""
+        match = request.resolver_match
+        route = match.route if match else None
+        view_name = match.view_name if match else None
+        budget = RequestProfilingMiddleware.get_budget(route, view_name)
+
+        return {
+            "method": request.method,
+            "route": route,
+            "view": view_name,
+            "status": response.status_code,
+            "queries": profile.queries,
+            "duplicate_queries": profile.duplicate_queries,
+            "query_budget": budget,
+            "over_budget": profile.queries > budget,
+            "db_ms": round(profile.db_time * 1000, 2),
+            "cache_hits": profile.cache_hits,
+            "cache_misses": profile.cache_misses,
+            "render_ms": round(profile.render_time * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+
+    @staticmethod
+    def server_timing(record):
+        """Server-Timing header value for a record"""
+        metrics = [
+            f'db;dur={record["db_ms"]};desc="{record["queries"]} queries, '
+            f'{record["duplicate_queries"]} repeated"',
+            f'cache;desc="{record["cache_hits"]} hits, {record["cache_misses"]} misses"',
+            f"render;dur={record['render_ms']}",
+            f"total;dur={record['total_ms']}",
+        ]
+        if record["over_budget"]:
+            metrics.append(f'budget;desc="over: {record["query_budget"]} queries"')
+        return ", ".join(metrics)
+
+    @staticmethod
+    def log(record):
+        line = f"{PROFILE_LOG_PREFIX} {json.dumps(record, sort_keys=True)}"
+        if record["over_budget"]:
+            settings.LOGGER.warning(line)
+        else:
+            settings.LOGGER.info(line)
@@ -0,0 +1,284 @@
+"""
+Periodic housekeeping jobs.
+
+The run_scheduler command runs the jobs in SCHEDULED_JOBS on cron schedules
+("minute hour day month weekday", in TIME_ZONE), so work like cancelling
+expired requests happens in the background instead of on the requests that
+read the data. Each job is either a service method ("task", a dotted path)
+or a management command ("command", with optional "args").
+
+Any number of schedulers can run, e.g. one beside each backend replica. They
+elect a leader with a Postgres advisory lock (SCHEDULER_LOCK_ID) held by the
+leader's database session, and only the leader runs jobs. If the leader dies
+its session ends, releasing the lock, and another takes over the next minute.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.utils.module_loading import import_string
+
+# Longest gap a leader makes up for after a slow job or a pause
+MAX_CATCH_UP = timedelta(hours=1)
+
+
+class CronSchedule:
+    """
+    A five-field cron expression
+
+    Each field takes *, a value, a range (a-b), a step (*/n or a-b/n) or a
+    comma-separated list of those. Weekdays run from 0 (Sunday) to 6, with 7
+    also meaning Sunday. As in cron, when both day and weekday are restricted
+    a day matching either will do.
+    """
+
+    FIELDS = (
+        ("minute", 0, 59),
+        ("hour", 0, 23),
+        ("day", 1, 31),
+        ("month", 1, 12),
+        ("weekday", 0, 7),
+    )
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression: Cron expression, e.g. "*/15 * * * *"
+
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        parts = expression.split()
+        if len(parts) != len(self.FIELDS):
+            raise ValueError(
+                f"Cron expression {expression!r} needs {len(self.FIELDS)} fields"
+            )
+
+        self.expression = expression
+        self.values = {}
+        for text, (field, low, high) in zip(parts, self.FIELDS):
+            self.values[field] = self._parse_field(text, low, high)
+        if 7 in self.values["weekday"]:
+            self.values["weekday"] = (self.values["weekday"] - {7}) | {0}
+        self.restricts_day = parts[2] != "*"
+        self.restricts_weekday = parts[4] != "*"
+
+    def matches(self, moment):
+        """
+        Whether the schedule fires in the minute of a datetime
+
+        Args:
+            moment: datetime, in the time zone the schedule is written for
+
+        Returns:
+            bool
+        """
+        if (
+            moment.minute not in self.values["minute"]
+            or moment.hour not in self.values["hour"]
+            or moment.month not in self.values["month"]
+        ):
+            return False
+
+        day = moment.day in self.values["day"]
+        # datetime counts weekdays from Monday, cron from Sunday
+        weekday = (moment.weekday() + 1) % 7 in self.values["weekday"]
+        if self.restricts_day and self.restricts_weekday:
+            return day or weekday
+        return day and weekday
+
+    def __str__(self):
+        return self.expression
+
+    @staticmethod
+    def _parse_field(text, low, high):
+        values = set()
+        for part in text.split(","):
+            span, _, step = part.partition("/")
+            try:
+                step = int(step) if step else 1
+                if span == "*":
+                    start, end = low, high
+                elif "-" in span:
+                    start, end = (int(value) for value in span.split("-", 1))
+                else:
+                    start = end = int(span)
+            except ValueError:
+                raise ValueError(f"Invalid cron field {text!r}")
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Cron field {text!r} is out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+
+class ScheduledJob:
+    """A job from SCHEDULED_JOBS"""
+
+    def __init__(self, name, schedule, task=None, command=None, args=()):
+        """
+        Args:
+            name: Name of the job
+            schedule: Cron expression
+            task: Dotted path of a function or static method to call
+            command: Management command to call instead
+            args: Arguments for the command
+
+        Raises:
+            ImproperlyConfigured: If the job is invalid
+        """
+        if (task is None) == (command is None):
+            raise ImproperlyConfigured(
+                f"Scheduled job {name} needs either a task or a command"
+            )
+        try:
+            self.schedule = CronSchedule(schedule)
+        except ValueError as e:
+            raise ImproperlyConfigured(f"Scheduled job {name}: {e}")
+
+        self.name = name
+        self.command = command
+        self.args = list(args)
+        self.task = task
+        self.function = self._resolve(task) if task else None
+
+    def run(self):
+        """
+        Run the job
+
+        Returns:
+            The task's return value, or None for a command
+        """
+        if self.command:
+            return call_command(self.command, *self.args)
+        return self.function()
+
+    def describe(self):
+        """What the job runs, for listing"""
+        if self.command:
+            return " ".join([self.command, *self.args])
+        return self.task
+
+    @staticmethod
+    def _resolve(path):
+        try:
+            return import_string(path)
+        except ImportError:
+            # A method of a class, e.g. "app.services.module.Service.method"
+            owner_path, _, attribute = path.rpartition(".")
+            try:
+                return getattr(import_string(owner_path), attribute)
+            except (ImportError, AttributeError):
+                raise ImproperlyConfigured(f"Scheduled task {path} not found")
+
+
+class Scheduler:
+    """Runs due jobs while this process holds the scheduler lock"""
+
+    def __init__(self, jobs=None, lock_id=None):
+        """
+        Args:
+            jobs: ScheduledJobs, built from SCHEDULED_JOBS if None
+            lock_id: Advisory lock key, SCHEDULER_LOCK_ID if None
+        """
+        if jobs is None:
+            jobs = [
+                ScheduledJob(name, **options)
+                for name, options in settings.SCHEDULED_JOBS.items()
+            ]
+        self.jobs = {job.name: job for job in jobs}
+        self.lock_id = settings.SCHEDULER_LOCK_ID if lock_id is None else lock_id
+        self._lock_connection = None
+
+    def is_leader(self):
+        """
+        Take the scheduler lock, or check it's still held
+
+        The lock belongs to a database session, so it's lost with the
+        connection; the next call tries to take it again.
+
+        Returns:
+            bool: True if this process should run jobs
+        """
+        if connection.vendor != "postgresql":
+            return True
+
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+        if (
+            self._lock_connection is not None
+            and self._lock_connection is connection.connection
+        ):
+            return True
+
+        self._lock_connection = None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", [self.lock_id])
+                acquired = cursor.fetchone()[0]
+        except DatabaseError as e:
+            settings.LOGGER.warning(f"Scheduler couldn't reach the database: {e}")
+            return False
+
+        if acquired:
+            self._lock_connection = connection.connection
+            settings.LOGGER.info("Scheduler took the lead")
+        return acquired
+
+    def resign(self):
+        """Release the scheduler lock if this process holds it"""
+        if self._lock_connection is None:
+            return
+        if self._lock_connection is connection.connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [self.lock_id])
+            except DatabaseError as e:
+                settings.LOGGER.warning(f"Scheduler couldn't release its lock: {e}")
+        self._lock_connection = None
+
+    def get_due_jobs(self, since, until):
+        """
+        Get the jobs scheduled in any minute after one and up to another
+
+        Args:
+            since: datetime of the last minute already handled
+            until: datetime of the current minute
+
+        Returns:
+            list: Names of the due jobs, each once
+        """
+        since = max(since, until - MAX_CATCH_UP)
+        due = []
+        minute = since.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        while minute <= until:
+            for name, job in self.jobs.items():
+                if name not in due and job.schedule.matches(minute):
+                    due.append(name)
+            minute += timedelta(minutes=1)
+        return due
+
+    def run_job(self, name):
+        """
+        Run a job, logging rather than raising its errors
+
+        Args:
+            name: Name of the job
+
+        Returns:
+            bool: True if it succeeded
+        """
+        started = time.monotonic()
+        try:
+            result = self.jobs[name].run()
+        except Exception as e:
+            settings.LOGGER.error(f"Scheduled job {name} failed: {e}", exc_info=True)
+            return False
+
+        elapsed = time.monotonic() - started
+        outcome = f": {result}" if result is not None else ""
+        settings.LOGGER.info(f"Scheduled job {name} took {elapsed:.1f}s{outcome}")
+        return True
@@ -0,0 +1,140 @@
+"""
+Sentry trace sampling by route.
+
+Sentry decides whether to trace a request before it runs, so the sampler
+can't see how a request will turn out. Instead, requests that end slow or in
+a server error mark their route "hot" (TraceSampler.note_request, called by
+TraceSamplingMiddleware), and every request to a hot route is traced for
+SENTRY_HOT_ROUTE_WINDOW seconds, catching the next occurrences in full. Error
+events themselves aren't subject to trace sampling and are always sent.
+
+Otherwise a request is traced at:
+    - its parent's decision, when the frontend started the trace
+    - SENTRY_STATIC_SAMPLE_RATE for static and media files
+    - SENTRY_TRACES_SAMPLE_RATES[route], e.g. health checks
+    - SENTRY_TRACES_SAMPLE_RATE
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+_hot_lock = threading.Lock()
+_hot_routes = {}  # route -> time.monotonic() its boost expires
+
+
+class TraceSampler:
+    """Chooses the Sentry trace sample rate for each request"""
+
+    @staticmethod
+    def traces_sampler(sampling_context):
+        """
+        Sentry traces_sampler hook
+
+        Args:
+            sampling_context: Sentry's sampling context; HTTP transactions
+                carry "wsgi_environ" or "asgi_scope"
+
+        Returns:
+            float: Probability of tracing the transaction
+        """
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return float(parent_sampled)
+
+        path = TraceSampler._get_path(sampling_context)
+        if path is None:
+            return settings.SENTRY_TRACES_SAMPLE_RATE
+        if path.startswith((settings.STATIC_URL, settings.MEDIA_URL)):
+            return settings.SENTRY_STATIC_SAMPLE_RATE
+
+        route = TraceSampler.get_route(path)
+        if TraceSampler.is_hot(route):
+            return 1.0
+        return settings.SENTRY_TRACES_SAMPLE_RATES.get(
+            route, settings.SENTRY_TRACES_SAMPLE_RATE
+        )
+
+    @staticmethod
+    def get_route(path):
+        """
+        The URL route a path resolves to, as in QUERY_BUDGETS
+
+        Returns:
+            str: Route, e.g. "api/v1/projects/<int:pk>", or None if unresolved
+        """
+        try:
+            return resolve(path).route
+        except Resolver404:
+            return None
+
+    @staticmethod
+    def note_request(route, duration, status_code):
+        """
+        Mark a route hot if a request to it was slow or failed
+
+        Args:
+            route: URL route of the request
+            duration: Seconds the request took
+            status_code: HTTP status of the response
+        """
+        if route is None:
+            return
+        if duration < settings.SENTRY_SLOW_REQUEST_THRESHOLD and status_code < 500:
+            return
+        with _hot_lock:
+            _hot_routes[route] = time.monotonic() + settings.SENTRY_HOT_ROUTE_WINDOW
+
+    @staticmethod
+    def is_hot(route):
+        """Whether requests to a route are being traced in full"""
+        expires = _hot_routes.get(route)
+        if expires is None:
+            return False
+        if expires > time.monotonic():
+            return True
+        with _hot_lock:
+            if _hot_routes.get(route) == expires:
+                del _hot_routes[route]
+        return False
+
+    @staticmethod
+    def clear():
+        """Forget every hot route"""
+        with _hot_lock:
+            _hot_routes.clear()
+
+    @staticmethod
+    def _get_path(sampling_context):
+        environ = sampling_context.get("wsgi_environ")
+        if environ is not None:
+            return environ.get("PATH_INFO")
+        scope = sampling_context.get("asgi_scope")
+        if scope is not None:
+            return scope.get("path")
+        return None
+
+
+class TraceSamplingMiddleware:
+    """
+    Reports each request's route, duration and status to TraceSampler
+
+    Independent of RequestProfilingMiddleware, so slow and failing routes
+    are still traced with REQUEST_PROFILING off.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        TraceSampler.note_request(
+            match.route if match else None,
+            time.perf_counter() - start,
+            response.status_code,
+        )
+        return response
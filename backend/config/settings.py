@@ -42,6 +42,22 @@ IT_ASSETS_URLS = {
 }
 IT_ASSETS_URL = IT_ASSETS_URLS.get(ENVIRONMENT)
 
+# Library publications cache (see PublicationCacheService)
+LIBRARY_API_TIMEOUT = 30  # seconds; fetches run off the request path
+LIBRARY_MISS_WAIT = env.float("LIBRARY_MISS_WAIT", default=3.0)
+LIBRARY_PUBLICATIONS_FRESH_FOR = 24 * 60 * 60  # seconds before an entry is stale
+LIBRARY_PUBLICATIONS_REFRESH_AHEAD = 2 * 60 * 60  # refresh this long before then
+LIBRARY_PUBLICATIONS_KEEP_STALE = 7 * 24 * 60 * 60  # serve stale entries this long
+LIBRARY_REFRESH_WORKERS = env.int("LIBRARY_REFRESH_WORKERS", default=2)
+LIBRARY_CIRCUIT_FAILURES = env.int("LIBRARY_CIRCUIT_FAILURES", default=5)
+LIBRARY_CIRCUIT_RESET = env.int("LIBRARY_CIRCUIT_RESET", default=300)
+
+# IT Assets directory mirror (see sync_it_assets_directory)
+IT_ASSETS_DIRECTORY_TIMEOUT = 60  # seconds to wait for the full user list
+IT_ASSETS_DIRECTORY_MAX_AGE = env.int(
+    "IT_ASSETS_DIRECTORY_MAX_AGE", default=24 * 60 * 60
+)  # seconds since the last sync before the mirror counts as stale
+
 # Domain configuration
 DOMAINS = {
     "development": {
@@ -75,6 +91,67 @@ if not DEBUG and not PRINCE_SERVER_URL:
     PRINCE_SERVER_URL = str(BASE_DIR)
 # /usr/src/app/backend (for getting images using PrinceXML in container)
 
+# PDF render worker configuration (see documents/management/commands/run_pdf_worker.py)
+PDF_WORKER_POLL_INTERVAL = env.int("PDF_WORKER_POLL_INTERVAL", default=5)
+PDF_JOB_STALE_AFTER = env.int("PDF_JOB_STALE_AFTER", default=900)
+
+# Prince renderer pool (see documents/services/prince_service.py)
+# Point PRINCE_BINARY at documents/tests/fake_prince.py to render without a licence
+PRINCE_BINARY = env("PRINCE_BINARY", default="prince")
+PRINCE_MAX_WORKERS = env.int("PRINCE_MAX_WORKERS", default=os.cpu_count() or 2)
+PRINCE_QUEUE_TIMEOUT = env.int("PRINCE_QUEUE_TIMEOUT", default=120)
+
+# Request profiling (see config/profiling_middleware.py)
+REQUEST_PROFILING = env.bool("REQUEST_PROFILING", default=True)
+QUERY_BUDGET_DEFAULT = env.int("QUERY_BUDGET_DEFAULT", default=50)
+# Query budgets for particular views, keyed by URL route or view name, e.g.
+# {"api/v1/documents/batchapprove": 20, "users:me-counts": 5}
+QUERY_BUDGETS = {}
+
+# Tagged service cache read counters (see common/utils/tagged_cache.py)
+CACHE_METRICS_FLUSH_INTERVAL = env.int("CACHE_METRICS_FLUSH_INTERVAL", default=60)
+
+# SSO last_login writes (see users/services/sso_service.py)
+SSO_LAST_LOGIN_INTERVAL = env.int("SSO_LAST_LOGIN_INTERVAL", default=300)
+SSO_LAST_LOGIN_BATCH_SIZE = env.int("SSO_LAST_LOGIN_BATCH_SIZE", default=50)
+SSO_LAST_LOGIN_FLUSH_INTERVAL = env.int("SSO_LAST_LOGIN_FLUSH_INTERVAL", default=60)
+
+# Periodic jobs (see config/scheduler.py), run by the run_scheduler command.
+# Schedules are cron expressions in TIME_ZONE.
+SCHEDULER_LOCK_ID = 0x53504D53  # Postgres advisory lock key held by the leader
+SCHEDULER_POLL_INTERVAL = env.int("SCHEDULER_POLL_INTERVAL", default=5)
+SCHEDULED_JOBS = {
+    "expire_caretaker_requests": {
+        "schedule": "*/15 * * * *",
+        "task": "caretakers.services.request_service.CaretakerRequestService.expire_requests",
+    },
+    "fail_stale_pdf_jobs": {
+        "schedule": "*/10 * * * *",
+        "task": "documents.services.pdf_job_service.PDFJobService.fail_stale_jobs",
+    },
+    "requeue_stale_emails": {
+        "schedule": "*/10 * * * *",
+        "task": "documents.services.email_outbox_service.EmailOutboxService.requeue_stale_messages",
+    },
+    "sync_it_assets_directory": {
+        "schedule": "5 * * * *",
+        "command": "sync_it_assets_directory",
+    },
+    "warm_publication_cache": {
+        "schedule": "35 * * * *",
+        "command": "warm_publication_cache",
+        "args": ["--due"],
+    },
+    "reconcile_dashboard_counts": {
+        "schedule": "30 2 * * *",
+        "command": "reconcile_dashboard_counts",
+    },
+    "clearsessions": {
+        "schedule": "0 3 * * *",
+        "command": "clearsessions",
+    },
+}
+
 # App configuration
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 2500
@@ -119,6 +196,14 @@ DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL")
 ENVELOPE_EMAIL_RECIPIENTS = [env("SPMS_MAINTAINER_EMAIL")]
 ENVELOPE_USE_HTML_EMAIL = True
 
+# Email outbox worker (see documents/management/commands/run_email_worker.py)
+EMAIL_WORKER_POLL_INTERVAL = env.int("EMAIL_WORKER_POLL_INTERVAL", default=5)
+EMAIL_BATCH_SIZE = env.int("EMAIL_BATCH_SIZE", default=50)
+EMAIL_MAX_ATTEMPTS = env.int("EMAIL_MAX_ATTEMPTS", default=6)
+EMAIL_RETRY_BASE_DELAY = env.int("EMAIL_RETRY_BASE_DELAY", default=60)
+EMAIL_RETRY_MAX_DELAY = env.int("EMAIL_RETRY_MAX_DELAY", default=3600)
+EMAIL_SENDING_STALE_AFTER = env.int("EMAIL_SENDING_STALE_AFTER", default=600)
+
 # endregion ========================================================================================
 
 # region Database =============================================================
@@ -239,6 +324,7 @@ SYSTEM_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -269,6 +355,8 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.sentry_sampling.TraceSamplingMiddleware",
+    "config.profiling_middleware.RequestProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "config.dbca_middleware.DBCAMiddleware",
@@ -353,13 +441,29 @@ else:
 # region Sentry Configuration =====================================================
 # Initialize Sentry only if SENTRY_URL is provided (optional)
 SENTRY_URL = env("SENTRY_URL", default=None)
+
+# Trace sampling (see config/sentry_sampling.py)
+SENTRY_TRACES_SAMPLE_RATE = env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.05)
+SENTRY_STATIC_SAMPLE_RATE = env.float("SENTRY_STATIC_SAMPLE_RATE", default=0.0)
+# Per-route rates, keyed by URL route as in QUERY_BUDGETS
+SENTRY_TRACES_SAMPLE_RATES = {
+    "health/": 0.001,
+}
+# Requests this slow (seconds), or failing, trace their route in full for a while
+SENTRY_SLOW_REQUEST_THRESHOLD = env.float("SENTRY_SLOW_REQUEST_THRESHOLD", default=2.0)
+SENTRY_HOT_ROUTE_WINDOW = env.int("SENTRY_HOT_ROUTE_WINDOW", default=300)
+# Fraction of traced transactions that are also profiled
+SENTRY_PROFILES_SAMPLE_RATE = env.float("SENTRY_PROFILES_SAMPLE_RATE", default=0.1)
+
 if ENVIRONMENT != "development" and SENTRY_URL:
+    from config.sentry_sampling import TraceSampler
+
     try:
         sentry_sdk.init(
             environment=ENVIRONMENT,
             dsn=SENTRY_URL,
-            traces_sample_rate=1.0,
-            profiles_sample_rate=1.0,
+            traces_sampler=TraceSampler.traces_sampler,
+            profiles_sample_rate=SENTRY_PROFILES_SAMPLE_RATE,
         )
     except Exception as e:
         # Log warning but don't crash if Sentry DSN is invalid
@@ -0,0 +1,101 @@
+"""
+Tests for the SSO handling in DBCAMiddleware.
+"""
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from common.tests.factories import AgencyFactory, UserFactory
+from config.dbca_middleware import DBCAMiddleware
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
+from users.services.sso_service import SSOService
+
+
+def sso_client(email):
+    """A client sending the SSO proxy's identity headers"""
+    return Client(
+        headers={
+            "remote-user": email,
+            "x-email": email,
+            "x-first-name": "Sso",
+            "x-last-name": "User",
+        }
+    )
+
+
+@pytest.mark.django_db
+class TestDBCAMiddlewareSSO:
+    """Tests for requests from signed-in SSO users"""
+
+    @pytest.fixture(autouse=True)
+    def flush_logins(self):
+        yield
+        SSOService.flush_logins()
+
+    @pytest.mark.integration
+    def test_signed_in_user_not_written(self):
+        """Test a request bound to its SSO identity doesn't write to users"""
+        # Arrange
+        email = "sso.user@example.com"
+        user = UserFactory(username=email, email=email)
+        client = sso_client(email)
+        client.force_login(user)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/v1/users/me")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.data["id"] == user.pk
+        assert not [q for q in queries if q["sql"].startswith("UPDATE")]
+
+    @pytest.mark.integration
+    def test_session_rebound_to_sso_identity(self):
+        """Test a session signed in as someone else is bound to the header user"""
+        # Arrange
+        email = "sso.user@example.com"
+        sso_user = UserFactory(username=email, email=email)
+        client = sso_client(email)
+        client.force_login(UserFactory())
+
+        # Act
+        first = client.get("/api/v1/users/me")
+        second = client.get("/api/v1/users/me")
+
+        # Assert
+        assert first.data["id"] == sso_user.pk
+        assert second.data["id"] == sso_user.pk
+        assert client.session["_auth_user_id"] == str(sso_user.pk)
+
+
+@pytest.mark.django_db
+class TestDBCAMiddlewareNewUser:
+    """Tests for creating users on their first SSO request"""
+
+    @pytest.mark.integration
+    def test_new_user_linked_to_it_assets(self):
+        """Test a new user's staff profile takes its IDs from the directory mirror"""
+        # Arrange
+        AgencyFactory(pk=1)
+        ITAssetsDirectoryService.sync(
+            [{"id": 42, "email": "New.User@example.com", "employee_id": "E42"}]
+        )
+        middleware = DBCAMiddleware(get_response=lambda request: None)
+
+        # Act
+        user = middleware.create_user_and_associated_entries(
+            None,
+            {
+                "username": "new.user@example.com",
+                "email": "new.user@example.com",
+                "first_name": "New",
+                "last_name": "User",
+            },
+        )
+
+        # Assert
+        assert user.staff_profile.it_asset_id == 42
+        assert user.staff_profile.employee_id == "E42"
@@ -0,0 +1,94 @@
+"""
+Tests for the email asset registry
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from config.email_assets import EmailAssetRegistry
+from config.helpers import build_html_email
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    EmailAssetRegistry.clear()
+    yield
+    EmailAssetRegistry.clear()
+
+
+class TestEmailAssetRegistry:
+    """Tests for EmailAssetRegistry"""
+
+    @pytest.mark.unit
+    def test_get_image_loads_once(self):
+        """Test an image is read from disk once per process"""
+        # Arrange
+        first = EmailAssetRegistry.get_image("dbca_logo")
+
+        # Act
+        with patch("builtins.open") as mock_open:
+            second = EmailAssetRegistry.get_image("dbca_logo")
+
+        # Assert
+        assert first["mimetype"] == "image/jpeg"
+        assert first["content"]
+        assert second is first
+        mock_open.assert_not_called()
+
+    @pytest.mark.unit
+    def test_get_data_url_missing_image(self):
+        """Test a missing image gives an empty data URL"""
+        # Arrange
+        with patch("builtins.open", side_effect=FileNotFoundError):
+            # Act
+            result = EmailAssetRegistry.get_data_url("dbca_logo")
+
+        # Assert
+        assert result == ""
+
+    @pytest.mark.unit
+    def test_render_preloads_email_templates(self):
+        """Test email templates are compiled together on first render"""
+        # Arrange
+        context = {"recipient_name": "Jane", "site_url": "https://example.com"}
+
+        # Act
+        html = EmailAssetRegistry.render(
+            "./email_templates/new_cycle_open_email.html", context
+        )
+
+        # Assert
+        assert "Hello Jane" in html
+        templates = EmailAssetRegistry._get_templates()
+        assert "email_templates/bump_email.html" in templates
+        assert "email_templates/staff_profile_email.html" in templates
+
+    @pytest.mark.unit
+    def test_build_html_email_attaches_referenced_logo(self):
+        """Test a cid: logo reference is sent as one inline attachment"""
+        # Arrange
+        src = EmailAssetRegistry.cid("dbca_logo")
+        html = f'<img src="{src}"><img src="{src}">'
+
+        # Act
+        msg = build_html_email(["test@example.com"], "Subject", html)
+        message = msg.message()
+
+        # Assert
+        assert message.get_content_type() == "multipart/related"
+        images = [
+            part for part in message.walk() if part.get_content_maintype() == "image"
+        ]
+        assert len(images) == 1
+        assert images[0]["Content-ID"] == "<dbca_logo>"
+
+    @pytest.mark.unit
+    def test_build_html_email_without_images(self):
+        """Test messages that reference no image have no attachments"""
+        # Act
+        msg = build_html_email(["test@example.com"], "Subject", "<p>Hi</p>")
+
+        # Assert
+        assert msg.attachments == []
+        assert msg.message().get_content_type() == "multipart/alternative"
@@ -0,0 +1,146 @@
+"""
+Tests for request profiling and query budgets.
+"""
+
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+
+from config.profiling_middleware import RequestProfile, RequestProfilingMiddleware
+
+
+class TestRequestProfilingMiddleware:
+    """Tests for RequestProfilingMiddleware"""
+
+    @pytest.mark.integration
+    def test_adds_server_timing(self, api_client, user, db):
+        """Test a request gets a Server-Timing header with its queries"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.get("/api/v1/users/me")
+
+        # Assert
+        assert response.status_code == 200
+        timing = response["Server-Timing"]
+        assert "db;dur=" in timing
+        assert "cache;desc=" in timing
+        assert "render;dur=" in timing
+        assert "budget" not in timing
+
+    @pytest.mark.integration
+    def test_flags_requests_over_budget(self, api_client, user, settings, db):
+        """Test a request over its view's query budget is logged as a warning"""
+        # Arrange
+        settings.QUERY_BUDGETS = {"api/v1/users/me": 0}
+        api_client.force_authenticate(user=user)
+
+        # Act
+        with patch("config.profiling_middleware.settings.LOGGER") as mock_logger:
+            response = api_client.get("/api/v1/users/me")
+
+        # Assert
+        assert 'budget;desc="over: 0 queries"' in response["Server-Timing"]
+        line = mock_logger.warning.call_args[0][0]
+        record = json.loads(line.split(" ", 1)[1])
+        assert record["route"] == "api/v1/users/me"
+        assert record["over_budget"] is True
+        assert record["queries"] > 0
+
+    @pytest.mark.unit
+    def test_get_budget_falls_back(self, settings):
+        """Test budgets are looked up by route, then view name, then default"""
+        # Arrange
+        settings.QUERY_BUDGETS = {"route/a": 5, "view-b": 7}
+        settings.QUERY_BUDGET_DEFAULT = 50
+
+        # Act & Assert
+        assert RequestProfilingMiddleware.get_budget("route/a", "view-b") == 5
+        assert RequestProfilingMiddleware.get_budget("route/x", "view-b") == 7
+        assert RequestProfilingMiddleware.get_budget("route/x", "view-x") == 50
+
+
+class TestRequestProfile:
+    """Tests for RequestProfile counters"""
+
+    @pytest.mark.unit
+    def test_counts_cache_reads(self):
+        """Test cache hits and misses are counted, then the cache restored"""
+        # Arrange
+        cache = LocMemCache("profile-test", {})
+        cache.set("present", 1)
+        profile = RequestProfile()
+
+        # Act
+        with profile.count_cache_reads(cache):
+            assert cache.get("present") == 1
+            assert cache.get("absent", "default") == "default"
+            assert cache.get_many(["present", "absent"]) == {"present": 1}
+
+        # Assert
+        assert profile.cache_hits == 2
+        assert profile.cache_misses == 2
+        assert "get" not in cache.__dict__
+        assert "get_many" not in cache.__dict__
+
+    @pytest.mark.unit
+    def test_counts_repeated_queries(self):
+        """Test repeated statements are reported as duplicates"""
+        # Arrange
+        profile = RequestProfile()
+
+        def execute(sql, params, many, context):
+            return None
+
+        # Act
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 1"):
+            profile.record_query(execute, sql, (), False, {})
+
+        # Assert
+        assert profile.queries == 4
+        assert profile.duplicate_queries == 2
+
+
+class TestQueryBudgetReport:
+    """Tests for the query_budget_report command"""
+
+    @pytest.mark.unit
+    def test_ranks_worst_views(self, tmp_path):
+        """Test logged profiles are grouped by view and ranked"""
+
+        # Arrange
+        def profile_line(route, queries, over_budget=False):
+            record = {
+                "method": "GET",
+                "route": route,
+                "queries": queries,
+                "duplicate_queries": 0,
+                "db_ms": 1.0,
+                "total_ms": 2.0,
+                "over_budget": over_budget,
+            }
+            return f"[INFO] request_profile {json.dumps(record)}\x1b[0m\n"
+
+        log_file = tmp_path / "app.log"
+        log_file.write_text(
+            profile_line("api/v1/cheap", 2)
+            + "[INFO] unrelated line\n"
+            + profile_line("api/v1/costly", 90, over_budget=True)
+            + profile_line("api/v1/costly", 110, over_budget=True)
+        )
+        out = StringIO()
+
+        # Act
+        call_command("query_budget_report", str(log_file), stdout=out)
+
+        # Assert
+        output = out.getvalue()
+        assert "3 request(s) over 2 view(s)" in output
+        costly = output.index("GET api/v1/costly")
+        assert costly < output.index("GET api/v1/cheap")
+        assert "100.0" in output[output.rindex("\n", 0, costly) : costly]
@@ -0,0 +1,234 @@
+"""
+Tests for the periodic job scheduler.
+"""
+
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+
+from config.scheduler import CronSchedule, ScheduledJob, Scheduler
+
+runs = []
+
+
+def record_run():
+    """Scheduled task for the tests"""
+    runs.append("recorded")
+    return 1
+
+
+def fail_run():
+    """Scheduled task for the tests that always fails"""
+    raise RuntimeError("boom")
+
+
+def job(name, schedule="* * * * *", task="config.tests.test_scheduler.record_run"):
+    return ScheduledJob(name, schedule, task=task)
+
+
+class TestCronSchedule:
+    """Tests for CronSchedule"""
+
+    @pytest.mark.unit
+    def test_every_quarter_hour(self):
+        """Test a step matches each multiple of it"""
+        # Arrange
+        schedule = CronSchedule("*/15 * * * *")
+
+        # Act
+        minutes = [
+            minute
+            for minute in range(60)
+            if schedule.matches(datetime(2026, 3, 2, 9, minute))
+        ]
+
+        # Assert
+        assert minutes == [0, 15, 30, 45]
+
+    @pytest.mark.unit
+    def test_ranges_and_lists(self):
+        """Test ranges and lists restrict hours and weekdays"""
+        # Arrange
+        schedule = CronSchedule("0 9-17/4,20 * * 1-5")
+
+        # Act / Assert
+        assert schedule.matches(datetime(2026, 3, 2, 13, 0))  # Monday
+        assert schedule.matches(datetime(2026, 3, 2, 20, 0))
+        assert not schedule.matches(datetime(2026, 3, 2, 11, 0))
+        assert not schedule.matches(datetime(2026, 3, 1, 13, 0))  # Sunday
+
+    @pytest.mark.unit
+    def test_day_or_weekday(self):
+        """Test a restricted day and weekday match either, as in cron"""
+        # Arrange
+        schedule = CronSchedule("0 0 1 * 7")
+
+        # Act / Assert
+        assert schedule.matches(datetime(2026, 4, 1, 0, 0))  # Wednesday the 1st
+        assert schedule.matches(datetime(2026, 3, 1, 0, 0))  # Sunday
+        assert not schedule.matches(datetime(2026, 3, 2, 0, 0))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "expression",
+        ["* * * *", "60 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *"],
+    )
+    def test_invalid(self, expression):
+        """Test invalid expressions are rejected"""
+        # Act / Assert
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+
+class TestScheduler:
+    """Tests for ScheduledJob and Scheduler"""
+
+    @pytest.fixture(autouse=True)
+    def clear_runs(self):
+        runs.clear()
+        yield
+        runs.clear()
+
+    @pytest.mark.unit
+    def test_resolves_static_methods(self):
+        """Test a task can name a service's static method"""
+        # Act
+        scheduled = job(
+            "expire",
+            task="caretakers.services.request_service.CaretakerRequestService.expire_requests",
+        )
+
+        # Assert
+        assert scheduled.function.__name__ == "expire_requests"
+
+    @pytest.mark.unit
+    def test_invalid_jobs(self):
+        """Test jobs without a task, or with a missing one, are rejected"""
+        # Act / Assert
+        with pytest.raises(ImproperlyConfigured):
+            ScheduledJob("empty", "* * * * *")
+        with pytest.raises(ImproperlyConfigured):
+            job("missing", task="config.tests.test_scheduler.Nothing.here")
+        with pytest.raises(ImproperlyConfigured):
+            job("bad", schedule="never")
+
+    @pytest.mark.unit
+    def test_get_due_jobs(self):
+        """Test jobs due in any minute since the last are returned once"""
+        # Arrange
+        scheduler = Scheduler(
+            [job("quarter", "*/15 * * * *"), job("hourly", "0 * * * *")], lock_id=1
+        )
+        last = datetime(2026, 3, 2, 9, 14)
+
+        # Act
+        due_now = scheduler.get_due_jobs(last, datetime(2026, 3, 2, 9, 15))
+        due_later = scheduler.get_due_jobs(last, datetime(2026, 3, 2, 10, 30))
+        due_none = scheduler.get_due_jobs(
+            datetime(2026, 3, 2, 9, 15), datetime(2026, 3, 2, 9, 16)
+        )
+
+        # Assert
+        assert due_now == ["quarter"]
+        assert due_later == ["quarter", "hourly"]
+        assert due_none == []
+
+    @pytest.mark.unit
+    def test_run_job_logs_failures(self):
+        """Test a failing job is reported without stopping the others"""
+        # Arrange
+        scheduler = Scheduler(
+            [job("fails", task="config.tests.test_scheduler.fail_run"), job("runs")],
+            lock_id=1,
+        )
+
+        # Act
+        results = [scheduler.run_job(name) for name in scheduler.jobs]
+
+        # Assert
+        assert results == [False, True]
+        assert runs == ["recorded"]
+
+    @pytest.mark.integration
+    def test_leader_election(self, db):
+        """Test only the holder of the advisory lock leads"""
+        # Arrange
+        scheduler = Scheduler([job("runs")], lock_id=987654)
+        other = connections.create_connection("default")
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [987654])
+
+            # Act
+            while_held = scheduler.is_leader()
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [987654])
+            once_released = scheduler.is_leader()
+            still_leader = scheduler.is_leader()
+            scheduler.resign()
+        finally:
+            other.close()
+
+        # Assert
+        assert while_held is False
+        assert once_released is True
+        assert still_leader is True
+
+    @pytest.mark.integration
+    def test_command_runs_named_jobs(self, settings, db):
+        """Test run_scheduler --job runs a job now and fails on its errors"""
+        # Arrange
+        settings.SCHEDULED_JOBS = {
+            "runs": {
+                "schedule": "0 0 1 1 *",
+                "task": "config.tests.test_scheduler.record_run",
+            },
+            "fails": {
+                "schedule": "0 0 1 1 *",
+                "task": "config.tests.test_scheduler.fail_run",
+            },
+        }
+        out = StringIO()
+
+        # Act
+        call_command("run_scheduler", "--job", "runs", stdout=out)
+        with pytest.raises(CommandError, match="fails"):
+            call_command("run_scheduler", "--job", "fails", stdout=out)
+
+        # Assert
+        assert runs == ["recorded"]
+
+    @pytest.mark.integration
+    def test_command_once_runs_due_jobs(self, settings, db):
+        """Test run_scheduler --once runs the jobs due this minute"""
+        # Arrange
+        settings.SCHEDULED_JOBS = {
+            "every_minute": {
+                "schedule": "* * * * *",
+                "task": "config.tests.test_scheduler.record_run",
+            },
+        }
+
+        # Act
+        call_command("run_scheduler", "--once", stdout=StringIO())
+
+        # Assert
+        assert runs == ["recorded"]
+
+    @pytest.mark.unit
+    def test_catch_up_is_bounded(self):
+        """Test a long pause doesn't replay more than an hour of schedules"""
+        # Arrange
+        scheduler = Scheduler([job("daily", "0 0 * * *")], lock_id=1)
+        until = datetime(2026, 3, 5, 12, 0)
+
+        # Act
+        due = scheduler.get_due_jobs(until - timedelta(days=3), until)
+
+        # Assert
+        assert due == []
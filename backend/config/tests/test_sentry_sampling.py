@@ -0,0 +1,137 @@
+"""
+Tests for route-aware Sentry trace sampling.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from config.sentry_sampling import TraceSampler
+
+
+def wsgi_context(path, parent_sampled=None):
+    """A sampling context as Sentry's WSGI integration builds it"""
+    return {
+        "parent_sampled": parent_sampled,
+        "transaction_context": {"op": "http.server", "name": "generic WSGI request"},
+        "wsgi_environ": {"PATH_INFO": path, "REQUEST_METHOD": "GET"},
+    }
+
+
+class TestTraceSampler:
+    """Tests for TraceSampler"""
+
+    @pytest.fixture(autouse=True)
+    def sampling_settings(self, settings):
+        settings.SENTRY_TRACES_SAMPLE_RATE = 0.05
+        settings.SENTRY_STATIC_SAMPLE_RATE = 0.0
+        settings.SENTRY_TRACES_SAMPLE_RATES = {"health/": 0.001}
+        settings.SENTRY_SLOW_REQUEST_THRESHOLD = 2.0
+        settings.SENTRY_HOT_ROUTE_WINDOW = 300
+        TraceSampler.clear()
+        yield
+        TraceSampler.clear()
+
+    @pytest.mark.unit
+    def test_default_rate(self):
+        """Test an ordinary route is sampled at the default rate"""
+        # Act
+        rate = TraceSampler.traces_sampler(wsgi_context("/api/v1/projects/12"))
+
+        # Assert
+        assert rate == 0.05
+
+    @pytest.mark.unit
+    def test_route_override(self):
+        """Test per-route rates down-sample health checks"""
+        # Act
+        rate = TraceSampler.traces_sampler(wsgi_context("/health/"))
+
+        # Assert
+        assert rate == 0.001
+
+    @pytest.mark.unit
+    def test_static_and_media_files(self, settings):
+        """Test static and media files use the static rate"""
+        # Act
+        static_rate = TraceSampler.traces_sampler(
+            wsgi_context(f"{settings.STATIC_URL}app.js")
+        )
+        media_rate = TraceSampler.traces_sampler(
+            wsgi_context(f"{settings.MEDIA_URL}user_avatars/a.jpg")
+        )
+
+        # Assert
+        assert static_rate == 0.0
+        assert media_rate == 0.0
+
+    @pytest.mark.unit
+    def test_parent_decision_wins(self):
+        """Test traces started by the frontend keep their decision"""
+        # Act
+        sampled = TraceSampler.traces_sampler(wsgi_context("/health/", True))
+        dropped = TraceSampler.traces_sampler(
+            wsgi_context("/api/v1/projects/12", False)
+        )
+
+        # Assert
+        assert sampled == 1.0
+        assert dropped == 0.0
+
+    @pytest.mark.unit
+    def test_non_http_transactions(self):
+        """Test transactions without a request use the default rate"""
+        # Act
+        rate = TraceSampler.traces_sampler({"transaction_context": {"op": "task"}})
+
+        # Assert
+        assert rate == 0.05
+
+    @pytest.mark.unit
+    def test_slow_request_marks_route_hot(self):
+        """Test a slow request has its route traced in full"""
+        # Arrange
+        route = TraceSampler.get_route("/api/v1/projects/12")
+
+        # Act
+        TraceSampler.note_request(route, 0.1, 200)
+        before = TraceSampler.traces_sampler(wsgi_context("/api/v1/projects/34"))
+        TraceSampler.note_request(route, 3.5, 200)
+        after = TraceSampler.traces_sampler(wsgi_context("/api/v1/projects/34"))
+
+        # Assert
+        assert route == "api/v1/projects/<int:pk>"
+        assert before == 0.05
+        assert after == 1.0
+
+    @pytest.mark.unit
+    def test_server_error_marks_route_hot_until_window_ends(self):
+        """Test a failing route is traced in full for the hot window only"""
+        # Arrange
+        route = TraceSampler.get_route("/api/v1/projects/12")
+
+        # Act
+        with patch("config.sentry_sampling.time.monotonic", return_value=1000.0):
+            TraceSampler.note_request(route, 0.1, 500)
+            during = TraceSampler.traces_sampler(wsgi_context("/api/v1/projects/12"))
+        with patch("config.sentry_sampling.time.monotonic", return_value=1301.0):
+            after = TraceSampler.traces_sampler(wsgi_context("/api/v1/projects/12"))
+
+        # Assert
+        assert during == 1.0
+        assert after == 0.05
+
+    @pytest.mark.integration
+    def test_middleware_reports_requests(self, api_client, settings, db):
+        """Test requests are reported to the sampler without request profiling"""
+        # Arrange
+        settings.REQUEST_PROFILING = False
+
+        # Act
+        with patch("config.sentry_sampling.TraceSampler.note_request") as mock_note:
+            api_client.get("/api/v1/users/me")
+
+        # Assert
+        route, duration, status_code = mock_note.call_args[0]
+        assert route == "api/v1/users/me"
+        assert status_code == 403
@@ -12,6 +12,8 @@ from .models import (
     ConceptPlan,
     CustomPublication,
     Endorsement,
+    OutboundEmail,
+    PDFRenderJob,
     ProgressReport,
     ProjectClosure,
     ProjectDocument,
@@ -359,3 +361,51 @@ class EndorsementAdmin(admin.ModelAdmin):
 
 
 # endregion ========================================================================================================
+
+
+@admin.register(PDFRenderJob)
+class PDFRenderJobAdmin(admin.ModelAdmin):
+
+    list_display = (
+        "pk",
+        "target",
+        "document",
+        "report",
+        "status",
+        "progress",
+        "requested_by",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "target",
+        "status",
+    )
+
+    raw_id_fields = ("document", "report", "requested_by")
+
+    ordering = ["-created_at"]
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+
+    list_display = (
+        "pk",
+        "subject",
+        "recipients",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+
+    list_filter = ("status",)
+
+    search_fields = ("subject",)
+
+    readonly_fields = ("worker", "claimed_at", "sent_at", "last_error")
+
+    ordering = ["-created_at"]
@@ -0,0 +1,62 @@
+"""
+Management command to refresh the PDFs of every report in an annual report.
+
+Renders run concurrently on the Prince pool (PRINCE_MAX_WORKERS), and
+documents whose stored PDF is already current are skipped.
+
+Usage:
+    python manage.py regenerate_report_pdfs 2024
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from documents.models import AnnualReport, ProjectDocument
+from documents.services.pdf_cache_service import PDFCacheService
+from documents.services.prince_service import PrinceService
+
+
+class Command(BaseCommand):
+    help = "Refresh progress and student report PDFs for an annual report year"
+
+    def add_arguments(self, parser):
+        parser.add_argument("year", type=int, help="Annual report year, e.g. 2024")
+
+    def handle(self, *args, **options):
+        year = options["year"]
+        report = AnnualReport.objects.filter(year=year).first()
+        if report is None:
+            raise CommandError(f"No annual report for {year}")
+
+        documents = (
+            ProjectDocument.objects.filter(
+                Q(progress_report_details__report=report)
+                | Q(student_report_details__report=report)
+            )
+            .select_related("project", "pdf")
+            .distinct()
+        )
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== Refreshing {documents.count()} report PDF(s) for {year} ==="
+            )
+        )
+
+        started = time.monotonic()
+        results = PDFCacheService.refresh_document_pdfs(documents)
+        elapsed = time.monotonic() - started
+
+        for document, error in results["failed"]:
+            self.stdout.write(self.style.WARNING(f"  {document}: {error}"))
+
+        metrics = PrinceService.get_metrics()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ {results['rendered']} rendered, {results['cached']} already "
+                f"current, {len(results['failed'])} failed in {elapsed:.1f}s "
+                f"({metrics['max_workers']} Prince workers)"
+            )
+        )
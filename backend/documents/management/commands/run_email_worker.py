@@ -0,0 +1,78 @@
+"""
+Management command to send queued outbound emails.
+
+Usage:
+    python manage.py run_email_worker
+    python manage.py run_email_worker --once  # Send everything due, then exit
+    python manage.py run_email_worker --poll-interval 10
+"""
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from documents.services.email_outbox_service import EmailOutboxService
+
+
+class Command(BaseCommand):
+    help = "Send queued notification emails in batches over pooled SMTP connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send every message that is due, then exit instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=settings.EMAIL_WORKER_POLL_INTERVAL,
+            help="Seconds to wait between polls when nothing is due",
+        )
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker_name = EmailOutboxService.get_worker_name()
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(f"\n=== Email worker {worker_name} started ===")
+        )
+
+        stale = EmailOutboxService.requeue_stale_messages()
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Requeued {stale} stale message(s)"))
+
+        totals = {"sent": 0, "retrying": 0, "failed": 0}
+        while self.running:
+            close_old_connections()
+            messages = EmailOutboxService.claim_batch(worker_name)
+
+            if not messages:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            results = EmailOutboxService.send_batch(messages)
+            for key, count in results.items():
+                totals[key] += count
+            self.stdout.write(
+                f"Batch of {len(messages)}: {results['sent']} sent, "
+                f"{results['retrying']} retrying, {results['failed']} failed"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ Email worker stopped: {totals['sent']} sent, "
+                f"{totals['retrying']} retrying, {totals['failed']} failed"
+            )
+        )
+
+    def _stop(self, signum, frame):
+        # Let the current batch finish; the loop exits before claiming another
+        self.running = False
@@ -0,0 +1,71 @@
+"""
+Management command to process queued PDF render jobs.
+
+Usage:
+    python manage.py run_pdf_worker
+    python manage.py run_pdf_worker --once  # Drain the queue and exit
+    python manage.py run_pdf_worker --poll-interval 10
+"""
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from documents.services.pdf_job_service import PDFJobService
+
+
+class Command(BaseCommand):
+    help = "Process queued project document and annual report PDF renders"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process every queued job, then exit instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=settings.PDF_WORKER_POLL_INTERVAL,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker_name = PDFJobService.get_worker_name()
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(f"\n=== PDF worker {worker_name} started ===")
+        )
+
+        stale = PDFJobService.fail_stale_jobs()
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Failed {stale} stale job(s)"))
+
+        processed = 0
+        while self.running:
+            close_old_connections()
+            job = PDFJobService.claim_next_job(worker_name)
+
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = PDFJobService.run_job(job)
+            processed += 1
+            self.stdout.write(f"Job {job.pk} ({job.get_target_object()}): {job.status}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\n✓ PDF worker stopped after {processed} job(s)")
+        )
+
+    def _stop(self, signum, frame):
+        # Let the current render finish; the loop exits before claiming another
+        self.running = False
@@ -0,0 +1,84 @@
+"""
+Management command to prefetch library publications for public staff profiles.
+
+Fills the publication cache so public profile pages don't wait on the
+library API. Run it after a deploy or cache flush, and on a schedule with
+--due to refresh entries before they go stale. It stops early if the
+library keeps failing (see PublicationCacheService).
+
+Usage:
+    python manage.py warm_publication_cache
+    python manage.py warm_publication_cache --due
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from documents.services.publication_cache_service import (
+    LibraryUnavailable,
+    PublicationCacheService,
+)
+from users.models import PublicStaffProfile
+
+
+class Command(BaseCommand):
+    help = "Prefetch library publications for every visible staff profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--due",
+            action="store_true",
+            help="Only fetch employees with nothing cached or an entry near expiry",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.LIBRARY_API_URL or not settings.LIBRARY_BEARER_TOKEN:
+            raise CommandError("Library API configuration missing")
+
+        employee_ids = list(
+            PublicStaffProfile.objects.filter(is_hidden=False, user__is_active=True)
+            .exclude(employee_id__isnull=True)
+            .exclude(employee_id="")
+            .order_by("employee_id")
+            .values_list("employee_id", flat=True)
+            .distinct()
+        )
+        if options["due"]:
+            employee_ids = [
+                employee_id
+                for employee_id in employee_ids
+                if (entry := PublicationCacheService.get_cached_entry(employee_id))
+                is None
+                or PublicationCacheService.needs_refresh(entry)
+            ]
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== Prefetching publications for {len(employee_ids)} staff ==="
+            )
+        )
+
+        started = time.monotonic()
+        fetched = 0
+        failed = 0
+        for employee_id in employee_ids:
+            if PublicationCacheService.is_circuit_open():
+                raise CommandError(
+                    f"Library API is failing; stopped after {fetched} fetched, "
+                    f"{failed} failed"
+                )
+            try:
+                PublicationCacheService.refresh(employee_id)
+                fetched += 1
+            except LibraryUnavailable as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"  {employee_id}: {e}"))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ {fetched} fetched, {failed} failed in {elapsed:.1f}s"
+            )
+        )
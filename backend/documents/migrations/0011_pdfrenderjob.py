@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0010_remove_old_id_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFRenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('target', models.CharField(choices=[('projectdocument', 'Project Document'), ('annualreport', 'Annual Report')], max_length=50)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='queued', max_length=50)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Rough completion percentage reported by the worker')),
+                ('worker', models.CharField(blank=True, help_text='Identifier of the worker process that claimed this job', max_length=255, null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('document', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pdf_render_jobs', to='documents.projectdocument')),
+                ('report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pdf_render_jobs', to='documents.annualreport')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pdf_render_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'PDF Render Job',
+                'verbose_name_plural': 'PDF Render Jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='documents_p_status_95f146_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('document',), name='unique_in_flight_document_pdf_job'), models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('report',), name='unique_in_flight_report_pdf_job')],
+            },
+        ),
+    ]
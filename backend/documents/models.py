@@ -1,7 +1,9 @@
 # region Imports ===================================
 from bs4 import BeautifulSoup
+from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 
 from common.models import CommonModel
@@ -686,6 +688,183 @@ class ProjectClosure(models.Model):
 # endregion ==================================
 
 
+# region PDF Render Jobs ===================================
+
+
+class PDFRenderJob(CommonModel):
+    """
+    A queued PDF render for a project document or an annual report.
+
+    Jobs are created by the generation endpoints and processed out of the
+    request cycle by the `run_pdf_worker` management command. Only one job
+    may be in flight (queued or running) for a given document or report.
+    """
+
+    class TargetChoices(models.TextChoices):
+        PROJECTDOCUMENT = "projectdocument", "Project Document"
+        ANNUALREPORT = "annualreport", "Annual Report"
+
+    class StatusChoices(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+        CANCELLED = "cancelled", "Cancelled"
+
+    IN_FLIGHT_STATUSES = [StatusChoices.QUEUED, StatusChoices.RUNNING]
+
+    target = models.CharField(
+        max_length=50,
+        choices=TargetChoices.choices,
+    )
+
+    document = models.ForeignKey(
+        "documents.ProjectDocument",
+        on_delete=models.CASCADE,
+        related_name="pdf_render_jobs",
+        blank=True,
+        null=True,
+    )
+
+    report = models.ForeignKey(
+        "documents.AnnualReport",
+        on_delete=models.CASCADE,
+        related_name="pdf_render_jobs",
+        blank=True,
+        null=True,
+    )
+
+    status = models.CharField(
+        max_length=50,
+        choices=StatusChoices.choices,
+        default=StatusChoices.QUEUED,
+    )
+
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Rough completion percentage reported by the worker",
+    )
+
+    requested_by = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        related_name="pdf_render_jobs",
+        blank=True,
+        null=True,
+    )
+
+    worker = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Identifier of the worker process that claimed this job",
+    )
+
+    error = models.TextField(blank=True, null=True)
+
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    @property
+    def is_in_flight(self):
+        return self.status in self.IN_FLIGHT_STATUSES
+
+    def get_target_object(self):
+        if self.target == PDFRenderJob.TargetChoices.ANNUALREPORT:
+            return self.report
+        return self.document
+
+    def __str__(self) -> str:
+        return f"({self.pk}) PDF render {self.target} - {self.status}"
+
+    class Meta:
+        verbose_name = "PDF Render Job"
+        verbose_name_plural = "PDF Render Jobs"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["document"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_in_flight_document_pdf_job",
+            ),
+            models.UniqueConstraint(
+                fields=["report"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_in_flight_report_pdf_job",
+            ),
+        ]
+
+
+class OutboundEmail(CommonModel):
+    """
+    An email waiting in, or delivered from, the outbox.
+
+    Notifications render their HTML and queue it here instead of talking to
+    SMTP during the request. The `run_email_worker` management command sends
+    queued messages in batches over one SMTP connection, retrying failures
+    with exponential backoff up to EMAIL_MAX_ATTEMPTS times.
+    """
+
+    class StatusChoices(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=998)
+
+    recipients = ArrayField(
+        models.EmailField(),
+        help_text="Addresses the message is sent to",
+    )
+
+    from_email = models.CharField(max_length=254)
+
+    html_content = models.TextField()
+
+    status = models.CharField(
+        max_length=50,
+        choices=StatusChoices.choices,
+        default=StatusChoices.QUEUED,
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Queued messages are not sent before this time",
+    )
+
+    worker = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Identifier of the worker process that last claimed this message",
+    )
+
+    last_error = models.TextField(blank=True, null=True)
+
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"({self.pk}) {self.subject} to {', '.join(self.recipients)} - {self.status}"
+
+    class Meta:
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+
+# endregion ==================================
+
+
 # region ================== Custom Publication Models ==================
 
 
@@ -43,6 +43,9 @@ from .custom_publication import (
     TinyCustomPublicationSerializer,
 )
 
+# PDF render job serializers
+from .pdf_job import PDFRenderJobSerializer
+
 # Progress report serializers
 from .progress_report import (
     ProgressReportCreateSerializer,
@@ -122,4 +125,6 @@ __all__ = [
     "PublicationDocSerializer",
     "LibraryPublicationResponseSerializer",
     "PublicationResponseSerializer",
+    # PDF render jobs
+    "PDFRenderJobSerializer",
 ]
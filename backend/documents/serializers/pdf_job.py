@@ -0,0 +1,29 @@
+"""
+PDF render job serializers
+"""
+
+from rest_framework import serializers
+
+from ..models import PDFRenderJob
+
+
+class PDFRenderJobSerializer(serializers.ModelSerializer):
+    """Render job status for polling clients"""
+
+    class Meta:
+        model = PDFRenderJob
+        fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "target",
+            "document",
+            "report",
+            "status",
+            "progress",
+            "requested_by",
+            "error",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
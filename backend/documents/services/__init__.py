@@ -6,21 +6,34 @@ from .approval_service import ApprovalService
 from .closure_service import ClosureService
 from .concept_plan_service import ConceptPlanService
 from .document_service import DocumentService
+from .email_outbox_service import EmailOutboxService
 from .email_service import EmailSendError, EmailService
 from .notification_service import NotificationService
+from .pdf_job_service import PDFJobService
 from .pdf_service import PDFService
+from .pending_action_service import PendingActionService
+from .prince_service import PrinceService
 from .progress_report_service import ProgressReportService
 from .project_plan_service import ProjectPlanService
+from .publication_cache_service import LibraryUnavailable, PublicationCacheService
+from .report_cycle_service import ReportCycleService
 
 __all__ = [
     "EmailService",
     "EmailSendError",
+    "EmailOutboxService",
     "NotificationService",
     "DocumentService",
     "ApprovalService",
     "PDFService",
+    "PDFJobService",
+    "PrinceService",
     "ConceptPlanService",
     "ProjectPlanService",
     "ProgressReportService",
+    "ReportCycleService",
+    "PendingActionService",
     "ClosureService",
+    "PublicationCacheService",
+    "LibraryUnavailable",
 ]
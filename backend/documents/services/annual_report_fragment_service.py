@@ -0,0 +1,426 @@
+"""
+Annual report fragment service - Cache rendered annual report sections per
+project and business area so a rebuild only re-renders what changed
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+
+from locations.services.area_registry import AreaRegistry
+
+from ..models import ProgressReport, ProjectDocument, StudentReport
+
+# Bump to invalidate every cached fragment, e.g. after changing how the
+# fragment context is built
+FRAGMENT_CACHE_VERSION = 1
+
+# Fragments are unreachable once a dependency token changes, so this only
+# bounds how long orphaned fragments occupy the cache
+FRAGMENT_TTL = 60 * 60 * 24 * 30
+
+FRAGMENT_TEMPLATE_DIR = (
+    Path(__file__).resolve().parent.parent / "templates" / "annual_report"
+)
+
+# Dependency kinds a fragment can depend on (see documents.signals)
+PROJECT = "project"
+BUSINESS_AREA = "business_area"
+AREAS = "areas"
+
+
+@lru_cache(maxsize=1)
+def _template_fingerprint():
+    """Short hash of the fragment templates, so a deploy invalidates fragments"""
+    digest = hashlib.sha256()
+    for path in sorted(FRAGMENT_TEMPLATE_DIR.glob("*.html")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class AnnualReportFragmentService:
+    """
+    Cached HTML fragments for the sections of the annual report
+
+    The report is assembled from one fragment per progress report, student
+    report and summary table row, and one chapter and summary table per
+    business area. Each fragment key embeds a version token for every object
+    it depends on. Saving one of those objects replaces its token (see
+    documents.signals), so stale fragments are never read again and only
+    the fragments for changed projects or business areas are re-rendered.
+    """
+
+    @staticmethod
+    def dependency_key(kind, pk=None):
+        """
+        Cache key holding the version token for a dependency
+
+        Args:
+            kind: PROJECT, BUSINESS_AREA or AREAS
+            pk: Object primary key (None for AREAS)
+
+        Returns:
+            str: Cache key
+        """
+        if pk is None:
+            return f"annual_report:dep:{kind}"
+        return f"annual_report:dep:{kind}:{pk}"
+
+    @staticmethod
+    def invalidate(kind, pks=(None,)):
+        """
+        Replace the version tokens for the given dependencies
+
+        Args:
+            kind: PROJECT, BUSINESS_AREA or AREAS
+            pks: Object primary keys to invalidate
+        """
+        keys = {
+            AnnualReportFragmentService.dependency_key(kind, pk): uuid4().hex
+            for pk in pks
+        }
+        if keys:
+            cache.set_many(keys, timeout=None)
+
+    @staticmethod
+    def _get_tokens(dependency_keys):
+        """Fetch version tokens, creating any the cache doesn't hold"""
+        tokens = cache.get_many(dependency_keys)
+        missing = {key: uuid4().hex for key in dependency_keys if key not in tokens}
+        if missing:
+            # A missing token may have been evicted, so it must not be
+            # reused: a fresh one orphans any fragments rendered under it
+            cache.set_many(missing, timeout=None)
+            tokens.update(missing)
+        return tokens
+
+    @staticmethod
+    def build_sections(report):
+        """
+        Get the rendered sections of an annual report
+
+        Args:
+            report: AnnualReport instance
+
+        Returns:
+            dict: Template context with lists of HTML fragments for
+            ba_chapter_fragments, ba_summary_table_fragments,
+            student_report_fragments and student_summary_row_fragments
+        """
+        dep = AnnualReportFragmentService.dependency_key
+        prefix = f"annual_report:v{FRAGMENT_CACHE_VERSION}:{_template_fingerprint()}"
+
+        progress_index = list(
+            ProgressReport.objects.filter(
+                report=report,
+                document__status=ProjectDocument.StatusChoices.APPROVED,
+                project__business_area__isnull=False,
+            )
+            .order_by("project__business_area__name", "project__title", "pk")
+            .values_list("pk", "project_id", "project__business_area_id")
+        )
+        student_index = list(
+            StudentReport.objects.filter(
+                report=report,
+                document__status=ProjectDocument.StatusChoices.APPROVED,
+            )
+            .order_by("project__title", "pk")
+            .values_list("pk", "project_id")
+        )
+
+        project_ids = {row[1] for row in progress_index} | {
+            row[1] for row in student_index
+        }
+        ba_ids = list(dict.fromkeys(row[2] for row in progress_index))
+        tokens = AnnualReportFragmentService._get_tokens(
+            [dep(PROJECT, pk) for pk in project_ids]
+            + [dep(BUSINESS_AREA, pk) for pk in ba_ids]
+            + [dep(AREAS)]
+        )
+
+        def project_token(project_id):
+            return tokens[dep(PROJECT, project_id)]
+
+        # Leaf fragments, one set per report
+        pr_keys = {
+            pk: f"{prefix}:progress_report:{pk}:{project_token(project_id)}"
+            for pk, project_id, _ in progress_index
+        }
+        pr_row_keys = {
+            pk: f"{prefix}:progress_summary_row:{pk}:{project_token(project_id)}:"
+            f"{tokens[dep(AREAS)]}"
+            for pk, project_id, _ in progress_index
+        }
+        sr_keys = {
+            pk: f"{prefix}:student_report:{pk}:{project_token(project_id)}"
+            for pk, project_id in student_index
+        }
+        sr_row_keys = {
+            pk: f"{prefix}:student_summary_row:{pk}:{project_token(project_id)}"
+            for pk, project_id in student_index
+        }
+
+        fragments = cache.get_many(
+            list(pr_keys.values())
+            + list(pr_row_keys.values())
+            + list(sr_keys.values())
+            + list(sr_row_keys.values())
+        )
+
+        missing_pr = [
+            pk
+            for pk in pr_keys
+            if pr_keys[pk] not in fragments or pr_row_keys[pk] not in fragments
+        ]
+        missing_sr = [
+            pk
+            for pk in sr_keys
+            if sr_keys[pk] not in fragments or sr_row_keys[pk] not in fragments
+        ]
+        rendered = {}
+        if missing_pr:
+            rendered.update(
+                AnnualReportFragmentService._render_progress_reports(
+                    missing_pr, pr_keys, pr_row_keys
+                )
+            )
+        if missing_sr:
+            rendered.update(
+                AnnualReportFragmentService._render_student_reports(
+                    missing_sr, sr_keys, sr_row_keys
+                )
+            )
+        if rendered:
+            cache.set_many(rendered, timeout=FRAGMENT_TTL)
+            fragments.update(rendered)
+
+        # Business area fragments wrap their reports' fragments, so their
+        # keys cover the business area token and every child key
+        children = {ba_id: [] for ba_id in ba_ids}
+        for pk, _, ba_id in progress_index:
+            children[ba_id].append(pk)
+
+        def composite_key(kind, ba_id, child_keys):
+            digest = hashlib.sha256("|".join(child_keys).encode("utf-8"))
+            return (
+                f"{prefix}:{kind}:{ba_id}:{tokens[dep(BUSINESS_AREA, ba_id)]}:"
+                f"{digest.hexdigest()}"
+            )
+
+        chapter_keys = {
+            ba_id: composite_key(
+                "ba_chapter", ba_id, [pr_keys[pk] for pk in children[ba_id]]
+            )
+            for ba_id in ba_ids
+        }
+        table_keys = {
+            ba_id: composite_key(
+                "ba_summary_table", ba_id, [pr_row_keys[pk] for pk in children[ba_id]]
+            )
+            for ba_id in ba_ids
+        }
+        ba_fragments = cache.get_many(
+            list(chapter_keys.values()) + list(table_keys.values())
+        )
+        missing_ba = [
+            ba_id
+            for ba_id in ba_ids
+            if chapter_keys[ba_id] not in ba_fragments
+            or table_keys[ba_id] not in ba_fragments
+        ]
+        if missing_ba:
+            rendered = AnnualReportFragmentService._render_business_areas(
+                missing_ba,
+                chapter_keys,
+                table_keys,
+                {
+                    ba_id: [fragments[pr_keys[pk]] for pk in children[ba_id]]
+                    for ba_id in missing_ba
+                },
+                {
+                    ba_id: [fragments[pr_row_keys[pk]] for pk in children[ba_id]]
+                    for ba_id in missing_ba
+                },
+            )
+            cache.set_many(rendered, timeout=FRAGMENT_TTL)
+            ba_fragments.update(rendered)
+
+        settings.LOGGER.info(
+            f"Annual report {report.year}: re-rendered {len(missing_pr)} progress "
+            f"report(s), {len(missing_sr)} student report(s) and {len(missing_ba)} "
+            f"business area(s)"
+        )
+
+        return {
+            "ba_chapter_fragments": [ba_fragments[chapter_keys[b]] for b in ba_ids],
+            "ba_summary_table_fragments": [ba_fragments[table_keys[b]] for b in ba_ids],
+            "student_report_fragments": [
+                fragments[sr_keys[pk]] for pk, _ in student_index
+            ],
+            "student_summary_row_fragments": [
+                fragments[sr_row_keys[pk]] for pk, _ in student_index
+            ],
+        }
+
+    @staticmethod
+    def _render(template_name, context):
+        context = {"server_url": settings.PRINCE_SERVER_URL, **context}
+        return render_to_string(f"annual_report/{template_name}", context)
+
+    @staticmethod
+    def _render_progress_reports(pks, body_keys, row_keys):
+        reports = AnnualReportFragmentService._load_reports(ProgressReport, pks)
+
+        rendered = {}
+        for report in reports:
+            data = AnnualReportFragmentService._report_data(report)
+            data.update(
+                {
+                    "context": report.context,
+                    "aims": report.aims,
+                    "progress": report.progress,
+                    "implications": report.implications,
+                    "future": report.future,
+                }
+            )
+            rendered[body_keys[report.pk]] = AnnualReportFragmentService._render(
+                "progress_report.html", {"report": data}
+            )
+            rendered[row_keys[report.pk]] = AnnualReportFragmentService._render(
+                "progress_summary_row.html", {"report": data}
+            )
+        return rendered
+
+    @staticmethod
+    def _render_student_reports(pks, body_keys, row_keys):
+        reports = AnnualReportFragmentService._load_reports(StudentReport, pks)
+
+        rendered = {}
+        for report in reports:
+            data = AnnualReportFragmentService._report_data(report)
+            data["progress_report"] = report.progress_report
+            rendered[body_keys[report.pk]] = AnnualReportFragmentService._render(
+                "student_report.html", {"report": data}
+            )
+            rendered[row_keys[report.pk]] = AnnualReportFragmentService._render(
+                "student_summary_row.html", {"report": data}
+            )
+        return rendered
+
+    @staticmethod
+    def _render_business_areas(
+        ba_ids, chapter_keys, table_keys, report_fragments, row_fragments
+    ):
+        from agencies.models import BusinessArea
+
+        business_areas = BusinessArea.objects.filter(pk__in=ba_ids).select_related(
+            "leader", "image"
+        )
+
+        rendered = {}
+        for ba in business_areas:
+            image = getattr(ba, "image", None)
+            leader = ba.leader
+            ba_item = {
+                "ba_name": ba.name,
+                "ba_image": {"file": image.file.url} if image and image.file else None,
+                "ba_leader": (
+                    f"{leader.display_first_name or ''} {leader.display_last_name or ''}".strip()
+                    if leader
+                    else ""
+                ),
+                "ba_introduction": ba.introduction,
+            }
+            rendered[chapter_keys[ba.pk]] = AnnualReportFragmentService._render(
+                "ba_chapter.html",
+                {"ba_item": ba_item, "report_fragments": report_fragments[ba.pk]},
+            )
+            rendered[table_keys[ba.pk]] = AnnualReportFragmentService._render(
+                "ba_summary_table.html",
+                {"ba_item": ba_item, "row_fragments": row_fragments[ba.pk]},
+            )
+        return rendered
+
+    @staticmethod
+    def _load_reports(model, pks):
+        """Load only the reports whose fragments must be re-rendered"""
+        from projects.models import ProjectMember
+
+        return list(
+            model.objects.filter(pk__in=pks)
+            .select_related(
+                "project",
+                "project__image",
+                "project__area",
+                "project__student_project_info",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "project__members",
+                    queryset=ProjectMember.objects.select_related(
+                        "user", "user__profile", "user__work__affiliation"
+                    ),
+                )
+            )
+        )
+
+    @staticmethod
+    def _report_data(report):
+        """Shape a report like the serialized data the templates were written for"""
+        project = report.project
+        image = getattr(project, "image", None)
+        student_info = getattr(project, "student_project_info", None)
+        project_area = getattr(project, "area", None)
+
+        return {
+            "document": {
+                "project": {
+                    "title": project.title,
+                    "kind": project.kind,
+                    "year": project.year,
+                    "number": project.number,
+                    "start_date": project.start_date,
+                    "end_date": project.end_date,
+                    "student_level": student_info.level if student_info else None,
+                    "image": (
+                        {"file": image.file.url} if image and image.file else None
+                    ),
+                }
+            },
+            "team_members": [
+                AnnualReportFragmentService._member_data(member)
+                for member in project.members.all()
+            ],
+            "project_areas": {
+                "data": {
+                    "areas": AreaRegistry.serialize(
+                        project_area.areas if project_area else []
+                    )
+                }
+            },
+        }
+
+    @staticmethod
+    def _member_data(member):
+        user = member.user
+        profile = getattr(user, "profile", None)
+        work = getattr(user, "work", None)
+        affiliation = work.affiliation if work else None
+        return {
+            "role": member.role,
+            "position": member.position,
+            "user": {
+                "display_first_name": user.display_first_name or "",
+                "display_last_name": user.display_last_name or "",
+                "title": profile.title if profile else None,
+                "is_staff": user.is_staff,
+                "affiliation": {"name": affiliation.name} if affiliation else None,
+            },
+        }
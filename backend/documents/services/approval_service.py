@@ -4,11 +4,32 @@ Approval service - Document approval workflow logic
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from projects.models import ProjectMember
+
 from ..models import ProjectDocument
+from .annual_report_fragment_service import PROJECT, AnnualReportFragmentService
 from .notification_service import NotificationService
 
+# Flags each approval stage grants, and the earlier flags it requires
+APPROVAL_STAGES = {
+    1: {"grants": "project_lead_approval_granted", "requires": ()},
+    2: {
+        "grants": "business_area_lead_approval_granted",
+        "requires": ("project_lead_approval_granted",),
+    },
+    3: {
+        "grants": "directorate_approval_granted",
+        "requires": (
+            "project_lead_approval_granted",
+            "business_area_lead_approval_granted",
+        ),
+    },
+}
+
 
 class ApprovalService:
     """Business logic for document approval workflows"""
@@ -175,7 +196,6 @@ class ApprovalService:
         NotificationService.notify_document_recalled(document, recaller, reason)
 
     @staticmethod
-    @transaction.atomic
     def batch_approve(documents, approver, stage):
         """
         Batch approve multiple documents
@@ -188,33 +208,147 @@ class ApprovalService:
         Returns:
             dict: Results with approved and failed documents
         """
+        return ApprovalService.bulk_approve(
+            [document.pk for document in documents], approver, stage
+        )
+
+    @staticmethod
+    def bulk_approve(document_ids, approver, stage):
+        """
+        Approve many documents at one stage in a fixed number of queries
+
+        The documents, their projects' members and the approvers are loaded
+        together and each document is checked in memory, with the same rules
+        and messages as approve_stage_one/two/three. Those that pass are
+        written with one bulk_update, and instead of an email per document
+        each recipient gets one digest listing every document approved.
+
+        Args:
+            document_ids: IDs of the documents to approve
+            approver: User approving the documents
+            stage: Approval stage (1, 2, or 3)
+
+        Returns:
+            dict: "approved", a list of document IDs, and "failed", a list of
+                dicts with "document_id" and "error", in request order
+        """
         results = {
             "approved": [],
             "failed": [],
         }
+        document_ids = list(dict.fromkeys(document_ids))
+
+        if stage not in APPROVAL_STAGES:
+            results["failed"] = [
+                {"document_id": pk, "error": f"Invalid stage: {stage}"}
+                for pk in document_ids
+            ]
+            return results
+
+        with transaction.atomic():
+            documents = (
+                ProjectDocument.objects.select_for_update(of=("self",))
+                .filter(pk__in=document_ids)
+                .select_related(
+                    "project",
+                    "project__business_area",
+                    "project__business_area__leader",
+                    "project__business_area__division",
+                    "project__business_area__division__director",
+                )
+                .prefetch_related(
+                    Prefetch(
+                        "project__members",
+                        queryset=ProjectMember.objects.select_related("user"),
+                    )
+                )
+                .in_bulk()
+            )
 
-        for document in documents:
-            try:
-                if stage == 1:
-                    ApprovalService.approve_stage_one(document, approver)
-                elif stage == 2:
-                    ApprovalService.approve_stage_two(document, approver)
-                elif stage == 3:
-                    ApprovalService.approve_stage_three(document, approver)
-                else:
-                    raise ValidationError(f"Invalid stage: {stage}")
-
-                results["approved"].append(document.pk)
-            except (PermissionDenied, ValidationError) as e:
-                results["failed"].append(
-                    {
-                        "document_id": document.pk,
-                        "error": str(e),
-                    }
+            approved = []
+            for pk in document_ids:
+                document = documents.get(pk)
+                error = (
+                    ApprovalService._bulk_check(document, approver, stage)
+                    if document
+                    else f"Document {pk} not found"
                 )
+                if error:
+                    results["failed"].append({"document_id": pk, "error": error})
+                    continue
+
+                setattr(document, APPROVAL_STAGES[stage]["grants"], True)
+                if stage == 3:
+                    document.status = ProjectDocument.StatusChoices.APPROVED
+                approved.append(document)
+                results["approved"].append(pk)
+
+            if not approved:
+                return results
+
+            settings.LOGGER.info(
+                f"{approver} is approving {len(approved)} documents at stage {stage}"
+            )
+
+            # bulk_update skips auto_now and the post_save signals
+            now = timezone.now()
+            fields = [APPROVAL_STAGES[stage]["grants"], "updated_at"]
+            if stage == 3:
+                fields.append("status")
+            for document in approved:
+                document.updated_at = now
+            ProjectDocument.objects.bulk_update(approved, fields)
+
+            project_ids = list({document.project_id for document in approved})
+            if stage == 3:
+                transaction.on_commit(
+                    lambda: AnnualReportFragmentService.invalidate(PROJECT, project_ids)
+                )
+
+            # Imported here as the dashboard counts build on this package
+            from users.services.dashboard_count_service import DashboardCountService
+
+            DashboardCountService.invalidate_projects(project_ids)
+
+            NotificationService.notify_documents_approved_digest(
+                approved, approver, stage
+            )
 
         return results
 
+    @staticmethod
+    def _bulk_check(document, approver, stage):
+        """
+        Check a document can be approved at a stage, using only loaded data
+
+        Returns:
+            str: Why it can't, or None if it can
+        """
+        for number, field in enumerate(APPROVAL_STAGES[stage]["requires"], 1):
+            if not getattr(document, field):
+                return f"Stage {number} approval must be granted first"
+
+        business_area = document.project.business_area
+        if stage == 1:
+            allowed = any(
+                member.user_id == approver.pk and member.is_leader
+                for member in document.project.members.all()
+            )
+        elif stage == 2:
+            allowed = (
+                business_area is not None and business_area.leader_id == approver.pk
+            )
+        else:
+            allowed = (
+                business_area is not None
+                and business_area.division is not None
+                and business_area.division.director_id == approver.pk
+            )
+
+        if not allowed:
+            return f"User not authorized to approve at stage {stage}"
+        return None
+
     @staticmethod
     def _can_approve_stage_one(document, user):
         """Check if user can approve at stage 1"""
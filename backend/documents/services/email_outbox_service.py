@@ -0,0 +1,219 @@
+"""
+Email outbox service - Queued email delivered by a background worker
+"""
+
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from config.helpers import build_html_email
+
+from ..models import OutboundEmail
+
+
+class EmailOutboxService:
+    """Business logic for the outbound email queue"""
+
+    @staticmethod
+    def enqueue(recipient_email, subject, html_content, from_email=None):
+        """
+        Queue an email for the worker to send
+
+        Args:
+            recipient_email: List of recipient email addresses
+            subject: Email subject line
+            html_content: Rendered HTML body
+            from_email: Sender email (defaults to settings.DEFAULT_FROM_EMAIL)
+
+        Returns:
+            OutboundEmail instance
+        """
+        message = OutboundEmail.objects.create(
+            recipients=list(recipient_email),
+            subject=subject,
+            html_content=html_content,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        )
+        settings.LOGGER.info(
+            f"Queued email {message.pk}: {subject} to {', '.join(message.recipients)}"
+        )
+        return message
+
+    @staticmethod
+    def get_worker_name():
+        """Identifier recorded on messages claimed by this process"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def claim_batch(worker_name=None, limit=None):
+        """
+        Atomically claim the oldest messages that are due
+
+        Uses SKIP LOCKED so several workers can poll the same table.
+
+        Args:
+            worker_name: Identifier of the claiming worker
+            limit: Maximum messages to claim (defaults to EMAIL_BATCH_SIZE)
+
+        Returns:
+            list: OutboundEmail instances in the sending state
+        """
+        limit = limit or settings.EMAIL_BATCH_SIZE
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=OutboundEmail.StatusChoices.QUEUED,
+                    next_attempt_at__lte=now,
+                )
+                .order_by("next_attempt_at", "pk")[:limit]
+            )
+            if not messages:
+                return []
+
+            OutboundEmail.objects.filter(pk__in=[m.pk for m in messages]).update(
+                status=OutboundEmail.StatusChoices.SENDING,
+                worker=worker_name or EmailOutboxService.get_worker_name(),
+                claimed_at=now,
+                updated_at=now,
+            )
+        for message in messages:
+            message.status = OutboundEmail.StatusChoices.SENDING
+        return messages
+
+    @staticmethod
+    def send_batch(messages):
+        """
+        Send claimed messages over a single mail connection
+
+        Each message is marked sent or scheduled for retry on its own, so one
+        bad address doesn't fail the batch. If the connection can't be opened
+        at all, every message is retried.
+
+        Args:
+            messages: OutboundEmail instances in the sending state
+
+        Returns:
+            dict: Counts of "sent", "retrying" and "failed" messages
+        """
+        results = {"sent": 0, "retrying": 0, "failed": 0}
+        if not messages:
+            return results
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            settings.LOGGER.error(f"Could not connect to the mail server: {e}")
+            for message in messages:
+                results[EmailOutboxService._record_failure(message, e)] += 1
+            return results
+
+        try:
+            for message in messages:
+                try:
+                    build_html_email(
+                        message.recipients,
+                        message.subject,
+                        message.html_content,
+                        from_email=message.from_email,
+                        connection=connection,
+                    ).send()
+                except Exception as e:
+                    settings.LOGGER.error(f"Email {message.pk} failed: {e}")
+                    results[EmailOutboxService._record_failure(message, e)] += 1
+                else:
+                    EmailOutboxService._record_sent(message)
+                    results["sent"] += 1
+        finally:
+            connection.close()
+
+        settings.LOGGER.info(
+            f"Email batch: {results['sent']} sent, {results['retrying']} "
+            f"retrying, {results['failed']} failed"
+        )
+        return results
+
+    @staticmethod
+    def get_retry_delay(attempts):
+        """
+        Backoff before the next attempt, doubling after each failure
+
+        Args:
+            attempts: Number of attempts made so far
+
+        Returns:
+            timedelta
+        """
+        seconds = settings.EMAIL_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0)
+        return timedelta(seconds=min(seconds, settings.EMAIL_RETRY_MAX_DELAY))
+
+    @staticmethod
+    def _record_sent(message):
+        now = timezone.now()
+        message.status = OutboundEmail.StatusChoices.SENT
+        message.attempts += 1
+        message.sent_at = now
+        message.last_error = None
+        OutboundEmail.objects.filter(pk=message.pk).update(
+            status=message.status,
+            attempts=message.attempts,
+            sent_at=now,
+            last_error=None,
+            updated_at=now,
+        )
+
+    @staticmethod
+    def _record_failure(message, error):
+        """Schedule a retry, or fail the message once out of attempts"""
+        now = timezone.now()
+        message.attempts += 1
+        message.last_error = str(error)
+        if message.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            message.status = OutboundEmail.StatusChoices.FAILED
+            outcome = "failed"
+        else:
+            message.status = OutboundEmail.StatusChoices.QUEUED
+            message.next_attempt_at = now + EmailOutboxService.get_retry_delay(
+                message.attempts
+            )
+            outcome = "retrying"
+        OutboundEmail.objects.filter(pk=message.pk).update(
+            status=message.status,
+            attempts=message.attempts,
+            last_error=message.last_error,
+            next_attempt_at=message.next_attempt_at,
+            updated_at=now,
+        )
+        return outcome
+
+    @staticmethod
+    def requeue_stale_messages(max_age=None):
+        """
+        Return messages claimed by a worker that appears to have died
+
+        They may already have gone out, so a crash can cause a duplicate,
+        but never a lost notification.
+
+        Args:
+            max_age: timedelta after which a sending message is considered stale
+
+        Returns:
+            int: Number of messages requeued
+        """
+        max_age = max_age or timedelta(seconds=settings.EMAIL_SENDING_STALE_AFTER)
+        now = timezone.now()
+        return OutboundEmail.objects.filter(
+            status=OutboundEmail.StatusChoices.SENDING,
+            claimed_at__lt=now - max_age,
+        ).update(
+            status=OutboundEmail.StatusChoices.QUEUED,
+            next_attempt_at=now,
+            updated_at=now,
+        )
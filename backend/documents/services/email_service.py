@@ -6,9 +6,10 @@ making it easy to swap email providers or modify email logic.
 """
 
 from django.conf import settings
-from django.template.loader import render_to_string
 
-from config.helpers import send_email_with_embedded_image
+from config.email_assets import EmailAssetRegistry
+
+from .email_outbox_service import EmailOutboxService
 
 
 class EmailService:
@@ -23,7 +24,7 @@ class EmailService:
         from_email: str = None,
     ) -> bool:
         """
-        Send email using HTML template
+        Render an HTML template and queue it for the email worker
 
         Args:
             template_name: Template file name (e.g., 'document_approved_email.html')
@@ -33,32 +34,30 @@ class EmailService:
             from_email: Sender email (defaults to settings.DEFAULT_FROM_EMAIL)
 
         Returns:
-            bool: True if email sent successfully
+            bool: True if email was queued
 
         Raises:
-            EmailSendError: If email fails to send
+            EmailSendError: If email fails to queue
         """
         if from_email is None:
             from_email = settings.DEFAULT_FROM_EMAIL
 
         # Render template
         template_path = f"./email_templates/{template_name}"
-        html_content = render_to_string(template_path, context)
+        html_content = EmailAssetRegistry.render(template_path, context)
 
-        # Send email
+        # Queue email; run_email_worker delivers it
         try:
-            send_email_with_embedded_image(
+            EmailOutboxService.enqueue(
                 recipient_email=recipient_email,
                 subject=subject,
                 html_content=html_content,
-            )
-            settings.LOGGER.info(
-                f"Email sent: {subject} to {', '.join(recipient_email)}"
+                from_email=from_email,
             )
             return True
         except Exception as e:
-            settings.LOGGER.error(f"Email send failed: {e}")
-            raise EmailSendError(f"Failed to send email: {e}")
+            settings.LOGGER.error(f"Email queueing failed: {e}")
+            raise EmailSendError(f"Failed to queue email: {e}")
 
     @staticmethod
     def send_document_notification(
@@ -69,7 +68,7 @@ class EmailService:
         additional_context: dict = None,
     ):
         """
-        Send document-related notification
+        Queue a document-related notification for each recipient
 
         Args:
             notification_type: Type of notification (approved, recalled, etc.)
@@ -107,7 +106,7 @@ class EmailService:
             **(additional_context or {}),
         }
 
-        # Send to each recipient
+        # Queue one email per recipient
         for recipient in recipients:
             context["recipient_name"] = recipient["name"]
             context["user_kind"] = recipient.get("kind", "User")
@@ -2,8 +2,19 @@
 Notification service - Business logic for document notifications
 """
 
+from django.conf import settings
+
 from .email_service import EmailService
 
+# Frontend route segment for each document kind
+DOCUMENT_URL_KINDS = {
+    "concept": "concept",
+    "projectplan": "project",
+    "progressreport": "progress",
+    "studentreport": "student",
+    "projectclosure": "closure",
+}
+
 
 class NotificationService:
     """Business logic for document notifications"""
@@ -184,6 +195,71 @@ class NotificationService:
                 },
             )
 
+    @staticmethod
+    def notify_documents_approved_digest(documents, approver, stage):
+        """
+        Send each recipient one email listing every document approved
+
+        Recipients are those the per-document notifications would reach:
+        project leads for stages 1 and 2, and the team, business area
+        leader and director once approved at stage 3.
+
+        Args:
+            documents: Approved document instances, with projects, members
+                and business areas loaded
+            approver: User who approved the documents
+            stage: Approval stage (1, 2, or 3)
+        """
+        digests = {}
+        for document in documents:
+            if stage == 3:
+                recipients = NotificationService._get_document_recipients(
+                    document
+                ) + NotificationService._get_directorate_recipients(document)
+            else:
+                recipients = NotificationService._get_approver_recipients(document)
+
+            for recipient in recipients:
+                digest = digests.setdefault(
+                    recipient["email"], {**recipient, "documents": {}}
+                )
+                digest["documents"].setdefault(
+                    document.pk,
+                    {
+                        "project_title": document.project.title,
+                        "kind": document.get_kind_display(),
+                        "url": (
+                            f"{settings.SITE_URL}/projects/{document.project_id}/"
+                            f"{DOCUMENT_URL_KINDS.get(document.kind, document.kind)}"
+                        ),
+                    },
+                )
+
+        subject = (
+            "Documents Approved"
+            if stage == 3
+            else f"Documents Approved at Stage {stage}"
+        )
+        for email, digest in digests.items():
+            EmailService.send_template_email(
+                template_name="document_approval_digest_email.html",
+                recipient_email=[email],
+                subject=subject,
+                context={
+                    "recipient_name": digest["name"],
+                    "user_kind": digest.get("kind", "User"),
+                    "actioning_user": approver,
+                    "actioning_user_email": approver.email,
+                    "stage": stage,
+                    "documents": list(digest["documents"].values()),
+                    "email_subject": subject,
+                },
+            )
+
+        settings.LOGGER.info(
+            f"Sent {len(digests)} approval digests for {len(documents)} documents"
+        )
+
     @staticmethod
     def notify_comment_mention(document, comment, mentioned_user, commenter):
         """
@@ -385,8 +461,10 @@ class NotificationService:
         # Logic depends on document approval stage
         # This is a placeholder - actual logic depends on approval workflow
         if hasattr(document, "project") and document.project:
-            # Stage 1: Project team leaders
-            for member in document.project.members.filter(is_leader=True):
+            # Stage 1: Project team leaders (filtered here so a prefetch is used)
+            for member in document.project.members.all():
+                if not member.is_leader:
+                    continue
                 recipients.append(
                     {
                         "name": member.user.get_full_name(),
@@ -0,0 +1,248 @@
+"""
+PDF cache service - Reuse stored PDFs when the rendered HTML is unchanged
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.base import ContentFile
+from rest_framework.exceptions import ValidationError
+
+from ..models import AnnualReport
+from .pdf_service import PDFService
+from .prince_service import PDFGenerationCancelled, PrinceService
+
+# Bump to invalidate every cached PDF, e.g. after a Prince upgrade
+RENDER_CACHE_VERSION = 1
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+
+@lru_cache(maxsize=1)
+def _stylesheet_fingerprint():
+    """Hash of the PDF stylesheets, which the HTML references but doesn't inline"""
+    digest = hashlib.sha256()
+    for path in sorted(ASSETS_DIR.glob("*.css")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class PDFCacheService:
+    """
+    Content-addressed cache for rendered PDFs
+
+    Each stored ProjectDocumentPDF/AnnualReportPDF records a hash of the HTML it
+    was rendered from. Any change to the details, members or images shown in the
+    PDF changes the HTML, so a matching hash means the stored file is current
+    and Prince can be skipped.
+    """
+
+    @staticmethod
+    def compute_render_hash(html_content):
+        """
+        Hash rendered HTML together with the cache version and stylesheets
+
+        Args:
+            html_content: HTML string passed to Prince
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{RENDER_CACHE_VERSION}:".encode("utf-8"))
+        digest.update(_stylesheet_fingerprint().encode("utf-8"))
+        digest.update(html_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_stored_pdf(obj):
+        """
+        Get the stored PDF for a document or report, if it has a file
+
+        Args:
+            obj: ProjectDocument or AnnualReport instance
+
+        Returns:
+            ProjectDocumentPDF/AnnualReportPDF instance or None
+        """
+        try:
+            pdf = obj.pdf
+        except ObjectDoesNotExist:
+            return None
+        return pdf if pdf and pdf.file else None
+
+    @staticmethod
+    def get_document_pdf(document, cancel_check=None):
+        """
+        Get an up-to-date PDF for a project document, rendering only on a miss
+
+        Args:
+            document: ProjectDocument instance
+            cancel_check: Optional callable returning True if the render
+                should be abandoned
+
+        Returns:
+            tuple: (ProjectDocumentPDF, cache_hit)
+
+        Raises:
+            ValidationError: If PDF generation fails
+            PDFGenerationCancelled: If cancel_check reported a cancellation
+        """
+        try:
+            html_content = PDFService.render_document_html(document)
+        except Exception as e:
+            settings.LOGGER.error(f"PDF generation failed for document {document}: {e}")
+            raise ValidationError(f"Failed to generate PDF: {e}")
+
+        return PDFCacheService._get_or_render(
+            document,
+            html_content,
+            f"{document.kind}_{document.pk}.pdf",
+            cancel_check,
+        )
+
+    @staticmethod
+    def get_annual_report_pdf(report, cancel_check=None, user=None):
+        """
+        Get an up-to-date PDF for an annual report, rendering only on a miss
+
+        Args:
+            report: AnnualReport instance
+            cancel_check: Optional callable returning True if the render
+                should be abandoned
+            user: User recorded as creator of a newly rendered PDF
+
+        Returns:
+            tuple: (AnnualReportPDF, cache_hit)
+
+        Raises:
+            ValidationError: If PDF generation fails
+            PDFGenerationCancelled: If cancel_check reported a cancellation
+        """
+        try:
+            html_content = PDFService.render_annual_report_html(report)
+        except Exception as e:
+            settings.LOGGER.error(f"PDF generation failed for report {report}: {e}")
+            raise ValidationError(f"Failed to generate PDF: {e}")
+
+        return PDFCacheService._get_or_render(
+            report,
+            html_content,
+            f"annual_report_{report.year}.pdf",
+            cancel_check,
+            user=user,
+        )
+
+    @staticmethod
+    def refresh_document_pdfs(documents):
+        """
+        Bring the stored PDFs for many project documents up to date
+
+        HTML is rendered and hashed one document at a time, then the Prince
+        renders for every cache miss run concurrently on the Prince pool.
+
+        Args:
+            documents: Iterable of ProjectDocument instances
+
+        Returns:
+            dict: Counts of "rendered" and "cached" documents, and "failed"
+            as a list of (document, error) tuples
+        """
+        results = {"rendered": 0, "cached": 0, "failed": []}
+        misses = []
+        for document in documents:
+            try:
+                html_content = PDFService.render_document_html(document)
+            except Exception as e:
+                results["failed"].append((document, e))
+                continue
+
+            render_hash = PDFCacheService.compute_render_hash(html_content)
+            stored = PDFCacheService.get_stored_pdf(document)
+            if stored and stored.render_hash == render_hash:
+                results["cached"] += 1
+            else:
+                misses.append((document, html_content, render_hash))
+
+        rendered = PrinceService.render_many(html for _, html, _ in misses)
+        for (document, _, render_hash), pdf_content in zip(misses, rendered):
+            if isinstance(pdf_content, Exception):
+                results["failed"].append((document, pdf_content))
+                continue
+            PDFCacheService.store_pdf(
+                document,
+                ContentFile(pdf_content, name=f"{document.kind}_{document.pk}.pdf"),
+                render_hash,
+            )
+            results["rendered"] += 1
+
+        return results
+
+    @staticmethod
+    def _get_or_render(obj, html_content, filename, cancel_check, user=None):
+        render_hash = PDFCacheService.compute_render_hash(html_content)
+
+        stored = PDFCacheService.get_stored_pdf(obj)
+        if stored and stored.render_hash == render_hash:
+            settings.LOGGER.info(f"PDF cache hit for {obj}")
+            return stored, True
+
+        settings.LOGGER.info(f"PDF cache miss for {obj}, rendering")
+        pdf_content = PDFService._html_to_pdf(html_content, cancel_check=cancel_check)
+
+        if cancel_check and cancel_check():
+            raise PDFGenerationCancelled("PDF generation cancelled")
+
+        stored = PDFCacheService.store_pdf(
+            obj, ContentFile(pdf_content, name=filename), render_hash, user=user
+        )
+        return stored, False
+
+    @staticmethod
+    def store_pdf(obj, pdf_file, render_hash, user=None):
+        """
+        Save a rendered PDF against its document or report
+
+        Replaces (and deletes from storage) any previously stored file.
+
+        Args:
+            obj: ProjectDocument or AnnualReport instance
+            pdf_file: ContentFile with the PDF bytes
+            render_hash: Hash of the HTML the PDF was rendered from
+            user: User recorded as creator (annual reports only)
+
+        Returns:
+            ProjectDocumentPDF/AnnualReportPDF instance
+        """
+        from medias.models import AnnualReportPDF, ProjectDocumentPDF
+
+        previous = PDFCacheService.get_stored_pdf(obj)
+        previous_name = previous.file.name if previous else None
+
+        if isinstance(obj, AnnualReport):
+            defaults = {"file": pdf_file, "render_hash": render_hash}
+            if user:
+                defaults["creator"] = user
+            stored, _ = AnnualReportPDF.objects.update_or_create(
+                report=obj, defaults=defaults
+            )
+        else:
+            stored, _ = ProjectDocumentPDF.objects.update_or_create(
+                document=obj,
+                defaults={
+                    "file": pdf_file,
+                    "render_hash": render_hash,
+                    "project": obj.project,
+                },
+            )
+
+        if previous_name and previous_name != stored.file.name:
+            stored.file.storage.delete(previous_name)
+
+        # Keep the reverse one-to-one cache in step for callers holding obj
+        obj.pdf = stored
+        return stored
@@ -0,0 +1,339 @@
+"""
+PDF job service - Queued PDF rendering processed by a background worker
+"""
+
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+
+from ..models import AnnualReport, PDFRenderJob
+from .pdf_cache_service import PDFCacheService
+from .pdf_service import PDFService
+from .prince_service import PDFGenerationCancelled
+
+
+class PDFJobService:
+    """Business logic for the PDF render job queue"""
+
+    @staticmethod
+    def enqueue_document(document, user=None):
+        """
+        Queue a PDF render for a project document
+
+        Args:
+            document: ProjectDocument instance
+            user: User requesting the render
+
+        Returns:
+            tuple: (PDFRenderJob, created) - created is False when an
+            identical job was already queued or running
+        """
+        return PDFJobService._enqueue(
+            PDFRenderJob.TargetChoices.PROJECTDOCUMENT, document, user
+        )
+
+    @staticmethod
+    def enqueue_annual_report(report, user=None):
+        """
+        Queue a PDF render for an annual report
+
+        Args:
+            report: AnnualReport instance
+            user: User requesting the render
+
+        Returns:
+            tuple: (PDFRenderJob, created) - created is False when an
+            identical job was already queued or running
+        """
+        return PDFJobService._enqueue(
+            PDFRenderJob.TargetChoices.ANNUALREPORT, report, user
+        )
+
+    @staticmethod
+    def _enqueue(target, obj, user):
+        """
+        Create a job for obj unless one is already in flight
+
+        The partial unique constraints on PDFRenderJob guarantee that two
+        concurrent requests cannot both create a job for the same target.
+        """
+        lookup = PDFJobService._lookup_for(obj)
+
+        existing = PDFJobService.get_in_flight_job(obj)
+        if existing:
+            settings.LOGGER.info(f"Reusing in-flight PDF job {existing.pk} for {obj}")
+            return existing, False
+
+        try:
+            with transaction.atomic():
+                job = PDFRenderJob.objects.create(
+                    target=target,
+                    requested_by=user if user and user.is_authenticated else None,
+                    **lookup,
+                )
+                # In the same transaction, so a worker never claims the job
+                # while the flag still reads as cancelled
+                PDFService.mark_pdf_generation_started(obj)
+        except IntegrityError:
+            # Lost the race against another request for the same target
+            return PDFJobService.get_in_flight_job(obj), False
+
+        settings.LOGGER.info(f"Queued PDF job {job.pk} for {obj}")
+        return job, True
+
+    @staticmethod
+    def _lookup_for(obj):
+        if isinstance(obj, AnnualReport):
+            return {"report": obj}
+        return {"document": obj}
+
+    @staticmethod
+    def get_job(pk):
+        """
+        Get render job by ID
+
+        Args:
+            pk: Job primary key
+
+        Returns:
+            PDFRenderJob instance
+
+        Raises:
+            NotFound: If job doesn't exist
+        """
+        try:
+            return PDFRenderJob.objects.select_related("requested_by").get(pk=pk)
+        except PDFRenderJob.DoesNotExist:
+            raise NotFound(f"PDF render job {pk} not found")
+
+    @staticmethod
+    def get_in_flight_job(obj):
+        """
+        Get the queued or running job for a document or report, if any
+
+        Args:
+            obj: ProjectDocument or AnnualReport instance
+
+        Returns:
+            PDFRenderJob instance or None
+        """
+        return PDFRenderJob.objects.filter(
+            status__in=PDFRenderJob.IN_FLIGHT_STATUSES,
+            **PDFJobService._lookup_for(obj),
+        ).first()
+
+    @staticmethod
+    def get_latest_job(obj):
+        """
+        Get the most recent job for a document or report, if any
+
+        Args:
+            obj: ProjectDocument or AnnualReport instance
+
+        Returns:
+            PDFRenderJob instance or None
+        """
+        return (
+            PDFRenderJob.objects.filter(**PDFJobService._lookup_for(obj))
+            .order_by("-created_at", "-pk")
+            .first()
+        )
+
+    @staticmethod
+    def cancel_jobs_for(obj):
+        """
+        Cancel all in-flight jobs for a document or report
+
+        A running worker notices the status change on its next poll and
+        kills its Prince process.
+
+        Args:
+            obj: ProjectDocument or AnnualReport instance
+
+        Returns:
+            int: Number of jobs cancelled
+        """
+        cancelled = PDFRenderJob.objects.filter(
+            status__in=PDFRenderJob.IN_FLIGHT_STATUSES,
+            **PDFJobService._lookup_for(obj),
+        ).update(
+            status=PDFRenderJob.StatusChoices.CANCELLED,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        if cancelled:
+            settings.LOGGER.info(f"Cancelled {cancelled} PDF job(s) for {obj}")
+        return cancelled
+
+    @staticmethod
+    def get_worker_name():
+        """Identifier recorded on jobs claimed by this process"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def claim_next_job(worker_name=None):
+        """
+        Atomically claim the oldest queued job
+
+        Uses SKIP LOCKED so several workers can poll the same table.
+
+        Args:
+            worker_name: Identifier of the claiming worker
+
+        Returns:
+            PDFRenderJob instance or None if the queue is empty
+        """
+        with transaction.atomic():
+            job = (
+                PDFRenderJob.objects.select_for_update(skip_locked=True)
+                .filter(status=PDFRenderJob.StatusChoices.QUEUED)
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if job is None:
+                return None
+
+            job.status = PDFRenderJob.StatusChoices.RUNNING
+            job.worker = worker_name or PDFJobService.get_worker_name()
+            job.started_at = timezone.now()
+            job.progress = 5
+            job.save(
+                update_fields=[
+                    "status",
+                    "worker",
+                    "started_at",
+                    "progress",
+                    "updated_at",
+                ]
+            )
+        return job
+
+    @staticmethod
+    def is_cancelled(job):
+        """
+        Check whether a job has been cancelled since it was claimed
+
+        A job counts as cancelled if its own status changed, or if the target's
+        `pdf_generation_in_progress` flag was cleared by the cancel endpoints.
+
+        Args:
+            job: PDFRenderJob instance
+
+        Returns:
+            bool: True if the worker should stop
+        """
+        status = (
+            PDFRenderJob.objects.filter(pk=job.pk)
+            .values_list("status", flat=True)
+            .first()
+        )
+        if status != PDFRenderJob.StatusChoices.RUNNING:
+            return True
+
+        target = job.get_target_object()
+        in_progress = (
+            type(target)
+            .objects.filter(pk=target.pk)
+            .values_list("pdf_generation_in_progress", flat=True)
+            .first()
+        )
+        return not in_progress
+
+    @staticmethod
+    def _set_progress(job, progress):
+        job.progress = progress
+        PDFRenderJob.objects.filter(pk=job.pk).update(
+            progress=progress, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def _finish(job, status, error=None):
+        job.status = status
+        job.error = error
+        job.finished_at = timezone.now()
+        if status == PDFRenderJob.StatusChoices.COMPLETED:
+            job.progress = 100
+        # Never overwrite a cancellation recorded by another process
+        PDFRenderJob.objects.filter(
+            pk=job.pk, status=PDFRenderJob.StatusChoices.RUNNING
+        ).update(
+            status=job.status,
+            error=job.error,
+            finished_at=job.finished_at,
+            progress=job.progress,
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def run_job(job):
+        """
+        Render the PDF for a claimed job and store it
+
+        Args:
+            job: PDFRenderJob instance in the running state
+
+        Returns:
+            PDFRenderJob: The job with its final status
+        """
+        target = job.get_target_object()
+        settings.LOGGER.info(f"Worker rendering PDF job {job.pk} for {target}")
+
+        def cancel_check():
+            return PDFJobService.is_cancelled(job)
+
+        try:
+            PDFJobService._set_progress(job, 10)
+            # The cache skips Prince if the stored PDF matches the current HTML
+            if job.target == PDFRenderJob.TargetChoices.ANNUALREPORT:
+                PDFCacheService.get_annual_report_pdf(
+                    target, cancel_check=cancel_check, user=job.requested_by
+                )
+            else:
+                PDFCacheService.get_document_pdf(target, cancel_check=cancel_check)
+        except PDFGenerationCancelled:
+            settings.LOGGER.info(f"PDF job {job.pk} cancelled")
+            PDFJobService._finish(job, PDFRenderJob.StatusChoices.CANCELLED)
+            return job
+        except Exception as e:
+            settings.LOGGER.error(f"PDF job {job.pk} failed: {e}")
+            PDFJobService._finish(job, PDFRenderJob.StatusChoices.FAILED, str(e))
+            PDFService.mark_pdf_generation_complete(target)
+            return job
+
+        PDFJobService._finish(job, PDFRenderJob.StatusChoices.COMPLETED)
+        PDFService.mark_pdf_generation_complete(target)
+        settings.LOGGER.info(f"PDF job {job.pk} completed")
+        return job
+
+    @staticmethod
+    def fail_stale_jobs(max_age=None):
+        """
+        Fail running jobs whose worker appears to have died
+
+        Args:
+            max_age: timedelta after which a running job is considered stale
+
+        Returns:
+            int: Number of jobs failed
+        """
+        max_age = max_age or timedelta(seconds=settings.PDF_JOB_STALE_AFTER)
+        cutoff = timezone.now() - max_age
+        stale_jobs = list(
+            PDFRenderJob.objects.filter(
+                status=PDFRenderJob.StatusChoices.RUNNING,
+                started_at__lt=cutoff,
+            ).select_related("document", "report")
+        )
+        for job in stale_jobs:
+            PDFJobService._finish(
+                job,
+                PDFRenderJob.StatusChoices.FAILED,
+                "Worker stopped responding",
+            )
+            PDFService.mark_pdf_generation_complete(job.get_target_object())
+        return len(stale_jobs)
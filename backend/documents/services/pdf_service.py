@@ -2,151 +2,153 @@
 PDF service - Document PDF generation using Prince XML
 """
 
-import os
-import subprocess
-import tempfile
-
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.template.loader import render_to_string
 from rest_framework.exceptions import ValidationError
 
+from .prince_service import PDFGenerationCancelled, PrinceService
+
 
 class PDFService:
     """PDF generation service using Prince XML"""
 
     @staticmethod
-    def generate_document_pdf(document, template_name="project_document.html"):
+    def generate_document_pdf(
+        document, template_name="project_document.html", cancel_check=None
+    ):
         """
         Generate PDF for project document
 
         Args:
             document: ProjectDocument instance
             template_name: HTML template to use
+            cancel_check: Optional callable returning True if the render
+                should be abandoned
 
         Returns:
             ContentFile: Generated PDF file
 
         Raises:
             ValidationError: If PDF generation fails
+            PDFGenerationCancelled: If cancel_check reported a cancellation
         """
         settings.LOGGER.info(f"Generating PDF for document {document}")
 
         try:
-            # Build context
-            context = PDFService._build_document_context(document)
-
             # Render HTML
-            html_content = render_to_string(f"templates/{template_name}", context)
+            html_content = PDFService.render_document_html(document, template_name)
 
             # Generate PDF using Prince
-            pdf_content = PDFService._html_to_pdf(html_content)
+            pdf_content = PDFService._html_to_pdf(
+                html_content, cancel_check=cancel_check
+            )
 
             # Create ContentFile
             filename = f"{document.kind}_{document.pk}.pdf"
             return ContentFile(pdf_content, name=filename)
 
+        except PDFGenerationCancelled:
+            raise
         except Exception as e:
             settings.LOGGER.error(f"PDF generation failed for document {document}: {e}")
             raise ValidationError(f"Failed to generate PDF: {e}")
 
     @staticmethod
-    def generate_annual_report_pdf(report, template_name="annual_report.html"):
+    def generate_annual_report_pdf(
+        report, template_name="annual_report.html", cancel_check=None
+    ):
         """
         Generate PDF for annual report
 
         Args:
             report: AnnualReport instance
             template_name: HTML template to use
+            cancel_check: Optional callable returning True if the render
+                should be abandoned
 
         Returns:
             ContentFile: Generated PDF file
 
         Raises:
             ValidationError: If PDF generation fails
+            PDFGenerationCancelled: If cancel_check reported a cancellation
         """
         settings.LOGGER.info(f"Generating PDF for annual report {report}")
 
         try:
-            # Build context
-            context = PDFService._build_annual_report_context(report)
-
             # Render HTML
-            html_content = render_to_string(f"templates/{template_name}", context)
+            html_content = PDFService.render_annual_report_html(report, template_name)
 
             # Generate PDF using Prince
-            pdf_content = PDFService._html_to_pdf(html_content)
+            pdf_content = PDFService._html_to_pdf(
+                html_content, cancel_check=cancel_check
+            )
 
             # Create ContentFile
             filename = f"annual_report_{report.year}.pdf"
             return ContentFile(pdf_content, name=filename)
 
+        except PDFGenerationCancelled:
+            raise
         except Exception as e:
             settings.LOGGER.error(f"PDF generation failed for report {report}: {e}")
             raise ValidationError(f"Failed to generate PDF: {e}")
 
     @staticmethod
-    def _html_to_pdf(html_content):
+    def render_document_html(document, template_name="project_document.html"):
+        """
+        Render the HTML Prince converts for a project document
+
+        Args:
+            document: ProjectDocument instance
+            template_name: HTML template to use
+
+        Returns:
+            str: Rendered HTML
+        """
+        context = PDFService._build_document_context(document)
+        return render_to_string(template_name, context)
+
+    @staticmethod
+    def render_annual_report_html(report, template_name="annual_report.html"):
+        """
+        Render the HTML Prince converts for an annual report
+
+        Args:
+            report: AnnualReport instance
+            template_name: HTML template to use
+
+        Returns:
+            str: Rendered HTML
+        """
+        context = PDFService._build_annual_report_context(report)
+        return render_to_string(template_name, context)
+
+    @staticmethod
+    def _html_to_pdf(html_content, cancel_check=None):
         """
         Convert HTML to PDF using Prince XML
 
+        Renders run on the bounded Prince pool, so this may wait for a free
+        worker when several renders are in progress.
+
         Args:
             html_content: HTML string
+            cancel_check: Optional callable polled while waiting and while
+                Prince runs; when it returns True the Prince process is killed
 
         Returns:
             bytes: PDF content
 
         Raises:
             ValidationError: If conversion fails
+            PDFGenerationCancelled: If cancel_check reported a cancellation
         """
         try:
-            # Create temporary files
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".html", delete=False, encoding="utf-8"
-            ) as html_file:
-                html_file.write(html_content)
-                html_path = html_file.name
-
-            with tempfile.NamedTemporaryFile(
-                mode="wb", suffix=".pdf", delete=False
-            ) as pdf_file:
-                pdf_path = pdf_file.name
-
-            try:
-                # Run Prince XML
-                prince_cmd = [
-                    "prince",
-                    html_path,
-                    "-o",
-                    pdf_path,
-                    "--javascript",
-                ]
-
-                result = subprocess.run(
-                    prince_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,  # 5 minute timeout
-                )
-
-                if result.returncode != 0:
-                    raise ValidationError(f"Prince XML failed: {result.stderr}")
-
-                # Read PDF content
-                with open(pdf_path, "rb") as f:
-                    pdf_content = f.read()
-
-                return pdf_content
-
-            finally:
-                # Clean up temporary files
-                if os.path.exists(html_path):
-                    os.unlink(html_path)
-                if os.path.exists(pdf_path):
-                    os.unlink(pdf_path)
-
-        except subprocess.TimeoutExpired:
-            raise ValidationError("PDF generation timed out")
+            return PrinceService.render(html_content, cancel_check=cancel_check)
+        except (ValidationError, PDFGenerationCancelled):
+            raise
         except Exception as e:
             raise ValidationError(f"PDF generation error: {e}")
 
@@ -201,6 +203,7 @@ class PDFService:
             dict: Template context
         """
         from ..models import ProjectDocument
+        from .annual_report_fragment_service import AnnualReportFragmentService
 
         # Get all approved documents for the report year
         progress_reports = (
@@ -238,6 +241,9 @@ class PDFService:
             "progress_reports": progress_reports,
             "student_reports": student_reports,
         }
+        # Per-project and per-business-area sections come from the fragment
+        # cache, so only sections whose data changed are re-rendered
+        context.update(AnnualReportFragmentService.build_sections(report))
 
         return context
 
@@ -252,7 +258,7 @@ class PDFService:
         settings.LOGGER.info(f"Cancelling PDF generation for {document}")
 
         document.pdf_generation_in_progress = False
-        document.save()
+        document.save(update_fields=["pdf_generation_in_progress"])
 
     @staticmethod
     def mark_pdf_generation_started(document):
@@ -263,7 +269,7 @@ class PDFService:
             document: ProjectDocument or AnnualReport instance
         """
         document.pdf_generation_in_progress = True
-        document.save()
+        document.save(update_fields=["pdf_generation_in_progress"])
 
     @staticmethod
     def mark_pdf_generation_complete(document):
@@ -274,4 +280,5 @@ class PDFService:
             document: ProjectDocument or AnnualReport instance
         """
         document.pdf_generation_in_progress = False
-        document.save()
+        # Only the flag: a worker's copy may predate edits made during the render
+        document.save(update_fields=["pdf_generation_in_progress"])
@@ -0,0 +1,270 @@
+"""
+Pending action service - Documents awaiting a user's approval, in one query
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+
+from projects.models import Project, ProjectMember
+
+from ..models import ProjectDocument
+from ..serializers import TinyProjectDocumentSerializer
+
+User = get_user_model()
+
+# Role buckets, in the order they're reported
+ROLES = ("team", "lead", "ba", "directorate")
+
+DIRECTORATE_NAME = "Directorate"
+
+# Everything TinyProjectDocumentSerializer reads
+PENDING_DOCUMENT_RELATIONS = (
+    "project",
+    "project__business_area",
+    "project__business_area__image",
+    "project__business_area__division",
+    "project__business_area__division__director",
+    "project__business_area__division__approver",
+    "project__business_area__leader",
+    "project__business_area__caretaker",
+    "project__business_area__finance_admin",
+    "project__business_area__data_custodian",
+    "project__image",
+    "project__image__uploader",
+    "pdf",
+    "pdf__document",
+    "pdf__project",
+    "creator",
+    "modifier",
+)
+
+
+class PendingActionService:
+    """
+    Finds the documents waiting on a set of users, by the role they act in
+
+    A document is pending for:
+        team: a non-leading member, until the project lead approves
+        lead: the project lead, until they approve
+        ba: the business area leader, once the project lead has approved
+        directorate: Directorate staff and superusers, once the business
+            area leader has approved
+
+    All four buckets come from one query over unapproved documents of
+    active projects, annotated with the user each role falls to, so a
+    user and all of their caretakees are covered in a single pass.
+    """
+
+    @staticmethod
+    def get_pending(user_ids, directorate=None):
+        """
+        Get the documents pending action from any of the given users
+
+        Args:
+            user_ids: IDs of the users acting, e.g. a user and their caretakees
+            directorate: Whether to include the directorate bucket; None
+                includes it if any of the users is Directorate staff or a
+                superuser
+
+        Returns:
+            dict: "documents", a list of ProjectDocument objects, and for each
+                role a dict of document ID to the ID of the user it's
+                pending for (None for directorate), in document order
+        """
+        pending = {"documents": []}
+        pending.update({role: {} for role in ROLES})
+        user_ids = list(user_ids)
+        if not user_ids:
+            return pending
+
+        documents = (
+            PendingActionService._pending_queryset(user_ids, directorate)
+            .select_related(*PENDING_DOCUMENT_RELATIONS)
+            .prefetch_related(
+                "project__business_area__division__directorate_email_list"
+            )
+            .order_by("pk")
+        )
+
+        for document in documents:
+            pending["documents"].append(document)
+            if document.pending_team:
+                pending["team"][document.pk] = document.team_user_id
+            if document.pending_lead:
+                pending["lead"][document.pk] = document.lead_user_id
+            if document.pending_ba:
+                pending["ba"][document.pk] = document.ba_user_id
+            if document.pending_directorate:
+                pending["directorate"][document.pk] = None
+        return pending
+
+    @staticmethod
+    def count_pending(user_ids, directorate=None):
+        """
+        Count the documents pending action from any of the given users
+
+        Args:
+            user_ids: IDs of the users acting
+            directorate: As for get_pending
+
+        Returns:
+            dict: "all" and a count per role
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {"all": 0, **{role: 0 for role in ROLES}}
+
+        return PendingActionService._pending_queryset(user_ids, directorate).aggregate(
+            all=Count("pk"),
+            **{
+                role: Count("pk", filter=Q(**{f"pending_{role}": True}))
+                for role in ROLES
+            },
+        )
+
+    @staticmethod
+    def serialize(pending, request, users=None, compact=False):
+        """
+        Serialize pending documents by role, each document once
+
+        Args:
+            pending: Result of get_pending
+            request: Request, for the serializer context
+            users: Dict of user ID to User; when given, each bucket entry
+                gets a "for_user" with the details of whom it's pending for
+            compact: Return the documents once, under "documents", with each
+                bucket listing document IDs
+
+        Returns:
+            dict: "all" (or "documents" when compact) and one list per role
+        """
+        serialized = {
+            data["id"]: data
+            for data in TinyProjectDocumentSerializer(
+                pending["documents"], many=True, context={"request": request}
+            ).data
+        }
+
+        if compact:
+            data = {"documents": list(serialized.values())}
+            data.update({role: list(pending[role]) for role in ROLES})
+            return data
+
+        user_data = {}
+        if users is not None:
+            user_data = {
+                pk: PendingActionService._user_data(user) for pk, user in users.items()
+            }
+
+        data = {}
+        for role in ROLES:
+            if users is None:
+                data[role] = [serialized[pk] for pk in pending[role]]
+            else:
+                data[role] = [
+                    {**serialized[pk], "for_user": user_data.get(user_id)}
+                    for pk, user_id in pending[role].items()
+                ]
+
+        data["all"] = PendingActionService._all(data)
+        return data
+
+    @staticmethod
+    def _pending_queryset(user_ids, directorate):
+        """Pending documents, flagged with pending_<role> and the user acting"""
+        if directorate is None:
+            directorate_users = User.objects.filter(pk__in=user_ids).filter(
+                Q(is_superuser=True) | Q(work__business_area__name=DIRECTORATE_NAME)
+            )
+            is_directorate = Exists(directorate_users)
+        else:
+            is_directorate = Value(directorate, output_field=BooleanField())
+
+        return (
+            ProjectDocument.objects.exclude(
+                status=ProjectDocument.StatusChoices.APPROVED
+            )
+            .exclude(project__status__in=Project.CLOSED_ONLY)
+            .annotate(
+                team_user_id=PendingActionService._member_id(user_ids, False),
+                lead_user_id=PendingActionService._member_id(user_ids, True),
+                ba_user_id=F("project__business_area__leader_id"),
+                is_directorate=is_directorate,
+            )
+            .annotate(
+                pending_team=ExpressionWrapper(
+                    Q(project_lead_approval_granted=False, team_user_id__isnull=False),
+                    output_field=BooleanField(),
+                ),
+                pending_lead=ExpressionWrapper(
+                    Q(project_lead_approval_granted=False, lead_user_id__isnull=False),
+                    output_field=BooleanField(),
+                ),
+                pending_ba=ExpressionWrapper(
+                    Q(
+                        project_lead_approval_granted=True,
+                        business_area_lead_approval_granted=False,
+                        ba_user_id__in=user_ids,
+                    ),
+                    output_field=BooleanField(),
+                ),
+                pending_directorate=ExpressionWrapper(
+                    Q(
+                        business_area_lead_approval_granted=True,
+                        directorate_approval_granted=False,
+                        is_directorate=True,
+                    ),
+                    output_field=BooleanField(),
+                ),
+            )
+            .filter(
+                Q(pending_team=True)
+                | Q(pending_lead=True)
+                | Q(pending_ba=True)
+                | Q(pending_directorate=True)
+            )
+        )
+
+    @staticmethod
+    def _all(data):
+        """Every document in the buckets, once, directorate first"""
+        seen = {}
+        for role in ("directorate", "ba", "lead", "team"):
+            for item in data[role]:
+                seen.setdefault(item["id"], item)
+        return list(seen.values())
+
+    @staticmethod
+    def _member_id(user_ids, is_leader):
+        """The first of user_ids in the document's project with this role"""
+        return Subquery(
+            ProjectMember.objects.filter(
+                project_id=OuterRef("project_id"),
+                user_id__in=user_ids,
+                is_leader=is_leader,
+            )
+            .order_by("user_id")
+            .values("user_id")[:1]
+        )
+
+    @staticmethod
+    def _user_data(user):
+        """The fields TinyProjectDocumentSerializerWithUserDocsBelongTo gives"""
+        avatar = getattr(user, "avatar", None)
+        return {
+            "id": user.pk,
+            "email": user.email,
+            "display_first_name": user.display_first_name,
+            "display_last_name": user.display_last_name,
+            "image": avatar.file.url if avatar else None,
+        }
@@ -0,0 +1,238 @@
+"""
+Prince service - Bounded pool of Prince XML renders
+"""
+
+import resource
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+PRINCE_TIMEOUT = 300  # 5 minute timeout
+CANCEL_POLL_INTERVAL = 2  # seconds between cancellation checks
+
+
+class PDFGenerationCancelled(Exception):
+    """Raised when a render is cancelled while Prince is queued or running"""
+
+
+class PrinceBusyError(ValidationError):
+    """Raised when no Prince worker frees up within PRINCE_QUEUE_TIMEOUT"""
+
+
+_pool_lock = threading.Lock()
+_slots = None
+_metrics = {
+    "renders": 0,
+    "failures": 0,
+    "rejected": 0,
+    "running": 0,
+    "waiting": 0,
+    "total_render_seconds": 0.0,
+    "max_render_seconds": 0.0,
+    "total_wait_seconds": 0.0,
+    "bytes_out": 0,
+    "peak_child_rss_kb": 0,
+}
+
+
+class PrinceService:
+    """
+    Runs Prince with at most PRINCE_MAX_WORKERS processes at once
+
+    Callers beyond the limit wait for a free slot (up to PRINCE_QUEUE_TIMEOUT)
+    rather than forking more Prince processes than the host has cores for.
+    HTML is piped to Prince on stdin and the PDF read from stdout, so no
+    temporary files are written.
+    """
+
+    @staticmethod
+    def _get_slots():
+        global _slots
+        with _pool_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(settings.PRINCE_MAX_WORKERS)
+            return _slots
+
+    @staticmethod
+    def render(html_content, cancel_check=None):
+        """
+        Render HTML to PDF on a pooled Prince worker
+
+        Args:
+            html_content: HTML string
+            cancel_check: Optional callable polled while queued and while
+                Prince runs; when it returns True the render is abandoned
+
+        Returns:
+            bytes: PDF content
+
+        Raises:
+            PrinceBusyError: If no worker became free in time
+            ValidationError: If Prince fails or times out
+            PDFGenerationCancelled: If cancel_check reported a cancellation
+        """
+        wait_seconds = PrinceService._acquire_slot(cancel_check)
+        try:
+            return PrinceService._run(html_content, cancel_check, wait_seconds)
+        finally:
+            PrinceService._get_slots().release()
+            PrinceService._record(running=-1)
+
+    @staticmethod
+    def render_many(html_contents):
+        """
+        Render several documents concurrently, one pool slot each
+
+        Args:
+            html_contents: Iterable of HTML strings
+
+        Returns:
+            list: PDF bytes, or the raised exception, for each input in order
+        """
+
+        def render_one(html_content):
+            try:
+                return PrinceService.render(html_content)
+            except Exception as e:
+                return e
+
+        html_contents = list(html_contents)
+        if not html_contents:
+            return []
+        workers = min(settings.PRINCE_MAX_WORKERS, len(html_contents))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prince"
+        ) as executor:
+            return list(executor.map(render_one, html_contents))
+
+    @staticmethod
+    def get_metrics():
+        """
+        Snapshot of pool activity since the process started
+
+        Returns:
+            dict: Counters plus the configured pool size
+        """
+        with _pool_lock:
+            metrics = dict(_metrics)
+        metrics["max_workers"] = settings.PRINCE_MAX_WORKERS
+        return metrics
+
+    @staticmethod
+    def _record(**changes):
+        with _pool_lock:
+            for key, value in changes.items():
+                if key.startswith(("max_", "peak_")):
+                    _metrics[key] = max(_metrics[key], value)
+                else:
+                    _metrics[key] += value
+
+    @staticmethod
+    def _acquire_slot(cancel_check):
+        """Wait for a free worker, returning the seconds spent queued"""
+        slots = PrinceService._get_slots()
+        started = time.monotonic()
+        deadline = started + settings.PRINCE_QUEUE_TIMEOUT
+        PrinceService._record(waiting=1)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                timeout = min(remaining, CANCEL_POLL_INTERVAL)
+                if timeout > 0 and slots.acquire(timeout=timeout):
+                    break
+                if cancel_check and cancel_check():
+                    raise PDFGenerationCancelled("PDF generation cancelled")
+                if time.monotonic() >= deadline:
+                    PrinceService._record(rejected=1)
+                    raise PrinceBusyError(
+                        "All PDF renderers are busy, please try again shortly"
+                    )
+        finally:
+            PrinceService._record(waiting=-1)
+
+        PrinceService._record(running=1)
+        return time.monotonic() - started
+
+    @staticmethod
+    def _get_command():
+        command = [settings.PRINCE_BINARY, "-", "-o", "-", "--javascript"]
+        # Relative URLs would otherwise resolve against the worker's cwd
+        if settings.PRINCE_SERVER_URL:
+            command += ["--baseurl", settings.PRINCE_SERVER_URL]
+        return command
+
+    @staticmethod
+    def _run(html_content, cancel_check, wait_seconds):
+        """Run one Prince process, polling cancel_check until it exits"""
+        command = PrinceService._get_command()
+        started = time.monotonic()
+        deadline = started + PRINCE_TIMEOUT
+
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as e:
+            PrinceService._record(failures=1)
+            raise ValidationError(f"PDF generation error: {e}")
+
+        payload = html_content.encode("utf-8")
+        pending_input = payload
+        try:
+            while True:
+                poll = deadline - time.monotonic()
+                if cancel_check:
+                    poll = min(poll, CANCEL_POLL_INTERVAL)
+                try:
+                    # communicate() refuses input once it has started, so
+                    # retries after a timeout carry on with the same pipes
+                    pdf_content, stderr = process.communicate(
+                        input=pending_input, timeout=max(poll, 0)
+                    )
+                    break
+                except subprocess.TimeoutExpired:
+                    pending_input = None
+                    if cancel_check and cancel_check():
+                        raise PDFGenerationCancelled("PDF generation cancelled")
+                    if time.monotonic() >= deadline:
+                        raise ValidationError("PDF generation timed out")
+        except PDFGenerationCancelled:
+            raise
+        except Exception:
+            PrinceService._record(failures=1)
+            raise
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.communicate()
+
+        elapsed = time.monotonic() - started
+        if process.returncode != 0:
+            PrinceService._record(failures=1)
+            raise ValidationError(
+                f"Prince XML failed: {stderr.decode('utf-8', errors='replace')}"
+            )
+
+        # ru_maxrss is the high-water mark across all reaped children (KB)
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        PrinceService._record(
+            renders=1,
+            total_render_seconds=elapsed,
+            max_render_seconds=elapsed,
+            total_wait_seconds=wait_seconds,
+            bytes_out=len(pdf_content),
+            peak_child_rss_kb=peak_rss_kb,
+        )
+        settings.LOGGER.info(
+            f"Prince rendered {len(payload)} bytes of HTML to {len(pdf_content)} "
+            f"bytes of PDF in {elapsed:.2f}s (queued {wait_seconds:.2f}s, "
+            f"peak renderer RSS {peak_rss_kb // 1024} MB)"
+        )
+        return pdf_content
@@ -0,0 +1,367 @@
+"""
+Publication cache service - Library publications served stale-while-revalidate
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models import PublicStaffProfile
+
+from ..models import CustomPublication
+from ..serializers import (
+    CustomPublicationSerializer,
+    LibraryPublicationResponseSerializer,
+)
+
+_refresh_lock = threading.Lock()
+_refreshing = {}  # employee ID -> Future of its refresh in this process
+_executor = None
+
+
+class LibraryUnavailable(Exception):
+    """Publications couldn't be had from the library API or the cache"""
+
+
+class PublicationCacheService:
+    """
+    Keeps public profile pages from waiting on the library API
+
+    Each employee's library publications are cached with the time they were
+    fetched. Reads return whatever is cached, however old: once an entry is
+    within LIBRARY_PUBLICATIONS_REFRESH_AHEAD of going stale (after
+    LIBRARY_PUBLICATIONS_FRESH_FOR), a read also starts a refresh on a
+    background thread, so the next read gets new data. Entries are kept for
+    LIBRARY_PUBLICATIONS_KEEP_STALE beyond that in case the library is down.
+
+    Only a read with nothing cached waits, for at most LIBRARY_MISS_WAIT
+    seconds; the fetch carries on and fills the cache either way. The
+    warm_publication_cache command fills it ahead of time.
+
+    After LIBRARY_CIRCUIT_FAILURES failed fetches in a row, the circuit
+    breaker stops calling the library for LIBRARY_CIRCUIT_RESET seconds. The
+    first fetch after that reopens it if it fails too. Its state is in the
+    shared cache, so every worker backs off together.
+    """
+
+    @staticmethod
+    def get_library_publications(employee_id):
+        """
+        Get an employee's library publications, cached or fetched
+
+        Args:
+            employee_id: Employee ID known to the library
+
+        Returns:
+            dict: Library response, as LibraryPublicationResponseSerializer
+
+        Raises:
+            LibraryUnavailable: If nothing is cached and the library didn't
+                respond in time
+        """
+        entry = PublicationCacheService._get(
+            settings.CACHE_KEYS["library_publications"].format(employee_id=employee_id)
+        )
+        if entry is not None:
+            if PublicationCacheService.needs_refresh(entry):
+                PublicationCacheService.refresh_async(employee_id)
+            return entry["data"]
+
+        if PublicationCacheService.is_circuit_open():
+            raise LibraryUnavailable("Library service is temporarily unavailable")
+
+        future = PublicationCacheService.refresh_async(employee_id)
+        if future is None:
+            raise LibraryUnavailable("Publications are loading, try again shortly")
+        try:
+            return future.result(timeout=settings.LIBRARY_MISS_WAIT)
+        except FutureTimeout:
+            raise LibraryUnavailable("Publications are loading, try again shortly")
+
+    @staticmethod
+    def refresh(employee_id):
+        """
+        Fetch an employee's publications from the library and cache them
+
+        Args:
+            employee_id: Employee ID known to the library
+
+        Returns:
+            dict: Library response, as LibraryPublicationResponseSerializer
+
+        Raises:
+            LibraryUnavailable: If the circuit breaker is open or the fetch
+                failed
+        """
+        if PublicationCacheService.is_circuit_open():
+            raise LibraryUnavailable("Library service is temporarily unavailable")
+
+        try:
+            data = PublicationCacheService.fetch(employee_id)
+        except LibraryUnavailable:
+            PublicationCacheService._record_failure()
+            raise
+
+        PublicationCacheService._delete(
+            [settings.CACHE_KEYS["library_circuit_failures"]]
+        )
+        PublicationCacheService._set(
+            settings.CACHE_KEYS["library_publications"].format(employee_id=employee_id),
+            {"data": data, "fetched_at": time.time()},
+            settings.LIBRARY_PUBLICATIONS_FRESH_FOR
+            + settings.LIBRARY_PUBLICATIONS_KEEP_STALE,
+        )
+        return data
+
+    @staticmethod
+    def refresh_async(employee_id):
+        """
+        Refresh an employee's publications on a background thread
+
+        A refresh already running for the employee, here or in another
+        worker, isn't repeated.
+
+        Args:
+            employee_id: Employee ID known to the library
+
+        Returns:
+            Future or None: The refresh, or None if another worker has it
+        """
+        with _refresh_lock:
+            future = _refreshing.get(employee_id)
+            if future is not None:
+                return future
+
+            lock_key = settings.CACHE_KEYS["library_refresh_lock"].format(
+                employee_id=employee_id
+            )
+            try:
+                acquired = cache.add(
+                    lock_key, 1, timeout=settings.LIBRARY_API_TIMEOUT * 2
+                )
+            except Exception as e:
+                settings.LOGGER.warning(
+                    f"Cache error locking publications of {employee_id}: {e}"
+                )
+                acquired = True
+            if not acquired:
+                return None
+
+            def run():
+                try:
+                    return PublicationCacheService.refresh(employee_id)
+                finally:
+                    with _refresh_lock:
+                        _refreshing.pop(employee_id, None)
+                    PublicationCacheService._delete([lock_key])
+
+            future = PublicationCacheService._get_executor().submit(run)
+            _refreshing[employee_id] = future
+            return future
+
+    @staticmethod
+    def fetch(employee_id):
+        """
+        Get an employee's publications from the library API
+
+        Args:
+            employee_id: Employee ID known to the library
+
+        Returns:
+            dict: Library response, as LibraryPublicationResponseSerializer
+
+        Raises:
+            LibraryUnavailable: If the library failed or sent something invalid
+        """
+        api_url = f"{settings.LIBRARY_API_URL}{employee_id}&rows=1000"
+        token = settings.LIBRARY_BEARER_TOKEN.replace("Bearer ", "")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        try:
+            response = requests.get(
+                api_url, headers=headers, timeout=settings.LIBRARY_API_TIMEOUT
+            )
+        except requests.RequestException as e:
+            settings.LOGGER.error(
+                f"Request to library API failed for employee {employee_id}: {e}"
+            )
+            raise LibraryUnavailable("Library API request failed")
+
+        if response.status_code != 200:
+            settings.LOGGER.error(
+                f"Failed to retrieve data from API:\n{response.status_code}: {response.text}"
+            )
+            raise LibraryUnavailable(
+                f"API request failed with status {response.status_code}"
+            )
+
+        try:
+            library_data = response.json().get("response", {})
+        except (ValueError, AttributeError):
+            raise LibraryUnavailable("Invalid library data format")
+
+        library_serializer = LibraryPublicationResponseSerializer(
+            data={
+                "numFound": library_data.get("numFound", 0),
+                "start": library_data.get("start", 0),
+                "numFoundExact": library_data.get("numFoundExact", True),
+                "docs": library_data.get("docs", []),
+                "isError": False,
+                "errorMessage": "",
+            }
+        )
+        if not library_serializer.is_valid():
+            settings.LOGGER.error(
+                f"Library Serializer errors: {library_serializer.errors}"
+            )
+            raise LibraryUnavailable("Invalid library data format")
+        return library_serializer.data
+
+    @staticmethod
+    def needs_refresh(entry):
+        """
+        Whether a cached entry is stale or about to be
+
+        Args:
+            entry: Cached {"data", "fetched_at"} entry
+
+        Returns:
+            bool: True once within LIBRARY_PUBLICATIONS_REFRESH_AHEAD of
+                going stale
+        """
+        age = time.time() - entry["fetched_at"]
+        return age >= (
+            settings.LIBRARY_PUBLICATIONS_FRESH_FOR
+            - settings.LIBRARY_PUBLICATIONS_REFRESH_AHEAD
+        )
+
+    @staticmethod
+    def get_cached_entry(employee_id):
+        """
+        Get an employee's cached entry without refreshing it
+
+        Returns:
+            dict or None: {"data", "fetched_at"}
+        """
+        return PublicationCacheService._get(
+            settings.CACHE_KEYS["library_publications"].format(employee_id=employee_id)
+        )
+
+    @staticmethod
+    def get_staff_publications(employee_id):
+        """
+        Get the staff profile and custom publications for an employee ID
+
+        Cached until either changes (see documents/signals.py).
+
+        Args:
+            employee_id: Employee ID of the staff profile
+
+        Returns:
+            dict: "staffProfilePk" (0 if none) and serialized
+                "customPublications"
+        """
+        cache_key = settings.CACHE_KEYS["staff_publications"].format(
+            employee_id=employee_id
+        )
+        staff_publications = PublicationCacheService._get(cache_key)
+        if staff_publications is None:
+            staff_profile_pk = (
+                PublicStaffProfile.objects.filter(employee_id=employee_id)
+                .values_list("pk", flat=True)
+                .first()
+            )
+            custom_publications = CustomPublication.objects.filter(
+                public_profile__employee_id=employee_id
+            )
+            staff_publications = {
+                "staffProfilePk": staff_profile_pk or 0,
+                "customPublications": CustomPublicationSerializer(
+                    custom_publications, many=True
+                ).data,
+            }
+            PublicationCacheService._set(
+                cache_key, staff_publications, settings.CACHE_TTL["staff_publications"]
+            )
+        return staff_publications
+
+    @staticmethod
+    def invalidate_staff(employee_ids):
+        """
+        Drop the cached staff profile and custom publications of employees
+
+        Args:
+            employee_ids: Employee IDs whose profile or publications changed
+        """
+        keys = [
+            settings.CACHE_KEYS["staff_publications"].format(employee_id=employee_id)
+            for employee_id in set(employee_ids)
+            if employee_id
+        ]
+        if keys:
+            PublicationCacheService._delete(keys)
+
+    @staticmethod
+    def is_circuit_open():
+        """Whether calls to the library are suspended after repeated failures"""
+        return bool(
+            PublicationCacheService._get(settings.CACHE_KEYS["library_circuit_open"])
+        )
+
+    @staticmethod
+    def _record_failure():
+        key = settings.CACHE_KEYS["library_circuit_failures"]
+        try:
+            # Outlives the open period, so one more failure after it reopens
+            cache.add(key, 0, timeout=settings.LIBRARY_CIRCUIT_RESET * 2)
+            failures = cache.incr(key)
+        except Exception as e:
+            settings.LOGGER.warning(f"Cache error counting library failures: {e}")
+            return
+        if failures >= settings.LIBRARY_CIRCUIT_FAILURES:
+            settings.LOGGER.warning(
+                f"Library API failed {failures} times in a row; pausing calls "
+                f"for {settings.LIBRARY_CIRCUIT_RESET}s"
+            )
+            PublicationCacheService._set(
+                settings.CACHE_KEYS["library_circuit_open"],
+                True,
+                settings.LIBRARY_CIRCUIT_RESET,
+            )
+
+    @staticmethod
+    def _get_executor():
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LIBRARY_REFRESH_WORKERS,
+                thread_name_prefix="publications",
+            )
+        return _executor
+
+    @staticmethod
+    def _get(cache_key):
+        try:
+            return cache.get(cache_key)
+        except Exception as e:
+            settings.LOGGER.warning(f"Cache error for {cache_key}: {e}")
+            return None
+
+    @staticmethod
+    def _set(cache_key, value, timeout):
+        try:
+            cache.set(cache_key, value, timeout=timeout)
+        except Exception as e:
+            settings.LOGGER.warning(f"Failed to cache {cache_key}: {e}")
+
+    @staticmethod
+    def _delete(keys):
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            settings.LOGGER.warning(f"Failed to delete {len(keys)} cache keys: {e}")
@@ -0,0 +1,244 @@
+"""
+Report cycle service - Open an annual reporting cycle in bulk
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from common.utils.tagged_cache import TaggedCache, make_tag
+from projects.models import Project
+
+from ..models import ProgressReport, ProjectDocument, StudentReport
+from .annual_report_fragment_service import PROJECT, AnnualReportFragmentService
+
+EMPTY_HTML = "<p></p>"
+
+# Project statuses that get a new report, without and with update requested
+CYCLE_STATUSES = ["active"]
+CYCLE_UPDATE_STATUSES = ["active", "updating", "suspended"]
+
+PROGRESS_KINDS = [
+    Project.CategoryKindChoices.SCIENCE,
+    Project.CategoryKindChoices.COREFUNCTION,
+]
+
+# Progress report fields carried over from last year with and without
+# prepopulate (the rest start empty)
+PROGRESS_FIELDS = ["context", "implications", "future", "progress", "aims"]
+PROGRESS_BASE_FIELDS = ["context", "implications", "aims"]
+
+
+class ReportCycleService:
+    """
+    Opens a reporting cycle: a new progress or student report for every
+    eligible project, created set-wise in one transaction
+
+    Query count is independent of the number of projects: one query each
+    for the eligible projects, this year's existing reports and last year's
+    reports, then bulk inserts and a single status update.
+    """
+
+    @staticmethod
+    def get_eligible_projects(annual_report, include_updating=False):
+        """
+        Projects that don't yet have a report for the annual report's year
+
+        Args:
+            annual_report: AnnualReport being opened
+            include_updating: Also include updating and suspended projects
+
+        Returns:
+            QuerySet of Project objects
+        """
+        statuses = CYCLE_UPDATE_STATUSES if include_updating else CYCLE_STATUSES
+        has_progress_report = ProgressReport.objects.filter(
+            document__project=OuterRef("pk"), report__year=annual_report.year
+        )
+        has_student_report = StudentReport.objects.filter(
+            document__project=OuterRef("pk"), report__year=annual_report.year
+        )
+        return (
+            Project.objects.filter(status__in=statuses)
+            .filter(
+                Q(kind__in=PROGRESS_KINDS) & ~Exists(has_progress_report)
+                | Q(kind=Project.CategoryKindChoices.STUDENT)
+                & ~Exists(has_student_report)
+            )
+            .only("pk", "kind")
+            .order_by("pk")
+        )
+
+    @staticmethod
+    def open_cycle(
+        user, annual_report, include_updating=False, prepopulate=False, dry_run=False
+    ):
+        """
+        Create this year's reports for every eligible project
+
+        Projects already holding a report for the year are only moved to
+        updating. With prepopulate, progress reports copy every section of
+        the project's latest report; without, only context, aims and
+        implications. Student reports copy last year's text with prepopulate.
+
+        Args:
+            user: User opening the cycle
+            annual_report: AnnualReport being opened
+            include_updating: Also include updating and suspended projects
+            prepopulate: Copy all of last year's content
+            dry_run: Plan without writing anything
+
+        Returns:
+            dict: Counts of "projects", "progress_reports" and
+                "student_reports", and "dry_run"
+        """
+        year = annual_report.year
+        projects = list(
+            ReportCycleService.get_eligible_projects(annual_report, include_updating)
+        )
+        student_ids = [
+            p.pk for p in projects if p.kind == Project.CategoryKindChoices.STUDENT
+        ]
+        progress_ids = [
+            p.pk for p in projects if p.kind != Project.CategoryKindChoices.STUDENT
+        ]
+
+        # Reports filed for the year outside this annual report need no new one
+        existing_progress = set(
+            ProgressReport.objects.filter(
+                project_id__in=progress_ids, year=year
+            ).values_list("project_id", flat=True)
+        )
+        existing_student = set(
+            StudentReport.objects.filter(
+                project_id__in=student_ids, year=year
+            ).values_list("project_id", flat=True)
+        )
+        new_progress_ids = [pk for pk in progress_ids if pk not in existing_progress]
+        new_student_ids = [pk for pk in student_ids if pk not in existing_student]
+
+        result = {
+            "projects": len(projects),
+            "progress_reports": len(new_progress_ids),
+            "student_reports": len(new_student_ids),
+            "dry_run": dry_run,
+        }
+        if dry_run or not projects:
+            return result
+
+        last_progress = ReportCycleService._latest_reports(
+            ProgressReport, new_progress_ids
+        )
+        last_student = ReportCycleService._latest_reports(
+            StudentReport, new_student_ids
+        )
+        progress_fields = PROGRESS_FIELDS if prepopulate else PROGRESS_BASE_FIELDS
+
+        # Imported here as the dashboard counts build on this package
+        from users.services.dashboard_count_service import DashboardCountService
+
+        now = timezone.now()
+        project_ids = [p.pk for p in projects]
+        with transaction.atomic():
+            documents = ProjectDocument.objects.bulk_create(
+                [
+                    ProjectDocument(
+                        project_id=pk,
+                        kind=ProjectDocument.CategoryKindChoices.PROGRESSREPORT,
+                        status=ProjectDocument.StatusChoices.NEW,
+                        creator=user,
+                        modifier=user,
+                    )
+                    for pk in new_progress_ids
+                ]
+                + [
+                    ProjectDocument(
+                        project_id=pk,
+                        kind=ProjectDocument.CategoryKindChoices.STUDENTREPORT,
+                        status=ProjectDocument.StatusChoices.NEW,
+                        creator=user,
+                        modifier=user,
+                    )
+                    for pk in new_student_ids
+                ]
+            )
+            progress_documents = documents[: len(new_progress_ids)]
+            student_documents = documents[len(new_progress_ids) :]
+
+            ProgressReport.objects.bulk_create(
+                [
+                    ProgressReport(
+                        document=document,
+                        project_id=document.project_id,
+                        report=annual_report,
+                        year=year,
+                        **ReportCycleService._carry_over(
+                            last_progress.get(document.project_id),
+                            PROGRESS_FIELDS,
+                            progress_fields,
+                        ),
+                    )
+                    for document in progress_documents
+                ]
+            )
+            StudentReport.objects.bulk_create(
+                [
+                    StudentReport(
+                        document=document,
+                        project_id=document.project_id,
+                        report=annual_report,
+                        year=year,
+                        **ReportCycleService._carry_over(
+                            last_student.get(document.project_id),
+                            ["progress_report"],
+                            ["progress_report"] if prepopulate else [],
+                        ),
+                    )
+                    for document in student_documents
+                ]
+            )
+
+            # update() skips auto_now, so updated_at is set explicitly
+            Project.objects.filter(pk__in=project_ids).update(
+                status=Project.StatusChoices.UPDATING, updated_at=now
+            )
+
+            # Bulk writes don't send the signals that invalidate fragments,
+            # dashboard counts and cached project lists
+            transaction.on_commit(
+                lambda: AnnualReportFragmentService.invalidate(PROJECT, project_ids)
+            )
+            DashboardCountService.invalidate_projects(project_ids)
+            TaggedCache.invalidate(make_tag("project", pk) for pk in project_ids)
+
+        settings.LOGGER.info(
+            f"{user} opened the {year} cycle: {len(projects)} projects, "
+            f"{result['progress_reports']} progress reports, "
+            f"{result['student_reports']} student reports"
+        )
+        return result
+
+    @staticmethod
+    def _latest_reports(model, project_ids):
+        """Each project's most recent report of a kind, in one query"""
+        if not project_ids:
+            return {}
+        reports = (
+            model.objects.filter(project_id__in=project_ids)
+            .order_by("project_id", "-year")
+            .distinct("project_id")
+        )
+        return {report.project_id: report for report in reports}
+
+    @staticmethod
+    def _carry_over(last_report, fields, copied_fields):
+        """Field values for a new report, copying copied_fields from last_report"""
+        return {
+            field: (
+                getattr(last_report, field)
+                if last_report and field in copied_fields
+                else EMPTY_HTML
+            )
+            for field in fields
+        }
@@ -0,0 +1,158 @@
+"""
+Django signals for the documents app.
+
+Invalidates cached annual report fragments when the data they were
+rendered from changes, and cached staff publications when a staff profile
+or its custom publications change.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from agencies.models import Affiliation, BusinessArea
+from locations.models import Area
+from medias.models import BusinessAreaPhoto, ProjectPhoto
+from projects.models import (
+    Project,
+    ProjectArea,
+    ProjectMember,
+    StudentProjectDetails,
+)
+from users.models import PublicStaffProfile, User, UserProfile, UserWork
+
+from .models import CustomPublication, ProgressReport, ProjectDocument, StudentReport
+from .services.annual_report_fragment_service import (
+    AREAS,
+    BUSINESS_AREA,
+    PROJECT,
+    AnnualReportFragmentService,
+)
+from .services.publication_cache_service import PublicationCacheService
+
+
+def _user_dependencies(user_id):
+    """A user appears in their projects' team lists and as a BA leader"""
+    return [
+        (
+            PROJECT,
+            ProjectMember.objects.filter(user_id=user_id).values_list(
+                "project_id", flat=True
+            ),
+        ),
+        (
+            BUSINESS_AREA,
+            BusinessArea.objects.filter(leader_id=user_id).values_list("pk", flat=True),
+        ),
+    ]
+
+
+def _affiliation_dependencies(affiliation_id):
+    return [
+        (
+            PROJECT,
+            ProjectMember.objects.filter(
+                user__work__affiliation_id=affiliation_id
+            ).values_list("project_id", flat=True),
+        )
+    ]
+
+
+# Model -> (fields the fragments read, or None for any field,
+#           function returning [(dependency kind, pks)] for an instance)
+FRAGMENT_DEPENDENCIES = {
+    ProgressReport: (None, lambda i: [(PROJECT, [i.project_id])]),
+    StudentReport: (None, lambda i: [(PROJECT, [i.project_id])]),
+    ProjectDocument: ({"status"}, lambda i: [(PROJECT, [i.project_id])]),
+    Project: (None, lambda i: [(PROJECT, [i.pk])]),
+    ProjectArea: (None, lambda i: [(PROJECT, [i.project_id])]),
+    ProjectMember: (None, lambda i: [(PROJECT, [i.project_id])]),
+    ProjectPhoto: (None, lambda i: [(PROJECT, [i.project_id])]),
+    StudentProjectDetails: (None, lambda i: [(PROJECT, [i.project_id])]),
+    BusinessArea: (None, lambda i: [(BUSINESS_AREA, [i.pk])]),
+    BusinessAreaPhoto: (None, lambda i: [(BUSINESS_AREA, [i.business_area_id])]),
+    Area: (None, lambda i: [(AREAS, [None])]),
+    # Logins save last_login, which mustn't invalidate every project
+    User: (
+        {"display_first_name", "display_last_name", "is_staff"},
+        lambda i: _user_dependencies(i.pk),
+    ),
+    UserProfile: ({"title"}, lambda i: _user_dependencies(i.user_id)),
+    UserWork: ({"affiliation"}, lambda i: _user_dependencies(i.user_id)),
+    Affiliation: ({"name"}, lambda i: _affiliation_dependencies(i.pk)),
+}
+
+
+def invalidate_annual_report_fragments(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate the annual report fragments that depend on instance.
+
+    Runs after commit so a report rendered concurrently can't cache the old
+    data under the new version token.
+    """
+    fields, resolve = FRAGMENT_DEPENDENCIES[sender]
+    if fields and update_fields and not fields.intersection(update_fields):
+        return
+
+    dependencies = [(kind, list(pks)) for kind, pks in resolve(instance)]
+
+    def invalidate():
+        for kind, pks in dependencies:
+            AnnualReportFragmentService.invalidate(kind, pks)
+
+    transaction.on_commit(invalidate)
+
+
+for model in FRAGMENT_DEPENDENCIES:
+    for signal_name, signal in (("post_save", post_save), ("post_delete", post_delete)):
+        signal.connect(
+            invalidate_annual_report_fragments,
+            sender=model,
+            dispatch_uid=f"annual_report_fragments_{signal_name}_{model.__name__}",
+        )
+
+
+def remember_employee_id(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Note a staff profile's stored employee ID, which a save may change"""
+    if raw or instance.pk is None:
+        return
+    if update_fields and "employee_id" not in update_fields:
+        return
+    instance._stored_employee_id = (
+        PublicStaffProfile.objects.filter(pk=instance.pk)
+        .values_list("employee_id", flat=True)
+        .first()
+    )
+
+
+def invalidate_staff_publications(sender, instance, **kwargs):
+    """
+    Drop the cached staff profile and custom publications of the employees
+    a change affects, once it commits.
+    """
+    if sender is CustomPublication:
+        employee_ids = PublicStaffProfile.objects.filter(
+            pk=instance.public_profile_id
+        ).values_list("employee_id", flat=True)
+    else:
+        employee_ids = [
+            instance.employee_id,
+            getattr(instance, "_stored_employee_id", None),
+        ]
+    employee_ids = list(employee_ids)
+    transaction.on_commit(
+        lambda: PublicationCacheService.invalidate_staff(employee_ids)
+    )
+
+
+pre_save.connect(
+    remember_employee_id,
+    sender=PublicStaffProfile,
+    dispatch_uid="staff_publications_pre_save_PublicStaffProfile",
+)
+for model in (PublicStaffProfile, CustomPublication):
+    for signal_name, signal in (("post_save", post_save), ("post_delete", post_delete)):
+        signal.connect(
+            invalidate_staff_publications,
+            sender=model,
+            dispatch_uid=f"staff_publications_{signal_name}_{model.__name__}",
+        )
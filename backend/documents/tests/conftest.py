@@ -609,3 +609,20 @@ def project_plan_with_details(db, project_with_lead):
         listed_references="<p>Test references</p>",
         methodology="<p>Test methodology</p>",
     )
+
+
+@pytest.fixture
+def fake_prince(settings, monkeypatch):
+    """
+    Render PDFs with the fake Prince binary and a fresh four-worker pool.
+
+    Returns:
+        Path: Path to the fake Prince script
+    """
+    from pathlib import Path
+
+    path = Path(__file__).resolve().parent / "fake_prince.py"
+    settings.PRINCE_BINARY = str(path)
+    settings.PRINCE_MAX_WORKERS = 4
+    monkeypatch.setattr("documents.services.prince_service._slots", None)
+    return path
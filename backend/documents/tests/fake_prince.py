@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Prince XML binary, for tests and local development without
+a Prince licence.
+
+Accepts the subset of the Prince command line PrinceService uses:
+
+    fake_prince.py <input.html|-> -o <output.pdf|-> [--javascript] [--baseurl URL]
+
+and writes a small placeholder PDF. Behaviour can be tuned with:
+
+    FAKE_PRINCE_DELAY  Seconds to sleep before writing output
+    FAKE_PRINCE_FAIL   If set, print it to stderr and exit with status 1
+"""
+
+import hashlib
+import os
+import sys
+import time
+
+
+def main(argv):
+    source = "-"
+    output = "-"
+    args = iter(argv)
+    for arg in args:
+        if arg == "-o":
+            output = next(args)
+        elif arg == "--baseurl":
+            next(args)
+        elif arg.startswith("--"):
+            continue
+        else:
+            source = arg
+
+    if source == "-":
+        html = sys.stdin.buffer.read()
+    else:
+        with open(source, "rb") as f:
+            html = f.read()
+
+    delay = float(os.environ.get("FAKE_PRINCE_DELAY", "0"))
+    if delay:
+        time.sleep(delay)
+
+    error = os.environ.get("FAKE_PRINCE_FAIL")
+    if error:
+        sys.stderr.write(f"prince: error: {error}\n")
+        return 1
+
+    pdf = (
+        b"%PDF-1.4\n"
+        b"% fake prince\n"
+        + f"% source-bytes {len(html)}\n".encode()
+        + f"% source-sha256 {hashlib.sha256(html).hexdigest()}\n".encode()
+        + b"%%EOF\n"
+    )
+    if output == "-":
+        sys.stdout.buffer.write(pdf)
+        sys.stdout.buffer.flush()
+    else:
+        with open(output, "wb") as f:
+            f.write(pdf)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
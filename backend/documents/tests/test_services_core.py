@@ -852,6 +852,139 @@ class TestApprovalService:
         assert len(results["failed"]) == 1
         assert "Invalid stage" in results["failed"][0]["error"]
 
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_bulk_approve_reports_each_failure(self, project_lead, ba_lead):
+        """Test bulk_approve reports missing, unauthorised and early documents"""
+        # Arrange
+        from common.tests.factories import BusinessAreaFactory
+
+        business_area = BusinessAreaFactory(leader=ba_lead)
+        project = ProjectFactory(business_area=business_area)
+        ready = ProjectDocumentFactory(
+            project=project,
+            status=ProjectDocument.StatusChoices.INAPPROVAL,
+            project_lead_approval_granted=True,
+        )
+        early = ProjectDocumentFactory(
+            project=project,
+            status=ProjectDocument.StatusChoices.INAPPROVAL,
+        )
+        other = ProjectDocumentFactory(
+            project=ProjectFactory(),
+            status=ProjectDocument.StatusChoices.INAPPROVAL,
+            project_lead_approval_granted=True,
+        )
+
+        # Act
+        with patch(
+            "documents.services.notification_service.EmailService.send_template_email"
+        ):
+            results = ApprovalService.bulk_approve(
+                [99999, ready.pk, early.pk, other.pk], ba_lead, stage=2
+            )
+
+        # Assert
+        assert results["approved"] == [ready.pk]
+        assert results["failed"] == [
+            {"document_id": 99999, "error": "Document 99999 not found"},
+            {
+                "document_id": early.pk,
+                "error": "Stage 1 approval must be granted first",
+            },
+            {
+                "document_id": other.pk,
+                "error": "User not authorized to approve at stage 2",
+            },
+        ]
+        ready.refresh_from_db()
+        early.refresh_from_db()
+        assert ready.business_area_lead_approval_granted is True
+        assert early.business_area_lead_approval_granted is False
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_bulk_approve_sends_one_digest_per_recipient(
+        self, project_lead, ba_lead, director
+    ):
+        """Test bulk_approve coalesces notifications into one email each"""
+        # Arrange
+        from common.tests.factories import BusinessAreaFactory, DivisionFactory
+
+        division = DivisionFactory(director=director)
+        business_area = BusinessAreaFactory(leader=ba_lead, division=division)
+        projects = [ProjectFactory(business_area=business_area) for _ in range(3)]
+        for project in projects:
+            project.members.create(
+                user=project_lead, is_leader=True, role="supervising"
+            )
+        documents = [
+            ProjectDocumentFactory(
+                project=project,
+                status=ProjectDocument.StatusChoices.INAPPROVAL,
+                project_lead_approval_granted=True,
+                business_area_lead_approval_granted=True,
+            )
+            for project in projects
+        ]
+
+        # Act
+        with patch(
+            "documents.services.notification_service.EmailService.send_template_email"
+        ) as mock_send:
+            results = ApprovalService.bulk_approve(
+                [document.pk for document in documents], director, stage=3
+            )
+
+        # Assert
+        assert len(results["approved"]) == 3
+        documents_by_recipient = {
+            call.kwargs["recipient_email"][0]: call.kwargs["context"]["documents"]
+            for call in mock_send.call_args_list
+        }
+        assert len(documents_by_recipient) == mock_send.call_count
+        for user in (project_lead, ba_lead, director):
+            assert len(documents_by_recipient[user.email]) == 3
+        for document in documents:
+            document.refresh_from_db()
+            assert document.status == ProjectDocument.StatusChoices.APPROVED
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_bulk_approve_queries_independent_of_count(self, project_lead):
+        """Test bulk_approve runs the same queries for 2 or 10 documents"""
+        # Arrange
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        project = ProjectFactory()
+        project.members.create(user=project_lead, is_leader=True, role="supervising")
+        few = [
+            ProjectDocumentFactory(
+                project=project, status=ProjectDocument.StatusChoices.INAPPROVAL
+            ).pk
+            for _ in range(2)
+        ]
+        many = [
+            ProjectDocumentFactory(
+                project=project, status=ProjectDocument.StatusChoices.INAPPROVAL
+            ).pk
+            for _ in range(10)
+        ]
+
+        # Act
+        with patch(
+            "documents.services.notification_service.EmailService.send_template_email"
+        ):
+            with CaptureQueriesContext(connection) as few_queries:
+                ApprovalService.bulk_approve(few, project_lead, stage=1)
+            with CaptureQueriesContext(connection) as many_queries:
+                results = ApprovalService.bulk_approve(many, project_lead, stage=1)
+
+        # Assert
+        assert len(results["approved"]) == 10
+        assert len(many_queries) == len(few_queries)
+
     @pytest.mark.django_db
     @pytest.mark.integration
     def test_get_next_approver_stage_one(self, project_lead):
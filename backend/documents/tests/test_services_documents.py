@@ -13,6 +13,7 @@ from rest_framework.exceptions import ValidationError
 from common.tests.factories import ProjectDocumentFactory, ProjectFactory, UserFactory
 from documents.models import ProjectDocument
 from documents.tests.factories import (
+    AnnualReportFactory,
     ConceptPlanFactory,
     ProgressReportFactory,
     ProjectPlanFactory,
@@ -858,3 +859,339 @@ class TestStudentReportService:
         assert data["document"] == document
         # Details won't be in data since no student_report_details exist
         assert "details" not in data
+
+
+class TestReportCycleService:
+    """Test ReportCycleService business logic"""
+
+    @pytest.fixture
+    def cycle_projects(self, db):
+        """Active science and student projects with last year's reports"""
+        last_year = AnnualReportFactory(year=2022)
+        science = ProjectFactory(status="active", kind="science")
+        student = ProjectFactory(status="active", kind="student")
+        ProgressReportFactory(document__project=science, report=last_year, year=2022)
+        StudentReportFactory(document__project=student, report=last_year, year=2022)
+        return science, student
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_creates_reports(self, cycle_projects):
+        """Test open_cycle creates a report per project and marks them updating"""
+        # Arrange
+        from documents.models import ProgressReport, StudentReport
+        from documents.services.report_cycle_service import ReportCycleService
+
+        science, student = cycle_projects
+        user = UserFactory()
+        annual_report = AnnualReportFactory(year=2023)
+        last_progress = ProgressReport.objects.get(project=science, year=2022)
+
+        # Act
+        result = ReportCycleService.open_cycle(user, annual_report)
+
+        # Assert
+        assert result == {
+            "projects": 2,
+            "progress_reports": 1,
+            "student_reports": 1,
+            "dry_run": False,
+        }
+        progress = ProgressReport.objects.get(project=science, year=2023)
+        assert progress.report == annual_report
+        assert progress.document.kind == "progressreport"
+        assert progress.document.creator == user
+        assert progress.aims == last_progress.aims
+        assert progress.progress == "<p></p>"
+        student_report = StudentReport.objects.get(project=student, year=2023)
+        assert student_report.progress_report == "<p></p>"
+        science.refresh_from_db()
+        student.refresh_from_db()
+        assert science.status == student.status == "updating"
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_refreshes_cached_project_lists(
+        self, cycle_projects, settings, django_capture_on_commit_callbacks
+    ):
+        """Test members' cached project lists show the updating status"""
+        # Arrange
+        from django.core.cache import cache
+
+        from common.tests.factories import ProjectMemberFactory
+        from documents.services.report_cycle_service import ReportCycleService
+        from projects.services.project_service import ProjectService
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-report-cycle",
+            }
+        }
+        cache.clear()
+        science, _ = cycle_projects
+        member = ProjectMemberFactory(project=science).user
+        assert ProjectService.get_user_projects(member.pk)[0]["status"] == "active"
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            ReportCycleService.open_cycle(UserFactory(), AnnualReportFactory(year=2023))
+
+        # Assert
+        assert ProjectService.get_user_projects(member.pk)[0]["status"] == "updating"
+        cache.clear()
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_prepopulate(self, cycle_projects):
+        """Test prepopulate copies all of last year's content"""
+        # Arrange
+        from documents.models import ProgressReport, StudentReport
+        from documents.services.report_cycle_service import ReportCycleService
+
+        science, student = cycle_projects
+        annual_report = AnnualReportFactory(year=2023)
+
+        # Act
+        ReportCycleService.open_cycle(UserFactory(), annual_report, prepopulate=True)
+
+        # Assert
+        last, new = ProgressReport.objects.filter(project=science).order_by("year")
+        assert new.progress == last.progress
+        assert new.future == last.future
+        last, new = StudentReport.objects.filter(project=student).order_by("year")
+        assert new.progress_report == last.progress_report
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_dry_run(self, cycle_projects):
+        """Test dry_run returns the plan without writing"""
+        # Arrange
+        from documents.models import ProgressReport
+        from documents.services.report_cycle_service import ReportCycleService
+
+        science, _ = cycle_projects
+        annual_report = AnnualReportFactory(year=2023)
+
+        # Act
+        result = ReportCycleService.open_cycle(
+            UserFactory(), annual_report, dry_run=True
+        )
+
+        # Assert
+        assert result["projects"] == 2
+        assert result["dry_run"] is True
+        assert not ProgressReport.objects.filter(year=2023).exists()
+        science.refresh_from_db()
+        assert science.status == "active"
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_skips_projects_with_report(self, cycle_projects):
+        """Test a second run finds nothing left to open"""
+        # Arrange
+        from documents.services.report_cycle_service import ReportCycleService
+
+        annual_report = AnnualReportFactory(year=2023)
+        ReportCycleService.open_cycle(UserFactory(), annual_report)
+
+        # Act
+        result = ReportCycleService.open_cycle(
+            UserFactory(), annual_report, include_updating=True
+        )
+
+        # Assert
+        assert result["projects"] == 0
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_open_cycle_query_count_independent_of_projects(
+        self, django_assert_max_num_queries
+    ):
+        """Test opening a cycle doesn't query per project"""
+        # Arrange
+        from documents.services.report_cycle_service import ReportCycleService
+
+        user = UserFactory()
+        annual_report = AnnualReportFactory(year=2023)
+        ProjectFactory.create_batch(20, status="active", kind="science")
+        ProjectFactory.create_batch(5, status="active", kind="student")
+
+        # Act
+        with django_assert_max_num_queries(12):
+            result = ReportCycleService.open_cycle(user, annual_report)
+
+        # Assert
+        assert result["progress_reports"] == 20
+        assert result["student_reports"] == 5
+
+
+class TestPendingActionService:
+    """Test PendingActionService role buckets"""
+
+    @staticmethod
+    def _document(project, **approvals):
+        return ProjectDocumentFactory(
+            project=project,
+            kind="concept",
+            status=ProjectDocument.StatusChoices.INAPPROVAL,
+            **approvals,
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_pending_buckets_by_role(self):
+        """Test each document lands in the buckets of the roles it waits on"""
+        # Arrange
+        from common.tests.factories import BusinessAreaFactory, ProjectMemberFactory
+        from documents.services.pending_action_service import PendingActionService
+
+        user = UserFactory()
+        led = ProjectFactory(business_area=BusinessAreaFactory(leader=user))
+        member_of = ProjectFactory()
+        ProjectMemberFactory(project=led, user=user, is_leader=True)
+        ProjectMemberFactory(project=member_of, user=user, is_leader=False)
+        lead_doc = self._document(led, project_lead_approval_granted=False)
+        ba_doc = self._document(
+            led,
+            project_lead_approval_granted=True,
+            business_area_lead_approval_granted=False,
+        )
+        team_doc = self._document(member_of, project_lead_approval_granted=False)
+        # Waiting on the directorate, which the user isn't
+        self._document(
+            led,
+            project_lead_approval_granted=True,
+            business_area_lead_approval_granted=True,
+            directorate_approval_granted=False,
+        )
+
+        # Act
+        pending = PendingActionService.get_pending([user.pk])
+
+        # Assert
+        assert pending["lead"] == {lead_doc.pk: user.pk}
+        assert pending["ba"] == {ba_doc.pk: user.pk}
+        assert pending["team"] == {team_doc.pk: user.pk}
+        assert pending["directorate"] == {}
+        assert [doc.pk for doc in pending["documents"]] == sorted(
+            [lead_doc.pk, ba_doc.pk, team_doc.pk]
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_pending_directorate_by_business_area(self):
+        """Test Directorate staff see documents awaiting directorate approval"""
+        # Arrange
+        from common.tests.factories import BusinessAreaFactory
+        from documents.services.pending_action_service import PendingActionService
+        from users.models import UserWork
+
+        user = UserFactory()
+        UserWork.objects.create(
+            user=user, business_area=BusinessAreaFactory(name="Directorate")
+        )
+        doc = self._document(
+            ProjectFactory(),
+            project_lead_approval_granted=True,
+            business_area_lead_approval_granted=True,
+            directorate_approval_granted=False,
+        )
+
+        # Act
+        pending = PendingActionService.get_pending([user.pk])
+        excluded = PendingActionService.get_pending([user.pk], directorate=False)
+
+        # Assert
+        assert pending["directorate"] == {doc.pk: None}
+        assert excluded["directorate"] == {}
+        assert excluded["documents"] == []
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_pending_skips_closed_and_approved(self):
+        """Test closed projects and approved documents are never pending"""
+        # Arrange
+        from common.tests.factories import ProjectMemberFactory
+        from documents.services.pending_action_service import PendingActionService
+
+        user = UserFactory(is_superuser=True)
+        closed = ProjectFactory(status="completed")
+        ProjectMemberFactory(project=closed, user=user, is_leader=True)
+        self._document(closed, project_lead_approval_granted=False)
+        ProjectDocumentFactory(
+            project=ProjectFactory(),
+            kind="concept",
+            status=ProjectDocument.StatusChoices.APPROVED,
+            business_area_lead_approval_granted=True,
+            directorate_approval_granted=False,
+        )
+
+        # Act
+        pending = PendingActionService.get_pending([user.pk])
+
+        # Assert
+        assert pending["documents"] == []
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_get_pending_many_users_one_query(self, django_assert_num_queries):
+        """Test the buckets for several users come from a single query"""
+        # Arrange
+        from common.tests.factories import ProjectMemberFactory
+        from documents.services.pending_action_service import PendingActionService
+
+        users = UserFactory.create_batch(5)
+        for user in users:
+            for is_leader in (True, False):
+                project = ProjectFactory()
+                ProjectMemberFactory(project=project, user=user, is_leader=is_leader)
+                self._document(project, project_lead_approval_granted=False)
+
+        # Act
+        # One query for the documents, one for the directorate email lists
+        with django_assert_num_queries(2):
+            pending = PendingActionService.get_pending([user.pk for user in users])
+
+        # Assert
+        assert len(pending["documents"]) == 10
+        assert len(pending["lead"]) == 5
+        assert len(pending["team"]) == 5
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_serialize_each_document_once(self):
+        """Test a document in several buckets is serialized once"""
+        # Arrange
+        from documents.serializers import TinyProjectDocumentSerializer
+        from documents.services.pending_action_service import PendingActionService
+
+        lead, member = UserFactory.create_batch(2)
+        doc = self._document(ProjectFactory(), project_lead_approval_granted=False)
+        pending = {
+            "documents": [doc],
+            "team": {doc.pk: member.pk},
+            "lead": {doc.pk: lead.pk},
+            "ba": {},
+            "directorate": {},
+        }
+
+        # Act
+        with patch(
+            "documents.services.pending_action_service.TinyProjectDocumentSerializer",
+            wraps=TinyProjectDocumentSerializer,
+        ) as mock_serializer:
+            data = PendingActionService.serialize(pending, None)
+        compact = PendingActionService.serialize(pending, None, compact=True)
+        for_users = PendingActionService.serialize(
+            pending, None, users={lead.pk: lead, member.pk: member}
+        )
+
+        # Assert
+        mock_serializer.assert_called_once()
+        assert data["team"][0] is data["lead"][0]
+        assert [item["id"] for item in data["all"]] == [doc.pk]
+        assert compact["team"] == [doc.pk]
+        assert [item["id"] for item in compact["documents"]] == [doc.pk]
+        assert for_users["lead"][0]["for_user"]["id"] == lead.pk
+        assert for_users["team"][0]["for_user"]["id"] == member.pk
@@ -4,15 +4,40 @@ Tests for document services.
 Tests business logic in document services.
 """
 
+import time
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
 from django.contrib.auth import get_user_model
+from django.core.mail import get_connection
+from django.core.management import CommandError, call_command
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
 from common.tests.factories import ProjectDocumentFactory, ProjectFactory, UserFactory
+from documents.models import (
+    CustomPublication,
+    OutboundEmail,
+    PDFRenderJob,
+    ProjectDocument,
+)
+from documents.services.annual_report_fragment_service import (
+    PROJECT,
+    AnnualReportFragmentService,
+)
+from documents.services.email_outbox_service import EmailOutboxService
 from documents.services.email_service import EmailSendError, EmailService
+from documents.services.pdf_cache_service import PDFCacheService
+from documents.services.pdf_job_service import PDFJobService
 from documents.services.pdf_service import PDFService
+from documents.services.prince_service import PrinceService
+from documents.services.publication_cache_service import (
+    LibraryUnavailable,
+    PublicationCacheService,
+)
 from documents.tests.factories import (
     ConceptPlanFactory,
 )
@@ -24,52 +49,44 @@ class TestPDFService:
     """Test PDFService business logic"""
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_generate_document_pdf_success(self, mock_render, mock_subprocess):
+    def test_generate_document_pdf_success(self, mock_render, mock_prince):
         """Test generate_document_pdf creates PDF successfully"""
         # Arrange
         from documents.tests.factories import ConceptPlanFactory
 
         concept_plan = ConceptPlanFactory()
         mock_render.return_value = "<html>Test document</html>"
-        mock_subprocess.return_value = Mock(returncode=0, stderr="")
+        mock_prince.return_value = b"PDF content"
 
         # Act
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                b"PDF content"
-            )
-            pdf_file = PDFService.generate_document_pdf(concept_plan.document)
+        pdf_file = PDFService.generate_document_pdf(concept_plan.document)
 
         # Assert
         assert pdf_file is not None
         assert pdf_file.name == f"concept_{concept_plan.document.pk}.pdf"
         mock_render.assert_called_once()
-        mock_subprocess.assert_called_once()
+        mock_prince.assert_called_once()
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_generate_document_pdf_custom_template(self, mock_render, mock_subprocess):
+    def test_generate_document_pdf_custom_template(self, mock_render, mock_prince):
         """Test generate_document_pdf uses custom template"""
         # Arrange
         from documents.tests.factories import ConceptPlanFactory
 
         concept_plan = ConceptPlanFactory()
         mock_render.return_value = "<html>Custom template</html>"
-        mock_subprocess.return_value = Mock(returncode=0, stderr="")
+        mock_prince.return_value = b"PDF content"
 
         # Act
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                b"PDF content"
-            )
-            pdf_file = PDFService.generate_document_pdf(
-                concept_plan.document, template_name="custom_template.html"
-            )
+        pdf_file = PDFService.generate_document_pdf(
+            concept_plan.document, template_name="custom_template.html"
+        )
 
         # Assert
         assert pdf_file is not None
@@ -79,46 +96,44 @@ class TestPDFService:
         assert "custom_template.html" in call_args[0][0]
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_generate_document_pdf_prince_failure(self, mock_render, mock_subprocess):
+    def test_generate_document_pdf_prince_failure(self, mock_render, mock_prince):
         """Test generate_document_pdf handles Prince XML failure"""
         # Arrange
         from documents.tests.factories import ConceptPlanFactory
 
         concept_plan = ConceptPlanFactory()
         mock_render.return_value = "<html>Test document</html>"
-        mock_subprocess.return_value = Mock(returncode=1, stderr="Prince error")
+        mock_prince.side_effect = ValidationError("Prince XML failed: Prince error")
 
         # Act & Assert
         with pytest.raises(ValidationError, match="Prince XML failed"):
             PDFService.generate_document_pdf(concept_plan.document)
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_generate_document_pdf_timeout(self, mock_render, mock_subprocess):
+    def test_generate_document_pdf_timeout(self, mock_render, mock_prince):
         """Test generate_document_pdf handles timeout"""
         # Arrange
-        from subprocess import TimeoutExpired
-
         from documents.tests.factories import ConceptPlanFactory
 
         concept_plan = ConceptPlanFactory()
         mock_render.return_value = "<html>Test document</html>"
-        mock_subprocess.side_effect = TimeoutExpired("prince", 300)
+        mock_prince.side_effect = ValidationError("PDF generation timed out")
 
         # Act & Assert
         with pytest.raises(ValidationError, match="timed out"):
             PDFService.generate_document_pdf(concept_plan.document)
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_generate_document_pdf_template_error(self, mock_render, mock_subprocess):
+    def test_generate_document_pdf_template_error(self, mock_render, mock_prince):
         """Test generate_document_pdf handles template rendering error"""
         # Arrange
         from documents.tests.factories import ConceptPlanFactory
@@ -131,50 +146,42 @@ class TestPDFService:
             PDFService.generate_document_pdf(concept_plan.document)
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
     def test_generate_annual_report_pdf_success(
-        self, mock_render, mock_subprocess, annual_report
+        self, mock_render, mock_prince, annual_report
     ):
         """Test generate_annual_report_pdf creates PDF successfully"""
         # Arrange
         mock_render.return_value = "<html>Annual report</html>"
-        mock_subprocess.return_value = Mock(returncode=0, stderr="")
+        mock_prince.return_value = b"PDF content"
 
         # Act
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                b"PDF content"
-            )
-            pdf_file = PDFService.generate_annual_report_pdf(annual_report)
+        pdf_file = PDFService.generate_annual_report_pdf(annual_report)
 
         # Assert
         assert pdf_file is not None
         assert pdf_file.name == f"annual_report_{annual_report.year}.pdf"
         mock_render.assert_called_once()
-        mock_subprocess.assert_called_once()
+        mock_prince.assert_called_once()
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
     def test_generate_annual_report_pdf_custom_template(
-        self, mock_render, mock_subprocess, annual_report
+        self, mock_render, mock_prince, annual_report
     ):
         """Test generate_annual_report_pdf uses custom template"""
         # Arrange
         mock_render.return_value = "<html>Custom annual report</html>"
-        mock_subprocess.return_value = Mock(returncode=0, stderr="")
+        mock_prince.return_value = b"PDF content"
 
         # Act
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                b"PDF content"
-            )
-            pdf_file = PDFService.generate_annual_report_pdf(
-                annual_report, template_name="custom_annual.html"
-            )
+        pdf_file = PDFService.generate_annual_report_pdf(
+            annual_report, template_name="custom_annual.html"
+        )
 
         # Assert
         assert pdf_file is not None
@@ -183,16 +190,18 @@ class TestPDFService:
         assert "custom_annual.html" in call_args[0][0]
 
     @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
+    @patch("documents.services.pdf_service.PrinceService.render")
     @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
     def test_generate_annual_report_pdf_failure(
-        self, mock_render, mock_subprocess, annual_report
+        self, mock_render, mock_prince, annual_report
     ):
         """Test generate_annual_report_pdf handles failure"""
         # Arrange
         mock_render.return_value = "<html>Annual report</html>"
-        mock_subprocess.return_value = Mock(returncode=1, stderr="Generation failed")
+        mock_prince.side_effect = ValidationError(
+            "Prince XML failed: Generation failed"
+        )
 
         # Act & Assert
         with pytest.raises(ValidationError, match="Prince XML failed"):
@@ -374,70 +383,568 @@ class TestPDFService:
         concept_plan.document.refresh_from_db()
         assert concept_plan.document.pdf_generation_in_progress is False
 
-    @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
-    @patch("documents.services.pdf_service.render_to_string")
     @pytest.mark.unit
-    def test_html_to_pdf_success(self, mock_render, mock_subprocess):
-        """Test _html_to_pdf converts HTML to PDF"""
+    def test_html_to_pdf_success(self, fake_prince):
+        """Test _html_to_pdf pipes HTML through Prince and returns the PDF"""
         # Arrange
         html_content = "<html><body>Test</body></html>"
-        mock_subprocess.return_value = Mock(returncode=0, stderr="")
 
         # Act
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                b"PDF content"
-            )
-            pdf_content = PDFService._html_to_pdf(html_content)
+        pdf_content = PDFService._html_to_pdf(html_content)
 
         # Assert
-        assert pdf_content == b"PDF content"
-        mock_subprocess.assert_called_once()
-        # Verify Prince command was called correctly
-        call_args = mock_subprocess.call_args
-        assert "prince" in call_args[0][0]
+        assert pdf_content.startswith(b"%PDF-1.4")
+        assert f"source-bytes {len(html_content)}".encode() in pdf_content
 
-    @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
     @pytest.mark.unit
-    def test_html_to_pdf_prince_error(self, mock_subprocess):
+    def test_html_to_pdf_prince_error(self, fake_prince, monkeypatch):
         """Test _html_to_pdf handles Prince error"""
         # Arrange
-        html_content = "<html><body>Test</body></html>"
-        mock_subprocess.return_value = Mock(returncode=1, stderr="Prince error message")
+        monkeypatch.setenv("FAKE_PRINCE_FAIL", "Prince error message")
 
         # Act & Assert
-        with pytest.raises(ValidationError, match="Prince XML failed"):
-            PDFService._html_to_pdf(html_content)
+        with pytest.raises(ValidationError, match="Prince error message"):
+            PDFService._html_to_pdf("<html><body>Test</body></html>")
 
-    @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
     @pytest.mark.unit
-    def test_html_to_pdf_timeout_error(self, mock_subprocess):
-        """Test _html_to_pdf handles timeout"""
+    def test_html_to_pdf_timeout_error(self, fake_prince, monkeypatch):
+        """Test _html_to_pdf kills Prince when it runs too long"""
         # Arrange
-        from subprocess import TimeoutExpired
-
-        html_content = "<html><body>Test</body></html>"
-        mock_subprocess.side_effect = TimeoutExpired("prince", 300)
+        monkeypatch.setenv("FAKE_PRINCE_DELAY", "5")
+        monkeypatch.setattr("documents.services.prince_service.PRINCE_TIMEOUT", 0.5)
 
         # Act & Assert
         with pytest.raises(ValidationError, match="timed out"):
-            PDFService._html_to_pdf(html_content)
+            PDFService._html_to_pdf("<html><body>Test</body></html>")
 
-    @pytest.mark.django_db
-    @patch("documents.services.pdf_service.subprocess.run")
     @pytest.mark.unit
-    def test_html_to_pdf_generic_error(self, mock_subprocess):
-        """Test _html_to_pdf handles generic errors"""
+    def test_html_to_pdf_generic_error(self, settings):
+        """Test _html_to_pdf handles a missing Prince binary"""
         # Arrange
-        html_content = "<html><body>Test</body></html>"
-        mock_subprocess.side_effect = Exception("Unexpected error")
+        settings.PRINCE_BINARY = "/nonexistent/prince"
 
         # Act & Assert
         with pytest.raises(ValidationError, match="PDF generation error"):
-            PDFService._html_to_pdf(html_content)
+            PDFService._html_to_pdf("<html><body>Test</body></html>")
+
+
+class TestPrinceService:
+    """Test the bounded Prince renderer pool"""
+
+    @pytest.mark.unit
+    def test_render_many_preserves_order(self, fake_prince):
+        """Test batch renders return results in input order"""
+        # Arrange
+        html_contents = ["<p>a</p>", "<p>bb</p>", "<p>ccc</p>"]
+
+        # Act
+        results = PrinceService.render_many(html_contents)
+
+        # Assert
+        assert len(results) == 3
+        for html_content, pdf_content in zip(html_contents, results):
+            assert f"source-bytes {len(html_content)}".encode() in pdf_content
+
+    @pytest.mark.unit
+    def test_render_many_runs_concurrently(self, fake_prince, monkeypatch, settings):
+        """Test the pool runs up to PRINCE_MAX_WORKERS renders at once"""
+        # Arrange
+        import time
+
+        monkeypatch.setenv("FAKE_PRINCE_DELAY", "0.5")
+
+        # Act
+        started = time.monotonic()
+        results = PrinceService.render_many(["<p>x</p>"] * 4)
+        elapsed = time.monotonic() - started
+
+        # Assert
+        assert all(isinstance(r, bytes) for r in results)
+        # Four half-second renders on four workers, not two seconds in series
+        assert elapsed < 1.5
+
+    @pytest.mark.unit
+    def test_render_polls_cancel_check_until_done(self, fake_prince, monkeypatch):
+        """Test a render outlasting several cancellation polls still completes"""
+        # Arrange
+        monkeypatch.setenv("FAKE_PRINCE_DELAY", "0.5")
+        monkeypatch.setattr(
+            "documents.services.prince_service.CANCEL_POLL_INTERVAL", 0.1
+        )
+        checks = []
+
+        def cancel_check():
+            checks.append(True)
+            return False
+
+        # Act
+        pdf_content = PrinceService.render("<p>slow</p>", cancel_check=cancel_check)
+
+        # Assert
+        assert pdf_content.startswith(b"%PDF-1.4")
+        assert len(checks) >= 2
+
+    @pytest.mark.unit
+    def test_render_rejects_when_pool_is_full(self, fake_prince, settings):
+        """Test callers give up once PRINCE_QUEUE_TIMEOUT passes without a slot"""
+        # Arrange
+        from documents.services.prince_service import PrinceBusyError
+
+        settings.PRINCE_QUEUE_TIMEOUT = 0.2
+        slots = PrinceService._get_slots()
+        for _ in range(settings.PRINCE_MAX_WORKERS):
+            slots.acquire()
+
+        # Act & Assert
+        try:
+            with pytest.raises(PrinceBusyError):
+                PrinceService.render("<p>x</p>")
+        finally:
+            for _ in range(settings.PRINCE_MAX_WORKERS):
+                slots.release()
+
+    @pytest.mark.unit
+    def test_render_records_metrics(self, fake_prince):
+        """Test each render updates the pool metrics"""
+        # Arrange
+        before = PrinceService.get_metrics()
+
+        # Act
+        PrinceService.render("<p>metrics</p>")
+        after = PrinceService.get_metrics()
+
+        # Assert
+        assert after["renders"] == before["renders"] + 1
+        assert after["bytes_out"] > before["bytes_out"]
+        assert after["running"] == 0
+        assert after["max_workers"] == 4
+
+
+class TestAnnualReportFragmentService:
+    """Test incremental rendering of annual report sections"""
+
+    @pytest.fixture
+    def fragment_cache(self, settings):
+        """Use a real cache so fragments persist between builds"""
+        from django.core.cache import cache
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "annual-report-fragments",
+            }
+        }
+        cache.clear()
+        yield cache
+        cache.clear()
+
+    @pytest.fixture
+    def approved_reports(self, db, progress_report_with_details, project_lead):
+        """Two approved progress reports in one business area"""
+        from documents.models import ProgressReport
+
+        project = ProjectFactory(
+            business_area=progress_report_with_details.project.business_area
+        )
+        project.members.create(user=project_lead, is_leader=True, role="research")
+        second = ProgressReport.objects.create(
+            document=ProjectDocumentFactory(
+                project=project, kind="progressreport", status="approved"
+            ),
+            project=project,
+            report=progress_report_with_details.report,
+            year=progress_report_with_details.year,
+            context="<p>Second context</p>",
+        )
+        progress_report_with_details.document.status = "approved"
+        progress_report_with_details.document.save()
+        return progress_report_with_details, second
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_build_sections_includes_approved_reports(
+        self, approved_reports, student_report_with_details
+    ):
+        """Test approved reports are grouped into their business area chapter"""
+        # Arrange
+        first, second = approved_reports
+
+        # Act
+        sections = AnnualReportFragmentService.build_sections(first.report)
+
+        # Assert
+        assert len(sections["ba_chapter_fragments"]) == 1
+        assert len(sections["ba_summary_table_fragments"]) == 1
+        chapter = sections["ba_chapter_fragments"][0]
+        assert first.project.business_area.name in chapter
+        assert "Test context" in chapter
+        assert "Second context" in chapter
+        # Student report is still "new", so it is left out
+        assert sections["student_report_fragments"] == []
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_build_sections_reuses_cached_fragments(
+        self, approved_reports, fragment_cache
+    ):
+        """Test an unchanged rebuild renders nothing"""
+        # Arrange
+        first, _ = approved_reports
+        expected = AnnualReportFragmentService.build_sections(first.report)
+
+        # Act
+        with patch.object(
+            AnnualReportFragmentService,
+            "_render",
+            wraps=AnnualReportFragmentService._render,
+        ) as mock_render:
+            sections = AnnualReportFragmentService.build_sections(first.report)
+
+        # Assert
+        assert sections == expected
+        mock_render.assert_not_called()
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_edit_rerenders_only_affected_project(
+        self, approved_reports, fragment_cache, django_capture_on_commit_callbacks
+    ):
+        """Test editing one report re-renders its fragments and its chapter"""
+        # Arrange
+        first, second = approved_reports
+        AnnualReportFragmentService.build_sections(first.report)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            second.context = "<p>Edited context</p>"
+            second.save()
+        with patch.object(
+            AnnualReportFragmentService,
+            "_render",
+            wraps=AnnualReportFragmentService._render,
+        ) as mock_render:
+            sections = AnnualReportFragmentService.build_sections(first.report)
+
+        # Assert
+        rendered = [call.args[0] for call in mock_render.call_args_list]
+        assert rendered.count("progress_report.html") == 1
+        assert rendered.count("ba_chapter.html") == 1
+        assert "Edited context" in sections["ba_chapter_fragments"][0]
+        assert "Test context" in sections["ba_chapter_fragments"][0]
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_login_does_not_invalidate_fragments(
+        self, approved_reports, fragment_cache, django_capture_on_commit_callbacks
+    ):
+        """Test saving unrelated user fields keeps the user's projects cached"""
+        # Arrange
+        first, _ = approved_reports
+        user = first.project.members.first().user
+        key = AnnualReportFragmentService.dependency_key(PROJECT, first.project_id)
+        AnnualReportFragmentService.build_sections(first.report)
+        token = fragment_cache.get(key)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save(update_fields=["last_login"])
+
+        # Assert
+        assert token is not None
+        assert fragment_cache.get(key) == token
+
+
+class TestPDFCacheService:
+    """Test PDFCacheService hit/miss behaviour"""
+
+    @pytest.mark.unit
+    def test_compute_render_hash_is_stable(self):
+        """Test identical HTML hashes identically and edits change the hash"""
+        # Act
+        first = PDFCacheService.compute_render_hash("<html>A</html>")
+        second = PDFCacheService.compute_render_hash("<html>A</html>")
+        edited = PDFCacheService.compute_render_hash("<html>B</html>")
+
+        # Assert
+        assert first == second
+        assert first != edited
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_cache_service.PDFService._html_to_pdf")
+    @patch("documents.services.pdf_cache_service.PDFService.render_document_html")
+    @pytest.mark.unit
+    def test_get_document_pdf_miss_then_hit(
+        self, mock_render, mock_html_to_pdf, project_document, settings, tmp_path
+    ):
+        """Test the first download renders and an unchanged repeat does not"""
+        # Arrange
+        settings.MEDIA_ROOT = str(tmp_path)
+        mock_render.return_value = "<html>Test document</html>"
+        mock_html_to_pdf.return_value = b"%PDF-1.4 cached"
+
+        # Act
+        with patch("medias.models._validate_and_save_file"):
+            first_pdf, first_hit = PDFCacheService.get_document_pdf(project_document)
+            second_pdf, second_hit = PDFCacheService.get_document_pdf(project_document)
+
+        # Assert
+        assert first_hit is False
+        assert second_hit is True
+        assert second_pdf.pk == first_pdf.pk
+        mock_html_to_pdf.assert_called_once()
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_cache_service.PDFService._html_to_pdf")
+    @patch("documents.services.pdf_cache_service.PDFService.render_document_html")
+    @pytest.mark.unit
+    def test_get_document_pdf_rerenders_after_change(
+        self, mock_render, mock_html_to_pdf, project_document, settings, tmp_path
+    ):
+        """Test a change to the rendered HTML invalidates the stored PDF"""
+        # Arrange
+        settings.MEDIA_ROOT = str(tmp_path)
+        mock_html_to_pdf.return_value = b"%PDF-1.4 cached"
+
+        # Act
+        with patch("medias.models._validate_and_save_file"):
+            mock_render.return_value = "<html>Before edit</html>"
+            PDFCacheService.get_document_pdf(project_document)
+            mock_render.return_value = "<html>After edit</html>"
+            pdf, cache_hit = PDFCacheService.get_document_pdf(project_document)
+
+        # Assert
+        assert cache_hit is False
+        assert mock_html_to_pdf.call_count == 2
+        assert pdf.render_hash == PDFCacheService.compute_render_hash(
+            "<html>After edit</html>"
+        )
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_cache_service.PDFService.render_document_html")
+    @pytest.mark.integration
+    def test_refresh_document_pdfs_renders_only_misses(
+        self, mock_render, project_document, fake_prince, settings, tmp_path
+    ):
+        """Test a batch refresh renders stale PDFs on the pool and skips current ones"""
+        # Arrange
+        settings.MEDIA_ROOT = str(tmp_path)
+        mock_render.return_value = "<html>Batch</html>"
+
+        # Act
+        with patch("medias.models._validate_and_save_file"):
+            first = PDFCacheService.refresh_document_pdfs([project_document])
+            second = PDFCacheService.refresh_document_pdfs([project_document])
+
+        # Assert
+        assert first == {"rendered": 1, "cached": 0, "failed": []}
+        assert second == {"rendered": 0, "cached": 1, "failed": []}
+        project_document.pdf.file.open("rb")
+        assert project_document.pdf.file.read().startswith(b"%PDF-1.4")
+
+
+class TestPDFJobService:
+    """Test PDFJobService queue logic"""
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_enqueue_document_creates_job(self, project_document, user):
+        """Test enqueue_document queues a job and sets the in-progress flag"""
+        # Act
+        job, created = PDFJobService.enqueue_document(project_document, user)
+
+        # Assert
+        assert created is True
+        assert job.status == PDFRenderJob.StatusChoices.QUEUED
+        assert job.document == project_document
+        assert job.requested_by == user
+        project_document.refresh_from_db()
+        assert project_document.pdf_generation_in_progress is True
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_enqueue_document_deduplicates(self, project_document, user):
+        """Test enqueue_document reuses an in-flight job"""
+        # Arrange
+        first_job, _ = PDFJobService.enqueue_document(project_document, user)
+
+        # Act
+        second_job, created = PDFJobService.enqueue_document(project_document, user)
+
+        # Assert
+        assert created is False
+        assert second_job.pk == first_job.pk
+        assert PDFRenderJob.objects.filter(document=project_document).count() == 1
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_enqueue_annual_report_creates_job(self, annual_report):
+        """Test enqueue_annual_report queues a report job"""
+        # Act
+        job, created = PDFJobService.enqueue_annual_report(annual_report)
+
+        # Assert
+        assert created is True
+        assert job.target == PDFRenderJob.TargetChoices.ANNUALREPORT
+        assert job.report == annual_report
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_claim_next_job(self, project_document, annual_report):
+        """Test claim_next_job claims the oldest queued job"""
+        # Arrange
+        first_job, _ = PDFJobService.enqueue_document(project_document)
+        PDFJobService.enqueue_annual_report(annual_report)
+
+        # Act
+        job = PDFJobService.claim_next_job("worker-1")
+
+        # Assert
+        assert job.pk == first_job.pk
+        assert job.status == PDFRenderJob.StatusChoices.RUNNING
+        assert job.worker == "worker-1"
+        assert job.started_at is not None
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_claim_next_job_empty_queue(self):
+        """Test claim_next_job returns None when nothing is queued"""
+        # Act & Assert
+        assert PDFJobService.claim_next_job() is None
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_job_service.PDFCacheService.get_document_pdf")
+    @pytest.mark.unit
+    def test_run_job_completes(self, mock_get_pdf, project_document):
+        """Test run_job renders through the cache and clears the flag"""
+        # Arrange
+        mock_get_pdf.return_value = (Mock(), False)
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+
+        # Act
+        PDFJobService.run_job(job)
+
+        # Assert
+        job.refresh_from_db()
+        assert job.status == PDFRenderJob.StatusChoices.COMPLETED
+        assert job.progress == 100
+        mock_get_pdf.assert_called_once()
+        project_document.refresh_from_db()
+        assert project_document.pdf_generation_in_progress is False
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_job_service.PDFCacheService.get_document_pdf")
+    @pytest.mark.unit
+    def test_run_job_failure(self, mock_get_pdf, project_document):
+        """Test run_job records the error when rendering fails"""
+        # Arrange
+        mock_get_pdf.side_effect = ValidationError("Prince XML failed")
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+
+        # Act
+        PDFJobService.run_job(job)
+
+        # Assert
+        job.refresh_from_db()
+        assert job.status == PDFRenderJob.StatusChoices.FAILED
+        assert "Prince XML failed" in job.error
+        project_document.refresh_from_db()
+        assert project_document.pdf_generation_in_progress is False
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_job_service.PDFCacheService.get_document_pdf")
+    @pytest.mark.unit
+    def test_run_job_keeps_edits_made_during_render(
+        self, mock_get_pdf, project_document
+    ):
+        """Test clearing the flag doesn't save the worker's stale copy"""
+        # Arrange
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+
+        def edit_during_render(document, cancel_check=None):
+            ProjectDocument.objects.filter(pk=document.pk).update(
+                status=ProjectDocument.StatusChoices.INAPPROVAL
+            )
+            return Mock(), False
+
+        mock_get_pdf.side_effect = edit_during_render
+
+        # Act
+        PDFJobService.run_job(job)
+
+        # Assert
+        project_document.refresh_from_db()
+        assert project_document.status == ProjectDocument.StatusChoices.INAPPROVAL
+        assert project_document.pdf_generation_in_progress is False
+
+    @pytest.mark.django_db
+    @patch("documents.services.pdf_cache_service.PDFCacheService.store_pdf")
+    @patch("documents.services.pdf_cache_service.PDFService._html_to_pdf")
+    @patch("documents.services.pdf_cache_service.PDFService.render_document_html")
+    @pytest.mark.unit
+    def test_run_job_cancelled(
+        self, mock_render, mock_html_to_pdf, mock_store, project_document
+    ):
+        """Test run_job discards the render when the job is cancelled"""
+        # Arrange
+        mock_render.return_value = "<html>Test document</html>"
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+
+        def cancel_during_render(html_content, cancel_check=None):
+            PDFService.cancel_pdf_generation(project_document)
+            PDFJobService.cancel_jobs_for(project_document)
+            return b"PDF content"
+
+        mock_html_to_pdf.side_effect = cancel_during_render
+
+        # Act
+        PDFJobService.run_job(job)
+
+        # Assert
+        job.refresh_from_db()
+        assert job.status == PDFRenderJob.StatusChoices.CANCELLED
+        mock_store.assert_not_called()
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_is_cancelled_when_flag_cleared(self, project_document):
+        """Test is_cancelled honours the pdf_generation_in_progress flag"""
+        # Arrange
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+        assert PDFJobService.is_cancelled(job) is False
+
+        # Act
+        PDFService.cancel_pdf_generation(project_document)
+
+        # Assert
+        assert PDFJobService.is_cancelled(job) is True
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_fail_stale_jobs(self, project_document):
+        """Test fail_stale_jobs fails jobs abandoned by a dead worker"""
+        # Arrange
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        PDFJobService.enqueue_document(project_document)
+        job = PDFJobService.claim_next_job()
+        PDFRenderJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(hours=1)
+        )
+
+        # Act
+        failed = PDFJobService.fail_stale_jobs(timedelta(minutes=15))
+
+        # Assert
+        assert failed == 1
+        job.refresh_from_db()
+        assert job.status == PDFRenderJob.StatusChoices.FAILED
 
 
 class TestNotificationService:
@@ -957,8 +1464,8 @@ class TestEmailService:
     """Test EmailService business logic"""
 
     @pytest.mark.django_db
-    @patch("documents.services.email_service.send_email_with_embedded_image")
-    @patch("documents.services.email_service.render_to_string")
+    @patch("documents.services.email_service.EmailOutboxService.enqueue")
+    @patch("documents.services.email_service.EmailAssetRegistry.render")
     @pytest.mark.unit
     def test_send_template_email_success(self, mock_render, mock_send):
         """Test send_template_email sends email correctly"""
@@ -980,8 +1487,8 @@ class TestEmailService:
         mock_send.assert_called_once()
 
     @pytest.mark.django_db
-    @patch("documents.services.email_service.send_email_with_embedded_image")
-    @patch("documents.services.email_service.render_to_string")
+    @patch("documents.services.email_service.EmailOutboxService.enqueue")
+    @patch("documents.services.email_service.EmailAssetRegistry.render")
     @pytest.mark.unit
     def test_send_template_email_failure(self, mock_render, mock_send):
         """Test send_template_email raises error on failure"""
@@ -1039,3 +1546,327 @@ class TestEmailService:
                 recipients=recipients,
                 actioning_user=user,
             )
+
+
+class TestEmailOutboxService:
+    """Test EmailOutboxService queue and delivery"""
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_enqueue_does_not_send(self, mailoutbox, settings):
+        """Test enqueue stores the message without contacting the mail server"""
+        # Act
+        message = EmailOutboxService.enqueue(
+            recipient_email=["leader@example.com"],
+            subject="SPMS: New Reporting Cycle Open",
+            html_content="<p>Hello</p>",
+        )
+
+        # Assert
+        assert message.status == OutboundEmail.StatusChoices.QUEUED
+        assert message.from_email == settings.DEFAULT_FROM_EMAIL
+        assert mailoutbox == []
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_send_batch_reuses_one_connection(self, mailoutbox):
+        """Test a claimed batch is delivered over a single connection"""
+        # Arrange
+        for index in range(3):
+            EmailOutboxService.enqueue([f"user{index}@example.com"], "Hi", "<p>Hi</p>")
+        messages = EmailOutboxService.claim_batch("worker-1")
+
+        # Act
+        with patch(
+            "documents.services.email_outbox_service.get_connection",
+            wraps=get_connection,
+        ) as mock_get_connection:
+            results = EmailOutboxService.send_batch(messages)
+
+        # Assert
+        assert results == {"sent": 3, "retrying": 0, "failed": 0}
+        assert mock_get_connection.call_count == 1
+        assert len(mailoutbox) == 3
+        assert mailoutbox[0].alternatives[0][0] == "<p>Hi</p>"
+        assert set(OutboundEmail.objects.values_list("status", flat=True)) == {
+            OutboundEmail.StatusChoices.SENT
+        }
+
+    @pytest.mark.django_db
+    @pytest.mark.unit
+    def test_claim_batch_skips_messages_not_due(self):
+        """Test messages waiting out a retry delay are not claimed"""
+        # Arrange
+        message = EmailOutboxService.enqueue(["a@example.com"], "Hi", "<p>Hi</p>")
+        OutboundEmail.objects.filter(pk=message.pk).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        # Act
+        claimed = EmailOutboxService.claim_batch("worker-1")
+
+        # Assert
+        assert claimed == []
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_send_failure_retries_with_backoff(self, settings):
+        """Test failed sends are requeued with a doubling delay, then failed"""
+        # Arrange
+        settings.EMAIL_MAX_ATTEMPTS = 2
+        settings.EMAIL_RETRY_BASE_DELAY = 60
+        message = EmailOutboxService.enqueue(["a@example.com"], "Hi", "<p>Hi</p>")
+
+        # Act
+        with patch(
+            "django.core.mail.EmailMultiAlternatives.send",
+            side_effect=Exception("Mailbox unavailable"),
+        ):
+            first = EmailOutboxService.send_batch(
+                EmailOutboxService.claim_batch("worker-1")
+            )
+            message.refresh_from_db()
+            retry_at = message.next_attempt_at
+            OutboundEmail.objects.filter(pk=message.pk).update(
+                next_attempt_at=timezone.now()
+            )
+            second = EmailOutboxService.send_batch(
+                EmailOutboxService.claim_batch("worker-1")
+            )
+
+        # Assert
+        assert first == {"sent": 0, "retrying": 1, "failed": 0}
+        assert retry_at > timezone.now() + timedelta(seconds=50)
+        assert second == {"sent": 0, "retrying": 0, "failed": 1}
+        message.refresh_from_db()
+        assert message.status == OutboundEmail.StatusChoices.FAILED
+        assert message.attempts == 2
+        assert message.last_error == "Mailbox unavailable"
+
+    @pytest.mark.unit
+    def test_get_retry_delay_is_capped(self, settings):
+        """Test the backoff doubles per attempt up to the maximum"""
+        # Arrange
+        settings.EMAIL_RETRY_BASE_DELAY = 60
+        settings.EMAIL_RETRY_MAX_DELAY = 300
+
+        # Act
+        delays = [EmailOutboxService.get_retry_delay(n) for n in (1, 2, 3, 4)]
+
+        # Assert
+        assert [d.total_seconds() for d in delays] == [60, 120, 240, 300]
+
+    @pytest.mark.django_db
+    @pytest.mark.integration
+    def test_run_email_worker_once(self, mailoutbox):
+        """Test the worker command drains the outbox and exits"""
+        # Arrange
+        EmailOutboxService.enqueue(["a@example.com"], "Hi", "<p>Hi</p>")
+
+        # Act
+        # The worker recycles connections between batches, which would close
+        # the test transaction's connection
+        with patch(
+            "documents.management.commands.run_email_worker.close_old_connections"
+        ):
+            call_command("run_email_worker", "--once", stdout=StringIO())
+
+        # Assert
+        assert len(mailoutbox) == 1
+        assert OutboundEmail.objects.get().status == OutboundEmail.StatusChoices.SENT
+
+
+def library_response(*titles):
+    """A library API response listing publications with these titles"""
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "response": {
+            "numFound": len(titles),
+            "start": 0,
+            "numFoundExact": True,
+            "docs": [{"DocId": title} for title in titles],
+        }
+    }
+    return response
+
+
+class TestPublicationCacheService:
+    """Tests for stale-while-revalidate library publications"""
+
+    @pytest.fixture(autouse=True)
+    def publication_cache(self, settings):
+        """Use a real cache so entries and the circuit breaker persist"""
+        from django.core.cache import cache
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "publications",
+            }
+        }
+        settings.LIBRARY_API_URL = "http://library.test/search?q="
+        settings.LIBRARY_BEARER_TOKEN = "token"
+        cache.clear()
+        yield cache
+        cache.clear()
+
+    @staticmethod
+    def cache_entry(employee_id, age, *titles):
+        """Cache library publications fetched age seconds ago"""
+        from django.conf import settings
+        from django.core.cache import cache
+
+        cache.set(
+            settings.CACHE_KEYS["library_publications"].format(employee_id=employee_id),
+            {
+                "data": {
+                    "numFound": len(titles),
+                    "docs": [{"DocId": t} for t in titles],
+                },
+                "fetched_at": time.time() - age,
+            },
+        )
+
+    @pytest.mark.unit
+    def test_fresh_entry_served_without_refresh(self):
+        """Test a fresh entry is returned as is"""
+        # Arrange
+        self.cache_entry("E1", 60, "Cached")
+
+        # Act
+        with patch.object(PublicationCacheService, "refresh_async") as mock_refresh:
+            data = PublicationCacheService.get_library_publications("E1")
+
+        # Assert
+        assert data["docs"] == [{"DocId": "Cached"}]
+        mock_refresh.assert_not_called()
+
+    @pytest.mark.unit
+    def test_stale_entry_served_while_refreshing(self, settings):
+        """Test an entry near or past expiry is returned and refreshed behind"""
+        # Arrange
+        self.cache_entry(
+            "E1",
+            settings.LIBRARY_PUBLICATIONS_FRESH_FOR + 60,
+            "Stale",
+        )
+
+        # Act
+        with patch.object(PublicationCacheService, "refresh_async") as mock_refresh:
+            data = PublicationCacheService.get_library_publications("E1")
+
+        # Assert
+        assert data["docs"] == [{"DocId": "Stale"}]
+        mock_refresh.assert_called_once_with("E1")
+
+    @patch("documents.services.publication_cache_service.requests.get")
+    @pytest.mark.unit
+    def test_refresh_async_updates_cache(self, mock_get):
+        """Test a background refresh fetches and caches new publications"""
+        # Arrange
+        self.cache_entry("E1", 10**7, "Stale")
+        mock_get.return_value = library_response("New")
+
+        # Act
+        future = PublicationCacheService.refresh_async("E1")
+        future.result(timeout=5)
+
+        # Assert
+        entry = PublicationCacheService.get_cached_entry("E1")
+        assert entry["data"]["docs"][0]["DocId"] == "New"
+        assert not PublicationCacheService.needs_refresh(entry)
+
+    @patch("documents.services.publication_cache_service.requests.get")
+    @pytest.mark.unit
+    def test_miss_waits_briefly(self, mock_get, settings):
+        """Test a miss returns the fetch if quick, else carries on behind"""
+        # Arrange
+        settings.LIBRARY_MISS_WAIT = 0.05
+
+        def slow_response(*args, **kwargs):
+            time.sleep(0.5)
+            return library_response("Slow")
+
+        mock_get.side_effect = slow_response
+
+        # Act & Assert
+        with pytest.raises(LibraryUnavailable, match="loading"):
+            PublicationCacheService.get_library_publications("E1")
+        PublicationCacheService.refresh_async("E1").result(timeout=5)
+        data = PublicationCacheService.get_library_publications("E1")
+        assert data["docs"][0]["DocId"] == "Slow"
+
+    @patch("documents.services.publication_cache_service.requests.get")
+    @pytest.mark.unit
+    def test_circuit_breaker_opens(self, mock_get, settings):
+        """Test repeated failures stop calls to the library for a while"""
+        # Arrange
+        settings.LIBRARY_CIRCUIT_FAILURES = 2
+        mock_get.side_effect = requests.ConnectionError("down")
+
+        # Act
+        for _ in range(2):
+            with pytest.raises(LibraryUnavailable):
+                PublicationCacheService.refresh("E1")
+
+        # Assert
+        assert PublicationCacheService.is_circuit_open()
+        with pytest.raises(LibraryUnavailable, match="temporarily unavailable"):
+            PublicationCacheService.get_library_publications("E2")
+        assert mock_get.call_count == 2
+
+    @pytest.mark.integration
+    def test_staff_publications_cached_until_changed(
+        self,
+        staff_profile,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test the profile half is cached and dropped when a publication changes"""
+        # Arrange
+        employee_id = staff_profile.employee_id
+        PublicationCacheService.get_staff_publications(employee_id)
+
+        # Act
+        with django_assert_num_queries(0):
+            cached = PublicationCacheService.get_staff_publications(employee_id)
+        with django_capture_on_commit_callbacks(execute=True):
+            CustomPublication.objects.create(
+                public_profile=staff_profile, title="Added", year=2024
+            )
+
+        # Assert
+        assert cached["staffProfilePk"] == staff_profile.pk
+        assert cached["customPublications"] == []
+        refreshed = PublicationCacheService.get_staff_publications(employee_id)
+        assert [p["title"] for p in refreshed["customPublications"]] == ["Added"]
+
+    @patch("documents.services.publication_cache_service.requests.get")
+    @pytest.mark.integration
+    def test_warm_command(self, mock_get, staff_profile, settings):
+        """Test warm_publication_cache fetches visible staff, stopping on outage"""
+        # Arrange
+        from users.models import PublicStaffProfile
+
+        PublicStaffProfile.objects.create(user=UserFactory(), employee_id="67890")
+        PublicStaffProfile.objects.create(
+            user=UserFactory(), employee_id="11111", is_hidden=True
+        )
+        mock_get.return_value = library_response("Warmed")
+        out = StringIO()
+
+        # Act
+        call_command("warm_publication_cache", stdout=out)
+
+        # Assert
+        assert "2 fetched, 0 failed" in out.getvalue()
+        entry = PublicationCacheService.get_cached_entry(staff_profile.employee_id)
+        assert entry["data"]["docs"][0]["DocId"] == "Warmed"
+        call_command("warm_publication_cache", "--due", stdout=out)
+        assert mock_get.call_count == 2
+
+        settings.LIBRARY_CIRCUIT_FAILURES = 1
+        mock_get.side_effect = requests.Timeout()
+        with pytest.raises(CommandError, match="failing"):
+            call_command("warm_publication_cache", stdout=StringIO())
@@ -530,29 +530,40 @@ class TestGetCurrentMaintainerId:
 class TestGetEncodedImage:
     """Tests for get_encoded_image"""
 
-    @patch("builtins.open")
-    @patch("os.path.join")
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        from config.email_assets import EmailAssetRegistry
+
+        EmailAssetRegistry.clear()
+        yield
+        EmailAssetRegistry.clear()
+
     @pytest.mark.unit
-    def test_get_encoded_image_success(self, mock_join, mock_open):
+    def test_get_encoded_image_success(self):
         """Test successful image encoding"""
-        mock_join.return_value = "/path/to/image.jpg"
-        mock_open.return_value.__enter__.return_value.read.return_value = (
-            b"fake_image_data"
-        )
-
         result = get_encoded_image()
 
         assert result.startswith("data:image/jpeg;base64,")
 
     @patch("builtins.open", side_effect=FileNotFoundError)
-    @patch("os.path.join")
     @pytest.mark.unit
-    def test_get_encoded_image_not_found(self, mock_join, mock_open):
+    def test_get_encoded_image_not_found(self, mock_open):
         """Test image not found"""
         result = get_encoded_image()
 
         assert result == ""
 
+    @pytest.mark.unit
+    def test_get_encoded_image_reads_file_once(self):
+        """Test the image is read once and then served from memory"""
+        first = get_encoded_image()
+
+        with patch("builtins.open", side_effect=FileNotFoundError) as mock_open:
+            second = get_encoded_image()
+
+        assert second == first
+        mock_open.assert_not_called()
+
 
 # ============================================================================
 # HTML TABLE TESTS
@@ -717,7 +728,7 @@ class TestJsonToHtmlTable:
 class TestEmailTemplateRenderer:
     """Tests for EmailTemplateRenderer"""
 
-    @patch("documents.utils.email_templates.render_to_string")
+    @patch("documents.utils.email_templates.EmailAssetRegistry.render")
     @pytest.mark.unit
     def test_render_template(self, mock_render):
         """Test rendering email template"""
@@ -732,7 +743,7 @@ class TestEmailTemplateRenderer:
             "./email_templates/test.html", {"key": "value"}
         )
 
-    @patch("documents.utils.email_templates.render_to_string")
+    @patch("documents.utils.email_templates.EmailAssetRegistry.render")
     @pytest.mark.integration
     def test_render_document_email_approved(self, mock_render, project_document, user):
         """Test rendering approved document email"""
@@ -748,7 +759,7 @@ class TestEmailTemplateRenderer:
         assert subject == "Document Approved"
         assert html == "<html>Approved</html>"
 
-    @patch("documents.utils.email_templates.render_to_string")
+    @patch("documents.utils.email_templates.EmailAssetRegistry.render")
     @pytest.mark.integration
     def test_render_document_email_recalled(self, mock_render, project_document, user):
         """Test rendering recalled document email"""
@@ -764,7 +775,7 @@ class TestEmailTemplateRenderer:
         assert subject == "Document Recalled"
         assert html == "<html>Recalled</html>"
 
-    @patch("documents.utils.email_templates.render_to_string")
+    @patch("documents.utils.email_templates.EmailAssetRegistry.render")
     @pytest.mark.integration
     def test_render_document_email_unknown_type(
         self, mock_render, project_document, user
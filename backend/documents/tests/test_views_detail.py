@@ -133,6 +133,66 @@ class TestBatchApproveOld:
         # Assert
         assert response.status_code == status.HTTP_202_ACCEPTED
 
+    @pytest.mark.integration
+    def test_batch_approve_old_refreshes_cached_project_lists(
+        self,
+        api_client,
+        superuser,
+        project_with_lead,
+        annual_report,
+        settings,
+        django_capture_on_commit_callbacks,
+        db,
+    ):
+        """Test reactivated projects show as active in cached project lists"""
+        # Arrange
+        from datetime import datetime
+
+        from django.core.cache import cache
+
+        from documents.models import AnnualReport
+        from projects.services.project_service import ProjectService
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-batch-approve-old",
+            }
+        }
+        cache.clear()
+        api_client.force_authenticate(user=superuser)
+        project_with_lead.status = "updating"
+        project_with_lead.save()
+        lead = project_with_lead.members.filter(is_leader=True).first().user
+        old_report = AnnualReport.objects.create(
+            year=2022,
+            is_published=False,
+            date_open=datetime(2022, 1, 1),
+            date_closed=datetime(2022, 12, 31),
+        )
+        ProgressReport.objects.create(
+            document=ProjectDocumentFactory(
+                project=project_with_lead,
+                kind="progressreport",
+                status="inapproval",
+                project_lead_approval_granted=True,
+                business_area_lead_approval_granted=True,
+            ),
+            project=project_with_lead,
+            report=old_report,
+            year=2022,
+        )
+        assert ProjectService.get_user_projects(lead.pk)[0]["status"] == "updating"
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(documents_urls.path("batchapproveold"))
+
+        # Assert
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert ProjectService.get_user_projects(lead.pk)[0]["status"] == "active"
+        cache.clear()
+
     @pytest.mark.integration
     def test_batch_approve_old_as_non_superuser(self, api_client, user, db):
         """Test batch approving old reports as non-superuser"""
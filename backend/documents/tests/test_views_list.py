@@ -698,16 +698,14 @@ class TestRecallDocument:
 class TestBatchApprove:
     """Tests for BatchApprove view - batch approve multiple documents"""
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_success(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test successfully batch approving multiple documents"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_get.return_value = project_document
         mock_batch.return_value = {"approved": 1, "failed": 0}
 
         data = {"document_ids": [project_document.id], "stage": 1}
@@ -720,17 +718,16 @@ class TestBatchApprove:
         # Assert
         assert response.status_code == status.HTTP_200_OK
         assert response.data["approved"] == 1
-        # Verify batch_approve was called with correct parameters
+        # Verify bulk_approve was called with correct parameters
         assert mock_batch.called
         call_kwargs = mock_batch.call_args[1]
         assert call_kwargs["stage"] == 1
         assert call_kwargs["approver"] == user
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_multiple_documents(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test batch approving multiple documents at once"""
         # Arrange
@@ -738,7 +735,6 @@ class TestBatchApprove:
         doc2 = ProjectDocumentFactory(
             project=project_document.project, kind="projectplan"
         )
-        mock_get.side_effect = [project_document, doc2]
         mock_batch.return_value = {"approved": 2, "failed": 0}
 
         data = {"document_ids": [project_document.id, doc2.id], "stage": 2}
@@ -751,8 +747,12 @@ class TestBatchApprove:
         # Assert
         assert response.status_code == status.HTTP_200_OK
         assert response.data["approved"] == 2
-        # Verify get_document was called twice
-        assert mock_get.call_count == 2
+        # All documents are passed to the service in one call
+        mock_batch.assert_called_once()
+        assert mock_batch.call_args[1]["document_ids"] == [
+            project_document.id,
+            doc2.id,
+        ]
 
     @pytest.mark.integration
     def test_batch_approve_missing_document_ids(self, api_client, user, db):
@@ -819,15 +819,11 @@ class TestBatchApprove:
             status.HTTP_403_FORBIDDEN,
         ]
 
-    @patch("documents.services.document_service.DocumentService.get_document")
     @pytest.mark.integration
-    def test_batch_approve_document_not_found(self, mock_get, api_client, user, db):
-        """Test batch approve when document doesn't exist"""
+    def test_batch_approve_document_not_found(self, api_client, user, db):
+        """Test batch approve reports a missing document as failed"""
         # Arrange
-        from rest_framework.exceptions import NotFound
-
         api_client.force_authenticate(user=user)
-        mock_get.side_effect = NotFound("Document not found")
 
         data = {"document_ids": [99999], "stage": 1}
 
@@ -837,18 +833,20 @@ class TestBatchApprove:
         )
 
         # Assert
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["approved"] == []
+        assert response.data["failed"] == [
+            {"document_id": 99999, "error": "Document 99999 not found"}
+        ]
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_stage_1(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test batch approve at stage 1"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_get.return_value = project_document
         mock_batch.return_value = {"approved": 1, "failed": 0}
 
         data = {"document_ids": [project_document.id], "stage": 1}
@@ -865,16 +863,14 @@ class TestBatchApprove:
         call_kwargs = mock_batch.call_args[1]
         assert call_kwargs["stage"] == 1
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_stage_2(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test batch approve at stage 2"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_get.return_value = project_document
         mock_batch.return_value = {"approved": 1, "failed": 0}
 
         data = {"document_ids": [project_document.id], "stage": 2}
@@ -890,16 +886,14 @@ class TestBatchApprove:
         call_kwargs = mock_batch.call_args[1]
         assert call_kwargs["stage"] == 2
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_stage_3(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test batch approve at stage 3"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_get.return_value = project_document
         mock_batch.return_value = {"approved": 1, "failed": 0}
 
         data = {"document_ids": [project_document.id], "stage": 3}
@@ -915,11 +909,10 @@ class TestBatchApprove:
         call_kwargs = mock_batch.call_args[1]
         assert call_kwargs["stage"] == 3
 
-    @patch("documents.services.approval_service.ApprovalService.batch_approve")
-    @patch("documents.services.document_service.DocumentService.get_document")
+    @patch("documents.services.approval_service.ApprovalService.bulk_approve")
     @pytest.mark.integration
     def test_batch_approve_partial_failure(
-        self, mock_get, mock_batch, api_client, user, project_document, db
+        self, mock_batch, api_client, user, project_document, db
     ):
         """Test batch approve with some failures"""
         # Arrange
@@ -927,7 +920,6 @@ class TestBatchApprove:
         doc2 = ProjectDocumentFactory(
             project=project_document.project, kind="projectplan"
         )
-        mock_get.side_effect = [project_document, doc2]
         mock_batch.return_value = {
             "approved": 1,
             "failed": 1,
@@ -956,17 +948,19 @@ class TestBatchApprove:
 class TestDownloadProjectDocument:
     """Tests for download project document endpoint"""
 
-    @patch("documents.services.pdf_service.PDFService.generate_document_pdf")
+    @patch("documents.services.pdf_cache_service.PDFCacheService.get_document_pdf")
     @pytest.mark.integration
     def test_download_document_generates_pdf(
-        self, mock_generate, api_client, user, project_document, db
+        self, mock_get_pdf, api_client, user, project_document, db
     ):
-        """Test downloading document generates PDF if not exists - covers lines 35-42"""
+        """Test downloading document goes through the render cache"""
         # Arrange
         api_client.force_authenticate(user=user)
         from django.core.files.base import ContentFile
 
-        mock_generate.return_value = ContentFile(b"PDF content", name="test.pdf")
+        mock_pdf = Mock()
+        mock_pdf.file.open.return_value = ContentFile(b"PDF content", name="test.pdf")
+        mock_get_pdf.return_value = (mock_pdf, False)
 
         # Act
         response = api_client.get(
@@ -974,8 +968,44 @@ class TestDownloadProjectDocument:
         )
 
         # Assert
-        # May fail if document doesn't exist or permissions fail
-        assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND]
+        assert response.status_code == status.HTTP_200_OK
+        mock_get_pdf.assert_called_once()
+
+    @patch("documents.services.pdf_cache_service.PDFService._html_to_pdf")
+    @patch("documents.services.pdf_cache_service.PDFService.render_document_html")
+    @pytest.mark.integration
+    def test_download_document_repeat_uses_cache(
+        self,
+        mock_render,
+        mock_html_to_pdf,
+        api_client,
+        user,
+        project_document,
+        settings,
+        tmp_path,
+        db,
+    ):
+        """Test repeat downloads of an unchanged document skip Prince"""
+        # Arrange
+        settings.MEDIA_ROOT = str(tmp_path)
+        api_client.force_authenticate(user=user)
+        mock_render.return_value = "<html>Test document</html>"
+        mock_html_to_pdf.return_value = b"%PDF-1.4 cached"
+
+        # Act
+        with patch("medias.models._validate_and_save_file"):
+            first = api_client.get(
+                documents_urls.path("downloadProjectDocument", project_document.id)
+            )
+            second = api_client.get(
+                documents_urls.path("downloadProjectDocument", project_document.id)
+            )
+
+        # Assert
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert b"".join(second.streaming_content) == b"%PDF-1.4 cached"
+        mock_html_to_pdf.assert_called_once()
 
     @patch("documents.services.document_service.DocumentService.get_document")
     @pytest.mark.integration
@@ -996,6 +1026,7 @@ class TestDownloadProjectDocument:
         mock_doc.kind = "concept"
         mock_doc.pdf = Mock()
         mock_doc.pdf.file = ContentFile(b"Existing PDF", name="existing.pdf")
+        mock_doc.pdf.render_hash = ""
         mock_get_doc.return_value = mock_doc
 
         # Act
@@ -1070,32 +1101,53 @@ class TestBeginProjectDocGeneration:
         ]
 
     @patch("documents.services.pdf_service.PDFService.generate_document_pdf")
-    @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_started")
-    @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_complete")
     @pytest.mark.integration
-    def test_begin_pdf_generation_with_exception(
+    def test_begin_pdf_generation_queues_job(
         self,
-        mock_complete,
-        mock_start,
         mock_generate,
         api_client,
         user,
         project_document,
         db,
     ):
-        """Test PDF generation with exception - covers lines 64-68"""
+        """Test starting PDF generation queues a job instead of rendering inline"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.post(
+            documents_urls.path("generate_project_document", project_document.id)
+        )
+        duplicate = api_client.post(
+            documents_urls.path("generate_project_document", project_document.id)
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["job"]["status"] == "queued"
+        assert duplicate.data["job"]["id"] == response.data["job"]["id"]
+        mock_generate.assert_not_called()
+
+    @pytest.mark.integration
+    def test_generation_status(self, api_client, user, project_document, db):
+        """Test polling the latest render job for a document"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_generate.side_effect = Exception("PDF generation failed")
+        api_client.post(
+            documents_urls.path("generate_project_document", project_document.id)
+        )
 
-        # Act & Assert
-        with pytest.raises(Exception):
-            api_client.post(
-                documents_urls.path("generate_project_document", project_document.id)
+        # Act
+        response = api_client.get(
+            documents_urls.path(
+                "generate_project_document", project_document.id, "status"
             )
+        )
 
-        # Verify cleanup was called
-        mock_complete.assert_called_once()
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["pdf_generation_in_progress"] is True
+        assert response.data["job"]["status"] == "queued"
 
     @pytest.mark.integration
     def test_begin_pdf_generation_not_found(self, api_client, user, db):
@@ -1189,17 +1241,19 @@ class TestCancelProjectDocGeneration:
 class TestDownloadAnnualReport:
     """Tests for download annual report endpoint"""
 
-    @patch("documents.services.pdf_service.PDFService.generate_annual_report_pdf")
+    @patch("documents.services.pdf_cache_service.PDFCacheService.get_annual_report_pdf")
     @pytest.mark.integration
     def test_download_annual_report(
-        self, mock_generate, api_client, user, annual_report, db
+        self, mock_get_pdf, api_client, user, annual_report, db
     ):
-        """Test downloading annual report PDF - covers lines 110-118"""
+        """Test downloading annual report PDF goes through the render cache"""
         # Arrange
         api_client.force_authenticate(user=user)
         from django.core.files.base import ContentFile
 
-        mock_generate.return_value = ContentFile(b"PDF content", name="report.pdf")
+        mock_pdf = Mock()
+        mock_pdf.file.open.return_value = ContentFile(b"PDF content", name="report.pdf")
+        mock_get_pdf.return_value = (mock_pdf, False)
 
         # Act
         response = api_client.get(
@@ -1232,6 +1286,7 @@ class TestDownloadAnnualReport:
             mock_report.year = annual_report.year
             mock_report.pdf = Mock()
             mock_report.pdf.file = ContentFile(b"Existing PDF", name="existing.pdf")
+            mock_report.pdf.render_hash = ""
             mock_get.return_value = mock_report
 
             # Act
@@ -1277,11 +1332,9 @@ class TestBeginAnnualReportDocGeneration:
 
     @patch("documents.services.pdf_service.PDFService.generate_annual_report_pdf")
     @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_started")
-    @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_complete")
     @pytest.mark.integration
     def test_begin_annual_report_generation(
         self,
-        mock_complete,
         mock_start,
         mock_generate,
         api_client,
@@ -1289,12 +1342,9 @@ class TestBeginAnnualReportDocGeneration:
         annual_report,
         db,
     ):
-        """Test starting annual report PDF generation - covers lines 127-151"""
+        """Test starting annual report PDF generation queues a render job"""
         # Arrange
         api_client.force_authenticate(user=user)
-        from django.core.files.base import ContentFile
-
-        mock_generate.return_value = ContentFile(b"PDF content", name="report.pdf")
 
         # Act
         response = api_client.post(
@@ -1305,43 +1355,40 @@ class TestBeginAnnualReportDocGeneration:
         assert response.status_code == status.HTTP_202_ACCEPTED
         assert response.data["message"] == "PDF generation started"
         assert response.data["report_id"] == annual_report.id
+        assert response.data["job"]["target"] == "annualreport"
+        assert response.data["job"]["status"] == "queued"
 
-        # Verify service methods were called
+        # Rendering is left to the worker
         mock_start.assert_called_once_with(annual_report)
-        mock_generate.assert_called_once_with(annual_report)
-        mock_complete.assert_called_once_with(annual_report)
+        mock_generate.assert_not_called()
 
     @patch("documents.services.pdf_service.PDFService.generate_annual_report_pdf")
-    @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_started")
-    @patch("documents.services.pdf_service.PDFService.mark_pdf_generation_complete")
     @pytest.mark.integration
-    def test_begin_annual_report_generation_with_exception(
+    def test_begin_annual_report_generation_already_queued(
         self,
-        mock_complete,
-        mock_start,
         mock_generate,
         api_client,
         user,
         annual_report,
         db,
     ):
-        """Test annual report generation with exception - ensures cleanup is called"""
+        """Test a second request reuses the in-flight job"""
         # Arrange
         api_client.force_authenticate(user=user)
-        mock_generate.side_effect = Exception("PDF generation failed")
+        first = api_client.post(
+            documents_urls.path("reports", annual_report.id, "generate_pdf")
+        )
 
-        # Act - the view catches the exception and re-raises it
-        # The exception will propagate through the test client
-        with pytest.raises(Exception, match="PDF generation failed"):
-            api_client.post(
-                documents_urls.path("reports", annual_report.id, "generate_pdf")
-            )
+        # Act
+        response = api_client.post(
+            documents_urls.path("reports", annual_report.id, "generate_pdf")
+        )
 
-        # Assert - verify cleanup was called even though exception was raised
-        mock_start.assert_called_once_with(annual_report)
-        mock_generate.assert_called_once_with(annual_report)
-        # This is the critical assertion - mark_pdf_generation_complete should be called in the except block
-        mock_complete.assert_called_once_with(annual_report)
+        # Assert
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["message"] == "PDF generation already in progress"
+        assert response.data["job"]["id"] == first.data["job"]["id"]
+        mock_generate.assert_not_called()
 
     @pytest.mark.integration
     def test_begin_annual_report_generation_not_found(self, api_client, user, db):
@@ -1437,7 +1484,7 @@ class TestCancelReportDocGeneration:
 class TestNewCycleOpen:
     """Tests for new cycle open endpoint"""
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_new_cycle_open_superuser(
         self,
@@ -1499,7 +1546,7 @@ class TestNewCycleOpen:
             status.HTTP_403_FORBIDDEN,
         ]
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_new_cycle_open_with_emails(
         self,
@@ -1528,6 +1575,60 @@ class TestNewCycleOpen:
         # Assert
         assert response.status_code == status.HTTP_202_ACCEPTED
 
+    @pytest.mark.integration
+    def test_new_cycle_open_dry_run(self, api_client, superuser, annual_report, db):
+        """Test a dry run returns the planned counts without opening the cycle"""
+        # Arrange
+        from common.tests.factories import ProjectFactory
+        from documents.models import ProgressReport
+
+        project = ProjectFactory(status="active", kind="science")
+        api_client.force_authenticate(user=superuser)
+        data = {
+            "update": False,
+            "prepopulate": False,
+            "send_emails": False,
+            "dry_run": True,
+        }
+
+        # Act
+        response = api_client.post(
+            documents_urls.path("opennewcycle"), data, format="json"
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["progress_reports"] == 1
+        assert response.data["dry_run"] is True
+        assert not ProgressReport.objects.filter(project=project).exists()
+
+    @pytest.mark.integration
+    def test_new_cycle_open_dry_run_false_string(
+        self, api_client, superuser, annual_report, db
+    ):
+        """Test a "false" dry_run string opens the cycle for real"""
+        # Arrange
+        from common.tests.factories import ProjectFactory
+        from documents.models import ProgressReport
+
+        project = ProjectFactory(status="active", kind="science")
+        api_client.force_authenticate(user=superuser)
+        data = {
+            "update": False,
+            "prepopulate": False,
+            "send_emails": False,
+            "dry_run": "false",
+        }
+
+        # Act
+        response = api_client.post(
+            documents_urls.path("opennewcycle"), data, format="json"
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert ProgressReport.objects.filter(project=project).exists()
+
     @pytest.mark.integration
     def test_new_cycle_open_no_annual_report(self, api_client, superuser, db):
         """Test opening new cycle when no annual report exists"""
@@ -1552,7 +1653,7 @@ class TestNewCycleOpen:
 class TestSendBumpEmails:
     """Tests for send bump emails endpoint"""
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_admin(
         self, mock_send_email, api_client, admin_user, project_with_lead, db
@@ -1626,7 +1727,7 @@ class TestSendBumpEmails:
             status.HTTP_403_FORBIDDEN,
         ]
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_multiple_documents(
         self,
@@ -1670,7 +1771,7 @@ class TestSendBumpEmails:
         # Assert
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST]
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_inactive_user(
         self,
@@ -1707,7 +1808,7 @@ class TestSendBumpEmails:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "errors" in response.data or "error" in response.data
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_user_not_found(
         self, mock_send_email, api_client, admin_user, project_with_lead, db
@@ -1736,7 +1837,7 @@ class TestSendBumpEmails:
         # Assert
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_email_error(
         self, mock_send_email, api_client, admin_user, project_with_lead, db
@@ -1766,7 +1867,7 @@ class TestSendBumpEmails:
         # Assert
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_bump_emails_different_document_kinds(
         self, mock_send_email, api_client, admin_user, project_with_lead, db
@@ -1811,7 +1912,7 @@ class TestSendBumpEmails:
 class TestUserPublications:
     """Tests for user publications endpoint"""
 
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_authenticated(
         self, mock_get, api_client, user, staff_profile, db
@@ -1836,7 +1937,7 @@ class TestUserPublications:
         assert "libraryData" in response.data
         assert "customPublications" in response.data
 
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_unauthenticated(
         self, mock_get, api_client, staff_profile, db
@@ -1871,7 +1972,7 @@ class TestUserPublications:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["libraryData"]["isError"] is True
 
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_api_error(
         self, mock_get, api_client, user, staff_profile, db
@@ -1880,12 +1981,6 @@ class TestUserPublications:
         # Arrange
         api_client.force_authenticate(user=user)
 
-        # Clear cache to ensure we hit the API
-        from django.core.cache import cache
-
-        cache_key = f"user_publications_{staff_profile.employee_id}"
-        cache.delete(cache_key)
-
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
@@ -1908,19 +2003,22 @@ class TestUserPublications:
             }
         }
     )
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_cached(
         self, mock_get, api_client, user, staff_profile, db
     ):
         """Test getting user publications from cache"""
         # Arrange
-        from datetime import timedelta
+        import time
 
+        from django.conf import settings
         from django.core.cache import cache
 
         api_client.force_authenticate(user=user)
-        cache_key = f"user_publications_{staff_profile.employee_id}"
+        cache_key = settings.CACHE_KEYS["library_publications"].format(
+            employee_id=staff_profile.employee_id
+        )
 
         # Set cache
         cached_data = {
@@ -1931,7 +2029,7 @@ class TestUserPublications:
             "isError": False,
             "errorMessage": "",
         }
-        cache.set(cache_key, cached_data, timeout=timedelta(hours=24).total_seconds())
+        cache.set(cache_key, {"data": cached_data, "fetched_at": time.time()})
 
         # Act
         response = api_client.get(
@@ -1943,7 +2041,7 @@ class TestUserPublications:
         assert response.data["libraryData"]["numFound"] == 5
         assert not mock_get.called  # Should not call API when cached
 
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_with_custom_publications(
         self, mock_get, api_client, user, staff_profile, db
@@ -1977,7 +2075,7 @@ class TestUserPublications:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["customPublications"]) == 1
 
-    @patch("documents.views.notifications.requests.get")
+    @patch("documents.services.publication_cache_service.requests.get")
     @pytest.mark.integration
     def test_get_user_publications_no_staff_profile(
         self, mock_get, api_client, user, db
@@ -2043,7 +2141,7 @@ class TestUserPublications:
 class TestSendMentionNotification:
     """Tests for send mention notification endpoint"""
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification(
         self, mock_send_email, api_client, user, project_document, project_with_lead, db
@@ -2142,7 +2240,7 @@ class TestSendMentionNotification:
             status.HTTP_403_FORBIDDEN,
         ]
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification_with_html_content(
         self, mock_send_email, api_client, user, project_document, project_with_lead, db
@@ -2175,7 +2273,7 @@ class TestSendMentionNotification:
         # Assert
         assert response.status_code == status.HTTP_200_OK
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification_inactive_user(
         self,
@@ -2217,7 +2315,7 @@ class TestSendMentionNotification:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["recipients"] == 0  # Inactive user not included
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification_non_dbca_email(
         self,
@@ -2259,7 +2357,7 @@ class TestSendMentionNotification:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["recipients"] == 0  # Non-DBCA email not included
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification_user_not_found(
         self, mock_send_email, api_client, user, project_document, project_with_lead, db
@@ -2293,7 +2391,7 @@ class TestSendMentionNotification:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["recipients"] == 0  # User not found, skipped
 
-    @patch("documents.views.notifications.send_email_with_embedded_image")
+    @patch("documents.views.notifications.EmailOutboxService.enqueue")
     @pytest.mark.integration
     def test_send_mention_notification_email_error(
         self, mock_send_email, api_client, user, project_document, project_with_lead, db
@@ -2455,6 +2553,32 @@ class TestProjectDocsPendingMyActionAllStages:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["directorate"]) >= 0  # May or may not have documents
 
+    @pytest.mark.integration
+    def test_get_pending_documents_compact(
+        self, api_client, project_lead, project_with_lead, db
+    ):
+        """Test compact mode lists each document once, referenced by ID"""
+        # Arrange
+        api_client.force_authenticate(user=project_lead)
+        doc = ProjectDocumentFactory(
+            project=project_with_lead,
+            kind="concept",
+            status="inapproval",
+            project_lead_approval_granted=False,
+        )
+
+        # Act
+        response = api_client.get(
+            documents_urls.path("projectdocuments", "pendingmyaction"),
+            {"compact": "true"},
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["documents"]] == [doc.pk]
+        assert response.data["lead"] == [doc.pk]
+        assert "all" not in response.data
+
     @pytest.mark.integration
     def test_get_pending_documents_no_user_work(self, api_client, db):
         """Test getting pending documents when user has no work relationship"""
@@ -36,6 +36,10 @@ urlpatterns = [
         "reports/<int:pk>/cancel_doc_gen",
         views.CancelReportDocGeneration.as_view(),
     ),
+    path(
+        "reports/<int:pk>/generate_pdf/status",
+        views.ReportDocGenerationStatus.as_view(),
+    ),
     # Admin Latest Report ========================================================
     path("actions/finalApproval", views.FinalDocApproval.as_view()),
     path("student_reports/update_progress", views.UpdateStudentReport.as_view()),
@@ -105,6 +109,11 @@ urlpatterns = [
         "generate_project_document/<int:pk>", views.BeginProjectDocGeneration.as_view()
     ),
     path("cancel_doc_gen/<int:pk>", views.CancelProjectDocGeneration.as_view()),
+    path(
+        "generate_project_document/<int:pk>/status",
+        views.ProjectDocGenerationStatus.as_view(),
+    ),
+    path("pdf_jobs/<int:pk>", views.PDFRenderJobDetail.as_view()),
     # EMAILS (Testing) ========================================================
     # path("spms_link_email", views.SPMSInviteEmail.as_view()),  # TODO: Not yet implemented
     # path("new_cycle_email", views.NewCycleOpenEmail.as_view()),  # TODO: Not yet implemented
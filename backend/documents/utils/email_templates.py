@@ -2,7 +2,7 @@
 Email template utilities
 """
 
-from django.template.loader import render_to_string
+from config.email_assets import EmailAssetRegistry
 
 
 class EmailTemplateRenderer:
@@ -23,7 +23,7 @@ class EmailTemplateRenderer:
             str: Rendered HTML content
         """
         template_path = f"{cls.TEMPLATE_DIR}{template_name}"
-        return render_to_string(template_path, context)
+        return EmailAssetRegistry.render(template_path, context)
 
     @classmethod
     def render_document_email(
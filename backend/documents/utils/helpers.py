@@ -236,23 +236,11 @@ def extract_text_content(html_content):
 
 def get_encoded_image():
     """
-    Get base64 encoded DBCA logo image
+    Get base64 encoded DBCA logo image, read once per process
 
     Returns:
-        str: Base64 encoded image string
+        str: Base64 encoded image string, or "" if the image is missing
     """
-    import base64
-    import os
+    from config.email_assets import EmailAssetRegistry
 
-    from django.conf import settings
-
-    # Path to DBCA logo
-    image_path = os.path.join(settings.BASE_DIR, "config", "dbca.jpg")
-
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return f"data:image/jpeg;base64,{encoded_string}"
-    except FileNotFoundError:
-        # Return empty string if image not found
-        return ""
+    return EmailAssetRegistry.get_data_url("dbca_logo")
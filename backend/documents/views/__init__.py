@@ -81,6 +81,9 @@ from .pdf import (
     CancelReportDocGeneration,
     DownloadAnnualReport,
     DownloadProjectDocument,
+    PDFRenderJobDetail,
+    ProjectDocGenerationStatus,
+    ReportDocGenerationStatus,
 )
 
 # Progress report views
@@ -125,6 +128,9 @@ __all__ = [
     "DownloadAnnualReport",
     "BeginAnnualReportDocGeneration",
     "CancelReportDocGeneration",
+    "ProjectDocGenerationStatus",
+    "ReportDocGenerationStatus",
+    "PDFRenderJobDetail",
     # Concept plan
     "ConceptPlans",
     "ConceptPlanDetail",
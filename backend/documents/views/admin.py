@@ -18,8 +18,9 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
-from projects.models import Project, ProjectMember
-from users.models import User
+from common.utils.tagged_cache import TaggedCache, make_tag
+from projects.models import Project
+from users.services.dashboard_count_service import DashboardCountService
 
 from ..models import (  # Comment,  # TODO: Comment model not yet implemented
     AnnualReport,
@@ -31,6 +32,7 @@ from ..serializers import (  # TinyCommentSerializer,  # TODO: Comment serialize
     ProjectDocumentSerializer,
     TinyProjectDocumentSerializer,
 )
+from ..services.pending_action_service import PendingActionService
 
 
 class ProjectDocsPendingMyActionAllStages(APIView):
@@ -39,285 +41,24 @@ class ProjectDocsPendingMyActionAllStages(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        """Get documents pending action for current user"""
+        """
+        Get documents pending action for current user
+
+        Each document is serialized once. With ?compact=true, documents are
+        listed once under "documents" and each bucket holds their IDs.
+        """
         settings.LOGGER.info(
             msg=f"{request.user} is getting their documents pending action"
         )
 
-        documents = []
-        member_input_required = []
-        pl_input_required = []
-        ba_input_required = []
-        directorate_input_required = []
-
-        # Optimize query with select_related
-        small_user_object = (
-            User.objects.filter(pk=request.user.pk)
-            .select_related("work", "work__business_area")
-            .prefetch_related("business_areas_led")
-            .first()
-        )
-
-        if small_user_object:
-            # Handle users without work relationship
-            ba = getattr(small_user_object, "work", None)
-            ba = ba.business_area if ba else None
-            is_directorate = (
-                ba is not None and ba.name == "Directorate"
-            ) or request.user.is_superuser
-
-            active_projects = Project.objects.exclude(
-                status__in=Project.CLOSED_ONLY
-            ).all()
-
-            # Check if the user is a leader of any business area
-            business_areas_led = small_user_object.business_areas_led.values_list(
-                "id", flat=True
-            )
-
-            is_ba_leader = len(business_areas_led) >= 1
-
-            if is_ba_leader:
-                # Filter for projects which the user leads
-                ba_projects = active_projects.filter(
-                    business_area__pk__in=business_areas_led
-                ).all()
-
-                # Extract project IDs for Business Area
-                ba_project_ids = ba_projects.values_list("id", flat=True)
-
-                # Fetch all documents requiring BA attention with optimized relationships
-                docs_requiring_ba_attention = (
-                    ProjectDocument.objects.exclude(
-                        status=ProjectDocument.StatusChoices.APPROVED
-                    )
-                    .filter(
-                        project__in=ba_project_ids,
-                        project_lead_approval_granted=True,
-                        business_area_lead_approval_granted=False,
-                    )
-                    .select_related(
-                        "project",
-                        "project__business_area",
-                        "project__business_area__image",
-                        "project__business_area__division",
-                        "project__business_area__division__director",
-                        "project__business_area__division__approver",
-                        "project__business_area__leader",
-                        "project__business_area__caretaker",
-                        "project__business_area__finance_admin",
-                        "project__business_area__data_custodian",
-                        "project__image",
-                        "project__image__uploader",
-                        "pdf",
-                        "pdf__document",
-                        "pdf__project",
-                        "creator",
-                        "modifier",
-                    )
-                    .prefetch_related(
-                        "project__business_area__division__directorate_email_list",
-                    )
-                    .all()
-                )
-
-                # Append the documents to the respective lists
-                documents.extend(docs_requiring_ba_attention)
-                ba_input_required.extend(docs_requiring_ba_attention)
-
-            # Directorate Filtering
-            if is_directorate:
-                # Extract project IDs for Directorate
-                directorate_project_ids = active_projects.values_list("id", flat=True)
-
-                # Fetch all documents requiring Directorate attention with optimized relationships
-                docs_requiring_directorate_attention = (
-                    ProjectDocument.objects.exclude(
-                        status=ProjectDocument.StatusChoices.APPROVED
-                    )
-                    .filter(
-                        project__in=directorate_project_ids,
-                        business_area_lead_approval_granted=True,
-                        directorate_approval_granted=False,
-                    )
-                    .select_related(
-                        "project",
-                        "project__business_area",
-                        "project__business_area__image",
-                        "project__business_area__division",
-                        "project__business_area__division__director",
-                        "project__business_area__division__approver",
-                        "project__business_area__leader",
-                        "project__business_area__caretaker",
-                        "project__business_area__finance_admin",
-                        "project__business_area__data_custodian",
-                        "project__image",
-                        "project__image__uploader",
-                        "pdf",
-                        "pdf__document",
-                        "pdf__project",
-                        "creator",
-                        "modifier",
-                    )
-                    .prefetch_related(
-                        "project__business_area__division__directorate_email_list",
-                    )
-                    .all()
-                )
-
-                # Append the documents to the respective lists
-                documents.extend(docs_requiring_directorate_attention)
-                directorate_input_required.extend(docs_requiring_directorate_attention)
-
-            # Lead Filtering - optimized the membership query
-            all_leader_memberships = ProjectMember.objects.filter(
-                project__in=active_projects, user=small_user_object, is_leader=True
-            ).select_related("project")
-
-            # Extract project IDs for projects where the user is a lead
-            lead_project_ids = [
-                membership.project_id for membership in all_leader_memberships
-            ]
-
-            # Fetch all documents requiring lead attention with optimized relationships
-            docs_requiring_lead_attention = (
-                ProjectDocument.objects.exclude(
-                    status=ProjectDocument.StatusChoices.APPROVED
-                )
-                .filter(
-                    project__in=lead_project_ids,
-                    project_lead_approval_granted=False,
-                )
-                .select_related(
-                    "project",
-                    "project__business_area",
-                    "project__business_area__image",
-                    "project__business_area__division",
-                    "project__business_area__division__director",
-                    "project__business_area__division__approver",
-                    "project__business_area__leader",
-                    "project__business_area__caretaker",
-                    "project__business_area__finance_admin",
-                    "project__business_area__data_custodian",
-                    "project__image",
-                    "project__image__uploader",
-                    "pdf",
-                    "pdf__document",
-                    "pdf__project",
-                    "creator",
-                    "modifier",
-                )
-                .prefetch_related(
-                    "project__business_area__division__directorate_email_list",
-                )
-                .all()
-            )
-
-            # Separate the documents based on lead and member input
-            for doc in docs_requiring_lead_attention:
-                documents.append(doc)
-                if doc.project_id in lead_project_ids:
-                    pl_input_required.append(doc)
-
-            # Optimized this query too (N+1)
-            my_non_leader_memberships = (
-                ProjectMember.objects.filter(user=request.user, is_leader=False)
-                .select_related("project")
-                .all()
-            )
-
-            my_projects = [
-                membership.project for membership in my_non_leader_memberships
-            ]
-
-            docs_requiring_team_attention = (
-                ProjectDocument.objects.exclude(
-                    status=ProjectDocument.StatusChoices.APPROVED
-                )
-                .filter(project_lead_approval_granted=False, project__in=my_projects)
-                .select_related(
-                    "project",
-                    "project__business_area",
-                    "project__business_area__image",
-                    "project__business_area__division",
-                    "project__business_area__division__director",
-                    "project__business_area__division__approver",
-                    "project__business_area__leader",
-                    "project__business_area__caretaker",
-                    "project__business_area__finance_admin",
-                    "project__business_area__data_custodian",
-                    "project__image",
-                    "project__image__uploader",
-                    "pdf",
-                    "pdf__document",
-                    "pdf__project",
-                    "creator",
-                    "modifier",
-                )
-                .prefetch_related(
-                    "project__business_area__division__directorate_email_list",
-                )
-                .all()
-            )
-
-            for doc in docs_requiring_team_attention:
-                documents.append(doc)
-                member_input_required.append(doc)
-
-            filtered_documents = list({doc.id: doc for doc in documents}.values())
-            filtered_pm_input_required = list(
-                {doc.id: doc for doc in member_input_required}.values()
-            )
-            filtered_pl_input_required = list(
-                {doc.id: doc for doc in pl_input_required}.values()
-            )
-            filtered_ba_input_required = list(
-                {doc.id: doc for doc in ba_input_required}.values()
-            )
-            filtered_directorate_input_required = list(
-                {doc.id: doc for doc in directorate_input_required}.values()
-            )
+        compact = request.query_params.get("compact", "").lower() in ("true", "1")
+        pending = PendingActionService.get_pending([request.user.pk])
+        data = PendingActionService.serialize(pending, request, compact=compact)
 
-            ser = TinyProjectDocumentSerializer(
-                filtered_documents,
-                many=True,
-                context={"request": request},
-            )
-
-            data = {
-                "all": ser.data,
-                "team": TinyProjectDocumentSerializer(
-                    filtered_pm_input_required,
-                    many=True,
-                    context={"request": request},
-                ).data,
-                "lead": TinyProjectDocumentSerializer(
-                    filtered_pl_input_required,
-                    many=True,
-                    context={"request": request},
-                ).data,
-                "ba": TinyProjectDocumentSerializer(
-                    filtered_ba_input_required,
-                    many=True,
-                    context={"request": request},
-                ).data,
-                "directorate": TinyProjectDocumentSerializer(
-                    filtered_directorate_input_required,
-                    many=True,
-                    context={"request": request},
-                ).data,
-            }
-
-            return Response(
-                data,
-                status=HTTP_200_OK,
-            )
-        else:
-            data = {"all": [], "team": [], "lead": [], "ba": [], "directorate": []}
-            return Response(
-                data,
-                status=HTTP_200_OK,
-            )
+        return Response(
+            data,
+            status=HTTP_200_OK,
+        )
 
 
 # TODO: Comment model and serializers not yet implemented
@@ -701,6 +442,15 @@ class BatchApproveOld(APIView):
             if projects_to_update:
                 Project.objects.bulk_update(projects_to_update, ["status"])
 
+            # Bulk updates don't send the signals that refresh dashboard counts
+            # and cached project lists
+            DashboardCountService.invalidate_projects(
+                {doc.project_id for doc in docs_to_update}
+            )
+            TaggedCache.invalidate(
+                make_tag("project", project.pk) for project in projects_to_update
+            )
+
         except Exception as e:
             settings.LOGGER.error(msg=f"{e}")
             return Response(
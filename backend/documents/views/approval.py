@@ -246,12 +246,9 @@ class BatchApprove(APIView):
                 status=HTTP_400_BAD_REQUEST,
             )
 
-        # Get documents
-        documents = [DocumentService.get_document(doc_id) for doc_id in document_ids]
-
-        # Delegate to service
-        results = ApprovalService.batch_approve(
-            documents=documents, approver=request.user, stage=int(stage)
+        # Delegate to service; documents not found are reported as failed
+        results = ApprovalService.bulk_approve(
+            document_ids=document_ids, approver=request.user, stage=int(stage)
         )
 
         return Response(results, status=HTTP_200_OK)
@@ -2,14 +2,8 @@
 Notification views - Admin notification operations
 """
 
-from datetime import timedelta
-
-import requests
 from django.conf import settings
-from django.core.cache import cache
-from django.db import transaction
-from django.db.models import Q
-from django.template.loader import render_to_string
+from rest_framework.fields import BooleanField
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import (
@@ -23,26 +17,19 @@ from rest_framework.status import (
 from rest_framework.views import APIView
 
 from agencies.models import BusinessArea
-from config.helpers import send_email_with_embedded_image
+from config.email_assets import EmailAssetRegistry
 from projects.models import Project
-from users.models import PublicStaffProfile, User
-
-from ..models import (
-    AnnualReport,
-    CustomPublication,
-    ProgressReport,
-    ProjectDocument,
-    StudentReport,
-)
-from ..serializers import (
-    CustomPublicationSerializer,
-    LibraryPublicationResponseSerializer,
-    ProgressReportCreateSerializer,
-    ProjectDocumentCreateSerializer,
-    PublicationResponseSerializer,
-    StudentReportCreateSerializer,
+from users.models import User
+
+from ..models import AnnualReport, ProjectDocument
+from ..serializers import PublicationResponseSerializer
+from ..services.email_outbox_service import EmailOutboxService
+from ..services.publication_cache_service import (
+    LibraryUnavailable,
+    PublicationCacheService,
 )
-from ..utils.helpers import get_current_maintainer_id, get_encoded_image
+from ..services.report_cycle_service import ReportCycleService
+from ..utils.helpers import get_current_maintainer_id
 
 
 class NewCycleOpen(APIView):
@@ -56,6 +43,10 @@ class NewCycleOpen(APIView):
         should_update = request.data["update"]
         should_prepopulate = request.data["prepopulate"]
         should_email = request.data["send_emails"]
+        # Form posts send "false", which bool() would treat as a dry run
+        should_dry_run = BooleanField().to_internal_value(
+            request.data.get("dry_run", False)
+        )
 
         settings.LOGGER.warning(
             f"{request.user} is attempting to batch create new progress reports for latest year "
@@ -76,227 +67,19 @@ class NewCycleOpen(APIView):
                 status=HTTP_404_NOT_FOUND,
             )
 
-        # Get eligible science/core function projects
-        if should_update:
-            eligible_projects = Project.objects.filter(
-                Q(
-                    kind__in=[
-                        Project.CategoryKindChoices.SCIENCE,
-                        Project.CategoryKindChoices.COREFUNCTION,
-                    ]
-                )
-                & Q(status__in=["active", "updating", "suspended"])
-            )
-        else:
-            eligible_projects = Project.objects.filter(
-                Q(
-                    kind__in=[
-                        Project.CategoryKindChoices.SCIENCE,
-                        Project.CategoryKindChoices.COREFUNCTION,
-                    ]
-                )
-                & Q(status="active")
-            )
-
-        eligible_projects = eligible_projects.exclude(
-            documents__progress_report_details__report__year=last_report.year
+        result = ReportCycleService.open_cycle(
+            request.user,
+            last_report,
+            include_updating=should_update,
+            prepopulate=should_prepopulate,
+            dry_run=should_dry_run,
         )
-
-        # Get eligible student projects
-        if should_update:
-            eligible_student_projects = Project.objects.filter(
-                Q(status__in=["active", "updating", "suspended"])
-                & Q(kind__in=[Project.CategoryKindChoices.STUDENT])
-            )
-        else:
-            eligible_student_projects = Project.objects.filter(
-                Q(status="active") & Q(kind__in=[Project.CategoryKindChoices.STUDENT])
-            )
-
-        eligible_student_projects = eligible_student_projects.exclude(
-            documents__student_report_details__report__year=last_report.year
-        )
-
-        # Combine querysets
-        all_eligible_projects = eligible_projects | eligible_student_projects
-
-        # Create documents for each eligible project
-        for project in all_eligible_projects:
-            if project.kind == Project.CategoryKindChoices.STUDENT:
-                typeofdoc = ProjectDocument.CategoryKindChoices.STUDENTREPORT
-            elif project.kind in [
-                Project.CategoryKindChoices.SCIENCE,
-                Project.CategoryKindChoices.COREFUNCTION,
-            ]:
-                typeofdoc = ProjectDocument.CategoryKindChoices.PROGRESSREPORT
-            else:
-                continue
-
-            new_doc_data = {
-                "kind": typeofdoc,
-                "status": "new",
-                "modifier": request.user.pk,
-                "creator": request.user.pk,
-                "project": project.pk,
-            }
-
-            new_project_document = ProjectDocumentCreateSerializer(data=new_doc_data)
-
-            if new_project_document.is_valid():
-                with transaction.atomic():
-                    doc = new_project_document.save()
-
-                    if project.kind != Project.CategoryKindChoices.STUDENT:
-                        # Create progress report
-                        exists = ProgressReport.objects.filter(
-                            year=last_report.year, project=project.pk
-                        ).exists()
-
-                        if not exists:
-                            # Get previous report for prepopulation
-                            last_one = (
-                                ProgressReport.objects.filter(project=project.pk)
-                                .order_by("-year")
-                                .first()
-                            )
-
-                            if not should_prepopulate:
-                                # Prepopulate only aims, context, implications
-                                prepopulated_aims = (
-                                    last_one.aims if last_one else "<p></p>"
-                                )
-                                prepopulated_context = (
-                                    last_one.context if last_one else "<p></p>"
-                                )
-                                prepopulated_implications = (
-                                    last_one.implications if last_one else "<p></p>"
-                                )
-
-                                progress_report_data = {
-                                    "document": doc.pk,
-                                    "project": project.pk,
-                                    "report": last_report.pk,
-                                    "year": last_report.year,
-                                    "context": prepopulated_context,
-                                    "implications": prepopulated_implications,
-                                    "future": "<p></p>",
-                                    "progress": "<p></p>",
-                                    "aims": prepopulated_aims,
-                                }
-                            else:
-                                # Prepopulate with all last year's data
-                                if last_one:
-                                    progress_report_data = {
-                                        "document": doc.pk,
-                                        "project": project.pk,
-                                        "report": last_report.pk,
-                                        "year": last_report.year,
-                                        "context": last_one.context,
-                                        "implications": last_one.implications,
-                                        "future": last_one.future,
-                                        "progress": last_one.progress,
-                                        "aims": last_one.aims,
-                                    }
-                                else:
-                                    progress_report_data = {
-                                        "document": doc.pk,
-                                        "project": project.pk,
-                                        "report": last_report.pk,
-                                        "year": last_report.year,
-                                        "context": "<p></p>",
-                                        "implications": "<p></p>",
-                                        "future": "<p></p>",
-                                        "progress": "<p></p>",
-                                        "aims": "<p></p>",
-                                    }
-
-                            progress_report = ProgressReportCreateSerializer(
-                                data=progress_report_data
-                            )
-
-                            if progress_report.is_valid():
-                                progress_report.save()
-                                project.status = Project.StatusChoices.UPDATING
-                                project.save()
-                            else:
-                                settings.LOGGER.error(
-                                    f"Error validating progress report: {progress_report.errors}"
-                                )
-                                return Response(
-                                    progress_report.errors, HTTP_400_BAD_REQUEST
-                                )
-                        else:
-                            project.status = Project.StatusChoices.UPDATING
-                            project.save()
-                    else:
-                        # Create student report
-                        exists = StudentReport.objects.filter(
-                            year=last_report.year, project=project.pk
-                        ).exists()
-
-                        if not exists:
-                            # Get previous report for prepopulation
-                            last_one = (
-                                StudentReport.objects.filter(project=project.pk)
-                                .order_by("-year")
-                                .first()
-                            )
-
-                            if not should_prepopulate:
-                                student_report_data = {
-                                    "document": doc.pk,
-                                    "project": project.pk,
-                                    "report": last_report.pk,
-                                    "year": last_report.year,
-                                    "progress_report": "<p></p>",
-                                }
-                            else:
-                                # Prepopulate with last year's data
-                                if last_one:
-                                    student_report_data = {
-                                        "document": doc.pk,
-                                        "project": project.pk,
-                                        "report": last_report.pk,
-                                        "year": last_report.year,
-                                        "progress_report": last_one.progress_report,
-                                    }
-                                else:
-                                    student_report_data = {
-                                        "document": doc.pk,
-                                        "project": project.pk,
-                                        "report": last_report.pk,
-                                        "year": last_report.year,
-                                        "progress_report": "<p></p>",
-                                    }
-
-                            student_report = StudentReportCreateSerializer(
-                                data=student_report_data
-                            )
-
-                            if student_report.is_valid():
-                                student_report.save()
-                                project.status = Project.StatusChoices.UPDATING
-                                project.save()
-                            else:
-                                settings.LOGGER.error(
-                                    f"Error validating student report {student_report.errors}"
-                                )
-                                return Response(
-                                    student_report.errors, HTTP_400_BAD_REQUEST
-                                )
-                        else:
-                            project.status = Project.StatusChoices.UPDATING
-                            project.save()
-
-            else:
-                settings.LOGGER.error(
-                    f"Error opening new cycle: {new_project_document.errors}"
-                )
-                return Response(new_project_document.errors, HTTP_400_BAD_REQUEST)
+        if should_dry_run:
+            return Response(result, status=HTTP_200_OK)
 
         # Send emails if requested
         if should_email:
-            settings.LOGGER.info("Sending cycle opened emails")
+            settings.LOGGER.info("Queueing cycle opened emails")
             maintainer_id = get_current_maintainer_id()
             settings.DEFAULT_FROM_EMAIL
             template_path = "./email_templates/new_cycle_open_email.html"
@@ -325,7 +108,7 @@ class NewCycleOpen(APIView):
                 if recipient["pk"] not in processed:
                     if settings.ENVIRONMENT == "production":
                         settings.LOGGER.info(
-                            f"PRODUCTION: Sending email to {recipient['name']}"
+                            f"PRODUCTION: Queueing email to {recipient['name']}"
                         )
 
                         email_subject = "SPMS: New Reporting Cycle Open"
@@ -338,15 +121,15 @@ class NewCycleOpen(APIView):
                             "financial_year_string": financial_year_string,
                             "recipient_name": recipient["name"],
                             "site_url": settings.SITE_URL,
-                            "dbca_image_path": get_encoded_image(),
+                            "dbca_image_path": EmailAssetRegistry.cid("dbca_logo"),
                         }
 
-                        template_content = render_to_string(
+                        template_content = EmailAssetRegistry.render(
                             template_path, template_props
                         )
 
                         try:
-                            send_email_with_embedded_image(
+                            EmailOutboxService.enqueue(
                                 recipient_email=to_email,
                                 subject=email_subject,
                                 html_content=template_content,
@@ -361,7 +144,7 @@ class NewCycleOpen(APIView):
                         # Test environment - only send to maintainer
                         if recipient["pk"] == maintainer_id:
                             settings.LOGGER.info(
-                                f"TEST: Sending email to {recipient['name']}"
+                                f"TEST: Queueing email to {recipient['name']}"
                             )
 
                             email_subject = "SPMS: New Reporting Cycle Open"
@@ -374,15 +157,15 @@ class NewCycleOpen(APIView):
                                 "financial_year_string": financial_year_string,
                                 "recipient_name": recipient["name"],
                                 "site_url": settings.SITE_URL,
-                                "dbca_image_path": get_encoded_image(),
+                                "dbca_image_path": EmailAssetRegistry.cid("dbca_logo"),
                             }
 
-                            template_content = render_to_string(
+                            template_content = EmailAssetRegistry.render(
                                 template_path, template_props
                             )
 
                             try:
-                                send_email_with_embedded_image(
+                                EmailOutboxService.enqueue(
                                     recipient_email=to_email,
                                     subject=email_subject,
                                     html_content=template_content,
@@ -397,7 +180,7 @@ class NewCycleOpen(APIView):
 
             return Response("Emails Sent!", status=HTTP_202_ACCEPTED)
 
-        return Response(status=HTTP_202_ACCEPTED)
+        return Response(result, status=HTTP_202_ACCEPTED)
 
 
 class SendBumpEmails(APIView):
@@ -491,15 +274,17 @@ class SendBumpEmails(APIView):
                     "document_url": f"{settings.SITE_URL}/projects/{doc_data.get('projectId')}/{url_doc_kind}",
                 }
 
-                template_content = render_to_string(template_path, template_props)
+                template_content = EmailAssetRegistry.render(
+                    template_path, template_props
+                )
 
                 if settings.ENVIRONMENT == "production":
                     settings.LOGGER.info(
-                        f"PRODUCTION: Sending bump email to {user_to_action.email}"
+                        f"PRODUCTION: Queueing bump email to {user_to_action.email}"
                     )
 
                     try:
-                        send_email_with_embedded_image(
+                        EmailOutboxService.enqueue(
                             recipient_email=to_email,
                             subject=email_subject,
                             html_content=template_content,
@@ -515,11 +300,11 @@ class SendBumpEmails(APIView):
                     maintainer_id = get_current_maintainer_id()
                     if user_to_action.pk == maintainer_id:
                         settings.LOGGER.info(
-                            f"TEST: Sending bump email to {user_to_action.email}"
+                            f"TEST: Queueing bump email to {user_to_action.email}"
                         )
 
                         try:
-                            send_email_with_embedded_image(
+                            EmailOutboxService.enqueue(
                                 recipient_email=to_email,
                                 subject=email_subject,
                                 html_content=template_content,
@@ -561,7 +346,7 @@ class SendBumpEmails(APIView):
             )
 
         if emails_sent > 0:
-            settings.LOGGER.info(f"Successfully sent {emails_sent} bump emails")
+            settings.LOGGER.info(f"Successfully queued {emails_sent} bump emails")
             return Response(response_data, status=HTTP_200_OK)
         else:
             return Response(
@@ -573,6 +358,9 @@ class SendBumpEmails(APIView):
 class UserPublications(APIView):
     """
     Get user publications from library API and custom publications
+
+    Library publications come from PublicationCacheService, so a request
+    only waits on the library when nothing is cached for the employee.
     """
 
     def get_permissions(self):
@@ -597,27 +385,6 @@ class UserPublications(APIView):
             status=HTTP_200_OK,
         )
 
-    def _get_library_publications(self, employee_id):
-        api_url = f"{settings.LIBRARY_API_URL}{employee_id}&rows=1000"
-        token = settings.LIBRARY_BEARER_TOKEN.replace("Bearer ", "")
-        headers = {"Authorization": f"Bearer {token}"}
-
-        try:
-            response = requests.get(api_url, headers=headers, timeout=30)
-        except requests.Timeout:
-            settings.LOGGER.error(
-                f"Request to library API timed out for employee {employee_id}"
-            )
-            raise Exception("Library API request timed out")
-
-        if response.status_code != 200:
-            settings.LOGGER.error(
-                f"Failed to retrieve data from API:\n{response.status_code}: {response.text}"
-            )
-            raise Exception(f"API request failed with status {response.status_code}")
-
-        return response.json()
-
     def get(self, request, employee_id):
         settings.LOGGER.info(
             f"{request.user} is getting UserPublications for {employee_id}"
@@ -632,82 +399,23 @@ class UserPublications(APIView):
         if not settings.LIBRARY_BEARER_TOKEN:
             return self._error_response("Library Token configuration missing")
 
-        # Check cache
-        cache_key = f"user_publications_{employee_id}"
-        cached_data = cache.get(cache_key)
-
-        # Get staff profile
-        staff_profile = PublicStaffProfile.objects.filter(
-            employee_id=employee_id
-        ).first()
-
-        # Get custom publications
-        custom_publications = CustomPublication.objects.filter(
-            public_profile__employee_id=employee_id
-        ).all()
-
-        if cached_data:
-            settings.LOGGER.info(f"Returning cached publications for {employee_id}")
-            response_data = {
-                "staffProfilePk": staff_profile.pk if staff_profile else 0,
-                "libraryData": cached_data,
-                "customPublications": CustomPublicationSerializer(
-                    custom_publications, many=True
-                ).data,
-            }
-            return Response(response_data, status=HTTP_200_OK)
-
         try:
-            # Get library publications
-            library_data = self._get_library_publications(employee_id)
-
-            library_response = {
-                "numFound": library_data.get("response", {}).get("numFound", 0),
-                "start": library_data.get("response", {}).get("start", 0),
-                "numFoundExact": library_data.get("response", {}).get(
-                    "numFoundExact", True
-                ),
-                "docs": library_data.get("response", {}).get("docs", []),
-                "isError": False,
-                "errorMessage": "",
-            }
+            # Cached, refreshed in the background once near expiry
+            library_data = PublicationCacheService.get_library_publications(employee_id)
+        except LibraryUnavailable as e:
+            return self._error_response(str(e))
 
-            # Serialize and cache
-            library_serializer = LibraryPublicationResponseSerializer(
-                data=library_response
-            )
-            if not library_serializer.is_valid():
-                settings.LOGGER.error(
-                    f"Library Serializer errors: {library_serializer.errors}"
-                )
-                return self._error_response("Invalid library data format")
-
-            cache.set(
-                cache_key,
-                library_serializer.data,
-                timeout=timedelta(hours=24).total_seconds(),
-            )
-
-            response_data = {
-                "staffProfilePk": staff_profile.pk if staff_profile else 0,
-                "libraryData": library_serializer.data,
-                "customPublications": CustomPublicationSerializer(
-                    custom_publications, many=True
-                ).data,
-            }
-
-            final_serializer = PublicationResponseSerializer(data=response_data)
-            if not final_serializer.is_valid():
-                settings.LOGGER.error(
-                    f"Final Serializer errors: {final_serializer.errors}"
-                )
-                return self._error_response("Invalid response format")
+        response_data = {
+            **PublicationCacheService.get_staff_publications(employee_id),
+            "libraryData": library_data,
+        }
 
-            return Response(final_serializer.data, status=HTTP_200_OK)
+        final_serializer = PublicationResponseSerializer(data=response_data)
+        if not final_serializer.is_valid():
+            settings.LOGGER.error(f"Final Serializer errors: {final_serializer.errors}")
+            return self._error_response("Invalid response format")
 
-        except Exception as e:
-            settings.LOGGER.error(f"Error processing request: {str(e)}")
-            return self._error_response("Failed to process request")
+        return Response(final_serializer.data, status=HTTP_200_OK)
 
 
 class SendMentionNotification(APIView):
@@ -839,11 +547,11 @@ class SendMentionNotification(APIView):
                 }
 
                 try:
-                    template_content = render_to_string(
+                    template_content = EmailAssetRegistry.render(
                         "./email_templates/document_comment_mention.html",
                         template_props,
                     )
-                    send_email_with_embedded_image(
+                    EmailOutboxService.enqueue(
                         recipient_email=to_email,
                         subject=email_subject,
                         html_content=template_content,
@@ -851,7 +559,7 @@ class SendMentionNotification(APIView):
                     emails_sent += 1
                     settings.LOGGER.info(
                         f"{'PRODUCTION' if settings.ENVIRONMENT == 'production' else 'TEST'}: "
-                        f"Sent comment notification to {user_name}"
+                        f"Queued comment notification to {user_name}"
                     )
                 except Exception as e:
                     settings.LOGGER.error(f"Comment Notification Email Error: {e}")
@@ -9,7 +9,10 @@ from rest_framework.status import HTTP_200_OK, HTTP_202_ACCEPTED
 from rest_framework.views import APIView
 
 from ..models import AnnualReport
+from ..serializers.pdf_job import PDFRenderJobSerializer
 from ..services.document_service import DocumentService
+from ..services.pdf_cache_service import PDFCacheService
+from ..services.pdf_job_service import PDFJobService
 from ..services.pdf_service import PDFService
 
 
@@ -21,19 +24,17 @@ class DownloadProjectDocument(APIView):
     def get(self, request, pk):
         """Download project document PDF"""
         document = DocumentService.get_document(pk)
+        filename = f"{document.kind}_{document.pk}.pdf"
 
-        # Check if PDF exists
-        if hasattr(document, "pdf") and document.pdf:
-            return FileResponse(
-                document.pdf.file,
-                as_attachment=True,
-                filename=f"{document.kind}_{document.pk}.pdf",
-            )
+        # Uploaded or pre-cache PDFs have no render hash, serve them as-is
+        stored = PDFCacheService.get_stored_pdf(document)
+        if stored and not stored.render_hash:
+            return FileResponse(stored.file, as_attachment=True, filename=filename)
 
-        # Generate PDF if not exists
-        pdf_file = PDFService.generate_document_pdf(document)
+        # Serve the stored PDF if the document is unchanged, otherwise render
+        pdf, _ = PDFCacheService.get_document_pdf(document)
 
-        return FileResponse(pdf_file, as_attachment=True, filename=pdf_file.name)
+        return FileResponse(pdf.file.open("rb"), as_attachment=True, filename=filename)
 
 
 class BeginProjectDocGeneration(APIView):
@@ -42,25 +43,22 @@ class BeginProjectDocGeneration(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        """Start PDF generation for project document"""
+        """Queue PDF generation for project document"""
         document = DocumentService.get_document(pk)
 
-        # Mark as in progress
-        PDFService.mark_pdf_generation_started(document)
-
-        # TODO: Trigger async PDF generation task
-        # For now, generate synchronously
-        try:
-            PDFService.generate_document_pdf(document)
-            # Save PDF to document
-            # document.pdf.save(pdf_file.name, pdf_file)
-            PDFService.mark_pdf_generation_complete(document)
-        except Exception:
-            PDFService.mark_pdf_generation_complete(document)
-            raise
+        # Rendering happens in the run_pdf_worker process, not in this request
+        job, created = PDFJobService.enqueue_document(document, request.user)
 
         return Response(
-            {"message": "PDF generation started", "document_id": document.pk},
+            {
+                "message": (
+                    "PDF generation started"
+                    if created
+                    else "PDF generation already in progress"
+                ),
+                "document_id": document.pk,
+                "job": PDFRenderJobSerializer(job).data,
+            },
             status=HTTP_202_ACCEPTED,
         )
 
@@ -74,6 +72,7 @@ class CancelProjectDocGeneration(APIView):
         """Cancel PDF generation"""
         document = DocumentService.get_document(pk)
         PDFService.cancel_pdf_generation(document)
+        PDFJobService.cancel_jobs_for(document)
 
         return Response({"message": "PDF generation cancelled"}, status=HTTP_200_OK)
 
@@ -92,18 +91,17 @@ class DownloadAnnualReport(APIView):
 
             raise NotFound(f"Annual report {pk} not found")
 
-        # Check if PDF exists
-        if hasattr(report, "pdf") and report.pdf:
-            return FileResponse(
-                report.pdf.file,
-                as_attachment=True,
-                filename=f"annual_report_{report.year}.pdf",
-            )
+        filename = f"annual_report_{report.year}.pdf"
+
+        # Uploaded or pre-cache PDFs have no render hash, serve them as-is
+        stored = PDFCacheService.get_stored_pdf(report)
+        if stored and not stored.render_hash:
+            return FileResponse(stored.file, as_attachment=True, filename=filename)
 
-        # Generate PDF if not exists
-        pdf_file = PDFService.generate_annual_report_pdf(report)
+        # Serve the stored PDF if the report is unchanged, otherwise render
+        pdf, _ = PDFCacheService.get_annual_report_pdf(report, user=request.user)
 
-        return FileResponse(pdf_file, as_attachment=True, filename=pdf_file.name)
+        return FileResponse(pdf.file.open("rb"), as_attachment=True, filename=filename)
 
 
 class BeginAnnualReportDocGeneration(APIView):
@@ -112,7 +110,7 @@ class BeginAnnualReportDocGeneration(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        """Start PDF generation for annual report"""
+        """Queue PDF generation for annual report"""
         try:
             report = AnnualReport.objects.get(pk=pk)
         except AnnualReport.DoesNotExist:
@@ -120,22 +118,19 @@ class BeginAnnualReportDocGeneration(APIView):
 
             raise NotFound(f"Annual report {pk} not found")
 
-        # Mark as in progress
-        PDFService.mark_pdf_generation_started(report)
-
-        # TODO: Trigger async PDF generation task
-        # For now, generate synchronously
-        try:
-            PDFService.generate_annual_report_pdf(report)
-            # Save PDF to report
-            # report.pdf.save(pdf_file.name, pdf_file)
-            PDFService.mark_pdf_generation_complete(report)
-        except Exception:
-            PDFService.mark_pdf_generation_complete(report)
-            raise
+        # Rendering happens in the run_pdf_worker process, not in this request
+        job, created = PDFJobService.enqueue_annual_report(report, request.user)
 
         return Response(
-            {"message": "PDF generation started", "report_id": report.pk},
+            {
+                "message": (
+                    "PDF generation started"
+                    if created
+                    else "PDF generation already in progress"
+                ),
+                "report_id": report.pk,
+                "job": PDFRenderJobSerializer(job).data,
+            },
             status=HTTP_202_ACCEPTED,
         )
 
@@ -155,5 +150,63 @@ class CancelReportDocGeneration(APIView):
             raise NotFound(f"Annual report {pk} not found")
 
         PDFService.cancel_pdf_generation(report)
+        PDFJobService.cancel_jobs_for(report)
 
         return Response({"message": "PDF generation cancelled"}, status=HTTP_200_OK)
+
+
+class ProjectDocGenerationStatus(APIView):
+    """Poll the latest PDF render job for a project document"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Get latest render job status"""
+        document = DocumentService.get_document(pk)
+        job = PDFJobService.get_latest_job(document)
+
+        return Response(
+            {
+                "document_id": document.pk,
+                "pdf_generation_in_progress": document.pdf_generation_in_progress,
+                "job": PDFRenderJobSerializer(job).data if job else None,
+            },
+            status=HTTP_200_OK,
+        )
+
+
+class ReportDocGenerationStatus(APIView):
+    """Poll the latest PDF render job for an annual report"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Get latest render job status"""
+        try:
+            report = AnnualReport.objects.get(pk=pk)
+        except AnnualReport.DoesNotExist:
+            from rest_framework.exceptions import NotFound
+
+            raise NotFound(f"Annual report {pk} not found")
+
+        job = PDFJobService.get_latest_job(report)
+
+        return Response(
+            {
+                "report_id": report.pk,
+                "pdf_generation_in_progress": report.pdf_generation_in_progress,
+                "job": PDFRenderJobSerializer(job).data if job else None,
+            },
+            status=HTTP_200_OK,
+        )
+
+
+class PDFRenderJobDetail(APIView):
+    """Poll a PDF render job by ID"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Get render job status"""
+        job = PDFJobService.get_job(pk)
+        return Response(PDFRenderJobSerializer(job).data, status=HTTP_200_OK)
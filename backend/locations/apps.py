@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LocationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "locations"
+
+    def ready(self):
+        """Import signals when the app is ready."""
+        import locations.signals  # noqa: F401
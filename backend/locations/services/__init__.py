@@ -2,6 +2,7 @@
 Location services
 """
 
+from .area_registry import AreaRegistry
 from .area_service import AreaService
 
-__all__ = ["AreaService"]
+__all__ = ["AreaRegistry", "AreaService"]
@@ -0,0 +1,165 @@
+"""
+Area registry - Process-local lookup table for Area reference data
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from locations.models import Area
+
+AREA_REGISTRY_VERSION_KEY = "locations:area_registry:version"
+VERSION_CHECK_INTERVAL = 5  # seconds between checks of the shared version
+MAX_AGE = 300  # reload at least this often, e.g. when the cache is a dummy
+
+_registry_lock = threading.Lock()
+_registry = None
+
+
+class AreaRegistry:
+    """
+    Areas held in memory, loaded once per worker
+
+    Areas are a small, nearly static reference table. Rather than querying
+    them for every serialized project, each process loads the table once
+    and keeps id and type indexes. Area saves and deletes bump a version
+    counter in the shared cache, so every worker reloads on its next lookup
+    after a change (checked at most every VERSION_CHECK_INTERVAL seconds).
+    """
+
+    @staticmethod
+    def get(pk):
+        """
+        Get an area by ID
+
+        Args:
+            pk: Area primary key
+
+        Returns:
+            Area instance, or None if it doesn't exist
+        """
+        return AreaRegistry._get_registry()["by_id"].get(pk)
+
+    @staticmethod
+    def get_many(pks):
+        """
+        Get areas by ID, skipping IDs that don't exist
+
+        Args:
+            pks: Iterable of area primary keys
+
+        Returns:
+            list: Area instances ordered by ID
+        """
+        by_id = AreaRegistry._get_registry()["by_id"]
+        return [by_id[pk] for pk in sorted(set(pks)) if pk in by_id]
+
+    @staticmethod
+    def list_by_type(area_type):
+        """
+        Get all areas of a type
+
+        Args:
+            area_type: One of Area.AreaTypeChoices
+
+        Returns:
+            list: Area instances ordered by ID
+        """
+        return list(AreaRegistry._get_registry()["by_type"].get(area_type, ()))
+
+    @staticmethod
+    def serialize(pks):
+        """
+        Get the TinyAreaSerializer data for areas by ID
+
+        Args:
+            pks: Iterable of area primary keys
+
+        Returns:
+            list: Serialized areas ordered by ID, skipping missing IDs
+        """
+        data = AreaRegistry._get_registry()["data"]
+        return [dict(data[pk]) for pk in sorted(set(pks or ())) if pk in data]
+
+    @staticmethod
+    def last_modified():
+        """
+        Latest updated_at of any area, for HTTP validators
+
+        Returns:
+            datetime, or None if there are no areas
+        """
+        return AreaRegistry._get_registry()["last_modified"]
+
+    @staticmethod
+    def invalidate():
+        """
+        Drop this worker's copy and, once committed, tell other workers
+
+        Called by the Area post_save/post_delete signals.
+        """
+        AreaRegistry.clear()
+
+        def bump_version():
+            try:
+                cache.incr(AREA_REGISTRY_VERSION_KEY)
+            except ValueError:
+                cache.set(AREA_REGISTRY_VERSION_KEY, 1, None)
+            # A lookup between the save and the commit may have reloaded
+            AreaRegistry.clear()
+
+        transaction.on_commit(bump_version)
+
+    @staticmethod
+    def clear():
+        """Drop this worker's copy so the next lookup reloads"""
+        global _registry
+        with _registry_lock:
+            _registry = None
+
+    @staticmethod
+    def _get_registry():
+        global _registry
+        now = time.monotonic()
+        registry = _registry
+        if registry and now < registry["checked_at"] + VERSION_CHECK_INTERVAL:
+            return registry
+
+        version = cache.get(AREA_REGISTRY_VERSION_KEY)
+        with _registry_lock:
+            registry = _registry
+            if (
+                registry is None
+                or registry["version"] != version
+                or now > registry["loaded_at"] + MAX_AGE
+            ):
+                registry = AreaRegistry._load(version, now)
+            else:
+                registry["checked_at"] = now
+            _registry = registry
+        return registry
+
+    @staticmethod
+    def _load(version, now):
+        from locations.serializers import TinyAreaSerializer
+
+        areas = list(Area.objects.order_by("pk"))
+        by_type = {}
+        for area in areas:
+            by_type.setdefault(area.area_type, []).append(area)
+
+        settings.LOGGER.info(f"Loaded {len(areas)} areas into the area registry")
+        return {
+            "version": version,
+            "loaded_at": now,
+            "checked_at": now,
+            "by_id": {area.pk: area for area in areas},
+            "by_type": by_type,
+            "last_modified": max((area.updated_at for area in areas), default=None),
+            "data": {
+                item["id"]: item for item in TinyAreaSerializer(areas, many=True).data
+            },
+        }
@@ -0,0 +1,18 @@
+"""
+Django signals for the locations app.
+
+Keeps every worker's in-memory AreaRegistry in step with the Area table.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Area
+from .services.area_registry import AreaRegistry
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def invalidate_area_registry(sender, instance, **kwargs):
+    """Reload the area registry after an area is created, changed or deleted"""
+    AreaRegistry.invalidate()
@@ -7,6 +7,8 @@ from django.contrib.auth import get_user_model
 from rest_framework.exceptions import NotFound
 
 from locations.models import Area
+from locations.services import area_registry
+from locations.services.area_registry import AreaRegistry
 from locations.services.area_service import AreaService
 
 User = get_user_model()
@@ -213,3 +215,98 @@ class TestAreaModelValidation:
 
         # Assert
         assert str_repr == "Test DBCA Region"
+
+
+class TestAreaRegistry:
+    """Tests for the in-memory area registry"""
+
+    @pytest.fixture
+    def shared_cache(self, settings):
+        """Use a real cache so the registry version is shared"""
+        from django.core.cache import cache
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "area-registry-tests",
+            }
+        }
+        cache.clear()
+        yield cache
+        cache.clear()
+
+    @pytest.mark.integration
+    def test_lookups_served_from_memory(
+        self, dbca_region, dbca_district, ibra_region, db, django_assert_num_queries
+    ):
+        """Test the table is loaded once and then served without queries"""
+        # Arrange
+        with django_assert_num_queries(1):
+            AreaRegistry.get(dbca_region.pk)
+
+        # Act & Assert
+        with django_assert_num_queries(0):
+            assert AreaRegistry.get(dbca_district.pk) == dbca_district
+            assert AreaRegistry.get(0) is None
+            assert AreaRegistry.get_many([ibra_region.pk, dbca_region.pk, 0]) == [
+                dbca_region,
+                ibra_region,
+            ]
+            assert AreaRegistry.list_by_type("ibra") == [ibra_region]
+            assert AreaRegistry.serialize([dbca_region.pk]) == [
+                {
+                    "id": dbca_region.pk,
+                    "name": dbca_region.name,
+                    "area_type": "dbcaregion",
+                }
+            ]
+
+    @pytest.mark.integration
+    def test_save_and_delete_invalidate(self, dbca_region, db):
+        """Test area signals drop the loaded copy"""
+        # Arrange
+        AreaRegistry.get(dbca_region.pk)
+
+        # Act
+        area = Area.objects.create(name="New Area", area_type="nrm")
+
+        # Assert
+        assert AreaRegistry.list_by_type("nrm") == [area]
+
+        # Act
+        area.delete()
+
+        # Assert
+        assert AreaRegistry.list_by_type("nrm") == []
+
+    @pytest.mark.integration
+    def test_version_bump_reloads_other_workers(
+        self, dbca_region, db, shared_cache, monkeypatch
+    ):
+        """Test a version bump from another worker triggers a reload"""
+        # Arrange
+        monkeypatch.setattr(area_registry, "VERSION_CHECK_INTERVAL", 0)
+        assert AreaRegistry.get(dbca_region.pk).name == "Test DBCA Region"
+        # Bypass signals, as a change made by another worker would
+        Area.objects.filter(pk=dbca_region.pk).update(name="Renamed Region")
+        assert AreaRegistry.get(dbca_region.pk).name == "Test DBCA Region"
+
+        # Act
+        shared_cache.set(area_registry.AREA_REGISTRY_VERSION_KEY, 42)
+
+        # Assert
+        assert AreaRegistry.get(dbca_region.pk).name == "Renamed Region"
+
+    @pytest.mark.integration
+    def test_invalidate_bumps_version_on_commit(
+        self, db, shared_cache, django_capture_on_commit_callbacks
+    ):
+        """Test invalidation tells other workers once the change commits"""
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            AreaRegistry.invalidate()
+        with django_capture_on_commit_callbacks(execute=True):
+            AreaRegistry.invalidate()
+
+        # Assert
+        assert shared_cache.get(area_registry.AREA_REGISTRY_VERSION_KEY) == 2
@@ -1,5 +1,5 @@
 """
-Area type views - List areas by type
+Area type views - List areas by type from the in-memory AreaRegistry
 """
 
 from rest_framework.permissions import IsAuthenticated
@@ -8,7 +8,7 @@ from rest_framework.status import HTTP_200_OK
 from rest_framework.views import APIView
 
 from locations.serializers import TinyAreaSerializer
-from locations.services import AreaService
+from locations.services import AreaRegistry
 
 
 class DBCADistricts(APIView):
@@ -18,7 +18,7 @@ class DBCADistricts(APIView):
 
     def get(self, request):
         """Get all DBCA districts"""
-        areas = AreaService.list_areas(area_type="dbcadistrict")
+        areas = AreaRegistry.list_by_type("dbcadistrict")
         serializer = TinyAreaSerializer(areas, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
 
@@ -30,7 +30,7 @@ class DBCARegions(APIView):
 
     def get(self, request):
         """Get all DBCA regions"""
-        areas = AreaService.list_areas(area_type="dbcaregion")
+        areas = AreaRegistry.list_by_type("dbcaregion")
         serializer = TinyAreaSerializer(areas, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
 
@@ -42,7 +42,7 @@ class Imcras(APIView):
 
     def get(self, request):
         """Get all IMCRA areas"""
-        areas = AreaService.list_areas(area_type="imcra")
+        areas = AreaRegistry.list_by_type("imcra")
         serializer = TinyAreaSerializer(areas, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
 
@@ -54,7 +54,7 @@ class Ibras(APIView):
 
     def get(self, request):
         """Get all IBRA areas"""
-        areas = AreaService.list_areas(area_type="ibra")
+        areas = AreaRegistry.list_by_type("ibra")
         serializer = TinyAreaSerializer(areas, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
 
@@ -66,6 +66,6 @@ class Nrms(APIView):
 
     def get(self, request):
         """Get all NRM areas"""
-        areas = AreaService.list_areas(area_type="nrm")
+        areas = AreaRegistry.list_by_type("nrm")
         serializer = TinyAreaSerializer(areas, many=True)
         return Response(serializer.data, status=HTTP_200_OK)
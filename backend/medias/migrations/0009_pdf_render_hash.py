@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medias', '0008_alter_annualreportmedia_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='annualreportpdf',
+            name='render_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of the HTML this PDF was rendered from (blank if uploaded)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='projectdocumentpdf',
+            name='render_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of the HTML this PDF was rendered from (blank if uploaded)', max_length=64),
+        ),
+    ]
@@ -157,6 +157,12 @@ class ProjectDocumentPDF(CommonModel):
 
     file = models.FileField(upload_to="project_documents/", null=True, blank=True)
     size = models.PositiveIntegerField(default=0)  # New size field
+    render_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Hash of the HTML this PDF was rendered from (blank if uploaded)",
+    )
     document = models.OneToOneField(
         "documents.ProjectDocument",
         on_delete=models.CASCADE,
@@ -294,6 +300,12 @@ class AnnualReportPDF(CommonModel):  # The latest pdf for a given annual report
 
     file = models.FileField(upload_to="annual_reports/pdfs/", null=True, blank=True)
     size = models.PositiveIntegerField(default=0)  # New size field
+    render_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Hash of the HTML this PDF was rendered from (blank if uploaded)",
+    )
     report = models.OneToOneField(
         "documents.AnnualReport",
         on_delete=models.CASCADE,
@@ -0,0 +1,64 @@
+"""
+Management command to (re)build the project full-text search index.
+
+Migration 0016 indexes the projects that existed when search_vector was
+added, and saves keep the index current after that. Run this after changing
+what ProjectSearchService indexes.
+
+Usage:
+    python manage.py backfill_project_search
+    python manage.py backfill_project_search --missing-only --batch-size 500
+"""
+
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from projects.services.search_service import ProjectSearchService
+
+
+class Command(BaseCommand):
+    help = "Fill Project.search_vector for full-text project search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Projects updated per statement (default 1000)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only index projects that have no search vector yet",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        projects = Project.objects.order_by("pk")
+        if options["missing_only"]:
+            projects = projects.filter(search_vector__isnull=True)
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== Indexing {projects.count()} project(s) for search ==="
+            )
+        )
+
+        # Batches keep each UPDATE's row locks and WAL short
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                projects.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not pks:
+                break
+            updated += ProjectSearchService.update_search_vectors(
+                Project.objects.filter(pk__in=pks)
+            )
+            last_pk = pks[-1]
+            self.stdout.write(f"  {updated} indexed")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✓ {updated} project(s) indexed"))
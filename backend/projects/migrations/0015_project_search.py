@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:42
+
+import logging
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+# search_vector is filled for existing projects by 0016_backfill_project_search
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Index titles for trigram matching, where pg_trgm can be installed
+
+    Skipped when the server lacks the extension or the privilege to create
+    it; ProjectSearchService then searches without trigram matching.
+    """
+    try:
+        with transaction.atomic(), schema_editor.connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS project_title_trgm_idx "
+                "ON projects_project USING gin (title gin_trgm_ops)"
+            )
+    except DatabaseError as e:
+        logger.warning(f"Skipping project title trigram index: {e}")
+
+
+def drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS project_title_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agencies", "0006_remove_old_id_fields"),
+        ("projects", "0014_remove_old_id_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="project_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["kind", "year", "number"], name="project_tag_idx"
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
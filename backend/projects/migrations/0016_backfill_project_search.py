@@ -0,0 +1,43 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Func, TextField, Value
+from django.db.models.functions import Coalesce
+
+# Frozen copy of ProjectSearchService.update_search_vectors, so this keeps
+# working if what the service indexes changes later
+SEARCH_FIELDS = {
+    "title": "A",
+    "keywords": "B",
+    "tagline": "C",
+    "description": "D",
+}
+HTML_PATTERN = r"<[^>]+>|&[#a-zA-Z0-9]+;"
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Index existing projects, so they are searchable as soon as this deploys"""
+    Project = apps.get_model("projects", "Project")
+    vector = None
+    for field, weight in SEARCH_FIELDS.items():
+        text = Func(
+            Coalesce(field, Value("")),
+            Value(HTML_PATTERN),
+            Value(" "),
+            Value("g"),
+            function="REGEXP_REPLACE",
+            output_field=TextField(),
+        )
+        part = SearchVector(text, weight=weight, config="english")
+        vector = part if vector is None else vector + part
+    Project.objects.filter(search_vector__isnull=True).update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0015_project_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
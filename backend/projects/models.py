@@ -4,6 +4,8 @@ from datetime import datetime as dt
 
 from bs4 import BeautifulSoup
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.forms import ValidationError
@@ -91,6 +93,15 @@ class Project(CommonModel):
         # StatusChoices.SUSPENDED,
     )
 
+    # Prefix of the project tag, e.g. SP-2024-12
+    KIND_TAGS = {
+        CategoryKindChoices.COREFUNCTION: "CF",
+        CategoryKindChoices.SCIENCE: "SP",
+        CategoryKindChoices.STUDENT: "STP",
+        CategoryKindChoices.EXTERNAL: "EXT",
+    }
+    KIND_FOR_TAG = {tag: kind for kind, tag in KIND_TAGS.items()}
+
     kind = models.CharField(
         choices=CategoryKindChoices.choices,
         blank=True,
@@ -169,6 +180,19 @@ class Project(CommonModel):
         null=False,
     )
 
+    # Maintained by the post_save signal, see ProjectSearchService
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="project_search_vector_idx"),
+            # Project tag lookups, e.g. CF-2022-123
+            models.Index(fields=["kind", "year", "number"], name="project_tag_idx"),
+        ]
+
     def get_deletion_request_id(self):
         # Check if there's a pending AdminTask related to this project with the action 'deleteproject'
         deletion_task = AdminTask.objects.filter(
@@ -188,14 +212,7 @@ class Project(CommonModel):
         return inner_text
 
     def project_kind_to_tag(self) -> str:
-        project_kind = self.kind
-        project_kind_dict = {
-            "core_function": "CF",
-            "science": "SP",
-            "student": "STP",
-            "external": "EXT",
-        }
-        return project_kind_dict.get(project_kind, "UNKNOWN")
+        return self.KIND_TAGS.get(self.kind, "UNKNOWN")
 
     def get_project_tag(self) -> str:
         kind_tag = self.project_kind_to_tag()
@@ -4,8 +4,7 @@ Project area serializers
 
 from rest_framework import serializers
 
-from locations.models import Area
-from locations.serializers import TinyAreaSerializer
+from locations.services.area_registry import AreaRegistry
 
 from ..models import ProjectArea
 
@@ -19,16 +18,5 @@ class ProjectAreaSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        areas = instance.areas
-
-        if areas:
-            try:
-                area_objects = Area.objects.filter(pk__in=areas)
-                area_serializer = TinyAreaSerializer(area_objects, many=True)
-                representation["areas"] = area_serializer.data
-            except Area.DoesNotExist:
-                representation["areas"] = []
-        else:
-            representation["areas"] = []
-
+        representation["areas"] = AreaRegistry.serialize(instance.areas)
         return representation
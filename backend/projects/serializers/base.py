@@ -9,8 +9,7 @@ from agencies.serializers import (
     BusinessAreaNameViewSerializer,
     TinyBusinessAreaSerializer,
 )
-from locations.models import Area
-from locations.serializers import TinyAreaSerializer
+from locations.services.area_registry import AreaRegistry
 from medias.serializers import ProjectPhotoSerializer, TinyProjectPhotoSerializer
 
 from ..models import Project
@@ -39,14 +38,14 @@ class ProjectSerializer(ModelSerializer):
         fields = "__all__"
 
     def get_deletion_request_id(self, instance):
+        # Bulk-resolved by ProjectService.get_list_serializer_context
+        deletion_request_ids = self.context.get("deletion_request_ids")
+        if deletion_request_ids is not None:
+            return deletion_request_ids.get(instance.pk)
         return instance.get_deletion_request_id()
 
     def get_areas(self, instance):
-        area_ids = instance.area.areas
-        if area_ids:
-            areas = Area.objects.filter(id__in=area_ids)
-            return TinyAreaSerializer(areas, many=True).data
-        return []
+        return AreaRegistry.serialize(instance.area.areas)
 
 
 class ProjectUpdateSerializer(ModelSerializer):
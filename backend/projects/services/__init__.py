@@ -7,6 +7,7 @@ from .details_service import DetailsService
 from .export_service import ExportService
 from .member_service import MemberService
 from .project_service import ProjectService
+from .search_service import ProjectSearchService
 
 __all__ = [
     "ProjectService",
@@ -14,4 +15,5 @@ __all__ = [
     "DetailsService",
     "AreaService",
     "ExportService",
+    "ProjectSearchService",
 ]
@@ -2,16 +2,31 @@
 Export service - CSV export functionality
 """
 
-import csv
-
 from bs4 import BeautifulSoup
 from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.http import HttpResponse
+from rest_framework.exceptions import ValidationError
+
+from common.utils.exports import EXPORT_CHUNK_SIZE, build_export_response
+from documents.models import AnnualReport, ProgressReport, StudentReport
 
-from documents.models import AnnualReport
-from users.models import User
+from ..models import Project, ProjectMember
 
-from ..models import Project
+PROJECT_EXPORT_HEADERS = [
+    "ID",
+    "Project Code",
+    "Status",
+    "Type",
+    "Year",
+    "Title",
+    "Business Area",
+    "Business Area Leader",
+    "Team Members",
+    "Cost Center ID",
+    "Start Date",
+    "End Date",
+]
 
 
 class ExportService:
@@ -26,111 +41,118 @@ class ExportService:
         return soup.get_text(separator=" ", strip=True)
 
     @staticmethod
-    def export_all_projects_csv(user):
+    def get_export_queryset(queryset):
+        """
+        Join everything a project export row needs
+
+        Business area leaders are joined in the same query and team members
+        are prefetched once per EXPORT_CHUNK_SIZE projects, so the number of
+        queries doesn't grow with the number of projects.
+
+        Args:
+            queryset: Project QuerySet or manager
+
+        Returns:
+            QuerySet: Ordered queryset with leaders and members loaded
+        """
+        return (
+            queryset.select_related("business_area", "business_area__leader")
+            .prefetch_related(
+                Prefetch(
+                    "members",
+                    queryset=ProjectMember.objects.select_related("user"),
+                )
+            )
+            .order_by("pk")
+        )
+
+    @staticmethod
+    def project_row(project):
         """
-        Export all projects to CSV
+        Build the export row for a project
+
+        Args:
+            project: Project from get_export_queryset
+
+        Returns:
+            list: Values in PROJECT_EXPORT_HEADERS order
+        """
+        business_area = project.business_area
+        ba_leader = business_area.leader if business_area else None
+        team_members = [
+            f"{member.user.first_name} {member.user.last_name}"
+            for member in project.members.all()
+            if member.user
+        ]
+        return [
+            project.pk,
+            project.get_project_tag(),
+            project.status,
+            project.kind,
+            project.year,
+            ExportService.strip_html_tags(project.title),
+            business_area,
+            str(ba_leader) if ba_leader else "",
+            ", ".join(team_members),
+            business_area.cost_center if business_area else "",
+            project.start_date,
+            project.end_date,
+        ]
+
+    @staticmethod
+    def _iter_rows(queryset, build_row):
+        """Yield export rows, fetching EXPORT_CHUNK_SIZE projects at a time"""
+        try:
+            for project in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield build_row(project)
+        except Exception as e:
+            # Headers are already sent, so the download can only be cut short
+            settings.LOGGER.error(f"Project export failed part way: {e}")
+            raise
+
+    @staticmethod
+    def export_all_projects_csv(user, export_format="csv"):
+        """
+        Export all projects, streamed in constant memory
 
         Args:
             user: User requesting the export
+            export_format: csv, csv.gz, xlsx or parquet
 
         Returns:
-            HttpResponse with CSV content
+            StreamingHttpResponse/FileResponse with the export, or
+            HttpResponse on error
         """
         settings.LOGGER.info(f"{user} is generating a csv of all projects...")
 
         try:
-            # Retrieve projects with optimization
-            projects = (
-                Project.objects.select_related("business_area")
-                .prefetch_related("members__user")
-                .all()
-            )
-
-            # Create CSV response
-            response = HttpResponse(content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="projects-full.csv"'
-
-            writer = csv.writer(response)
-
-            # CSV headers
-            headers = [
-                "ID",
-                "Project Code",
-                "Status",
-                "Type",
-                "Year",
-                "Title",
-                "Business Area",
-                "Business Area Leader",
-                "Team Members",
-                "Cost Center ID",
-                "Start Date",
-                "End Date",
-            ]
-            writer.writerow(headers)
-
-            # Write project rows
-            for project in projects:
-                # Get business area leader
-                ba_leader = ""
-                if project.business_area and project.business_area.leader_id:
-                    try:
-                        leader_user = User.objects.filter(
-                            pk=project.business_area.leader_id
-                        ).first()
-                        if leader_user:
-                            ba_leader = str(leader_user)
-                    except Exception as e:
-                        settings.LOGGER.warning(
-                            f"Failed to get business area leader for project {project.pk}: {e}"
-                        )
+            projects = ExportService.get_export_queryset(Project.objects)
 
-                # Get team members
-                team_members = []
-                for project_member in project.members.all():
-                    try:
-                        if project_member.user:
-                            team_members.append(
-                                f"{project_member.user.first_name} {project_member.user.last_name}"
-                            )
-                    except Exception as e:
-                        settings.LOGGER.warning(
-                            f"Failed to get team member for project {project.pk}: {e}"
-                        )
-                        continue
-
-                row = [
-                    project.pk,
-                    project.get_project_tag(),
-                    project.status,
-                    project.kind,
-                    project.year,
-                    ExportService.strip_html_tags(project.title),
-                    project.business_area,
-                    ba_leader,
-                    ", ".join(team_members),
-                    project.business_area.cost_center if project.business_area else "",
-                    project.start_date,
-                    project.end_date,
-                ]
-                writer.writerow(row)
-
-            return response
+            return build_export_response(
+                PROJECT_EXPORT_HEADERS,
+                ExportService._iter_rows(projects, ExportService.project_row),
+                "projects-full",
+                export_format,
+            )
 
+        except ValidationError:
+            raise
         except Exception as e:
             settings.LOGGER.error(f"{e}")
             return HttpResponse(status=500, content="Error generating CSV")
 
     @staticmethod
-    def export_annual_report_projects_csv(user):
+    def export_annual_report_projects_csv(user, export_format="csv"):
         """
-        Export annual report projects to CSV
+        Export annual report projects, streamed in constant memory
 
         Args:
             user: User requesting the export
+            export_format: csv, csv.gz, xlsx or parquet
 
         Returns:
-            HttpResponse with CSV content
+            StreamingHttpResponse/FileResponse with the export, or
+            HttpResponse on error
         """
         settings.LOGGER.info(f"{user} is generating a csv of annual report projects...")
 
@@ -141,113 +163,42 @@ class ExportService:
             if not latest_annual_report:
                 return HttpResponse(status=404, content="No annual reports found")
 
-            # Get projects in progress reports
-            progress_report_projects = Project.objects.filter(
-                progress_reports__report=latest_annual_report
-            ).distinct()
-
-            # Get projects in student reports
-            student_report_projects = Project.objects.filter(
-                student_reports__report=latest_annual_report
-            ).distinct()
-
-            # Combine and remove duplicates
-            annual_report_projects = (
-                progress_report_projects | student_report_projects
-            ).distinct()
-
-            # Create CSV response
-            response = HttpResponse(content_type="text/csv")
-            response["Content-Disposition"] = (
-                f'attachment; filename="projects-annual-report-{latest_annual_report.year}.csv"'
+            # Flag report types in the same query rather than two per project
+            projects = ExportService.get_export_queryset(
+                Project.objects.annotate(
+                    has_progress_report=Exists(
+                        ProgressReport.objects.filter(
+                            project=OuterRef("pk"), report=latest_annual_report
+                        )
+                    ),
+                    has_student_report=Exists(
+                        StudentReport.objects.filter(
+                            project=OuterRef("pk"), report=latest_annual_report
+                        )
+                    ),
+                ).filter(Q(has_progress_report=True) | Q(has_student_report=True))
             )
 
-            writer = csv.writer(response)
-
-            # CSV headers
-            headers = [
-                "ID",
-                "Project Code",
-                "Status",
-                "Type",
-                "Year",
-                "Title",
-                "Business Area",
-                "Business Area Leader",
-                "Team Members",
-                "Cost Center ID",
-                "Start Date",
-                "End Date",
-                "Report Type",
-            ]
-            writer.writerow(headers)
-
-            # Write project rows
-            for project in annual_report_projects:
-                # Determine report type
-                has_progress_report = project.progress_reports.filter(
-                    report=latest_annual_report
-                ).exists()
-                has_student_report = project.student_reports.filter(
-                    report=latest_annual_report
-                ).exists()
-
-                if has_progress_report and has_student_report:
+            def build_row(project):
+                if project.has_progress_report and project.has_student_report:
                     report_type = "Progress & Student"
-                elif has_progress_report:
+                elif project.has_progress_report:
                     report_type = "Progress"
-                elif has_student_report:
+                elif project.has_student_report:
                     report_type = "Student"
                 else:
                     report_type = "Unknown"
+                return ExportService.project_row(project) + [report_type]
 
-                # Get business area leader
-                ba_leader = ""
-                if project.business_area and project.business_area.leader_id:
-                    try:
-                        leader_user = User.objects.filter(
-                            pk=project.business_area.leader_id
-                        ).first()
-                        if leader_user:
-                            ba_leader = str(leader_user)
-                    except Exception as e:
-                        settings.LOGGER.warning(
-                            f"Failed to get business area leader for project {project.pk}: {e}"
-                        )
-
-                # Get team members
-                team_members = []
-                for project_member in project.members.all():
-                    try:
-                        if project_member.user:
-                            team_members.append(
-                                f"{project_member.user.first_name} {project_member.user.last_name}"
-                            )
-                    except Exception as e:
-                        settings.LOGGER.warning(
-                            f"Failed to get team member for project {project.pk}: {e}"
-                        )
-                        continue
-
-                row = [
-                    project.pk,
-                    project.get_project_tag(),
-                    project.status,
-                    project.kind,
-                    project.year,
-                    ExportService.strip_html_tags(project.title),
-                    project.business_area,
-                    ba_leader,
-                    ", ".join(team_members),
-                    project.business_area.cost_center if project.business_area else "",
-                    project.start_date,
-                    project.end_date,
-                    report_type,
-                ]
-                writer.writerow(row)
-
-            return response
+            return build_export_response(
+                PROJECT_EXPORT_HEADERS + ["Report Type"],
+                ExportService._iter_rows(projects, build_row),
+                f"projects-annual-report-{latest_annual_report.year}",
+                export_format,
+            )
 
+        except ValidationError:
+            raise
         except Exception as e:
             settings.LOGGER.error(f"{e}")
             return HttpResponse(status=500, content="Error generating CSV")
@@ -2,19 +2,32 @@
 Project service - Core project operations
 """
 
+import hashlib
 import logging
 import os
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.db import transaction
-from django.db.models import Case, CharField, IntegerField, Q, Value, When
-from django.db.models.functions import Cast
+from django.db.models import (
+    Case,
+    Count,
+    IntegerField,
+    Max,
+    Q,
+    Value,
+    When,
+)
 from rest_framework.exceptions import NotFound
 
-from ..models import Project
+from adminoptions.models import AdminTask
+from common.utils.tagged_cache import cached, make_tag
+from locations.services.area_registry import AreaRegistry
+
+from ..models import Project, ProjectMember
+from ..serializers import TinyProjectSerializer
+from .search_service import ProjectSearchService
 
 logger = logging.getLogger(__name__)
 
@@ -22,99 +35,51 @@ logger = logging.getLogger(__name__)
 class ProjectService:
     """Business logic for project operations"""
 
+    # Keyset for cursor pagination, matching list_projects() ordering
+    CURSOR_ORDERING = ("custom_ordering", "-year", "id")
+
     @staticmethod
+    @cached(
+        "user_projects",
+        tags=lambda user_id: [make_tag("user", user_id)],
+        result_tags=lambda projects: ProjectService._get_project_tags(projects),
+    )
     def get_user_projects(user_id):
         """
-        Get projects for a specific user with caching
+        Get the projects a user is a member of, cached
+
+        Cached as TinyProjectSerializer data until the user, one of the
+        projects or their business areas changes (see projects/signals.py).
 
         Args:
             user_id: User ID to get projects for
 
         Returns:
-            QuerySet of Project objects for the user
+            list: Serialized projects
         """
-        cache_key = settings.CACHE_KEYS["user_projects"].format(user_id=user_id)
-
-        try:
-            # Try cache first
-            cached_projects = cache.get(cache_key)
-            if cached_projects is not None:
-                logger.debug(f"Cache hit for user {user_id} projects")
-                return cached_projects
-        except Exception as e:
-            logger.warning(f"Cache error for user {user_id} projects: {e}")
-            # Fall through to database query
-
-        # Cache miss - query database
-        logger.debug(f"Cache miss for user {user_id} projects")
         projects = (
             Project.objects.filter(members__user_id=user_id)
             .select_related(
                 "business_area",
                 "business_area__division",
-                "business_area__division__director",
-                "business_area__division__approver",
-                "business_area__leader",
-                "business_area__caretaker",
-                "business_area__finance_admin",
-                "business_area__data_custodian",
                 "business_area__image",
                 "image",
                 "image__uploader",
-                "area",
-            )
-            .prefetch_related(
-                "members",
-                "members__user",
-                "members__user__profile",
-                "members__user__work",
-                "members__user__work__business_area",
-                "members__user__caretakers",
-                "members__user__caretaking_for",
-                "business_area__division__directorate_email_list",
-                "admintasks",
             )
             .distinct()
         )
-
-        # Convert to list for caching
-        projects_list = list(projects)
-
-        # Cache for 5 minutes
-        try:
-            cache.set(
-                cache_key, projects_list, timeout=settings.CACHE_TTL["user_projects"]
-            )
-        except Exception as e:
-            logger.warning(f"Failed to cache user {user_id} projects: {e}")
-
-        return projects_list
-
-    @staticmethod
-    def invalidate_user_projects_cache(user_id):
-        """
-        Invalidate cache for a specific user's projects
-
-        Args:
-            user_id: User ID to invalidate cache for
-        """
-        cache_key = settings.CACHE_KEYS["user_projects"].format(user_id=user_id)
-        try:
-            cache.delete(cache_key)
-            logger.debug(f"Invalidated cache for user {user_id} projects")
-        except Exception as e:
-            logger.warning(f"Failed to invalidate cache for user {user_id}: {e}")
+        return TinyProjectSerializer(projects, many=True).data
 
     @staticmethod
-    def invalidate_project_member_caches(project):
-        """
-        Invalidate cache for all members of a project
-
-        Args:
-            project: Project instance
-        """
-        for member in project.members.all():
-            ProjectService.invalidate_user_projects_cache(member.user_id)
+    def _get_project_tags(projects):
+        tags = []
+        for project in projects:
+            tags.append(make_tag("project", project["id"]))
+            if project["business_area"]:
+                tags.append(make_tag("business_area", project["business_area"]["id"]))
+            if project["image"] and project["image"]["uploader"]:
+                tags.append(make_tag("user", project["image"]["uploader"]["id"]))
+        return tags
 
     @staticmethod
     def list_projects(user, filters=None):
@@ -157,10 +122,12 @@ class ProjectService:
             "members__user__caretakers",
             "members__user__caretaking_for",
             "business_area__division__directorate_email_list",
-            "admintasks",
         )
 
-        # Custom ordering
+        # Custom ordering, best search matches first when searching
+        ordering = ["custom_ordering", "-year", "id"]
+        if "search_rank" in projects.query.annotations:
+            ordering.insert(0, "-search_rank")
         projects = projects.annotate(
             custom_ordering=Case(
                 When(
@@ -169,10 +136,154 @@ class ProjectService:
                 default=Value(0),
                 output_field=IntegerField(),
             )
-        ).order_by("custom_ordering", "-year", "id")
+        ).order_by(*ordering)
 
         return projects.distinct()
 
+    @staticmethod
+    def get_list_serializer_context(projects):
+        """
+        Resolve ProjectSerializer lookups for a page of projects in bulk
+
+        ProjectSerializer otherwise queries pending deletion requests once
+        per project. Passing this in the serializer context fetches them with
+        a single query, whatever the page size. Areas come from AreaRegistry.
+
+        Args:
+            projects: Projects to be serialized
+
+        Returns:
+            dict: "deletion_request_ids" (pending DELETEPROJECT AdminTask id
+            by project id)
+        """
+        project_ids = [project.pk for project in projects]
+
+        deletion_request_ids = {}
+        if project_ids:
+            tasks = (
+                AdminTask.objects.filter(
+                    action=AdminTask.ActionTypes.DELETEPROJECT,
+                    status=AdminTask.TaskStatus.PENDING,
+                    project__in=project_ids,
+                )
+                .order_by("pk")
+                .values_list("project_id", "pk")
+            )
+            for project_id, task_id in tasks:
+                # Matches Project.get_deletion_request_id, which takes the first
+                deletion_request_ids.setdefault(project_id, task_id)
+
+        return {"deletion_request_ids": deletion_request_ids}
+
+    @staticmethod
+    def list_map_projects(filters=None):
+        """
+        List the compact project rows the map draws
+
+        Only the columns the map needs are selected, with no related
+        objects, so this stays a single query however many projects match.
+
+        Args:
+            filters: Dict of filter parameters, as for list_projects
+
+        Returns:
+            dict: "projects" (id, tag, title, status, kind and area ids for
+            each project) and "areas" (name and type by area id, for the
+            areas those projects use)
+        """
+        projects = Project.objects.all()
+        if filters:
+            projects = ProjectService._apply_filters(projects, filters)
+
+        rows = (
+            projects.annotate(
+                custom_ordering=Case(
+                    When(
+                        status__in=["suspended", "completed", "terminated"],
+                        then=Value(1),
+                    ),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("custom_ordering", "-year", "id")
+            .values("id", "title", "status", "kind", "year", "number", "area__areas")
+            .distinct()
+        )
+
+        map_projects = []
+        area_ids = set()
+        for row in rows:
+            areas = row["area__areas"] or []
+            area_ids.update(areas)
+            map_projects.append(
+                {
+                    "id": row["id"],
+                    "tag": (
+                        f"{Project.KIND_TAGS.get(row['kind'], 'UNKNOWN')}"
+                        f"-{row['year']}-{row['number']}"
+                    ),
+                    "title": row["title"],
+                    "status": row["status"],
+                    "kind": row["kind"],
+                    "areas": areas,
+                }
+            )
+
+        return {
+            "projects": map_projects,
+            "areas": {
+                area["id"]: {"name": area["name"], "area_type": area["area_type"]}
+                for area in AreaRegistry.serialize(area_ids)
+            },
+        }
+
+    @staticmethod
+    def get_map_summary():
+        """
+        Get the map totals and a fingerprint of the data the map shows
+
+        The fingerprint changes whenever a project, its areas or its members
+        (which the user filter reads) are saved, added or deleted, or an
+        area is renamed. Bulk QuerySet.update() calls bypass auto_now, so
+        they must set updated_at themselves to be noticed.
+
+        Returns:
+            dict: "total_projects", "projects_without_location" and
+            "fingerprint"
+        """
+        projects = Project.objects.aggregate(
+            total=Count("pk"),
+            without_location=Count(
+                "pk",
+                filter=Q(area__isnull=True)
+                | Q(area__areas__isnull=True)
+                | Q(area__areas=[]),
+            ),
+            latest=Max("updated_at"),
+            latest_area=Max("area__updated_at"),
+        )
+        members = ProjectMember.objects.aggregate(
+            total=Count("pk"), latest=Max("updated_at")
+        )
+
+        stamp = "|".join(
+            str(value)
+            for value in (
+                projects["total"],
+                projects["latest"],
+                projects["latest_area"],
+                members["total"],
+                members["latest"],
+                AreaRegistry.last_modified(),
+            )
+        )
+        return {
+            "total_projects": projects["total"],
+            "projects_without_location": projects["without_location"],
+            "fingerprint": hashlib.md5(stamp.encode()).hexdigest(),
+        }
+
     @staticmethod
     def _apply_filters(queryset, filters):
         """Apply filters to project queryset"""
@@ -182,15 +293,7 @@ class ProjectService:
             if ProjectService._is_project_tag_search(search_term):
                 queryset = ProjectService._parse_search_term(search_term)
             else:
-                queryset = queryset.annotate(
-                    number_as_text=Cast("number", output_field=CharField())
-                ).filter(
-                    Q(title__icontains=search_term)
-                    | Q(description__icontains=search_term)
-                    | Q(tagline__icontains=search_term)
-                    | Q(keywords__icontains=search_term)
-                    | Q(number_as_text__icontains=search_term)
-                )
+                queryset = ProjectSearchService.search(queryset, search_term)
 
         # User filter
         selected_user = filters.get("selected_user")
@@ -264,49 +367,7 @@ class ProjectService:
     @staticmethod
     def _parse_search_term(search_term):
         """Parse project tag search term (e.g., CF-2022-123)"""
-        if not search_term:
-            return Project.objects.none()
-
-        parts = search_term.split("-")
-
-        if not parts or not parts[0]:
-            return Project.objects.none()
-
-        db_kind = ProjectService._determine_db_kind(parts[0].upper())
-        if not db_kind:
-            return Project.objects.none()
-
-        projects = Project.objects.filter(kind=db_kind)
-
-        # Case: prefix-year-number (e.g., "CF-2022-123")
-        if len(parts) >= 3:
-            if parts[1] and parts[1].strip():
-                try:
-                    year_as_int = int(parts[1])
-                    if len(parts[1]) == 4:
-                        projects = projects.filter(year=year_as_int)
-                except (ValueError, TypeError):
-                    pass
-
-            if parts[2] and parts[2].strip():
-                try:
-                    number_as_int = int(parts[2])
-                    projects = projects.filter(number__icontains=number_as_int)
-                except (ValueError, TypeError):
-                    pass
-
-        # Case: prefix-year (e.g., "CF-2022")
-        elif len(parts) == 2:
-            if parts[1] and parts[1].strip():
-                try:
-                    year_as_int = int(parts[1])
-                    if len(parts[1]) == 4:
-                        projects = projects.filter(year=year_as_int)
-                except (ValueError, TypeError):
-                    pass
-
-        # Case: prefix only (e.g., "CF")
-        # No additional filtering needed, just the kind filter above
+        projects = ProjectSearchService.filter_by_tag(search_term)
 
         # Apply N+1 optimization for ALL cases (including single-part searches)
         projects = projects.select_related(
@@ -429,9 +490,6 @@ class ProjectService:
 
         project.save()
 
-        # Invalidate cache for all project members
-        ProjectService.invalidate_project_member_caches(project)
-
         return project
 
     @staticmethod
@@ -447,9 +505,6 @@ class ProjectService:
         project = ProjectService.get_project(pk)
         settings.LOGGER.info(f"{user} is deleting project: {project}")
 
-        # Invalidate cache for all project members before deletion
-        ProjectService.invalidate_project_member_caches(project)
-
         project.delete()
 
     @staticmethod
@@ -0,0 +1,167 @@
+"""
+Project search service - Full-text and trigram search over projects
+"""
+
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Func, Q, TextField, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Project
+
+SEARCH_CONFIG = "english"
+
+# Fields in Project.search_vector, by rank weight
+SEARCH_FIELDS = {
+    "title": "A",
+    "keywords": "B",
+    "tagline": "C",
+    "description": "D",
+}
+
+# Tags and entities in the HTML rich-text fields
+HTML_PATTERN = r"<[^>]+>|&[#a-zA-Z0-9]+;"
+
+_trigram_available = None
+
+
+def _plain_text(field):
+    """SQL expression for a field's text with the HTML stripped"""
+    return Func(
+        Coalesce(field, Value("")),
+        Value(HTML_PATTERN),
+        Value(" "),
+        Value("g"),
+        function="REGEXP_REPLACE",
+        output_field=TextField(),
+    )
+
+
+class ProjectSearchService:
+    """
+    Searches projects through the indexed Project.search_vector column
+
+    The vector holds the HTML-stripped title, keywords, tagline and
+    description, weighted in that order, and is kept current by the Project
+    post_save signal. Search terms match as word prefixes, so results
+    narrow as the user types. Where the pg_trgm extension is installed,
+    titles also match on trigram word similarity, catching typos and
+    fragments inside words.
+    """
+
+    @staticmethod
+    def search(queryset, search_term):
+        """
+        Filter projects by a free-text search term, annotating search_rank
+
+        Args:
+            queryset: Project queryset
+            search_term: Text typed by the user
+
+        Returns:
+            QuerySet filtered to matches, with a search_rank annotation
+        """
+        query = ProjectSearchService.build_query(search_term)
+        condition = Q()
+        if query is not None:
+            condition |= Q(search_vector=query)
+        if ProjectSearchService.trigram_available():
+            condition |= Q(title__trigram_word_similar=search_term)
+        if search_term.strip().isdigit():
+            condition |= Q(number=int(search_term))
+        if not condition:
+            return queryset.none()
+
+        rank = (
+            SearchRank(F("search_vector"), query) if query is not None else Value(0.0)
+        )
+        return queryset.filter(condition).annotate(search_rank=rank)
+
+    @staticmethod
+    def build_query(search_term):
+        """
+        Build a prefix-matching tsquery from a search term
+
+        Args:
+            search_term: Text typed by the user
+
+        Returns:
+            SearchQuery requiring every word as a prefix, or None if the term
+            has no words
+        """
+        words = re.findall(r"\w+", search_term or "")
+        if not words:
+            return None
+        # \w+ words can't contain tsquery operators, so raw syntax is safe
+        return SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+
+    @staticmethod
+    def filter_by_tag(search_term):
+        """
+        Find projects by tag (e.g., CF-2022-123) using the tag index
+
+        Args:
+            search_term: Tag, or its prefix-year or prefix-only start
+
+        Returns:
+            QuerySet of Project objects
+        """
+        parts = (search_term or "").split("-")
+        kind = Project.KIND_FOR_TAG.get(parts[0].upper())
+        if not kind:
+            return Project.objects.none()
+
+        projects = Project.objects.filter(kind=kind)
+
+        if len(parts) >= 2 and len(parts[1]) == 4 and parts[1].isdigit():
+            projects = projects.filter(year=int(parts[1]))
+
+        if len(parts) >= 3 and parts[2].strip().isdigit():
+            projects = projects.filter(number=int(parts[2]))
+
+        return projects
+
+    @staticmethod
+    def update_search_vectors(queryset):
+        """
+        Recompute search_vector for projects in a single UPDATE
+
+        Args:
+            queryset: Project queryset
+
+        Returns:
+            int: Number of projects updated
+        """
+        vector = None
+        for field, weight in SEARCH_FIELDS.items():
+            part = SearchVector(_plain_text(field), weight=weight, config=SEARCH_CONFIG)
+            vector = part if vector is None else vector + part
+        # update() rather than save() so updated_at isn't bumped
+        return queryset.update(search_vector=vector)
+
+    @staticmethod
+    def trigram_available():
+        """
+        Whether the pg_trgm extension is installed, checked once per process
+
+        Returns:
+            bool
+        """
+        global _trigram_available
+        if _trigram_available is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                _trigram_available = cursor.fetchone() is not None
+            if not _trigram_available:
+                settings.LOGGER.warning(
+                    "pg_trgm is not installed; project search will only match "
+                    "whole words and word prefixes"
+                )
+        return _trigram_available
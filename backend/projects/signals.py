@@ -0,0 +1,38 @@
+"""
+Django signals for the projects app.
+
+Keeps Project.search_vector in step with the text it indexes, and bumps the
+cache tags of changed projects and memberships.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from common.utils.tagged_cache import TaggedCache, make_tag
+from medias.models import ProjectPhoto
+
+from .models import Project, ProjectMember
+from .services.search_service import SEARCH_FIELDS, ProjectSearchService
+
+
+@receiver(post_save, sender=Project)
+def update_project_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Reindex a project after a save that may have changed its text"""
+    if update_fields and not set(SEARCH_FIELDS).intersection(update_fields):
+        return
+    ProjectSearchService.update_search_vectors(Project.objects.filter(pk=instance.pk))
+
+
+TaggedCache.invalidate_on_change(
+    Project, lambda project: [make_tag("project", project.pk)]
+)
+TaggedCache.invalidate_on_change(
+    ProjectMember,
+    lambda member: [
+        make_tag("project", member.project_id),
+        make_tag("user", member.user_id),
+    ],
+)
+TaggedCache.invalidate_on_change(
+    ProjectPhoto, lambda photo: [make_tag("project", photo.project_id)]
+)
@@ -2,10 +2,12 @@
 Tests for project services
 """
 
+from io import StringIO
 from unittest.mock import patch
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from rest_framework.exceptions import NotFound
 
 from projects.models import Project, ProjectArea, ProjectMember
@@ -14,6 +16,7 @@ from projects.services.details_service import DetailsService
 from projects.services.export_service import ExportService
 from projects.services.member_service import MemberService
 from projects.services.project_service import ProjectService
+from projects.services.search_service import ProjectSearchService
 
 User = get_user_model()
 
@@ -212,6 +215,67 @@ class TestProjectService:
         # Assert
         assert user.pk not in updated.hidden_from_staff_profiles
 
+    @pytest.mark.integration
+    def test_get_user_projects_cached_until_change(
+        self,
+        settings,
+        project_with_lead,
+        project_lead,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+        db,
+    ):
+        """Test a user's projects are served from cache until a project changes"""
+        # Arrange
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-user-projects",
+            }
+        }
+        first = ProjectService.get_user_projects(project_lead.pk)
+
+        # Act
+        with django_assert_num_queries(0):
+            second = ProjectService.get_user_projects(project_lead.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            project_with_lead.title = "Renamed project"
+            project_with_lead.save()
+        third = ProjectService.get_user_projects(project_lead.pk)
+
+        # Assert
+        assert first == second
+        assert [p["id"] for p in first] == [project_with_lead.pk]
+        assert third[0]["title"] == "Renamed project"
+
+    @pytest.mark.integration
+    def test_get_user_projects_invalidated_by_membership(
+        self,
+        settings,
+        project,
+        user,
+        django_capture_on_commit_callbacks,
+        db,
+    ):
+        """Test joining a project invalidates the user's cached projects"""
+        # Arrange
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-user-projects-membership",
+            }
+        }
+        before = ProjectService.get_user_projects(user.pk)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            ProjectMember.objects.create(project=project, user=user, role="supervising")
+        after = ProjectService.get_user_projects(user.pk)
+
+        # Assert
+        assert before == []
+        assert [p["id"] for p in after] == [project.pk]
+
 
 class TestMemberService:
     """Tests for MemberService"""
@@ -476,6 +540,63 @@ class TestMemberService:
         assert projects.count() >= 1
         assert project_with_lead in projects
 
+    @pytest.mark.integration
+    def test_list_map_projects_is_compact(self, project, db):
+        """Test map rows carry only the map fields and an area lookup"""
+        # Arrange
+        from common.tests.factories import AreaFactory
+
+        area = AreaFactory(area_type="nrm")
+        project.area.areas = [area.pk]
+        project.area.save()
+
+        # Act
+        result = ProjectService.list_map_projects()
+
+        # Assert
+        assert result["projects"] == [
+            {
+                "id": project.pk,
+                "tag": project.get_project_tag(),
+                "title": project.title,
+                "status": project.status,
+                "kind": project.kind,
+                "areas": [area.pk],
+            }
+        ]
+        assert result["areas"] == {area.pk: {"name": area.name, "area_type": "nrm"}}
+
+    @pytest.mark.integration
+    def test_list_map_projects_with_selected_user_filter(
+        self, project_with_lead, project_lead, project, db
+    ):
+        """Test map rows are filtered without duplicating projects"""
+        # Act
+        result = ProjectService.list_map_projects({"selected_user": project_lead.pk})
+
+        # Assert
+        assert [row["id"] for row in result["projects"]] == [project_with_lead.pk]
+
+    @pytest.mark.integration
+    def test_get_map_summary_fingerprint_tracks_changes(self, project, db):
+        """Test the map fingerprint changes when map data changes"""
+        # Arrange
+        summary = ProjectService.get_map_summary()
+
+        # Assert - unchanged data gives the same fingerprint
+        assert ProjectService.get_map_summary() == summary
+        assert summary["total_projects"] == 1
+        assert summary["projects_without_location"] == 1
+
+        # Act
+        project.title = "Renamed"
+        project.save()
+
+        # Assert
+        assert ProjectService.get_map_summary()["fingerprint"] != (
+            summary["fingerprint"]
+        )
+
 
 class TestDetailsService:
     """Tests for DetailsService"""
@@ -651,7 +772,7 @@ class TestExportService:
         assert "projects-full.csv" in response["Content-Disposition"]
 
         # Check CSV content
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "Project Code" in content
         assert "Title" in content
 
@@ -685,7 +806,7 @@ class TestExportService:
 
         # Assert
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert str(user) in content
 
     @pytest.mark.integration
@@ -698,7 +819,7 @@ class TestExportService:
 
         # Assert
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         # Check that member names appear in CSV
         for member in project_with_members.members.all():
             if member.user:
@@ -707,6 +828,26 @@ class TestExportService:
                     or member.user.last_name in content
                 )
 
+    @pytest.mark.integration
+    def test_export_all_projects_csv_query_count_is_constant(
+        self, business_area, user, db, django_assert_max_num_queries
+    ):
+        """Test leaders and members are loaded without a query per project"""
+        # Arrange
+        from common.tests.factories import ProjectFactory, UserFactory
+
+        for _ in range(5):
+            project = ProjectFactory(business_area=business_area)
+            ProjectMember.objects.create(
+                project=project, user=UserFactory(), role="supervising"
+            )
+
+        # Act & Assert - one query for projects, one for their members
+        response = ExportService.export_all_projects_csv(user)
+        with django_assert_max_num_queries(2):
+            content = b"".join(response.streaming_content).decode("utf-8")
+        assert len(content.splitlines()) == Project.objects.count() + 1
+
     @patch("projects.services.export_service.AnnualReport")
     @pytest.mark.integration
     def test_export_annual_report_projects_csv_no_reports(
@@ -1014,7 +1155,7 @@ class TestExportServiceAdditional:
         assert "projects-annual-report-2023.csv" in response["Content-Disposition"]
 
         # Check CSV content
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "Project Code" in content
         assert "Report Type" in content
         assert "Progress" in content
@@ -1047,7 +1188,7 @@ class TestExportServiceAdditional:
 
         # Assert
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "Student" in content
 
     @pytest.mark.integration
@@ -1092,7 +1233,7 @@ class TestExportServiceAdditional:
 
         # Assert
         assert response.status_code == 200
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "Progress & Student" in content
 
 
@@ -1375,6 +1516,79 @@ class TestProjectServiceAdditional:
 # Additional tests for DetailsService to reach 100% coverage
 
 
+class TestProjectSearchService:
+    """Tests for ProjectSearchService"""
+
+    @pytest.mark.integration
+    def test_search_matches_word_prefixes_in_html(self, project_factory, db):
+        """Test text inside HTML matches as the user types, but markup doesn't"""
+        # Arrange
+        project = project_factory(
+            title="<p>Survey</p>",
+            description="<p><strong>Loggerhead</strong>&nbsp;turtles</p>",
+        )
+
+        # Act
+        prefix = ProjectSearchService.search(Project.objects.all(), "logger turt")
+        markup = ProjectSearchService.search(Project.objects.all(), "strong nbsp")
+
+        # Assert
+        assert list(prefix) == [project]
+        assert list(markup) == []
+
+    @pytest.mark.integration
+    def test_search_ranks_title_matches_first(self, user, project_factory, db):
+        """Test title matches outrank description matches in list_projects"""
+        # Arrange
+        in_description = project_factory(
+            title="Survey", description="Numbat monitoring", year=2025
+        )
+        in_title = project_factory(title="Numbat ecology", year=2020)
+
+        # Act
+        projects = ProjectService.list_projects(user, {"searchTerm": "numbat"})
+
+        # Assert
+        assert list(projects) == [in_title, in_description]
+
+    @pytest.mark.integration
+    def test_search_reindexes_on_save(self, project, db):
+        """Test saving a project updates its search vector"""
+        # Arrange
+        project.title = "Quokka population"
+
+        # Act
+        project.save()
+
+        # Assert
+        assert project in ProjectSearchService.search(Project.objects.all(), "quokka")
+
+    @pytest.mark.integration
+    def test_filter_by_tag_matches_number_exactly(self, project_factory, db):
+        """Test a tag finds its project and not others sharing its digits"""
+        # Arrange
+        project = project_factory(kind="core_function", year=2022, number=12)
+        project_factory(kind="core_function", year=2022, number=123)
+
+        # Act
+        result = ProjectSearchService.filter_by_tag("CF-2022-12")
+
+        # Assert
+        assert list(result) == [project]
+
+    @pytest.mark.integration
+    def test_backfill_project_search_command(self, project, db):
+        """Test the backfill command indexes projects without vectors"""
+        # Arrange
+        Project.objects.update(search_vector=None)
+
+        # Act
+        call_command("backfill_project_search", "--missing-only", stdout=StringIO())
+
+        # Assert
+        assert project in ProjectSearchService.search(Project.objects.all(), "test")
+
+
 class TestDetailsServiceAdditional:
     """Additional tests for DetailsService to cover remaining lines"""
 
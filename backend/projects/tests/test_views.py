@@ -2,11 +2,13 @@
 Tests for project views
 """
 
+import gzip
+
 import pytest
 from rest_framework import status
 
 from common.tests.test_helpers import projects_urls
-from projects.models import Project, ProjectMember
+from projects.models import Project, ProjectArea, ProjectMember
 
 
 class TestProjects:
@@ -52,6 +54,35 @@ class TestProjects:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["projects"]) >= 0
 
+    @pytest.mark.integration
+    def test_list_projects_by_cursor(self, api_client, user, project_factory, db):
+        """Test following next_cursor matches the page-numbered order"""
+        # Arrange
+        for status_value in ("new", "completed", "active", "new"):
+            ProjectArea.objects.create(
+                project=project_factory(status=status_value), areas=[]
+            )
+        api_client.force_authenticate(user=user)
+        expected = [
+            item["id"]
+            for item in api_client.get(projects_urls.list(), {"page_size": 100}).data[
+                "projects"
+            ]
+        ]
+
+        # Act
+        seen = []
+        params = {"cursor": "", "page_size": 3}
+        while params["cursor"] is not None:
+            response = api_client.get(projects_urls.list(), params)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [item["id"] for item in response.data["projects"]]
+            params["cursor"] = response.data["next_cursor"]
+
+        # Assert
+        assert seen == expected
+        assert len(seen) == 4
+
 
 class TestProjectDetails:
     """Tests for ProjectDetails view (get, update, delete)"""
@@ -1122,6 +1153,37 @@ class TestDownloadAllProjectsAsCSV:
         assert response["Content-Type"] == "text/csv"
         assert "attachment" in response["Content-Disposition"]
 
+    @pytest.mark.integration
+    def test_download_csv_gzip(self, api_client, superuser, project, db):
+        """Test downloading all projects as gzipped CSV"""
+        # Arrange
+        api_client.force_authenticate(user=superuser)
+
+        # Act
+        response = api_client.get(
+            projects_urls.path("download"), {"file_format": "csv.gz"}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/gzip"
+        content = gzip.decompress(b"".join(response.streaming_content))
+        assert project.get_project_tag().encode() in content
+
+    @pytest.mark.integration
+    def test_download_csv_unsupported_format(self, api_client, superuser, db):
+        """Test downloading projects in an unsupported format fails"""
+        # Arrange
+        api_client.force_authenticate(user=superuser)
+
+        # Act
+        response = api_client.get(
+            projects_urls.path("download"), {"file_format": "pdf"}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     @pytest.mark.integration
     def test_download_csv_as_non_admin(self, api_client, user, db):
         """Test downloading CSV as non-admin fails"""
@@ -1142,6 +1204,9 @@ class TestDownloadARProjectsAsCSV:
     def test_download_ar_csv_as_admin(self, api_client, superuser, project, db):
         """Test downloading annual report projects CSV as admin"""
         # Arrange
+        from documents.tests.factories import AnnualReportFactory
+
+        AnnualReportFactory(year=2023)
         api_client.force_authenticate(user=superuser)
 
         # Act
@@ -1152,6 +1217,18 @@ class TestDownloadARProjectsAsCSV:
         assert response["Content-Type"] == "text/csv"
         assert "attachment" in response["Content-Disposition"]
 
+    @pytest.mark.integration
+    def test_download_ar_csv_no_annual_report(self, api_client, superuser, project, db):
+        """Test downloading AR CSV with no annual report returns 404"""
+        # Arrange
+        api_client.force_authenticate(user=superuser)
+
+        # Act
+        response = api_client.get(projects_urls.path("download-ar"))
+
+        # Assert
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     @pytest.mark.integration
     def test_download_ar_csv_as_non_admin(self, api_client, user, db):
         """Test downloading AR CSV as non-admin fails"""
@@ -1200,6 +1277,77 @@ class TestProjectMap:
         assert "projects" in response.data
 
 
+class TestProjectMapCompact:
+    """Tests for ProjectMapCompact view"""
+
+    @pytest.mark.integration
+    def test_get_compact_map(self, api_client, user, project, db):
+        """Test the compact map returns rows, areas and totals"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.get(projects_urls.path("map", "compact"))
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["projects"][0]["tag"] == project.get_project_tag()
+        assert response.data["areas"] == {}
+        assert response.data["total_projects"] == 1
+        assert response["ETag"]
+
+    @pytest.mark.integration
+    def test_unchanged_compact_map_returns_304(self, api_client, user, project, db):
+        """Test revalidating an unchanged map returns 304 Not Modified"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+        etag = api_client.get(projects_urls.path("map", "compact"))["ETag"]
+
+        # Act
+        response = api_client.get(
+            projects_urls.path("map", "compact"), HTTP_IF_NONE_MATCH=etag
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.integration
+    def test_changed_compact_map_returns_200(self, api_client, user, project, db):
+        """Test a stale ETag gets the new map"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+        etag = api_client.get(projects_urls.path("map", "compact"))["ETag"]
+        project.status = "active"
+        project.save()
+
+        # Act
+        response = api_client.get(
+            projects_urls.path("map", "compact"), HTTP_IF_NONE_MATCH=etag
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["projects"][0]["status"] == "active"
+
+    @pytest.mark.integration
+    def test_compact_map_etag_varies_with_filters(self, api_client, user, project, db):
+        """Test filtered maps don't share an ETag"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+        etag = api_client.get(projects_urls.path("map", "compact"))["ETag"]
+
+        # Act
+        response = api_client.get(
+            projects_urls.path("map", "compact"),
+            {"projectkind": "student"},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["projects"] == []
+
+
 # Tests for search views
 
 
@@ -7,6 +7,7 @@ urlpatterns = [
     path("list", views.Projects.as_view()),
     # String patterns MUST come before <int:pk> to avoid matching conflicts
     path("map", views.ProjectMap.as_view()),
+    path("map/compact", views.ProjectMapCompact.as_view()),
     path("mine", views.MyProjects.as_view()),
     path("listofyears", views.ProjectYears.as_view()),
     path("smallsearch", views.SmallProjectSearch.as_view()),
@@ -2,10 +2,8 @@
 Project filtering utilities
 """
 
-from django.db.models import CharField, Q
-from django.db.models.functions import Cast
-
 from ..models import Project
+from ..services.search_service import ProjectSearchService
 
 
 def determine_db_kind(provided):
@@ -39,48 +37,7 @@ def parse_project_tag_search(search_term):
     Returns:
         QuerySet of Project objects
     """
-    if not search_term:
-        return Project.objects.none()
-
-    parts = search_term.split("-")
-
-    if not parts or not parts[0]:
-        return Project.objects.none()
-
-    db_kind = determine_db_kind(parts[0].upper())
-    if not db_kind:
-        return Project.objects.none()
-
-    projects = Project.objects.filter(kind=db_kind)
-
-    # Case: prefix-year-number (e.g., "CF-2022-123")
-    if len(parts) >= 3:
-        if parts[1] and parts[1].strip():
-            try:
-                year_as_int = int(parts[1])
-                if len(parts[1]) == 4:
-                    projects = projects.filter(year=year_as_int)
-            except (ValueError, TypeError):
-                pass
-
-        if parts[2] and parts[2].strip():
-            try:
-                number_as_int = int(parts[2])
-                projects = projects.filter(number__icontains=number_as_int)
-            except (ValueError, TypeError):
-                pass
-
-    # Case: prefix-year (e.g., "CF-2022")
-    elif len(parts) == 2:
-        if parts[1] and parts[1].strip():
-            try:
-                year_as_int = int(parts[1])
-                if len(parts[1]) == 4:
-                    projects = projects.filter(year=year_as_int)
-            except (ValueError, TypeError):
-                pass
-
-    return projects
+    return ProjectSearchService.filter_by_tag(search_term)
 
 
 def is_project_tag_search(search_term):
@@ -121,15 +78,7 @@ def apply_project_filters(queryset, filters):
         if is_project_tag_search(search_term):
             queryset = parse_project_tag_search(search_term)
         else:
-            queryset = queryset.annotate(
-                number_as_text=Cast("number", output_field=CharField())
-            ).filter(
-                Q(title__icontains=search_term)
-                | Q(description__icontains=search_term)
-                | Q(tagline__icontains=search_term)
-                | Q(keywords__icontains=search_term)
-                | Q(number_as_text__icontains=search_term)
-            )
+            queryset = ProjectSearchService.search(queryset, search_term)
 
     # User filter
     selected_user = filters.get("selected_user")
@@ -23,7 +23,7 @@ from .details import (
     StudentProjectAdditionalDetail,
 )
 from .export import DownloadAllProjectsAsCSV, DownloadARProjectsAsCSV
-from .map import ProjectMap
+from .map import ProjectMap, ProjectMapCompact
 from .members import (
     MembersForProject,
     ProjectLeaderDetail,
@@ -49,6 +49,7 @@ __all__ = [
     "ProjectDetails",
     # Map
     "ProjectMap",
+    "ProjectMapCompact",
     # Search
     "SmallProjectSearch",
     "MyProjects",
@@ -52,13 +52,19 @@ class Projects(APIView):
         )
 
         # Paginate results
-        paginated = paginate_queryset(projects, request)
+        paginated = paginate_queryset(
+            projects, request, cursor_ordering=ProjectService.CURSOR_ORDERING
+        )
 
-        # Serialize and return
+        # Serialize and return, resolving deletion requests in bulk
         serializer = ProjectSerializer(
             paginated["items"],
             many=True,
-            context={"request": request, "projects": paginated["items"]},
+            context={
+                "request": request,
+                "projects": paginated["items"],
+                **ProjectService.get_list_serializer_context(paginated["items"]),
+            },
         )
 
         return Response(
@@ -66,6 +72,7 @@ class Projects(APIView):
                 "projects": serializer.data,
                 "total_results": paginated["total_results"],
                 "total_pages": paginated["total_pages"],
+                "next_cursor": paginated["next_cursor"],
             },
             status=HTTP_200_OK,
         )
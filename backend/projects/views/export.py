@@ -2,38 +2,33 @@
 Project export views (CSV downloads)
 """
 
-from django.http import HttpResponse
 from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
 
+from common.utils.exports import get_export_format
+
 from ..services.export_service import ExportService
 
 
 class DownloadAllProjectsAsCSV(APIView):
-    """Download all projects as CSV"""
+    """Download all projects as CSV (or ?file_format=csv.gz/xlsx/parquet)"""
 
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        """Generate and download CSV of all projects"""
-        csv_content = ExportService.export_all_projects_csv(request.user)
-
-        response = HttpResponse(csv_content, content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="all_projects.csv"'
-        return response
+        """Stream an export of all projects"""
+        return ExportService.export_all_projects_csv(
+            request.user, get_export_format(request)
+        )
 
 
 class DownloadARProjectsAsCSV(APIView):
-    """Download annual report projects as CSV"""
+    """Download annual report projects as CSV (or ?file_format=...)"""
 
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        """Generate and download CSV of annual report projects"""
-        csv_content = ExportService.export_annual_report_projects_csv(request.user)
-
-        response = HttpResponse(csv_content, content_type="text/csv")
-        response["Content-Disposition"] = (
-            'attachment; filename="annual_report_projects.csv"'
+        """Stream an export of annual report projects"""
+        return ExportService.export_annual_report_projects_csv(
+            request.user, get_export_format(request)
         )
-        return response
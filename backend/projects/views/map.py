@@ -1,9 +1,13 @@
 """
-Project map view
+Project map views
 """
 
+import hashlib
+
 from django.conf import settings
 from django.db.models import Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK
@@ -43,7 +47,11 @@ class ProjectMap(APIView):
         serializer = ProjectSerializer(
             projects,
             many=True,
-            context={"request": request, "projects": projects},
+            context={
+                "request": request,
+                "projects": projects,
+                **ProjectService.get_list_serializer_context(projects),
+            },
         )
 
         return Response(
@@ -54,3 +62,45 @@ class ProjectMap(APIView):
             },
             status=HTTP_200_OK,
         )
+
+
+class ProjectMapCompact(APIView):
+    """
+    Compact project map: one row per project plus an area lookup
+
+    Responses carry an ETag derived from ProjectService.get_map_summary, so a
+    client revalidating an unchanged map gets a 304 without the projects
+    being queried or serialized.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Get compact projects for map display"""
+        summary = ProjectService.get_map_summary()
+        # The ETag must differ per filter combination
+        etag = quote_etag(
+            hashlib.md5(
+                f"{summary['fingerprint']}|{request.GET.urlencode()}".encode()
+            ).hexdigest()
+        )
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        settings.LOGGER.info(f"{request.user} is viewing the compact map")
+        data = ProjectService.list_map_projects(filters=request.query_params)
+
+        response = Response(
+            {
+                **data,
+                "total_projects": summary["total_projects"],
+                "projects_without_location": summary["projects_without_location"],
+            },
+            status=HTTP_200_OK,
+        )
+        response["ETag"] = etag
+        # Browsers may keep the map but must revalidate it on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -9,7 +9,6 @@ from rest_framework.status import HTTP_200_OK
 from rest_framework.views import APIView
 
 from ..serializers import TinyProjectSerializer
-from ..services.member_service import MemberService
 from ..services.project_service import ProjectService
 
 
@@ -40,7 +39,6 @@ class MyProjects(APIView):
         """Get all projects where user is a member"""
         settings.LOGGER.info(f"{request.user} is viewing their projects")
 
-        projects = MemberService.get_user_projects(request.user.pk)
+        projects = ProjectService.get_user_projects(request.user.pk)
 
-        serializer = TinyProjectSerializer(projects, many=True)
-        return Response(serializer.data, status=HTTP_200_OK)
+        return Response(projects, status=HTTP_200_OK)
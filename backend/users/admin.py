@@ -2,7 +2,6 @@
 import csv
 from datetime import datetime
 
-import requests
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
@@ -16,9 +15,17 @@ from agencies.serializers import (
 )
 from projects.models import ProjectMember
 from users.serializers import TinyUserSerializer
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
 
 # Project Imports --------------------
-from .models import KeywordTag, PublicStaffProfile, User, UserProfile, UserWork
+from .models import (
+    ITAssetsDirectoryEntry,
+    KeywordTag,
+    PublicStaffProfile,
+    User,
+    UserProfile,
+    UserWork,
+)
 
 # endregion ===========================================
 
@@ -128,58 +135,59 @@ def generate_active_staff_csv(model_admin, request, selected):
         staff_profile__is_hidden=True
     )
 
-    # Fetch IT Assets data
-    try:
-        response_it = requests.get(
-            settings.IT_ASSETS_URL,
-            auth=(settings.IT_ASSETS_USER, settings.IT_ASSETS_ACCESS_TOKEN),
-            timeout=30,
+    # Read IT Assets data from the local directory mirror
+    age = ITAssetsDirectoryService.get_age()
+    if age is None:
+        model_admin.message_user(
+            request,
+            "IT Assets directory has not been synced; run sync_it_assets_directory",
+            level="ERROR",
+        )
+        return None
+    if ITAssetsDirectoryService.is_stale(age):
+        model_admin.message_user(
+            request,
+            f"IT Assets directory was last synced {age} ago",
+            level="WARNING",
         )
 
-        if response_it.status_code == 200:
-            it_asset_data = response_it.json()
-            # Create lookup dictionary
-            it_asset_data_by_email = {
-                user_data["email"]: user_data
-                for user_data in it_asset_data
-                if "email" in user_data
-            }
-
-            # Write data rows
-            for user in users:
-                user_data = it_asset_data_by_email.get(user.email, {})
-
-                # Only include BCS division staff
-                if (
-                    user_data.get("unit")
-                    == "Biodiversity and Conservation Science Division"
-                    # user_data.get("division")
-                    # == "Biodiversity and Conservation Science"
-                    # or user_data.get("division")
-                    # == "Dept Biodiversity, Conservation and Attractions"
-                ):
-                    writer.writerow(
-                        [
-                            user_data.get("id", ""),
-                            f"{user.first_name} {user.last_name}",
-                            user_data.get("title", ""),
-                            user_data.get("location", {}).get("name", ""),
-                            user.email,
-                            user_data.get("division", ""),
-                            user_data.get("unit", ""),
-                            user_data.get("employee_id", ""),
-                            user_data.get("manager", {}).get("name", ""),
-                            user_data.get("manager", {}).get("email", ""),
-                            user_data.get("manager", {}).get("id", ""),
-                        ]
-                    )
-        else:
-            model_admin.message_user(
-                request,
-                f"Failed to fetch IT Assets data: {response_it.status_code}",
-                level="ERROR",
-            )
-            return None
+    try:
+        # Create lookup dictionary
+        it_asset_data_by_email = {
+            email: entry.data
+            for email, entry in ITAssetsDirectoryService.get_by_emails(
+                users.values_list("email", flat=True)
+            ).items()
+        }
+
+        # Write data rows
+        for user in users:
+            user_data = it_asset_data_by_email.get(user.email.lower(), {})
+
+            # Only include BCS division staff
+            if (
+                user_data.get("unit")
+                == "Biodiversity and Conservation Science Division"
+                # user_data.get("division")
+                # == "Biodiversity and Conservation Science"
+                # or user_data.get("division")
+                # == "Dept Biodiversity, Conservation and Attractions"
+            ):
+                writer.writerow(
+                    [
+                        user_data.get("id", ""),
+                        f"{user.first_name} {user.last_name}",
+                        user_data.get("title", ""),
+                        (user_data.get("location") or {}).get("name", ""),
+                        user.email,
+                        user_data.get("division", ""),
+                        user_data.get("unit", ""),
+                        user_data.get("employee_id", ""),
+                        (user_data.get("manager") or {}).get("name", ""),
+                        (user_data.get("manager") or {}).get("email", ""),
+                        (user_data.get("manager") or {}).get("id", ""),
+                    ]
+                )
 
     except Exception as e:
         model_admin.message_user(
@@ -200,49 +208,30 @@ def set_it_assets_id(model_admin, req, selected):
         print("PLEASE SELECT ONLY ONE")
         return
 
-    # Filter for users that do not have display names set but have first and last names
-    users_to_update = User.objects.filter(staff_profile__it_asset_id__isnull=True)
-
-    # Call the API to retrieve the list of users
-    api_url = settings.IT_ASSETS_URL
-    try:
-        response = requests.get(
-            api_url,
-            auth=(
-                settings.IT_ASSETS_USER,
-                settings.IT_ASSETS_ACCESS_TOKEN,
-            ),
-            timeout=30,
+    # Filter for staff profiles without an IT Assets ID
+    profiles_to_update = list(
+        PublicStaffProfile.objects.filter(it_asset_id__isnull=True).select_related(
+            "user"
         )
-    except requests.Timeout:
-        settings.LOGGER.error("Request to IT Assets API timed out")
-        return
-
-    if response.status_code != 200:
-        if settings.IT_ASSETS_USER is None:
-            settings.LOGGER.warning("No IT_ASSETS_USER found in settings/env")
-        if settings.IT_ASSETS_ACCESS_TOKEN is None:
-            settings.LOGGER.warning("No IT_ASSETS_ACCESS_TOKEN found in settings/env")
-        settings.LOGGER.error(
-            f"Failed to retrieve data from API:\n{response.status_code}: {response.text}"
-        )
-        return
-
-    api_data = response.json()
+    )
 
-    # Iterate through users to update and match them with the API data
-    for user in users_to_update:
-        matching_record = next(
-            (item for item in api_data if item["email"] == user.email), None
-        )
+    # Match them against the local IT Assets directory mirror
+    if ITAssetsDirectoryService.is_stale():
+        settings.LOGGER.warning("IT Assets directory is stale or has not been synced")
+    entries = ITAssetsDirectoryService.get_by_emails(
+        profile.user.email for profile in profiles_to_update
+    )
 
-        if matching_record:
-            staff_profile = PublicStaffProfile.objects.get(user=user)
-            staff_profile.it_asset_id = matching_record["id"]
-            staff_profile.save()
+    updated = []
+    for profile in profiles_to_update:
+        entry = entries.get(profile.user.email.lower())
+        if entry:
+            profile.it_asset_id = entry.it_asset_id
+            updated.append(profile)
+    PublicStaffProfile.objects.bulk_update(updated, ["it_asset_id"])
 
     model_admin.message_user(
-        req, f"public profiles updated for {users_to_update.count()} user(s)."
+        req, f"public profiles updated for {len(updated)} user(s)."
     )
 
 
@@ -457,6 +446,14 @@ class StaffProfileAdmin(admin.ModelAdmin):
     ]
 
 
+@admin.register(ITAssetsDirectoryEntry)
+class ITAssetsDirectoryEntryAdmin(admin.ModelAdmin):
+    list_display = ["it_asset_id", "email", "employee_id", "updated_at"]
+    ordering = ["email"]
+    search_fields = ["email", "employee_id"]
+    readonly_fields = ["it_asset_id", "email", "employee_id", "data", "updated_at"]
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     user = TinyUserSerializer(read_only=True)
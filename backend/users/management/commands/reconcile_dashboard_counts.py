@@ -0,0 +1,54 @@
+"""
+Management command to repair cached dashboard counters.
+
+Signals keep the counters current, but writes that skip them (raw SQL,
+queryset updates, fixtures) leave them stale until they expire. Run this
+periodically, or after such a write, to recompute them.
+
+Usage:
+    python manage.py reconcile_dashboard_counts
+    python manage.py reconcile_dashboard_counts --user 12 --user 34
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.models import User
+from users.services.dashboard_count_service import DashboardCountService
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached dashboard counters of active users"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only reconcile this user ID (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"]
+        if not user_ids:
+            user_ids = list(
+                User.objects.filter(is_active=True)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\n=== Reconciling dashboard counters for {len(user_ids)} user(s) ==="
+            )
+        )
+
+        drifted = DashboardCountService.reconcile(user_ids)
+        for user_id in drifted:
+            self.stdout.write(self.style.WARNING(f"  User {user_id} had stale counts"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✓ {len(user_ids)} user(s) reconciled, {len(drifted)} repaired"
+            )
+        )
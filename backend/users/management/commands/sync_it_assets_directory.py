@@ -0,0 +1,58 @@
+"""
+Management command to sync the local IT Assets directory mirror.
+
+Staff lookups (SSO sign-up, staff profiles, admin actions) read the mirror
+rather than IT Assets, so run this on a schedule, e.g. hourly from a
+Kubernetes CronJob. Only records that changed are written.
+
+Usage:
+    python manage.py sync_it_assets_directory
+    python manage.py sync_it_assets_directory --status
+"""
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
+
+
+class Command(BaseCommand):
+    help = "Mirror the IT Assets department users into the local directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Only report how long since the last sync",
+        )
+
+    def handle(self, *args, **options):
+        if not options["status"]:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING("\n=== Syncing IT Assets directory ===")
+            )
+            try:
+                counts = ITAssetsDirectoryService.sync()
+            except (requests.RequestException, ValueError) as e:
+                raise CommandError(f"IT Assets directory sync failed: {e}")
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"\n✓ {counts['created']} created, {counts['updated']} updated, "
+                    f"{counts['deleted']} deleted, {counts['unchanged']} unchanged"
+                )
+            )
+
+        age = ITAssetsDirectoryService.get_age()
+        if age is None:
+            self.stdout.write(
+                self.style.WARNING("IT Assets directory has never been synced")
+            )
+        elif ITAssetsDirectoryService.is_stale(age):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"IT Assets directory is stale: last synced {age} ago"
+                )
+            )
+        else:
+            self.stdout.write(f"IT Assets directory last synced {age} ago")
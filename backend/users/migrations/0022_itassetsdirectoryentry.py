@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0021_publicstaffprofile_public_email_on'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ITAssetsDirectoryEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('it_asset_id', models.PositiveIntegerField(help_text='ID of the department user in IT Assets.', unique=True)),
+                ('email', models.EmailField(db_index=True, help_text='Lowercased email, for lookups.', max_length=254)),
+                ('employee_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('data', models.JSONField(help_text='The department user record as IT Assets returned it.')),
+                ('synced_at', models.DateTimeField(help_text='When a sync last confirmed this record.')),
+            ],
+            options={
+                'verbose_name': 'IT Assets Directory Entry',
+                'verbose_name_plural': 'IT Assets Directory Entries',
+            },
+        ),
+    ]
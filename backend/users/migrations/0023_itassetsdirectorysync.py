@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:39
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def copy_last_sync(apps, schema_editor):
+    """Keep the mirror's age, read from the entries' stamps"""
+    ITAssetsDirectoryEntry = apps.get_model("users", "ITAssetsDirectoryEntry")
+    ITAssetsDirectorySync = apps.get_model("users", "ITAssetsDirectorySync")
+    synced_at = ITAssetsDirectoryEntry.objects.aggregate(synced_at=Max("synced_at"))[
+        "synced_at"
+    ]
+    if synced_at is not None:
+        ITAssetsDirectorySync.objects.create(pk=1, synced_at=synced_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0022_itassetsdirectoryentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ITAssetsDirectorySync",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "synced_at",
+                    models.DateTimeField(help_text="When a sync last completed."),
+                ),
+            ],
+            options={
+                "verbose_name": "IT Assets Directory Sync",
+            },
+        ),
+        migrations.RunPython(copy_last_sync, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="itassetsdirectoryentry",
+            name="synced_at",
+        ),
+    ]
@@ -1,7 +1,5 @@
 # region IMPORTS ===================================
 
-import requests
-from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from rest_framework import serializers
@@ -112,67 +110,21 @@ class User(AbstractUser):
             "end_date": caretaker_instance.end_date if caretaker_instance else None,
         }
 
-    def get_caretakers_recursive(self, depth=0, max_depth=12, current_path=None):
+    def get_caretakers_recursive(self, max_depth=12):
         """Get all caretakers with recursive relationships."""
-        if current_path is None:
-            current_path = []
-
-        if depth >= max_depth or self.pk in current_path:
-            return []
-
-        # Add current user to the path
-        new_path = current_path + [self.pk]
-        caretakers = self.get_caretakers()
-
-        return [
-            {
-                **caretaker.caretaker.get_caretaker_data(new_path),
-                # Recursively get caretakers of this caretaker
-                "caretakers": caretaker.caretaker.get_caretakers_recursive(
-                    depth + 1, max_depth, new_path
-                ),
-            }
-            for caretaker in caretakers
-            if caretaker.caretaker.get_caretaker_data(new_path) is not None
-        ]
-
-    def get_caretaking_recursive(self, depth=0, max_depth=12, current_path=None):
-        """Get all users being caretaken for with recursive relationships."""
-        if current_path is None:
-            current_path = []
-
-        if depth >= max_depth or self.pk in current_path:
-            return []
-
-        # Add current user to the path
-        new_path = current_path + [self.pk]
-        caretaking = self.get_caretaking_for()
-        result = []
-
-        for caretaking_user in caretaking:
-            user_data = caretaking_user.user.get_caretaker_data(new_path)
-            if user_data is not None:
-                # Use a new path for each branch to avoid cross-branch conflicts
-                branch_path = new_path.copy()
-
-                caretaking_chain = caretaking_user.user.get_caretaking_recursive(
-                    depth + 1, max_depth, branch_path
-                )
+        from caretakers.services.caretaker_graph_service import (
+            CaretakerGraphService,
+        )
 
-                # Use a fresh path for caretakers to avoid conflicts with caretaking chain
-                caretakers_chain = caretaking_user.user.get_caretakers_recursive(
-                    0, max_depth, []
-                )
+        return CaretakerGraphService.get_caretakers_tree(self.pk, max_depth)
 
-                result.append(
-                    {
-                        **user_data,
-                        "caretaking_for": caretaking_chain,
-                        "caretakers": caretakers_chain,
-                    }
-                )
+    def get_caretaking_recursive(self, max_depth=12):
+        """Get all users being caretaken for with recursive relationships."""
+        from caretakers.services.caretaker_graph_service import (
+            CaretakerGraphService,
+        )
 
-        return result
+        return CaretakerGraphService.get_caretaking_tree(self.pk, max_depth)
 
     def get_caretakers(self):
         """Get active caretakers for this user (excludes expired)"""
@@ -509,117 +461,51 @@ class PublicStaffProfile(CommonModel):
         help_text="Whether to display the custom title on the public profile.",
     )
 
-    def get_it_asset_data(self):
-        it_asset_id = self.it_asset_id
+    def get_it_asset_entry(self):
+        """
+        This profile's record in the local IT Assets directory mirror
 
-        if it_asset_id:
-            api_url = f"{settings.IT_ASSETS_URL}{it_asset_id}"
-        else:
-            api_url = settings.IT_ASSETS_URL
+        Looked up by it_asset_id, or by the user's email, saving the ID
+        found so later lookups go straight to it.
 
-        try:
-            response = requests.get(
-                api_url,
-                auth=(
-                    settings.IT_ASSETS_USER,
-                    settings.IT_ASSETS_ACCESS_TOKEN,
-                ),
-                timeout=30,
-            )
-        except requests.Timeout:
-            settings.LOGGER.error(
-                f"Request to IT Assets API timed out for profile {self.pk}"
-            )
-            return None
-
-        if response.status_code != 200:
-            if settings.IT_ASSETS_USER is None:
-                settings.LOGGER.warning("No IT_ASSETS_USER found in settings/env")
-            if settings.IT_ASSETS_ACCESS_TOKEN is None:
-                settings.LOGGER.warning(
-                    "No IT_ASSETS_ACCESS_TOKEN found in settings/env"
-                )
-            settings.LOGGER.error(
-                f"Failed to retrieve data from API:\n{response.status_code}: {response.text}"
-            )
-            return None
-
-        api_data = response.json()
-        matching_record = next(
-            (item for item in api_data if item["email"] == self.user.email), None
+        Returns:
+            ITAssetsDirectoryEntry or None
+        """
+        # Imported here as the directory service imports these models
+        from users.services.it_assets_directory_service import (
+            ITAssetsDirectoryService,
         )
 
-        # Remove the email from the object
-        # if matching_record:
-        #     matching_record.pop("email", None)
-        if matching_record is not None:
-            # Extract only the specified fields
-            matching_record = {
-                "id": matching_record.get("id"),
-                # "email": matching_record.get("email"),
-                "title": matching_record.get("title"),
-                "division": matching_record.get("division"),
-                "unit": matching_record.get("unit"),
-                "location": matching_record.get("location"),
-            }
-
-        # also save the id if not already
-        if not it_asset_id and matching_record:
-            self.it_asset_id = matching_record["id"]
-            self.save()
-
-        if matching_record is not None:
-            return matching_record
-        return None
+        entry = None
+        if self.it_asset_id:
+            entry = ITAssetsDirectoryService.get_by_id(self.it_asset_id)
+        if entry is None:
+            entry = ITAssetsDirectoryService.get_by_email(self.user.email)
 
-    def get_it_asset_email(self):
-        it_asset_id = self.it_asset_id
+        if entry is not None and self.it_asset_id != entry.it_asset_id:
+            self.it_asset_id = entry.it_asset_id
+            self.save(update_fields=["it_asset_id", "updated_at"])
+        return entry
 
-        if it_asset_id:
-            api_url = f"{settings.IT_ASSETS_URL}{it_asset_id}"
-        else:
-            api_url = settings.IT_ASSETS_URL
-
-        try:
-            response = requests.get(
-                api_url,
-                auth=(
-                    settings.IT_ASSETS_USER,
-                    settings.IT_ASSETS_ACCESS_TOKEN,
-                ),
-                timeout=30,
-            )
-        except requests.Timeout:
-            settings.LOGGER.error(
-                f"Request to IT Assets API timed out for profile {self.pk}"
-            )
-            return self.email
-
-        if response.status_code != 200:
-            if settings.IT_ASSETS_USER is None:
-                settings.LOGGER.warning("No IT_ASSETS_USER found in settings/env")
-            if settings.IT_ASSETS_ACCESS_TOKEN is None:
-                settings.LOGGER.warning(
-                    "No IT_ASSETS_ACCESS_TOKEN found in settings/env"
-                )
-            settings.LOGGER.error(
-                f"Failed to retrieve data from API:\n{response.status_code}: {response.text}"
-            )
+    def get_it_asset_data(self):
+        entry = self.get_it_asset_entry()
+        if entry is None:
             return None
 
-        api_data = response.json()
-        matching_record = next(
-            (item for item in api_data if item["email"] == self.user.email), None
-        )
-
-        # also save the id if not already
-        if not it_asset_id and matching_record:
-            self.it_asset_id = matching_record["id"]
-            self.save()
+        # Extract only the specified fields
+        return {
+            "id": entry.it_asset_id,
+            "title": entry.data.get("title"),
+            "division": entry.data.get("division"),
+            "unit": entry.data.get("unit"),
+            "location": entry.data.get("location"),
+        }
 
-        if matching_record is not None:
-            return matching_record["email"]
-        return self.email
+    def get_it_asset_email(self):
+        entry = self.get_it_asset_entry()
+        if entry is None:
+            return self.user.email
+        return entry.data.get("email", self.user.email)
 
     def __str__(self) -> str:
         return f"Staff Profile | {f'{self.user.first_name} {self.user.last_name}' if self.user else 'No User'}"
@@ -630,3 +516,60 @@ class PublicStaffProfile(CommonModel):
 
 
 # endregion =======================================
+
+
+# region IT Assets Models ===================================
+
+
+class ITAssetsDirectoryEntry(CommonModel):
+    """
+    Local mirror of one IT Assets department user
+
+    Kept in step with IT Assets by the sync_it_assets_directory command, so
+    looking staff up doesn't download the whole directory.
+    """
+
+    it_asset_id = models.PositiveIntegerField(
+        unique=True,
+        help_text="ID of the department user in IT Assets.",
+    )
+    email = models.EmailField(
+        db_index=True,
+        help_text="Lowercased email, for lookups.",
+    )
+    employee_id = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+    )
+    data = models.JSONField(
+        help_text="The department user record as IT Assets returned it.",
+    )
+
+    def __str__(self) -> str:
+        return f"{self.it_asset_id} | {self.email}"
+
+    class Meta:
+        verbose_name = "IT Assets Directory Entry"
+        verbose_name_plural = "IT Assets Directory Entries"
+
+
+class ITAssetsDirectorySync(models.Model):
+    """
+    When the IT Assets directory mirror was last synced
+
+    A single row, so a sync that changes nothing writes nothing else.
+    """
+
+    synced_at = models.DateTimeField(
+        help_text="When a sync last completed.",
+    )
+
+    def __str__(self) -> str:
+        return f"Synced {self.synced_at}"
+
+    class Meta:
+        verbose_name = "IT Assets Directory Sync"
+
+
+# endregion =======================================
@@ -2,9 +2,12 @@
 User services
 """
 
+from .dashboard_count_service import DashboardCountService
 from .entry_service import EducationService, EmploymentService
 from .export_service import ExportService
+from .it_assets_directory_service import ITAssetsDirectoryService
 from .profile_service import ProfileService
+from .sso_service import SSOService
 from .user_service import UserService
 
 __all__ = [
@@ -13,4 +16,7 @@ __all__ = [
     "EmploymentService",
     "EducationService",
     "ExportService",
+    "DashboardCountService",
+    "SSOService",
+    "ITAssetsDirectoryService",
 ]
@@ -0,0 +1,209 @@
+"""
+Dashboard count service - Cached per-user counters for the dashboard badges
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+from adminoptions.models import AdminTask
+from documents.services.pending_action_service import (
+    DIRECTORATE_NAME,
+    PendingActionService,
+)
+from projects.models import Project, ProjectMember
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardCountService:
+    """
+    Counts of what's waiting on a user, kept in the shared cache
+
+    A user's counters are computed on first read and cached until something
+    that feeds them changes: document approvals, recalls and send-backs,
+    project and membership changes and caretaker requests drop the counters
+    of every user they affect (see users/signals.py), and the next read
+    recomputes them. Dropping rather than adjusting in place keeps a
+    document moving between role buckets from double counting. The
+    reconcile_dashboard_counts command repairs any drift, e.g. from writes
+    that skip signals.
+    """
+
+    @staticmethod
+    def get_counts(user):
+        """
+        Get a user's dashboard counters, from the cache when present
+
+        Args:
+            user: User to count for
+
+        Returns:
+            dict: "documents" (pending counts by role and "all"),
+                "caretaker_requests" and "admin_tasks" (superusers only)
+        """
+        cache_key = settings.CACHE_KEYS["user_counts"].format(user_id=user.pk)
+        try:
+            counts = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Cache error for user {user.pk} counts: {e}")
+            counts = None
+
+        if counts is None:
+            counts = DashboardCountService.compute_user_counts(user.pk)
+            DashboardCountService._set(
+                cache_key, counts, settings.CACHE_TTL["user_counts"]
+            )
+
+        return {
+            **counts,
+            "admin_tasks": (
+                DashboardCountService.get_admin_task_count() if user.is_superuser else 0
+            ),
+        }
+
+    @staticmethod
+    def compute_user_counts(user_id):
+        """
+        Count what's waiting on a user, straight from the database
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            dict: "documents" and "caretaker_requests"
+        """
+        return {
+            "documents": PendingActionService.count_pending([user_id]),
+            "caretaker_requests": AdminTask.objects.filter(
+                action=AdminTask.ActionTypes.SETCARETAKER,
+                status=AdminTask.TaskStatus.PENDING,
+                secondary_users__contains=[user_id],
+            ).count(),
+        }
+
+    @staticmethod
+    def get_admin_task_count():
+        """
+        Get the number of pending admin tasks, shared by all admins
+
+        Returns:
+            int: Pending AdminTask count
+        """
+        cache_key = settings.CACHE_KEYS["pending_admin_tasks"]
+        try:
+            count = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Cache error for pending admin task count: {e}")
+            count = None
+
+        if count is None:
+            count = AdminTask.objects.filter(
+                status=AdminTask.TaskStatus.PENDING
+            ).count()
+            DashboardCountService._set(
+                cache_key, count, settings.CACHE_TTL["pending_admin_tasks"]
+            )
+        return count
+
+    @staticmethod
+    def invalidate_users(user_ids):
+        """
+        Drop users' counters once the current transaction commits
+
+        Args:
+            user_ids: IDs of the users affected
+        """
+        keys = [
+            settings.CACHE_KEYS["user_counts"].format(user_id=user_id)
+            for user_id in set(user_ids)
+            if user_id is not None
+        ]
+        if keys:
+            transaction.on_commit(lambda: DashboardCountService._delete(keys))
+
+    @staticmethod
+    def invalidate_projects(project_ids):
+        """
+        Drop the counters of everyone a change to projects' documents affects
+
+        That's each project's members and business area leader, and the
+        Directorate, who see documents awaiting their approval.
+
+        Args:
+            project_ids: IDs of the projects changed
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        members = ProjectMember.objects.filter(
+            user_id=OuterRef("pk"), project_id__in=project_ids
+        )
+        leaders = Project.objects.filter(
+            business_area__leader_id=OuterRef("pk"), pk__in=project_ids
+        )
+        user_ids = User.objects.filter(
+            Exists(members)
+            | Exists(leaders)
+            | Q(is_superuser=True)
+            | Q(work__business_area__name=DIRECTORATE_NAME)
+        ).values_list("pk", flat=True)
+        DashboardCountService.invalidate_users(user_ids)
+
+    @staticmethod
+    def invalidate_admin_tasks(user_ids=()):
+        """
+        Drop the admin task count, and the counters of users a task names
+
+        Args:
+            user_ids: IDs of users asked to act on the task
+        """
+        DashboardCountService.invalidate_users(user_ids)
+        transaction.on_commit(
+            lambda: DashboardCountService._delete(
+                [settings.CACHE_KEYS["pending_admin_tasks"]]
+            )
+        )
+
+    @staticmethod
+    def reconcile(user_ids):
+        """
+        Recompute and store users' counters, reporting those that drifted
+
+        Args:
+            user_ids: IDs of the users to reconcile
+
+        Returns:
+            list: IDs of users whose cached counters were wrong
+        """
+        drifted = []
+        for user_id in user_ids:
+            cache_key = settings.CACHE_KEYS["user_counts"].format(user_id=user_id)
+            counts = DashboardCountService.compute_user_counts(user_id)
+            cached = cache.get(cache_key)
+            if cached is not None and cached != counts:
+                drifted.append(user_id)
+            DashboardCountService._set(
+                cache_key, counts, settings.CACHE_TTL["user_counts"]
+            )
+
+        DashboardCountService._delete([settings.CACHE_KEYS["pending_admin_tasks"]])
+        return drifted
+
+    @staticmethod
+    def _set(cache_key, value, timeout):
+        try:
+            cache.set(cache_key, value, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cache {cache_key}: {e}")
+
+    @staticmethod
+    def _delete(keys):
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate {len(keys)} dashboard counters: {e}")
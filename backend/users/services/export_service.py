@@ -2,53 +2,52 @@
 Export service for data export operations
 """
 
-import csv
-
 from django.conf import settings
-from django.http import HttpResponse
 
+from common.utils.exports import EXPORT_CHUNK_SIZE, build_export_response
 from users.models import PublicStaffProfile
 
+STAFF_EXPORT_HEADERS = [
+    "ID",
+    "First Name",
+    "Last Name",
+    "Email",
+    "Business Area",
+    "Position",
+    "Is Hidden",
+]
+
 
 class ExportService:
     """Business logic for data export operations"""
 
     @staticmethod
-    def generate_staff_csv():
+    def generate_staff_csv(export_format="csv"):
         """
-        Generate CSV export of all staff profiles
+        Stream an export of all visible staff profiles
+
+        Args:
+            export_format: csv, csv.gz, xlsx or parquet
 
         Returns:
-            HttpResponse with CSV data
+            StreamingHttpResponse/FileResponse with the export
         """
         settings.LOGGER.info("Generating staff CSV export")
 
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="staff_profiles.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "ID",
-                "First Name",
-                "Last Name",
-                "Email",
-                "Business Area",
-                "Position",
-                "Is Hidden",
-            ]
+        profiles = (
+            PublicStaffProfile.objects.select_related(
+                "user",
+                "user__work",
+                "user__work__business_area",
+            )
+            .filter(is_hidden=False)
+            .order_by("pk")
         )
 
-        profiles = PublicStaffProfile.objects.select_related(
-            "user",
-            "user__work",
-            "user__work__business_area",
-        ).filter(is_hidden=False)
-
-        for profile in profiles:
-            user_work = getattr(profile.user, "work", None)
-            writer.writerow(
-                [
+        def rows():
+            for profile in profiles.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                user_work = getattr(profile.user, "work", None)
+                yield [
                     profile.id,
                     profile.user.first_name,
                     profile.user.last_name,
@@ -61,6 +60,7 @@ class ExportService:
                     user_work.role if user_work else "",
                     profile.is_hidden,
                 ]
-            )
 
-        return response
+        return build_export_response(
+            STAFF_EXPORT_HEADERS, rows(), "staff_profiles", export_format
+        )
@@ -0,0 +1,218 @@
+"""
+IT Assets directory service - Local mirror of the IT Assets department users
+"""
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import ITAssetsDirectoryEntry, ITAssetsDirectorySync
+
+
+class ITAssetsDirectoryService:
+    """
+    Staff lookups against a local copy of the IT Assets directory
+
+    IT Assets only serves its department users as one list, so looking
+    someone up directly means downloading all of them. Instead,
+    sync_it_assets_directory mirrors the list into ITAssetsDirectoryEntry
+    (run it on a schedule), writing only the records that changed, and
+    lookups read the mirror by email or IT Assets ID. Each sync records
+    its time in the single ITAssetsDirectorySync row, so get_age tells how
+    out of date the mirror is; it's stale once older than
+    IT_ASSETS_DIRECTORY_MAX_AGE seconds.
+    """
+
+    @staticmethod
+    def fetch():
+        """
+        Download the department users from IT Assets
+
+        Returns:
+            list: Department user records
+
+        Raises:
+            requests.RequestException: If IT Assets can't be reached or
+                responds with an error
+            ValueError: If the response isn't a list of records
+        """
+        if not settings.IT_ASSETS_URL:
+            raise ValueError("IT Assets URL not configured")
+
+        response = requests.get(
+            settings.IT_ASSETS_URL,
+            auth=(
+                settings.IT_ASSETS_USER or "",
+                settings.IT_ASSETS_ACCESS_TOKEN or "",
+            ),
+            timeout=settings.IT_ASSETS_DIRECTORY_TIMEOUT,
+        )
+        response.raise_for_status()
+
+        records = response.json()
+        if not isinstance(records, list):
+            raise ValueError("IT Assets returned an unexpected response")
+        return records
+
+    @staticmethod
+    def sync(records=None):
+        """
+        Bring the mirror in line with IT Assets
+
+        Args:
+            records: Department user records, fetched from IT Assets if None
+
+        Returns:
+            dict: Numbers of records "created", "updated", "deleted" and
+                "unchanged"
+
+        Raises:
+            requests.RequestException: If IT Assets can't be reached
+            ValueError: If IT Assets returned nothing usable, which leaves
+                the mirror as it was rather than emptying it
+        """
+        if records is None:
+            records = ITAssetsDirectoryService.fetch()
+
+        incoming = {
+            record["id"]: record
+            for record in records
+            if record.get("id") is not None and record.get("email")
+        }
+        if not incoming:
+            raise ValueError("IT Assets returned no department users")
+
+        now = timezone.now()
+        existing = ITAssetsDirectoryEntry.objects.in_bulk(field_name="it_asset_id")
+        created = []
+        updated = []
+        for it_asset_id, record in incoming.items():
+            entry = existing.get(it_asset_id)
+            if entry is None:
+                created.append(
+                    ITAssetsDirectoryEntry(
+                        it_asset_id=it_asset_id,
+                        **ITAssetsDirectoryService._get_fields(record),
+                    )
+                )
+            elif entry.data != record:
+                for field, value in ITAssetsDirectoryService._get_fields(
+                    record
+                ).items():
+                    setattr(entry, field, value)
+                # bulk_update doesn't apply auto_now
+                entry.updated_at = now
+                updated.append(entry)
+
+        removed = [
+            it_asset_id for it_asset_id in existing if it_asset_id not in incoming
+        ]
+
+        with transaction.atomic():
+            ITAssetsDirectoryEntry.objects.filter(it_asset_id__in=removed).delete()
+            ITAssetsDirectoryEntry.objects.bulk_create(created, batch_size=500)
+            ITAssetsDirectoryEntry.objects.bulk_update(
+                updated,
+                ["email", "employee_id", "data", "updated_at"],
+                batch_size=500,
+            )
+            ITAssetsDirectorySync.objects.update_or_create(
+                pk=1, defaults={"synced_at": now}
+            )
+
+        return {
+            "created": len(created),
+            "updated": len(updated),
+            "deleted": len(removed),
+            "unchanged": len(incoming) - len(created) - len(updated),
+        }
+
+    @staticmethod
+    def get_by_email(email):
+        """
+        Get the mirrored record for an email address
+
+        Args:
+            email: Email address, in any case
+
+        Returns:
+            ITAssetsDirectoryEntry or None
+        """
+        if not email:
+            return None
+        return (
+            ITAssetsDirectoryEntry.objects.filter(email=email.lower())
+            .order_by("-updated_at")
+            .first()
+        )
+
+    @staticmethod
+    def get_by_emails(emails):
+        """
+        Get the mirrored records for many email addresses in one query
+
+        Args:
+            emails: Email addresses, in any case
+
+        Returns:
+            dict: Lowercased email -> ITAssetsDirectoryEntry, for those found
+        """
+        emails = {email.lower() for email in emails if email}
+        return {
+            entry.email: entry
+            for entry in ITAssetsDirectoryEntry.objects.filter(
+                email__in=emails
+            ).order_by("updated_at")
+        }
+
+    @staticmethod
+    def get_by_id(it_asset_id):
+        """
+        Get the mirrored record for an IT Assets ID
+
+        Args:
+            it_asset_id: ID of the department user in IT Assets
+
+        Returns:
+            ITAssetsDirectoryEntry or None
+        """
+        return ITAssetsDirectoryEntry.objects.filter(it_asset_id=it_asset_id).first()
+
+    @staticmethod
+    def get_age():
+        """
+        How long since the mirror was last synced
+
+        Returns:
+            timedelta or None: None if it has never been synced
+        """
+        synced_at = ITAssetsDirectorySync.objects.values_list(
+            "synced_at", flat=True
+        ).first()
+        if synced_at is None:
+            return None
+        return timezone.now() - synced_at
+
+    @staticmethod
+    def is_stale(age=None):
+        """
+        Whether the mirror is too old to rely on
+
+        Args:
+            age: Age from get_age, looked up if not given
+
+        Returns:
+            bool: True if never synced or older than IT_ASSETS_DIRECTORY_MAX_AGE
+        """
+        if age is None:
+            age = ITAssetsDirectoryService.get_age()
+        return age is None or age.total_seconds() > settings.IT_ASSETS_DIRECTORY_MAX_AGE
+
+    @staticmethod
+    def _get_fields(record):
+        return {
+            "email": record["email"].lower(),
+            "employee_id": record.get("employee_id"),
+            "data": record,
+        }
@@ -8,12 +8,14 @@ from django.db.models import Q
 from rest_framework.exceptions import NotFound, ValidationError
 
 from users.models import PublicStaffProfile, User, UserProfile
-from users.services.user_service import UserService
 
 
 class ProfileService:
     """Business logic for profile operations"""
 
+    # Keyset for cursor pagination of list_staff_profiles()
+    CURSOR_ORDERING = ("user__first_name", "user__last_name", "id")
+
     @staticmethod
     def list_staff_profiles(filters=None, search=None):
         """
@@ -299,9 +301,6 @@ class ProfileService:
 
         profile.save()
 
-        # Invalidate user profile cache (UserProfile is cached via select_related)
-        UserService.invalidate_user_profile_cache(profile.user_id)
-
         return profile
 
     @staticmethod
@@ -329,7 +328,4 @@ class ProfileService:
 
         user.save()
 
-        # Invalidate user profile cache
-        UserService.invalidate_user_profile_cache(user_id)
-
         return user
@@ -0,0 +1,128 @@
+"""
+SSO service - Identity lookups and throttled last_login writes for SSO requests
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.utils.tagged_cache import TaggedCache, make_tag
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+_pending_lock = threading.Lock()
+_pending_logins = {}  # user ID -> time of their latest request
+_oldest_pending = None  # time.monotonic() of the oldest unflushed entry
+
+
+class SSOService:
+    """
+    Keeps requests from signed-in SSO users off the users table
+
+    Every request through the SSO proxy carries the user's identity headers.
+    Resolving those to a user is cached, and when the session is already
+    bound to that user nothing is looked up at all. last_login is recorded
+    at most once per SSO_LAST_LOGIN_INTERVAL per user (tracked in the shared
+    cache), and the writes are buffered per worker and flushed together in
+    one UPDATE once SSO_LAST_LOGIN_BATCH_SIZE users are waiting or the
+    oldest has waited SSO_LAST_LOGIN_FLUSH_INTERVAL seconds.
+    """
+
+    @staticmethod
+    def get_user(username):
+        """
+        Get the user an SSO identity belongs to
+
+        Args:
+            username: Username from the SSO headers
+
+        Returns:
+            User or None
+        """
+        cache_key = settings.CACHE_KEYS["sso_user"].format(username=username)
+        try:
+            user_id = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Cache error for SSO user {username}: {e}")
+            user_id = None
+
+        if user_id is not None:
+            user = User.objects.filter(pk=user_id).first()
+            # Renamed or deleted since it was cached
+            if user is not None and user.username == username:
+                return user
+
+        user = User.objects.filter(username=username).first()
+        if user is not None:
+            try:
+                cache.set(cache_key, user.pk, timeout=settings.CACHE_TTL["sso_user"])
+            except Exception as e:
+                logger.warning(f"Failed to cache SSO user {username}: {e}")
+        return user
+
+    @staticmethod
+    def record_login(user_id):
+        """
+        Note that a user made a request, writing last_login if it's due
+
+        Args:
+            user_id: ID of the user
+        """
+        cache_key = settings.CACHE_KEYS["sso_last_login"].format(user_id=user_id)
+        try:
+            due = cache.add(cache_key, 1, timeout=settings.SSO_LAST_LOGIN_INTERVAL)
+        except Exception as e:
+            logger.warning(f"Cache error for last_login of user {user_id}: {e}")
+            due = True
+        if not due:
+            return
+
+        global _oldest_pending
+        now = time.monotonic()
+        with _pending_lock:
+            _pending_logins[user_id] = timezone.now()
+            if _oldest_pending is None:
+                _oldest_pending = now
+            flush = (
+                len(_pending_logins) >= settings.SSO_LAST_LOGIN_BATCH_SIZE
+                or now - _oldest_pending >= settings.SSO_LAST_LOGIN_FLUSH_INTERVAL
+            )
+        if flush:
+            SSOService.flush_logins()
+
+    @staticmethod
+    def flush_logins():
+        """
+        Write buffered last_login times in one UPDATE
+
+        Returns:
+            int: Number of users updated
+        """
+        global _oldest_pending
+        with _pending_lock:
+            pending = dict(_pending_logins)
+            _pending_logins.clear()
+            _oldest_pending = None
+        if not pending:
+            return 0
+
+        try:
+            User.objects.bulk_update(
+                [User(pk=pk, last_login=at) for pk, at in pending.items()],
+                ["last_login"],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record last_login for {len(pending)} users: {e}")
+            return 0
+        # bulk_update sends no post_save, which drops cached users
+        TaggedCache.invalidate(make_tag("user", pk) for pk in pending)
+        return len(pending)
+
+
+atexit.register(SSOService.flush_logins)
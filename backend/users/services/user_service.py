@@ -6,21 +6,32 @@ import logging
 
 from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
-from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Q, Value
 from django.db.models.functions import Concat
 from django.utils.crypto import get_random_string
 from rest_framework.exceptions import NotFound, ValidationError
 
+from common.utils.tagged_cache import (
+    cached,
+    instance_from_dict,
+    instance_to_dict,
+    make_tag,
+)
 from users.models import User
 
 logger = logging.getLogger(__name__)
 
+# Loaded with, and cached with, users from get_user
+USER_CACHED_RELATIONS = ("profile", "work", "work__business_area")
+
 
 class UserService:
     """Business logic for user operations"""
 
+    # Keyset for cursor pagination of list_users()
+    CURSOR_ORDERING = ("first_name", "last_name", "id")
+
     @staticmethod
     def authenticate_user(username, password):
         """
@@ -215,68 +226,59 @@ class UserService:
         )
 
     @staticmethod
+    @cached(
+        "user_profile",
+        tags=lambda user_id: [make_tag("user", user_id)],
+        result_tags=lambda user: UserService._get_user_tags(user),
+        dump=lambda user: instance_to_dict(user, USER_CACHED_RELATIONS),
+        load=lambda data: instance_from_dict(User, data),
+    )
     def get_user(user_id):
         """
         Get user by ID with caching
 
+        Cached as field data until the user, their profile, their work or
+        its business area changes. Use get_user_for_update to change the user.
+
         Args:
             user_id: User ID
 
         Returns:
-            User object
+            User object, with profile and work loaded
 
         Raises:
             NotFound: If user doesn't exist
         """
-        cache_key = settings.CACHE_KEYS["user_profile"].format(user_id=user_id)
-
-        try:
-            cached_user = cache.get(cache_key)
-            if cached_user is not None:
-                logger.debug(f"Cache hit for user {user_id} profile")
-                return cached_user
-        except Exception as e:
-            logger.warning(f"Cache error for user {user_id} profile: {e}")
-
-        # Cache miss - query database
-        logger.debug(f"Cache miss for user {user_id} profile")
         try:
-            user = (
-                User.objects.select_related(
-                    "profile",
-                    "work",
-                    "work__business_area",
-                )
-                .prefetch_related(
-                    "groups",
-                )
-                .get(pk=user_id)
-            )
-
-            # Cache for 10 minutes
-            try:
-                cache.set(cache_key, user, timeout=settings.CACHE_TTL["user_profile"])
-            except Exception as e:
-                logger.warning(f"Failed to cache user {user_id} profile: {e}")
-
-            return user
+            return User.objects.select_related(*USER_CACHED_RELATIONS).get(pk=user_id)
         except User.DoesNotExist:
             raise NotFound(f"User {user_id} not found")
 
     @staticmethod
-    def invalidate_user_profile_cache(user_id):
+    def get_user_for_update(user_id):
         """
-        Invalidate cache for a specific user's profile
+        Get a user from the database, locked until the transaction ends
 
         Args:
-            user_id: User ID to invalidate cache for
+            user_id: User ID
+
+        Returns:
+            User object
+
+        Raises:
+            NotFound: If user doesn't exist
         """
-        cache_key = settings.CACHE_KEYS["user_profile"].format(user_id=user_id)
         try:
-            cache.delete(cache_key)
-            logger.debug(f"Invalidated cache for user {user_id} profile")
-        except Exception as e:
-            logger.warning(f"Failed to invalidate cache for user {user_id}: {e}")
+            return User.objects.select_for_update().get(pk=user_id)
+        except User.DoesNotExist:
+            raise NotFound(f"User {user_id} not found")
+
+    @staticmethod
+    def _get_user_tags(user):
+        work = getattr(user, "work", None)
+        if work is not None and work.business_area_id:
+            return [make_tag("business_area", work.business_area_id)]
+        return []
 
     @staticmethod
     @transaction.atomic
@@ -317,7 +319,7 @@ class UserService:
         Returns:
             Updated User object
         """
-        user = UserService.get_user(user_id)
+        user = UserService.get_user_for_update(user_id)
         settings.LOGGER.info(f"Updating user {user}")
 
         for field, value in data.items():
@@ -328,9 +330,6 @@ class UserService:
 
         user.save()
 
-        # Invalidate user profile cache
-        UserService.invalidate_user_profile_cache(user_id)
-
         return user
 
     @staticmethod
@@ -342,12 +341,9 @@ class UserService:
         Args:
             user_id: User ID
         """
-        user = UserService.get_user(user_id)
+        user = UserService.get_user_for_update(user_id)
         settings.LOGGER.info(f"Deleting user {user}")
 
-        # Invalidate user profile cache before deletion
-        UserService.invalidate_user_profile_cache(user_id)
-
         user.delete()
 
     @staticmethod
@@ -362,15 +358,12 @@ class UserService:
         Returns:
             Updated User object
         """
-        user = UserService.get_user(user_id)
+        user = UserService.get_user_for_update(user_id)
         user.is_active = not user.is_active
         user.save()
 
         settings.LOGGER.info(f"Toggled active status for {user}: {user.is_active}")
 
-        # Invalidate user profile cache
-        UserService.invalidate_user_profile_cache(user_id)
-
         return user
 
     @staticmethod
@@ -385,15 +378,12 @@ class UserService:
         Returns:
             Updated User object
         """
-        user = UserService.get_user(user_id)
+        user = UserService.get_user_for_update(user_id)
         user.is_superuser = not user.is_superuser
         user.save()
 
         settings.LOGGER.info(f"Toggled admin status for {user}: {user.is_superuser}")
 
-        # Invalidate user profile cache
-        UserService.invalidate_user_profile_cache(user_id)
-
         return user
 
     @staticmethod
@@ -0,0 +1,92 @@
+"""
+Django signals for the users app.
+
+Drops the cached dashboard counters of everyone a change affects, and bumps
+the cache tags of changed users.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from adminoptions.models import AdminTask
+from agencies.models import BusinessArea
+from common.utils.tagged_cache import TaggedCache, make_tag
+from documents.models import ProjectDocument
+from projects.models import Project, ProjectMember
+
+from .models import User, UserProfile, UserWork
+from .services.dashboard_count_service import DashboardCountService
+
+# ProjectDocument fields that decide whom a document is pending for
+DOCUMENT_COUNT_FIELDS = {
+    "status",
+    "project",
+    "project_lead_approval_granted",
+    "business_area_lead_approval_granted",
+    "directorate_approval_granted",
+}
+
+
+@receiver(post_save, sender=ProjectDocument)
+@receiver(post_delete, sender=ProjectDocument)
+def invalidate_document_counts(sender, instance, update_fields=None, **kwargs):
+    """Recount after an approval, recall or send-back"""
+    if update_fields and not DOCUMENT_COUNT_FIELDS.intersection(update_fields):
+        return
+    DashboardCountService.invalidate_projects([instance.project_id])
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def invalidate_member_counts(sender, instance, **kwargs):
+    """Recount after someone joins, leaves or leads a project"""
+    DashboardCountService.invalidate_projects([instance.project_id])
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_counts(sender, instance, update_fields=None, **kwargs):
+    """Recount after a project's status or business area changes"""
+    if update_fields and not {"status", "business_area"}.intersection(update_fields):
+        return
+    DashboardCountService.invalidate_projects([instance.pk])
+
+
+@receiver(pre_save, sender=BusinessArea)
+def remember_leader_id(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Note a business area's stored leader, which a save may replace"""
+    if raw or instance.pk is None:
+        return
+    if update_fields and "leader" not in update_fields:
+        return
+    instance._stored_leader_id = (
+        BusinessArea.objects.filter(pk=instance.pk)
+        .values_list("leader_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=BusinessArea)
+def invalidate_business_area_counts(sender, instance, **kwargs):
+    """Recount for a business area's leader, and the one it replaced"""
+    DashboardCountService.invalidate_users(
+        [instance.leader_id, getattr(instance, "_stored_leader_id", None)]
+    )
+
+
+@receiver(post_save, sender=AdminTask)
+@receiver(post_delete, sender=AdminTask)
+def invalidate_admin_task_counts(sender, instance, **kwargs):
+    """Recount admin tasks, and caretaker requests for the users asked"""
+    user_ids = []
+    if instance.action == AdminTask.ActionTypes.SETCARETAKER:
+        user_ids = instance.secondary_users or []
+    DashboardCountService.invalidate_admin_tasks(user_ids)
+
+
+TaggedCache.invalidate_on_change(User, lambda user: [make_tag("user", user.pk)])
+TaggedCache.invalidate_on_change(
+    UserProfile, lambda profile: [make_tag("user", profile.user_id)]
+)
+TaggedCache.invalidate_on_change(
+    UserWork, lambda work: [make_tag("user", work.user_id)]
+)
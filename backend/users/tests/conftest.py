@@ -4,6 +4,10 @@ User-specific pytest fixtures.
 Provides fixtures for testing user-related functionality.
 """
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from django.contrib.auth import get_user_model
 
@@ -206,3 +210,44 @@ def api_client():
     from rest_framework.test import APIClient
 
     return APIClient()
+
+
+@pytest.fixture
+def it_assets_server(settings):
+    """
+    Provide a local HTTP server standing in for IT Assets.
+
+    Serves its "records" as the department user list, with "status" as the
+    response code, and points IT_ASSETS_URL at it.
+
+    Returns:
+        ThreadingHTTPServer: Server, with "records", "status" and "requests"
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.server.requests.append(self.path)
+            body = json.dumps(self.server.records).encode()
+            self.send_response(self.server.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.records = []
+    server.status = 200
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.IT_ASSETS_URL = (
+        f"http://127.0.0.1:{server.server_port}/api/v3/departmentuser/"
+    )
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -25,6 +25,7 @@ from users.admin import (  # create_redirect_files was removed - function no lon
     update_display_names,
 )
 from users.models import KeywordTag, PublicStaffProfile, User, UserProfile, UserWork
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
 
 # ============================================================================
 # ADMIN ACTION TESTS - KEYWORD TAG
@@ -369,17 +370,13 @@ class TestSetItAssetsId:
             # Assert
             mock_print.assert_called_once_with("PLEASE SELECT ONLY ONE")
 
-    @patch("users.admin.requests.get")
     @pytest.mark.integration
-    def test_sets_it_asset_id_from_api(self, mock_get, staff_profile):
-        """Test action sets IT asset ID from API response"""
+    def test_sets_it_asset_id_from_directory(self, staff_profile):
+        """Test action sets IT asset ID from the directory mirror"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {"email": staff_profile.user.email, "id": 12345}
-        ]
-        mock_get.return_value = mock_response
+        ITAssetsDirectoryService.sync(
+            [{"email": staff_profile.user.email, "id": 12345}]
+        )
 
         staff_profile.it_asset_id = None
         staff_profile.save()
@@ -389,40 +386,29 @@ class TestSetItAssetsId:
         selected = [staff_profile]
 
         # Act
-        with patch("users.admin.settings") as mock_settings:
-            mock_settings.IT_ASSETS_URL = "http://test.com"
-            mock_settings.IT_ASSETS_USER = "user"
-            mock_settings.IT_ASSETS_ACCESS_TOKEN = "token"
+        with patch.object(admin, "message_user") as mock_message:
             set_it_assets_id(admin, request, selected)
 
         # Assert
         staff_profile.refresh_from_db()
         assert staff_profile.it_asset_id == 12345
+        assert "1 user(s)" in mock_message.call_args[0][1]
 
-    @patch("users.admin.requests.get")
     @pytest.mark.unit
-    def test_handles_api_failure(self, mock_get, staff_profile):
-        """Test action handles API failure gracefully"""
+    def test_warns_when_directory_not_synced(self, staff_profile):
+        """Test action warns when the directory mirror has not been synced"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Server error"
-        mock_get.return_value = mock_response
-
         admin = StaffProfileAdmin(PublicStaffProfile, AdminSite())
         request = Mock()
         selected = [staff_profile]
 
         # Act
         with patch("users.admin.settings") as mock_settings:
-            mock_settings.IT_ASSETS_URL = "http://test.com"
-            mock_settings.IT_ASSETS_USER = "user"
-            mock_settings.IT_ASSETS_ACCESS_TOKEN = "token"
             mock_settings.LOGGER = Mock()
             set_it_assets_id(admin, request, selected)
 
-        # Assert - should not crash, just log error
-        assert mock_settings.LOGGER.error.called
+        # Assert - should not crash, just log a warning
+        assert mock_settings.LOGGER.warning.called
 
 
 # ============================================================================
@@ -455,45 +441,37 @@ class TestGenerateActiveStaffCSV:
             # Assert
             mock_print.assert_called_once_with("PLEASE SELECT ONLY ONE")
 
-    @patch("users.admin.requests.get")
     @pytest.mark.integration
-    def test_generates_csv_from_it_assets_api(self, mock_get, staff_user):
-        """Test action generates CSV from IT Assets API data"""
+    def test_generates_csv_from_it_assets_directory(self, staff_user):
+        """Test action generates CSV from the IT Assets directory mirror"""
         # Arrange
         PublicStaffProfile.objects.create(user=staff_user, is_hidden=False)
 
-        # Mock API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {
-                "email": staff_user.email,
-                "id": 12345,
-                "title": "Senior Scientist",
-                "location": {"name": "Perth"},
-                "division": "BCS",
-                "unit": "Biodiversity and Conservation Science Division",
-                "employee_id": "EMP001",
-                "manager": {
-                    "name": "Manager Name",
-                    "email": "manager@dbca.wa.gov.au",
-                    "id": 99999,
-                },
-            }
-        ]
-        mock_get.return_value = mock_response
+        ITAssetsDirectoryService.sync(
+            [
+                {
+                    "email": staff_user.email,
+                    "id": 12345,
+                    "title": "Senior Scientist",
+                    "location": {"name": "Perth"},
+                    "division": "BCS",
+                    "unit": "Biodiversity and Conservation Science Division",
+                    "employee_id": "EMP001",
+                    "manager": {
+                        "name": "Manager Name",
+                        "email": "manager@dbca.wa.gov.au",
+                        "id": 99999,
+                    },
+                }
+            ]
+        )
 
         admin = CustomUserAdmin(User, AdminSite())
         request = Mock()
         selected = [staff_user]
 
         # Act
-        with patch("users.admin.settings") as mock_settings:
-            mock_settings.IT_ASSETS_URL = "http://test.com"
-            mock_settings.IT_ASSETS_USER = "user"
-            mock_settings.IT_ASSETS_ACCESS_TOKEN = "token"
-
-            response = generate_active_staff_csv(admin, request, selected)
+        response = generate_active_staff_csv(admin, request, selected)
 
         # Assert
         assert isinstance(response, HttpResponse)
@@ -503,34 +481,25 @@ class TestGenerateActiveStaffCSV:
         # Verify CSV content includes user data
         content = response.content.decode("utf-8")
         assert staff_user.email in content
+        assert "Senior Scientist" in content
 
-    @patch("users.admin.requests.get")
     @pytest.mark.integration
-    def test_handles_api_failure_gracefully(self, mock_get, staff_user):
-        """Test action handles IT Assets API failure"""
+    def test_handles_unsynced_directory_gracefully(self, staff_user):
+        """Test action reports an IT Assets directory that was never synced"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
-
         admin = CustomUserAdmin(User, AdminSite())
         request = Mock()
         selected = [staff_user]
 
         # Act
-        with patch("users.admin.settings") as mock_settings:
-            mock_settings.IT_ASSETS_URL = "http://test.com"
-            mock_settings.IT_ASSETS_USER = "user"
-            mock_settings.IT_ASSETS_ACCESS_TOKEN = "token"
-
-            with patch.object(admin, "message_user") as mock_message:
-                result = generate_active_staff_csv(admin, request, selected)
+        with patch.object(admin, "message_user") as mock_message:
+            result = generate_active_staff_csv(admin, request, selected)
 
         # Assert
         assert result is None
         mock_message.assert_called()
         args = mock_message.call_args[0]
-        assert "Failed to fetch IT Assets data" in args[1]
+        assert "IT Assets directory has not been synced" in args[1]
 
 
 @pytest.mark.integration
@@ -8,11 +8,17 @@ import pytest
 from django.core.cache import cache
 from django.test import override_settings
 
+from common.utils.tagged_cache import TaggedCache
 from users.models import User, UserProfile, UserWork
 from users.services.profile_service import ProfileService
 from users.services.user_service import UserService
 
 
+def get_cached_user(user_id):
+    """The user's cache entry, if still valid"""
+    return TaggedCache.get("user_profile", f"user:{user_id}:profile")
+
+
 @pytest.fixture
 def clear_cache():
     """Clear cache before and after each test"""
@@ -40,13 +46,13 @@ class TestUserCacheInvalidation:
         # Arrange - Populate cache
         cached_user = UserService.get_user(user.pk)
         assert cached_user is not None
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         # Act - Update user
         UserService.update_user(user.pk, {"first_name": "Updated"})
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -60,13 +66,13 @@ class TestUserCacheInvalidation:
         """Test that toggling user active status invalidates cache"""
         # Arrange - Populate cache
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         # Act - Toggle active
         UserService.toggle_active(user.pk)
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -80,13 +86,13 @@ class TestUserCacheInvalidation:
         """Test that toggling admin status invalidates cache"""
         # Arrange - Populate cache
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         # Act - Switch admin
         UserService.switch_admin(user.pk)
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -104,7 +110,7 @@ class TestUserCacheInvalidation:
             email="test@example.com",
         )
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         user_pk = user.pk
 
@@ -112,7 +118,7 @@ class TestUserCacheInvalidation:
         UserService.delete_user(user_pk)
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user_pk}:profile") is None
+        assert get_cached_user(user_pk) is None
 
     @override_settings(
         CACHES={
@@ -127,13 +133,13 @@ class TestUserCacheInvalidation:
         # Arrange - Create profile and populate cache
         profile = UserProfile.objects.create(user=user, title="Test Title")
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         # Act - Update profile
         ProfileService.update_user_profile(profile.pk, {"title": "Updated Title"})
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -147,7 +153,7 @@ class TestUserCacheInvalidation:
         """Test that updating personal information invalidates cache"""
         # Arrange - Populate cache
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
         # Act - Update personal information
         ProfileService.update_personal_information(
@@ -155,7 +161,7 @@ class TestUserCacheInvalidation:
         )
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -194,7 +200,7 @@ class TestUserCacheInvalidation:
     def test_cache_invalidation_after_work_update(
         self, user, business_area, clear_cache
     ):
-        """Test that updating UserWork invalidates cache"""
+        """Test that saving UserWork anywhere invalidates cache"""
         # Arrange - Create work and populate cache
         work = UserWork.objects.create(
             user=user,
@@ -202,15 +208,14 @@ class TestUserCacheInvalidation:
             role="Test Role",
         )
         UserService.get_user(user.pk)
-        assert cache.get(f"user:{user.pk}:profile") is not None
+        assert get_cached_user(user.pk) is not None
 
-        # Act - Update work (simulating what the view does)
+        # Act - Update work; its signal bumps the user's tag
         work.role = "Updated Role"
         work.save()
-        UserService.invalidate_user_profile_cache(user.pk)
 
         # Assert - Cache was invalidated
-        assert cache.get(f"user:{user.pk}:profile") is None
+        assert get_cached_user(user.pk) is None
 
     @override_settings(
         CACHES={
@@ -235,12 +240,63 @@ class TestUserCacheInvalidation:
         UserService.get_user(user1.pk)
         UserService.get_user(user2.pk)
 
-        assert cache.get(f"user:{user1.pk}:profile") is not None
-        assert cache.get(f"user:{user2.pk}:profile") is not None
+        assert get_cached_user(user1.pk) is not None
+        assert get_cached_user(user2.pk) is not None
 
         # Act - Update user1
         UserService.update_user(user1.pk, {"first_name": "Updated"})
 
         # Assert - Only user1 cache was invalidated
-        assert cache.get(f"user:{user1.pk}:profile") is None
-        assert cache.get(f"user:{user2.pk}:profile") is not None
+        assert get_cached_user(user1.pk) is None
+        assert get_cached_user(user2.pk) is not None
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-cache-invalidation-10",
+            }
+        }
+    )
+    def test_business_area_change_invalidates_cache(
+        self, user, business_area, clear_cache
+    ):
+        """Test that renaming the user's business area invalidates cache"""
+        # Arrange - Create work and populate cache
+        UserWork.objects.create(user=user, business_area=business_area)
+        UserService.get_user(user.pk)
+        assert get_cached_user(user.pk) is not None
+
+        # Act - Rename business area
+        business_area.name = "Renamed Area"
+        business_area.save()
+
+        # Assert - Cache was invalidated
+        assert get_cached_user(user.pk) is None
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-cache-invalidation-11",
+            }
+        }
+    )
+    def test_cache_hit_needs_no_queries(
+        self, user, business_area, clear_cache, django_assert_num_queries
+    ):
+        """Test that a cache hit rebuilds the user and their work without queries"""
+        # Arrange - Create work and populate cache
+        UserWork.objects.create(user=user, business_area=business_area, role="Role")
+        UserService.get_user(user.pk)
+
+        # Act
+        with django_assert_num_queries(0):
+            cached_user = UserService.get_user(user.pk)
+            role = cached_user.work.role
+            business_area_name = cached_user.work.business_area.name
+
+        # Assert
+        assert cached_user.pk == user.pk
+        assert role == "Role"
+        assert business_area_name == business_area.name
@@ -3,7 +3,6 @@ Tests for user models
 """
 
 from datetime import timedelta
-from unittest.mock import Mock, patch
 
 import pytest
 from django.utils import timezone
@@ -18,6 +17,7 @@ from users.models import (
     UserProfile,
     UserWork,
 )
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
 
 
 @pytest.mark.integration
@@ -547,24 +547,22 @@ class TestPublicStaffProfileModel:
         assert tag1 in staff_profile.keyword_tags.all()
         assert tag2 in staff_profile.keyword_tags.all()
 
-    @patch("users.models.requests.get")
     @pytest.mark.integration
-    def test_get_it_asset_data_success(self, mock_get, staff_profile):
-        """Test getting IT asset data successfully"""
+    def test_get_it_asset_data_success(self, staff_profile):
+        """Test getting IT asset data from the directory mirror"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {
-                "id": 123,
-                "email": staff_profile.user.email,
-                "title": "Test Title",
-                "division": "Test Division",
-                "unit": "Test Unit",
-                "location": "Test Location",
-            }
-        ]
-        mock_get.return_value = mock_response
+        ITAssetsDirectoryService.sync(
+            [
+                {
+                    "id": 123,
+                    "email": staff_profile.user.email.upper(),
+                    "title": "Test Title",
+                    "division": "Test Division",
+                    "unit": "Test Unit",
+                    "location": "Test Location",
+                }
+            ]
+        )
 
         # Act
         result = staff_profile.get_it_asset_data()
@@ -574,16 +572,14 @@ class TestPublicStaffProfileModel:
         assert result["id"] == 123
         assert result["title"] == "Test Title"
         assert result["division"] == "Test Division"
+        staff_profile.refresh_from_db()
+        assert staff_profile.it_asset_id == 123
 
-    @patch("users.models.requests.get")
     @pytest.mark.unit
-    def test_get_it_asset_data_failure(self, mock_get, staff_profile):
-        """Test getting IT asset data when API fails"""
+    def test_get_it_asset_data_not_mirrored(self, staff_profile):
+        """Test getting IT asset data for someone not in the mirror"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-        mock_get.return_value = mock_response
+        ITAssetsDirectoryService.sync([{"id": 1, "email": "other@example.com"}])
 
         # Act
         result = staff_profile.get_it_asset_data()
@@ -591,22 +587,13 @@ class TestPublicStaffProfileModel:
         # Assert
         assert result is None
 
-    @patch("users.models.requests.get")
     @pytest.mark.integration
-    def test_get_it_asset_email_success(self, mock_get, staff_profile):
-        """Test getting IT asset email successfully"""
+    def test_get_it_asset_email_success(self, staff_profile):
+        """Test getting IT asset email by the profile's IT Assets ID"""
         # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {
-                "id": 123,
-                "email": "it.asset@example.com",
-            }
-        ]
-        mock_get.return_value = mock_response
-        staff_profile.user.email = "it.asset@example.com"
-        staff_profile.user.save()
+        ITAssetsDirectoryService.sync([{"id": 123, "email": "it.asset@example.com"}])
+        staff_profile.it_asset_id = 123
+        staff_profile.save()
 
         # Act
         result = staff_profile.get_it_asset_email()
@@ -614,18 +601,11 @@ class TestPublicStaffProfileModel:
         # Assert
         assert result == "it.asset@example.com"
 
-    @patch("users.models.requests.get")
     @pytest.mark.unit
-    def test_get_it_asset_email_failure(self, mock_get, staff_profile):
-        """Test getting IT asset email when API fails"""
-        # Arrange
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-        mock_get.return_value = mock_response
-
+    def test_get_it_asset_email_not_mirrored(self, staff_profile):
+        """Test getting IT asset email falls back to the user's email"""
         # Act
         result = staff_profile.get_it_asset_email()
 
         # Assert
-        assert result is None
+        assert result == staff_profile.user.email
@@ -2,16 +2,32 @@
 Tests for user services
 """
 
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import NotFound, ValidationError
 
-from users.models import EducationEntry, EmploymentEntry, PublicStaffProfile
+from common.tests.factories import UserFactory
+from users.models import (
+    EducationEntry,
+    EmploymentEntry,
+    ITAssetsDirectoryEntry,
+    PublicStaffProfile,
+)
+from users.services.dashboard_count_service import DashboardCountService
 from users.services.entry_service import EducationService, EmploymentService
 from users.services.export_service import ExportService
+from users.services.it_assets_directory_service import ITAssetsDirectoryService
 from users.services.profile_service import ProfileService
+from users.services.sso_service import SSOService
 from users.services.user_service import UserService
 
 User = get_user_model()
@@ -849,7 +865,380 @@ class TestExportService:
         assert "attachment" in response["Content-Disposition"]
 
         # Check CSV content
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         assert "First Name" in content
         assert "Last Name" in content
         assert "Email" in content
+
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-dashboard-counts",
+    }
+}
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestDashboardCountService:
+    """Tests for DashboardCountService"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, settings):
+        settings.CACHES = LOCMEM_CACHE
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def lead_document(self, db):
+        """A document waiting on its project lead"""
+        from common.tests.factories import (
+            ProjectDocumentFactory,
+            ProjectFactory,
+            ProjectMemberFactory,
+        )
+
+        project = ProjectFactory()
+        lead = ProjectMemberFactory(project=project, is_leader=True).user
+        document = ProjectDocumentFactory(
+            project=project,
+            kind="concept",
+            status="inapproval",
+            project_lead_approval_granted=False,
+        )
+        return lead, document
+
+    def test_compute_user_counts(self, lead_document):
+        """Test counters cover pending documents and caretaker requests"""
+        # Arrange
+        from adminoptions.models import AdminTask
+
+        lead, _ = lead_document
+        AdminTask.objects.create(
+            action=AdminTask.ActionTypes.SETCARETAKER,
+            status=AdminTask.TaskStatus.PENDING,
+            secondary_users=[lead.pk],
+        )
+
+        # Act
+        counts = DashboardCountService.compute_user_counts(lead.pk)
+
+        # Assert
+        assert counts["documents"] == {
+            "all": 1,
+            "team": 0,
+            "lead": 1,
+            "ba": 0,
+            "directorate": 0,
+        }
+        assert counts["caretaker_requests"] == 1
+
+    def test_get_counts_cached(self, lead_document, django_assert_num_queries):
+        """Test a second read is served from the cache"""
+        # Arrange
+        lead, _ = lead_document
+        first = DashboardCountService.get_counts(lead)
+
+        # Act
+        with django_assert_num_queries(0):
+            second = DashboardCountService.get_counts(lead)
+
+        # Assert
+        assert second == first
+        assert second["documents"]["lead"] == 1
+
+    def test_approval_drops_counts(
+        self, lead_document, django_capture_on_commit_callbacks
+    ):
+        """Test approving a document refreshes its lead's counters"""
+        # Arrange
+        lead, document = lead_document
+        DashboardCountService.get_counts(lead)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            document.project_lead_approval_granted = True
+            document.save()
+
+        # Assert
+        assert DashboardCountService.get_counts(lead)["documents"]["lead"] == 0
+
+    def test_caretaker_request_drops_counts(
+        self, user, django_capture_on_commit_callbacks
+    ):
+        """Test a new caretaker request refreshes the asked user's counters"""
+        # Arrange
+        from adminoptions.models import AdminTask
+
+        user.is_superuser = True
+        user.save()
+        DashboardCountService.get_counts(user)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            AdminTask.objects.create(
+                action=AdminTask.ActionTypes.SETCARETAKER,
+                status=AdminTask.TaskStatus.PENDING,
+                secondary_users=[user.pk],
+            )
+
+        # Assert
+        counts = DashboardCountService.get_counts(user)
+        assert counts["caretaker_requests"] == 1
+        assert counts["admin_tasks"] == 1
+
+    def test_leader_change_drops_previous_leader_counts(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test replacing a business area leader refreshes both leaders"""
+        # Arrange
+        from common.tests.factories import (
+            BusinessAreaFactory,
+            ProjectDocumentFactory,
+            ProjectFactory,
+        )
+
+        previous, successor = UserFactory(), UserFactory()
+        business_area = BusinessAreaFactory(leader=previous)
+        ProjectDocumentFactory(
+            project=ProjectFactory(business_area=business_area),
+            kind="concept",
+            status="inapproval",
+            project_lead_approval_granted=True,
+            business_area_lead_approval_granted=False,
+        )
+        assert DashboardCountService.get_counts(previous)["documents"]["ba"] == 1
+        DashboardCountService.get_counts(successor)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            business_area.leader = successor
+            business_area.save()
+
+        # Assert
+        assert DashboardCountService.get_counts(previous)["documents"]["ba"] == 0
+        assert DashboardCountService.get_counts(successor)["documents"]["ba"] == 1
+
+    def test_reconcile_command_repairs_drift(self, lead_document):
+        """Test the reconcile command rewrites stale counters"""
+        # Arrange
+        lead, document = lead_document
+        DashboardCountService.get_counts(lead)
+        # A queryset update sends no signals
+        type(document).objects.filter(pk=document.pk).update(
+            project_lead_approval_granted=True
+        )
+        out = StringIO()
+
+        # Act
+        call_command("reconcile_dashboard_counts", "--user", str(lead.pk), stdout=out)
+
+        # Assert
+        assert f"User {lead.pk} had stale counts" in out.getvalue()
+        assert DashboardCountService.get_counts(lead)["documents"]["lead"] == 0
+
+
+@pytest.mark.django_db
+class TestSSOService:
+    """Tests for SSOService"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, settings):
+        settings.CACHES = LOCMEM_CACHE
+        settings.SSO_LAST_LOGIN_BATCH_SIZE = 2
+        settings.SSO_LAST_LOGIN_FLUSH_INTERVAL = 3600
+        cache.clear()
+        SSOService.flush_logins()
+        yield
+        cache.clear()
+        SSOService.flush_logins()
+
+    @pytest.mark.unit
+    def test_get_user_cached(self, user, django_assert_num_queries):
+        """Test the identity lookup is cached by user ID"""
+        # Arrange
+        SSOService.get_user(user.username)
+
+        # Act & Assert
+        with django_assert_num_queries(1):
+            assert SSOService.get_user(user.username) == user
+
+    @pytest.mark.unit
+    def test_get_user_renamed(self, user):
+        """Test a cached identity is rechecked after the user is renamed"""
+        # Arrange
+        old_username = user.username
+        SSOService.get_user(old_username)
+        user.username = "renamed@example.com"
+        user.save()
+
+        # Act & Assert
+        assert SSOService.get_user(old_username) is None
+        assert SSOService.get_user("renamed@example.com") == user
+
+    @pytest.mark.unit
+    def test_flush_logins_drops_cached_users(self, django_capture_on_commit_callbacks):
+        """Test a batched last_login write refreshes the cached user"""
+        # Arrange
+        user = UserFactory(last_login=None)
+        UserService.get_user(user.pk)
+        SSOService.record_login(user.pk)
+
+        # Act
+        with django_capture_on_commit_callbacks(execute=True):
+            SSOService.flush_logins()
+
+        # Assert
+        assert UserService.get_user(user.pk).last_login is not None
+
+    @pytest.mark.unit
+    def test_record_login_throttled_and_batched(self, django_assert_num_queries):
+        """Test last_login is written once per interval, in batches"""
+        # Arrange
+        first = UserFactory(last_login=None)
+        second = UserFactory(last_login=None)
+
+        # Act
+        with django_assert_num_queries(0):
+            SSOService.record_login(first.pk)
+            SSOService.record_login(first.pk)
+        with django_assert_num_queries(1):
+            SSOService.record_login(second.pk)
+
+        # Assert
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.last_login is not None
+        assert second.last_login is not None
+        with django_assert_num_queries(0):
+            SSOService.record_login(first.pk)
+            SSOService.flush_logins()
+
+
+def department_user(it_asset_id, email, **fields):
+    """An IT Assets department user record"""
+    return {"id": it_asset_id, "email": email, "employee_id": None, **fields}
+
+
+@pytest.mark.django_db
+class TestITAssetsDirectoryService:
+    """Tests for ITAssetsDirectoryService"""
+
+    @pytest.mark.integration
+    def test_sync_mirrors_it_assets(self, it_assets_server):
+        """Test a sync downloads the department users into the mirror"""
+        # Arrange
+        it_assets_server.records = [
+            department_user(1, "First.Person@example.com", employee_id="E1"),
+            department_user(2, "second@example.com", title="Scientist"),
+        ]
+
+        # Act
+        counts = ITAssetsDirectoryService.sync()
+
+        # Assert
+        assert counts == {"created": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert it_assets_server.requests == ["/api/v3/departmentuser/"]
+        entry = ITAssetsDirectoryService.get_by_email("first.person@EXAMPLE.com")
+        assert entry.it_asset_id == 1
+        assert entry.employee_id == "E1"
+        assert entry.data["email"] == "First.Person@example.com"
+        assert ITAssetsDirectoryService.get_by_id(2).data["title"] == "Scientist"
+        assert not ITAssetsDirectoryService.is_stale()
+
+    @pytest.mark.integration
+    def test_sync_writes_only_changes(self, it_assets_server):
+        """Test a later sync creates, updates and deletes only what changed"""
+        # Arrange
+        it_assets_server.records = [
+            department_user(1, "kept@example.com"),
+            department_user(2, "changed@example.com", title="Old"),
+            department_user(3, "left@example.com"),
+        ]
+        ITAssetsDirectoryService.sync()
+        kept_updated_at = ITAssetsDirectoryEntry.objects.get(it_asset_id=1).updated_at
+        it_assets_server.records = [
+            department_user(1, "kept@example.com"),
+            department_user(2, "changed@example.com", title="New"),
+            department_user(4, "joined@example.com"),
+        ]
+
+        # Act
+        counts = ITAssetsDirectoryService.sync()
+
+        # Assert
+        assert counts == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        assert ITAssetsDirectoryService.get_by_id(2).data["title"] == "New"
+        assert ITAssetsDirectoryService.get_by_id(3) is None
+        assert ITAssetsDirectoryService.get_by_email("joined@example.com")
+        kept = ITAssetsDirectoryEntry.objects.get(it_asset_id=1)
+        assert kept.updated_at == kept_updated_at
+        assert ITAssetsDirectoryService.get_age() < timedelta(minutes=1)
+
+    @pytest.mark.integration
+    def test_sync_unchanged_writes_no_entries(self):
+        """Test a sync with nothing new only records the sync time"""
+        # Arrange
+        records = [department_user(1, "a@example.com")]
+        ITAssetsDirectoryService.sync(records)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            counts = ITAssetsDirectoryService.sync(records)
+
+        # Assert
+        assert counts["unchanged"] == 1
+        assert not [
+            query
+            for query in queries
+            if query["sql"].startswith("UPDATE")
+            and "users_itassetsdirectoryentry" in query["sql"]
+        ]
+
+    @pytest.mark.integration
+    def test_sync_failure_keeps_mirror(self, it_assets_server):
+        """Test a failed or empty download leaves the mirror as it was"""
+        # Arrange
+        ITAssetsDirectoryService.sync([department_user(1, "kept@example.com")])
+
+        # Act & Assert
+        it_assets_server.status = 500
+        with pytest.raises(requests.HTTPError):
+            ITAssetsDirectoryService.sync()
+        it_assets_server.status = 200
+        it_assets_server.records = []
+        with pytest.raises(ValueError):
+            ITAssetsDirectoryService.sync()
+        assert ITAssetsDirectoryService.get_by_id(1) is not None
+
+    @pytest.mark.unit
+    def test_is_stale(self, settings):
+        """Test the mirror is stale until synced, and once it ages out"""
+        # Arrange
+        settings.IT_ASSETS_DIRECTORY_MAX_AGE = 3600
+
+        # Act & Assert
+        assert ITAssetsDirectoryService.get_age() is None
+        assert ITAssetsDirectoryService.is_stale()
+        ITAssetsDirectoryService.sync([department_user(1, "a@example.com")])
+        assert not ITAssetsDirectoryService.is_stale()
+        assert ITAssetsDirectoryService.is_stale(timedelta(hours=2))
+
+    @pytest.mark.integration
+    def test_sync_command(self, it_assets_server):
+        """Test the sync_it_assets_directory command syncs and reports its age"""
+        # Arrange
+        it_assets_server.records = [department_user(1, "a@example.com")]
+        out = StringIO()
+
+        # Act
+        call_command("sync_it_assets_directory", stdout=out)
+
+        # Assert
+        assert "1 created" in out.getvalue()
+        assert "last synced" in out.getvalue()
+        it_assets_server.status = 503
+        with pytest.raises(CommandError):
+            call_command("sync_it_assets_directory", stdout=StringIO())
@@ -158,6 +158,38 @@ class TestUserViews:
         assert response.status_code == status.HTTP_200_OK
         assert "users" in response.data
 
+    def test_list_users_by_cursor(self, api_client, user, user_factory):
+        """Test cursor pages list users by name without repeats"""
+        # Arrange
+        for first_name in ("Cara", "Abe", "Bo", "Abe"):
+            user_factory(first_name=first_name)
+        api_client.force_authenticate(user=user)
+
+        # Act
+        first_page = api_client.get(users_urls.list(), {"cursor": "", "page_size": 3})
+        second_page = api_client.get(
+            users_urls.list(),
+            {"cursor": first_page.data["next_cursor"], "page_size": 3},
+        )
+
+        # Assert
+        users = first_page.data["users"] + second_page.data["users"]
+        assert len(users) == 5
+        assert len({item["id"] for item in users}) == 5
+        assert second_page.data["next_cursor"] is None
+        assert first_page.data["total_results"] is None
+
+    def test_list_users_invalid_cursor(self, api_client, user):
+        """Test a malformed cursor is a bad request"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.get(users_urls.list(), {"cursor": "%%%"})
+
+        # Assert
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_create_user(self, api_client, superuser):
         """Test creating a user"""
         # Arrange
@@ -680,6 +712,20 @@ class TestUtilityViews:
         # Assert
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_my_counts(self, api_client, user):
+        """Test getting the current user's dashboard counters"""
+        # Arrange
+        api_client.force_authenticate(user=user)
+
+        # Act
+        response = api_client.get(users_urls.path("me", "counts"))
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["documents"]["all"] == 0
+        assert response.data["caretaker_requests"] == 0
+        assert response.data["admin_tasks"] == 0
+
     def test_small_internal_user_search(self, api_client, user, user_factory):
         """Test searching users"""
         # Arrange
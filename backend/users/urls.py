@@ -6,6 +6,7 @@ urlpatterns = [
     # Base Views - String patterns MUST come before <int:pk>
     path("is_staff/<int:pk>", views.CheckUserIsStaff.as_view()),
     path("me", views.Me.as_view()),
+    path("me/counts", views.MyCounts.as_view()),
     path("smallsearch", views.SmallInternalUserSearch.as_view()),
     path("directorate", views.DirectorateUsers.as_view()),
     path(
@@ -45,6 +45,7 @@ from .utils import (
     CheckNameExists,
     CheckUserIsStaff,
     Me,
+    MyCounts,
     SmallInternalUserSearch,
 )
 
@@ -62,6 +63,7 @@ __all__ = [
     "CheckNameExists",
     "CheckUserIsStaff",
     "Me",
+    "MyCounts",
     "SmallInternalUserSearch",
     # Admin
     "ToggleUserActive",
@@ -29,7 +29,9 @@ class Users(APIView):
         users = UserService.list_users(filters=request.query_params)
 
         # Paginate results
-        paginated = paginate_queryset(users, request)
+        paginated = paginate_queryset(
+            users, request, cursor_ordering=UserService.CURSOR_ORDERING
+        )
 
         serializer = TinyUserSerializer(paginated["items"], many=True)
         return Response(
@@ -37,6 +39,7 @@ class Users(APIView):
                 "users": serializer.data,
                 "total_results": paginated["total_results"],
                 "total_pages": paginated["total_pages"],
+                "next_cursor": paginated["next_cursor"],
             }
         )
 
@@ -4,7 +4,6 @@ Staff profile views
 
 from django.conf import settings
 from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import (
     AllowAny,
@@ -21,7 +20,8 @@ from rest_framework.status import (
 )
 from rest_framework.views import APIView
 
-from common.utils import paginate_queryset
+from common.utils import get_export_format, paginate_queryset
+from config.email_assets import EmailAssetRegistry
 from projects.models import ProjectMember
 from projects.serializers import ProjectDataTableSerializer
 from users.models import PublicStaffProfile
@@ -50,7 +50,9 @@ class StaffProfiles(APIView):
         filters = {k: v for k, v in filters.items() if v is not None}
 
         profiles = ProfileService.list_staff_profiles(filters=filters, search=search)
-        paginated = paginate_queryset(profiles, request)
+        paginated = paginate_queryset(
+            profiles, request, cursor_ordering=ProfileService.CURSOR_ORDERING
+        )
 
         serializer = TinyStaffProfileSerializer(paginated["items"], many=True)
         return Response(
@@ -58,6 +60,7 @@ class StaffProfiles(APIView):
                 "profiles": serializer.data,
                 "total_results": paginated["total_results"],
                 "total_pages": paginated["total_pages"],
+                "next_cursor": paginated["next_cursor"],
             }
         )
 
@@ -168,12 +171,12 @@ class CheckStaffProfileAndReturnDataAndActiveState(APIView):
 
 
 class DownloadBCSStaffCSV(APIView):
-    """Download staff profiles as CSV"""
+    """Download staff profiles as CSV (or ?file_format=csv.gz/xlsx/parquet)"""
 
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return ExportService.generate_staff_csv()
+        return ExportService.generate_staff_csv(get_export_format(request))
 
 
 class StaffProfileProjects(APIView):
@@ -260,7 +263,7 @@ class PublicEmailStaffMember(APIView):
             }
 
             # Render the email template
-            template_content = render_to_string(template_path, template_props)
+            template_content = EmailAssetRegistry.render(template_path, template_props)
 
             if settings.ENVIRONMENT == "production":
                 try:
@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 
 from users.serializers import TinyUserSerializer, UserMeSerializer
 from users.services import UserService
+from users.services.dashboard_count_service import DashboardCountService
 
 
 class CheckEmailExists(APIView):
@@ -61,6 +62,15 @@ class Me(APIView):
         return Response(serializer.data)
 
 
+class MyCounts(APIView):
+    """Get the current user's dashboard counters, cheap enough to poll"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(DashboardCountService.get_counts(request.user))
+
+
 class SmallInternalUserSearch(APIView):
     """Search users (internal)"""
 